@@ -302,16 +302,11 @@ class AdvancedMetaheuristicScheduler(BaseScheduler):
         Try to place a single assignment in the best available slot
         """
         # Get weekly hours for this assignment
-        weekly_hours = self.db_manager.get_weekly_hours_for_lesson(assignment.lesson_id, 
-                                                                  assignment.class_id)  # This isn't a complete class object
+        weekly_hours = self.db_manager.get_requirement_table().weekly_hours(assignment.class_id, assignment.lesson_id)
         if not weekly_hours:
-            # Get class object to get grade
             classes = self.db_manager.get_all_classes()
             class_obj = next((c for c in classes if c.class_id == assignment.class_id), None)
-            if class_obj:
-                weekly_hours = self.db_manager.get_weekly_hours_for_lesson(assignment.lesson_id, 
-                                                                          class_obj.grade)
-            else:
+            if not class_obj:
                 # As a fallback, try to get some default value
                 weekly_hours = 2  # Default to 2 hours if we can't determine
         
@@ -1,14 +1,15 @@
 # -*- coding: utf-8 -*-
 """
 Automatic Algorithm Selector - Selects the optimal scheduler based on input characteristics
+
+Kayıtlı çalıştırma geçmişi varsa (utils/run_history.py) benzer örneklerde %100
+kapsamaya ulaşması muhtemel en hızlı algoritma seçilir; yoksa elle ayarlanmış
+puanlara dönülür.
 """
-from typing import Dict, Any, Type
+from typing import Dict, Any, Optional, Type
 from algorithms.base_scheduler import BaseScheduler
-from algorithms.simple_perfect_scheduler import SimplePerfectScheduler
-from algorithms.hybrid_optimal_scheduler import HybridOptimalScheduler
-from algorithms.ultra_aggressive_scheduler import UltraAggressiveScheduler
-from algorithms.ultimate_scheduler import UltimateScheduler
-from algorithms.enhanced_strict_scheduler import EnhancedStrictScheduler
+from algorithms.scheduler_registry import SchedulerRegistry, get_scheduler_registry
+from utils.run_history import InstanceFeatures, RunHistoryStore, get_run_history
 import logging
 
 logger = logging.getLogger(__name__)
@@ -24,16 +25,16 @@ class AlgorithmSelector:
     - Number of lessons
     - Required coverage percentage
     - Performance constraints
+    - Recorded wall time and coverage of earlier runs on similar instances
     """
     
-    def __init__(self):
-        self.algorithms = {
-            'simple_perfect': SimplePerfectScheduler,
-            'hybrid_optimal': HybridOptimalScheduler,
-            'ultra_aggressive': UltraAggressiveScheduler,
-            'ultimate': UltimateScheduler,
-            'enhanced_strict': EnhancedStrictScheduler
-        }
+    CANDIDATES = ('simple_perfect', 'hybrid_optimal', 'ultra_aggressive', 'ultimate', 'enhanced_strict')
+
+    def __init__(self, history: Optional[RunHistoryStore] = None, registry: Optional[SchedulerRegistry] = None):
+        self.history = history if history is not None else get_run_history()
+        # Aday adı -> sınıf adı; modüller yalnızca seçilen algoritma için içe aktarılır
+        self.registry = registry if registry is not None else get_scheduler_registry()
+        self.algorithms = {name: self.registry.spec(name).class_name for name in self.CANDIDATES}
         
         # Performance characteristics for each algorithm
         self.algorithm_characteristics = {
@@ -86,7 +87,7 @@ class AlgorithmSelector:
 
     def analyze_input(self, db_manager: Any) -> Dict[str, Any]:
         """
-        Analyze input data to determine the best algorithm
+        Analyze input data to determine the best algorithm (COUNT(*) queries only)
         
         Args:
             db_manager: Database manager instance
@@ -94,19 +95,20 @@ class AlgorithmSelector:
         Returns:
             Dictionary with analysis results
         """
-        classes = db_manager.get_all_classes()
-        teachers = db_manager.get_all_teachers()
-        lessons = db_manager.get_all_lessons()
-        assignments = db_manager.get_schedule_by_school_type()
+        features = InstanceFeatures.from_database(db_manager)
         
         analysis = {
-            'num_classes': len(classes),
-            'num_teachers': len(teachers),
-            'num_lessons': len(lessons),
-            'num_assignments': len(assignments),
-            'teacher_to_class_ratio': len(teachers) / max(1, len(classes)),
-            'lesson_to_class_density': len(lessons) / max(1, len(classes)),
-            'assignment_density': len(assignments) / max(1, len(classes) * len(lessons))
+            'num_classes': features.num_classes,
+            'num_teachers': features.num_teachers,
+            'num_lessons': features.num_lessons,
+            'num_assignments': features.num_assignments,
+            'teacher_to_class_ratio': features.num_teachers / max(1, features.num_classes),
+            'lesson_to_class_density': features.num_lessons / max(1, features.num_classes),
+            'assignment_density': features.assignment_density,
+            'availability_tightness': features.availability_tightness,
+            'curriculum_pressure': features.curriculum_pressure,
+            'teacher_load': features.teacher_load,
+            'features': features,
         }
         
         logger.info(f"Input analysis: {analysis}")
@@ -172,20 +174,39 @@ class AlgorithmSelector:
         Returns:
             Best algorithm class
         """
-        analysis = self.analyze_input(db_manager)
+        recommendation = self.get_algorithm_recommendation(db_manager)
+        best_algorithm = recommendation['best_algorithm']
         
-        scores = {}
-        for alg_name in self.algorithms:
-            scores[alg_name] = self.calculate_priority_score(analysis, alg_name)
-            
-        logger.info(f"Algorithm scores: {scores}")
+        logger.info(f"Algorithm scores: {recommendation['all_scores']}")
+        logger.info(
+            f"Selected algorithm: {best_algorithm} ({recommendation['source']}) "
+            f"with score: {recommendation['score']}"
+        )
         
-        # Select algorithm with highest score
-        best_algorithm = max(scores, key=scores.get)
+        return self.registry.load(best_algorithm)
         
-        logger.info(f"Selected algorithm: {best_algorithm} with score: {scores[best_algorithm]}")
+    def predict_best_algorithm(self, features: InstanceFeatures) -> Optional[Dict[str, Any]]:
+        """
+        Ask the run-history model for the fastest algorithm likely to reach 100%
         
-        return self.algorithms[best_algorithm]
+        Args:
+            features: Instance features
+            
+        Returns:
+            Prediction dictionary with 'algorithm' as selector key, or None without a
+            candidate likely to complete (the caller falls back to heuristic scores)
+        """
+        names = {class_name: name for name, class_name in self.algorithms.items()}
+        try:
+            prediction = self.history.predictor().best(features, candidates=names)
+        except Exception as e:
+            logger.warning(f"Run history model unavailable: {e}")
+            return None
+        if prediction is None:
+            return None
+        result = prediction.to_dict()
+        result['algorithm'] = names[prediction.algorithm]
+        return result
         
     def get_algorithm_recommendation(self, db_manager: Any) -> Dict[str, Any]:
         """
@@ -203,25 +224,32 @@ class AlgorithmSelector:
         for alg_name in self.algorithms:
             scores[alg_name] = self.calculate_priority_score(analysis, alg_name)
             
-        best_algorithm = max(scores, key=scores.get)
+        prediction = self.predict_best_algorithm(analysis['features'])
+        if prediction is not None:
+            best_algorithm, source = prediction['algorithm'], 'learned'
+        else:
+            best_algorithm, source = max(scores, key=scores.get), 'heuristic'
         
         recommendation = {
             'best_algorithm': best_algorithm,
             'score': scores[best_algorithm],
             'analysis': analysis,
             'all_scores': scores,
-            'reasoning': self._generate_reasoning(analysis, best_algorithm)
+            'source': source,
+            'prediction': prediction,
+            'reasoning': self._generate_reasoning(analysis, best_algorithm, prediction)
         }
         
         return recommendation
         
-    def _generate_reasoning(self, analysis: Dict, best_algorithm: str) -> str:
+    def _generate_reasoning(self, analysis: Dict, best_algorithm: str, prediction: Optional[Dict] = None) -> str:
         """
         Generate human-readable reasoning for the recommendation
         
         Args:
             analysis: Input analysis
             best_algorithm: Name of recommended algorithm
+            prediction: Run-history prediction, if the choice was learned
             
         Returns:
             Reasoning string
@@ -242,6 +270,13 @@ class AlgorithmSelector:
         else:
             reasons.append("Medium assignment density (30-70%)")
             
+        if prediction is not None:
+            reasons.append(
+                f"Learned from {prediction['samples']} recorded runs: "
+                f"~{prediction['expected_time']:.1f}s, {prediction['p_complete']:.0%} chance of full coverage"
+            )
+            return " | ".join(reasons)
+            
         # Add algorithm-specific reasoning
         if best_algorithm == 'simple_perfect':
             reasons.append("Recommended for quick, reliable results")
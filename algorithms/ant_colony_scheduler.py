@@ -126,7 +126,7 @@ class AntColonyOptimizationScheduler(BaseScheduler):
             # Get weekly hours for this assignment
             class_obj = next((c for c in self.classes if c.class_id == assignment.class_id), None)
             if class_obj:
-                weekly_hours = self.db_manager.get_weekly_hours_for_lesson(assignment.lesson_id, class_obj.grade)
+                weekly_hours = self.db_manager.get_requirement_table().weekly_hours(class_obj.class_id, assignment.lesson_id)
                 
                 if weekly_hours:
                     # Place the required number of hours
@@ -241,7 +241,7 @@ class AntColonyOptimizationScheduler(BaseScheduler):
         for assignment in self.assignments:
             class_obj = next((c for c in self.classes if c.class_id == assignment.class_id), None)
             if class_obj:
-                weekly_hours = self.db_manager.get_weekly_hours_for_lesson(assignment.lesson_id, class_obj.grade)
+                weekly_hours = self.db_manager.get_requirement_table().weekly_hours(class_obj.class_id, assignment.lesson_id)
                 
                 if weekly_hours:
                     # Count how many slots are theoretically available for this assignment
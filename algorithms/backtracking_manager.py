@@ -19,6 +19,8 @@ from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Set, Tuple, TYPE_CHECKING
 from enum import Enum
 
+from utils.memory_budget import estimate_size, get_memory_budget
+
 if TYPE_CHECKING:
     from database.db_manager import DatabaseManager
     from algorithms.optimized_curriculum_scheduler import EnhancedScheduleEntry
@@ -131,13 +133,21 @@ class BacktrackingManager:
             "randomizations_applied": 0
         }
         
-        # Randomization seed for avoiding local optima
+        # Randomization seed for avoiding local optima (own generator, global random untouched)
         self.randomization_seed = None
         self.randomization_enabled = True
+        self.rng = random.Random()
         
         # School configuration
         self.school_config = self._get_school_config()
         
+        # Bellek bütçesi: eski snapshot'lar bütçe aşılınca ilk feda edilenlerdendir
+        self.memory_budget = get_memory_budget()
+        self.memory_budget.register(
+            "solution_stack", self, BacktrackingManager._solution_stack_bytes,
+            BacktrackingManager._evict_old_snapshots, value=1.0
+        )
+        
         self.logger.info(f"BacktrackingManager initialized with max_depth={max_depth}")
     
     def _get_school_config(self) -> Dict[str, Any]:
@@ -169,6 +179,32 @@ class BacktrackingManager:
         self.current_state.depth = len(self.solution_stack)
         
         self.logger.debug(f"Pushed solution state at depth {self.current_state.depth}")
+        self.memory_budget.maybe_check()
+    
+    def _solution_stack_bytes(self) -> int:
+        """Approximate size of the solution stack (snapshots are similar in size)"""
+        if not self.solution_stack:
+            return 0
+        return estimate_size(self.solution_stack[-1]) * len(self.solution_stack)
+    
+    def _evict_old_snapshots(self, target_bytes: int) -> int:
+        """
+        Drop the oldest snapshots until about ``target_bytes`` are freed
+        
+        The newest snapshot is kept, so one level of backtracking stays
+        possible; deeper backtracking is given up under memory pressure.
+        
+        Returns:
+            Estimated bytes freed
+        """
+        if len(self.solution_stack) <= 1:
+            return 0
+        per_snapshot = max(1, estimate_size(self.solution_stack[-1]))
+        count = min(len(self.solution_stack) - 1, -(-target_bytes // per_snapshot))
+        del self.solution_stack[:count]
+        self.current_state.depth = len(self.solution_stack)
+        self.logger.warning(f"Memory budget: dropped {count} old solution snapshots")
+        return count * per_snapshot
     
     def pop_solution_state(self) -> bool:
         """
@@ -757,7 +793,7 @@ class BacktrackingManager:
         
         # Shuffle the top slots
         top_slots = alternative_slots[:randomize_count]
-        random.shuffle(top_slots)
+        self.rng.shuffle(top_slots)
         alternative_slots[:randomize_count] = top_slots
         
         self.stats["randomizations_applied"] += 1
@@ -815,8 +851,7 @@ class BacktrackingManager:
             seed: Random seed (None for random seed)
         """
         self.randomization_seed = seed
-        if seed is not None:
-            random.seed(seed)
+        self.rng.seed(seed)
         self.logger.info(f"Randomization seed set to: {seed}")
     
     def enable_randomization(self, enabled: bool = True) -> None:
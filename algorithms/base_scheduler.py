@@ -38,6 +38,7 @@ from exceptions import (
     TeacherConflictError,
 )
 from algorithms.monitoring import PerformanceMonitor
+from database.requirement_table import block_pattern
 from algorithms.teacher_availability_cache import TeacherAvailabilityCache
 
 # Import constants
@@ -410,22 +411,7 @@ class BaseScheduler(ABC):
         Returns:
             List of block sizes
         """
-        if total_hours <= 0:
-            return []
-
-        blocks = []
-        remaining = total_hours
-
-        # Fill with 2-hour blocks first
-        while remaining >= 2:
-            blocks.append(2)
-            remaining -= 2
-
-        # Add remaining single hour if any
-        if remaining == 1:
-            blocks.append(1)
-
-        return blocks
+        return list(block_pattern(total_hours))
 
     def _detect_conflicts(self) -> List[Dict[str, Any]]:
         """
@@ -602,11 +588,13 @@ class BaseScheduler(ABC):
         """
         class_lessons = []
 
+        requirements = self.db_manager.get_requirement_table()
+
         for lesson in lessons:
             assignment_key = (class_obj.class_id, lesson.lesson_id)
             if assignment_key in assignment_map:
-                # Get weekly hours from curriculum
-                weekly_hours = self.db_manager.get_weekly_hours_for_lesson(lesson.lesson_id, class_obj.grade)
+                # Weekly hours from the materialized requirement table
+                weekly_hours = requirements.weekly_hours(class_obj.class_id, lesson.lesson_id)
 
                 if weekly_hours and weekly_hours > 0:
                     teacher_id = assignment_map[assignment_key]
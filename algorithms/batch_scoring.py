@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""
+Batch Scoring - Birden fazla aday programı tek seferde puanlama
+K aday program (ya da bir temel programa uygulanan K hamle) tek bir dizide
+paketlenir; hard ihlal sayıları ve soft skorlar tek vektörel çağrıyla hesaplanır
+"""
+
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from algorithms.compiled_soft_constraints import (
+    NUMPY_AVAILABLE,
+    CompiledSoftConstraintEvaluator,
+    TimetableTensor,
+    pack_entries,
+)
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+# (entry index in base schedule, new day, new time_slot)
+Move = Tuple[int, int, int]
+
+
+@dataclass
+class BatchScores:
+    """Scores of K candidates (lists are indexed by candidate)"""
+
+    teacher_conflicts: List[int]
+    class_conflicts: List[int]
+    soft_scores: List[float]
+    constraint_scores: Dict[str, List[float]] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.teacher_conflicts)
+
+    @property
+    def hard_violations(self) -> List[int]:
+        """Teacher + class double bookings per candidate"""
+        return [t + c for t, c in zip(self.teacher_conflicts, self.class_conflicts)]
+
+    def best_index(self) -> Optional[int]:
+        """Candidate with the fewest hard violations, ties broken by soft score"""
+        if not len(self):
+            return None
+        hard = self.hard_violations
+        return max(range(len(self)), key=lambda k: (-hard[k], self.soft_scores[k]))
+
+
+class BatchScheduleScorer:
+    """
+    Scores many candidate schedules in one call
+
+    Hard violations are counted the same way as the schedulers'
+    ``_detect_conflicts_in_schedule`` / ``_count_conflicts`` (every entry that
+    reuses an already taken teacher or class slot counts once). Soft scores
+    come from a SoftConstraintManager through the compiled evaluator.
+    Without NumPy every candidate is scored in a Python loop.
+    """
+
+    def __init__(self, soft_manager=None, days: int = 5, slots: int = 8):
+        """
+        Args:
+            soft_manager: SoftConstraintManager for soft scores (None = hard only)
+            days: Number of school days
+            slots: Number of time slots per day
+        """
+        self.soft_manager = soft_manager
+        self.days = days
+        self.slots = slots
+        self.evaluator = CompiledSoftConstraintEvaluator(soft_manager, days, slots) if soft_manager else None
+        self.logger = logging.getLogger(__name__)
+
+    def score_schedules(self, schedules: Sequence[List[Dict]]) -> BatchScores:
+        """
+        Score K complete schedules
+
+        Args:
+            schedules: Candidate schedules (lists of entry dicts)
+
+        Returns:
+            BatchScores with one value per candidate
+        """
+        if not NUMPY_AVAILABLE or not schedules:
+            return self._score_python(schedules)
+
+        sizes = np.fromiter((len(schedule) for schedule in schedules), dtype=np.int64, count=len(schedules))
+        columns = pack_entries([entry for schedule in schedules for entry in schedule])
+        candidate = np.repeat(np.arange(len(schedules)), sizes)
+        return self._score_packed(columns, candidate, len(schedules), lambda k: schedules[k])
+
+    def score_moves(self, base: List[Dict], moves: Sequence[Move]) -> BatchScores:
+        """
+        Score K single-entry moves against a base schedule
+
+        Candidate k is ``base`` with entry ``moves[k][0]`` moved to day
+        ``moves[k][1]`` and slot ``moves[k][2]``; the base itself is not
+        modified.
+
+        Args:
+            base: Base schedule
+            moves: (entry index, day, time_slot) per candidate
+
+        Returns:
+            BatchScores with one value per move
+        """
+        if not NUMPY_AVAILABLE or not moves:
+            return self._score_python([apply_move(base, move) for move in moves])
+
+        n, k = len(base), len(moves)
+        move_array = np.asarray(moves, dtype=np.int64).reshape(k, 3)
+        columns = np.tile(pack_entries(base), (k, 1))
+        rows = np.arange(k) * n + move_array[:, 0]
+        columns[rows, 3] = move_array[:, 1]
+        columns[rows, 4] = move_array[:, 2]
+        candidate = np.repeat(np.arange(k), n)
+        return self._score_packed(columns, candidate, k, lambda c: apply_move(base, moves[c]))
+
+    # ------------------------------------------------------------------
+    # Vectorized path
+    # ------------------------------------------------------------------
+
+    def _score_packed(self, columns, candidate, n_candidates: int, materialize) -> BatchScores:
+        teacher_conflicts = self._duplicate_counts(candidate, columns[:, 1], columns[:, 3], columns[:, 4], n_candidates)
+        class_conflicts = self._duplicate_counts(candidate, columns[:, 0], columns[:, 3], columns[:, 4], n_candidates)
+
+        soft_scores = np.zeros(n_candidates)
+        constraint_scores = {}
+        if self.evaluator is not None:
+            tensor = TimetableTensor.from_packed(columns, candidate, n_candidates, self.days, self.slots)
+            if tensor is None:
+                # Negatif gün/saat: tensöre sığmıyor, manager ile tek tek puanla
+                results = [self.soft_manager.evaluate_schedule(materialize(k)) for k in range(n_candidates)]
+                soft_scores = np.array([result["total_score"] for result in results])
+                constraint_scores = {
+                    name: [result["constraint_scores"][name] for result in results]
+                    for name in (results[0]["constraint_scores"] if results else {})
+                }
+            else:
+                for constraint, scores in self.evaluator.evaluate_tensor(tensor, materialize).items():
+                    soft_scores += scores
+                    constraint_scores[constraint.name] = scores.tolist()
+
+        return BatchScores(
+            teacher_conflicts=teacher_conflicts.tolist(),
+            class_conflicts=class_conflicts.tolist(),
+            soft_scores=[float(score) for score in soft_scores],
+            constraint_scores=constraint_scores,
+        )
+
+    @staticmethod
+    def _duplicate_counts(candidate, owner, day, slot, n_candidates: int):
+        """Per candidate: entries whose (owner, day, slot) was already taken"""
+        if len(candidate) == 0:
+            return np.zeros(n_candidates, dtype=np.int64)
+        key = candidate
+        for column in (owner, day, slot):
+            low = int(column.min())
+            key = key * (int(column.max()) - low + 1) + (column - low)
+        _, first = np.unique(key, return_index=True)
+        entries = np.bincount(candidate, minlength=n_candidates)
+        distinct = np.bincount(candidate[first], minlength=n_candidates)
+        return entries - distinct
+
+    # ------------------------------------------------------------------
+    # Fallback
+    # ------------------------------------------------------------------
+
+    def _score_python(self, schedules: Sequence[List[Dict]]) -> BatchScores:
+        scores = BatchScores([], [], [])
+        for schedule in schedules:
+            scores.teacher_conflicts.append(_duplicates(schedule, "teacher_id"))
+            scores.class_conflicts.append(_duplicates(schedule, "class_id"))
+            if self.soft_manager is None:
+                scores.soft_scores.append(0.0)
+                continue
+            result = self.soft_manager.evaluate_schedule(schedule)
+            scores.soft_scores.append(result["total_score"])
+            for name, score in result["constraint_scores"].items():
+                scores.constraint_scores.setdefault(name, []).append(score)
+        return scores
+
+
+def apply_move(base: List[Dict], move: Move) -> List[Dict]:
+    """Copy of ``base`` with one entry moved to another day/slot"""
+    index, day, time_slot = move
+    schedule = list(base)
+    schedule[index] = {**base[index], "day": day, "time_slot": time_slot}
+    return schedule
+
+
+def _duplicates(schedule: List[Dict], owner_field: str) -> int:
+    counts = Counter((entry[owner_field], entry["day"], entry["time_slot"]) for entry in schedule)
+    return sum(count - 1 for count in counts.values())
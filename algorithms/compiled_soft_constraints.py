@@ -0,0 +1,397 @@
+# -*- coding: utf-8 -*-
+"""
+Compiled Soft Constraints - Vektörel soft constraint değerlendirici
+Programı bir kez yoğun (sınıf × gün × saat) tensörüne çevirir ve
+SoftConstraintManager'daki tüm kısıtlamaları NumPy indirgemeleriyle hesaplar
+"""
+
+import logging
+from dataclasses import dataclass
+from operator import itemgetter
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+from algorithms.soft_constraints import DIFFICULT_LESSONS, LIGHT_LESSONS
+
+# Öğle saatleri (bkz. SoftConstraintManager._evaluate_lunch_break)
+LUNCH_SLOTS = (3, 4)
+
+ENTRY_FIELDS = itemgetter("class_id", "teacher_id", "lesson_id", "day", "time_slot")
+
+
+@dataclass
+class TimetableTensor:
+    """
+    Dense encoding of one or more schedules
+
+    Per-entry index arrays plus a class × day × slot occupancy tensor and a
+    lesson tensor (-1 = empty cell; if a cell is double booked the last
+    entry wins and ``has_class_conflicts`` is set).
+
+    Several candidate schedules can share one tensor: classes and teachers are
+    then indexed per candidate (``class_candidate`` / ``teacher_candidate``
+    map each row back to its candidate) so a reduction over rows followed by a
+    bincount gives one value per candidate.
+    """
+
+    class_idx: Any
+    teacher_idx: Any
+    lesson_idx: Any
+    day: Any
+    slot: Any
+    lesson_ids: Any
+    n_classes: int
+    n_teachers: int
+    n_days: int
+    n_slots: int
+    occupancy: Any
+    cells: Any
+    has_class_conflicts: bool
+    candidate: Any = None
+    n_candidates: int = 1
+    class_candidate: Any = None
+    teacher_candidate: Any = None
+    conflicted: Any = None
+
+    @classmethod
+    def from_schedule(cls, schedule: List[Dict], days: int = 5, slots: int = 8) -> Optional["TimetableTensor"]:
+        """
+        Encode a schedule
+
+        Args:
+            schedule: Entries with class_id, teacher_id, lesson_id, day, time_slot
+            days: Minimum number of days in the tensor
+            slots: Minimum number of slots per day
+
+        Returns:
+            TimetableTensor, or None if the schedule cannot be densely encoded
+            (negative day/slot values)
+        """
+        return cls.from_packed(pack_entries(schedule), np.zeros(len(schedule), dtype=np.int64), 1, days, slots)
+
+    @classmethod
+    def from_packed(
+        cls, columns, candidate, n_candidates: int, days: int = 5, slots: int = 8
+    ) -> Optional["TimetableTensor"]:
+        """
+        Encode packed entries of several candidate schedules
+
+        Args:
+            columns: (M, 5) int array of class_id, teacher_id, lesson_id, day, time_slot
+            candidate: (M,) candidate index of every row
+            n_candidates: Number of candidates
+            days: Minimum number of days in the tensor
+            slots: Minimum number of slots per day
+
+        Returns:
+            TimetableTensor, or None if a day/slot value is negative
+        """
+        n = len(columns)
+        class_ids, teacher_ids, lesson_column, day, slot = columns.T
+        if n and (day.min() < 0 or slot.min() < 0):
+            return None
+
+        class_keys, class_idx = _candidate_unique(candidate, class_ids)
+        teacher_keys, teacher_idx = _candidate_unique(candidate, teacher_ids)
+        lesson_ids, lesson_idx = np.unique(lesson_column, return_inverse=True)
+
+        n_classes = len(class_keys[0])
+        n_teachers = len(teacher_keys[0])
+        n_days = max(days, int(day.max()) + 1 if n else 0)
+        n_slots = max(slots, int(slot.max()) + 1 if n else 0)
+
+        flat = (class_idx * n_days + day) * n_slots + slot
+        occupancy = np.bincount(flat, minlength=n_classes * n_days * n_slots).reshape(n_classes, n_days, n_slots)
+        cells = np.full(n_classes * n_days * n_slots, -1, dtype=np.int64)
+        cells[flat] = lesson_idx
+        cells = cells.reshape(n_classes, n_days, n_slots)
+
+        double_booked = occupancy.reshape(n_classes, n_days * n_slots).max(axis=1, initial=0) > 1
+        conflicted = np.bincount(class_keys[0], weights=double_booked.astype(np.float64), minlength=n_candidates) > 0
+
+        return cls(
+            class_idx=class_idx,
+            teacher_idx=teacher_idx,
+            lesson_idx=lesson_idx,
+            day=day,
+            slot=slot,
+            lesson_ids=lesson_ids,
+            n_classes=n_classes,
+            n_teachers=n_teachers,
+            n_days=n_days,
+            n_slots=n_slots,
+            occupancy=occupancy,
+            cells=cells,
+            has_class_conflicts=bool(conflicted.any()),
+            candidate=candidate,
+            n_candidates=n_candidates,
+            class_candidate=class_keys[0],
+            teacher_candidate=teacher_keys[0],
+            conflicted=conflicted,
+        )
+
+    def per_candidate(self, owner_candidate, weights):
+        """Sum per-row (or per-entry) values into one value per candidate"""
+        return np.bincount(owner_candidate, weights=weights, minlength=self.n_candidates)
+
+
+def pack_entries(schedule: List[Dict]):
+    """(N, 5) int64 array of class_id, teacher_id, lesson_id, day, time_slot"""
+    return np.array(list(map(ENTRY_FIELDS, schedule)), dtype=np.int64).reshape(len(schedule), 5)
+
+
+def _candidate_unique(candidate, ids):
+    """
+    Dense (candidate, id) index
+
+    Returns:
+        ((key_candidate, key_id), inverse) with keys sorted by candidate, id
+    """
+    if len(ids) == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return (empty, empty), empty
+    low = int(ids.min())
+    span = int(ids.max()) - low + 1
+    keys, inverse = np.unique(candidate * span + (ids - low), return_inverse=True)
+    return (keys // span, keys % span + low), inverse
+
+
+class CompiledSoftConstraintEvaluator:
+    """
+    Vectorized drop-in for ``SoftConstraintManager.evaluate_schedule``
+
+    The schedule is encoded once; every built-in constraint is then a few
+    array reductions (std-dev per class/teacher, gap counts, morning-slot
+    masks, day-gap histograms). Custom constraints registered on the manager
+    and cases the tensor cannot represent exactly fall back to the manager's
+    Python implementation, so scores are identical either way.
+    """
+
+    # constraint name -> (manager method the kernel replaces, kernel method)
+    KERNELS = {
+        "teacher_time_preference": ("_evaluate_teacher_time_preference", "_teacher_time_preference"),
+        "balanced_daily_load": ("_evaluate_balanced_daily_load", "_balanced_daily_load"),
+        "lesson_spacing": ("_evaluate_lesson_spacing", "_lesson_spacing"),
+        "difficult_lessons_morning": ("_evaluate_difficult_lessons_morning", "_difficult_lessons_morning"),
+        "teacher_load_balance": ("_evaluate_teacher_load_balance", "_teacher_load_balance"),
+        "consecutive_block_bonus": ("_evaluate_consecutive_blocks", "_consecutive_blocks"),
+        "no_gaps_penalty": ("_evaluate_no_gaps", "_no_gaps"),
+        "lunch_break_preference": ("_evaluate_lunch_break", "_lunch_break"),
+    }
+
+    def __init__(self, manager, days: int = 5, slots: int = 8):
+        """
+        Args:
+            manager: SoftConstraintManager whose constraints and weights are used
+            days: Number of school days
+            slots: Number of time slots per day
+        """
+        self.manager = manager
+        self.days = days
+        self.slots = slots
+        self.logger = logging.getLogger(__name__)
+
+        # lesson_id -> lesson name (None if the lesson does not exist)
+        self._lesson_names: Dict[int, Optional[str]] = {}
+
+    @property
+    def available(self) -> bool:
+        """True if NumPy is installed"""
+        return NUMPY_AVAILABLE
+
+    def invalidate_lessons(self):
+        """Forget cached lesson names"""
+        self._lesson_names.clear()
+
+    def evaluate_schedule(self, schedule: List[Dict]) -> Dict:
+        """
+        Score a schedule (same result format as SoftConstraintManager)
+
+        Returns: {
+            'total_score': float,
+            'constraint_scores': {name: score},
+            'violations': [...],
+            'num_violations': int
+        }
+        """
+        if not NUMPY_AVAILABLE:
+            return self.manager.evaluate_schedule(schedule)
+
+        tensor = TimetableTensor.from_schedule(schedule, self.days, self.slots)
+        if tensor is None:
+            return self.manager.evaluate_schedule(schedule)
+
+        total_score = 0.0
+        constraint_scores = {}
+        violations = []
+
+        for constraint, scores in self.evaluate_tensor(tensor, lambda _: schedule).items():
+            score = float(scores[0])
+            total_score += score
+            constraint_scores[constraint.name] = score
+
+            # Negatif skor = ihlal
+            if score < 0:
+                violations.append(
+                    {
+                        "constraint": constraint.name,
+                        "description": constraint.description,
+                        "score": score,
+                    }
+                )
+
+        return {
+            "total_score": total_score,
+            "constraint_scores": constraint_scores,
+            "violations": violations,
+            "num_violations": len(violations),
+        }
+
+    def total_score(self, schedule: List[Dict]) -> float:
+        """Weighted total only (annealing objective)"""
+        return self.evaluate_schedule(schedule)["total_score"]
+
+    def evaluate_tensor(self, tensor: TimetableTensor, materialize: Callable[[int], List[Dict]]) -> Dict:
+        """
+        Weighted per-candidate scores of every constraint
+
+        Args:
+            tensor: Encoded candidate schedules
+            materialize: Returns candidate k as a list of entries; only called
+                for constraints (or candidates) the kernels cannot score
+
+        Returns:
+            {constraint: float array of length tensor.n_candidates}
+        """
+        results = {}
+        for constraint in self.manager.constraints:
+            kernel = self._kernel_for(constraint)
+            raw = kernel(tensor) if kernel else np.full(tensor.n_candidates, np.nan)
+            for k in np.flatnonzero(np.isnan(raw)):
+                raw[k] = constraint.evaluate_func(materialize(int(k)))
+            results[constraint] = constraint.weight * raw
+        return results
+
+    def _kernel_for(self, constraint) -> Optional[Callable]:
+        """Vectorized kernel for a constraint, if it is an unmodified built-in"""
+        spec = self.KERNELS.get(constraint.name)
+        if spec is None:
+            return None
+        method_name, kernel_name = spec
+        if constraint.evaluate_func != getattr(self.manager, method_name, None):
+            return None
+        return getattr(self, kernel_name)
+
+    # ------------------------------------------------------------------
+    # Lesson lookups
+    # ------------------------------------------------------------------
+
+    def _lesson_name(self, lesson_id: int) -> Optional[str]:
+        if lesson_id not in self._lesson_names:
+            lesson = self.manager.db_manager.get_lesson_by_id(lesson_id)
+            self._lesson_names[lesson_id] = lesson.name if lesson else None
+        return self._lesson_names[lesson_id]
+
+    def _lesson_table(self, tensor: TimetableTensor, score: Callable[[Optional[str]], float]):
+        """Per-lesson value array indexed like ``tensor.lesson_idx``"""
+        return np.array([score(self._lesson_name(int(lesson_id))) for lesson_id in tensor.lesson_ids], dtype=np.float64)
+
+    # ------------------------------------------------------------------
+    # Kernels (unweighted scores per candidate, same semantics as the
+    # manager methods; NaN = candidate must be scored by the manager)
+    # ------------------------------------------------------------------
+
+    def _teacher_time_preference(self, tensor: TimetableTensor):
+        slot = tensor.slot
+        weights = 2.0 * (slot <= 3) - 1.0 * (slot >= 6)
+        return tensor.per_candidate(tensor.candidate, weights)
+
+    @staticmethod
+    def _daily_std_penalty(owner_idx, owner_candidate, tensor: TimetableTensor, factor: float):
+        """-factor × Σ std-dev of per-day loads (only days with lessons count)"""
+        n_owners = len(owner_candidate)
+        if n_owners == 0:
+            return np.zeros(tensor.n_candidates)
+        loads = np.bincount(owner_idx * tensor.n_days + tensor.day, minlength=n_owners * tensor.n_days)
+        loads = loads.reshape(n_owners, tensor.n_days).astype(np.float64)
+        present = loads > 0
+        counts = present.sum(axis=1)
+        rows = counts > 1
+        std = np.zeros(n_owners)
+        if rows.any():
+            loads, present, counts = loads[rows], present[rows], counts[rows]
+            mean = loads.sum(axis=1) / counts
+            std[rows] = np.sqrt((((loads - mean[:, None]) ** 2) * present).sum(axis=1) / counts)
+        return -factor * tensor.per_candidate(owner_candidate, std)
+
+    def _balanced_daily_load(self, tensor: TimetableTensor):
+        return self._daily_std_penalty(tensor.class_idx, tensor.class_candidate, tensor, 5.0)
+
+    def _teacher_load_balance(self, tensor: TimetableTensor):
+        return self._daily_std_penalty(tensor.teacher_idx, tensor.teacher_candidate, tensor, 3.0)
+
+    def _lesson_spacing(self, tensor: TimetableTensor):
+        if len(tensor.day) == 0:
+            return np.zeros(tensor.n_candidates)
+        # (class, lesson) × day presence
+        pair = tensor.class_idx * len(tensor.lesson_ids) + tensor.lesson_idx
+        _, rows = np.unique(pair, return_inverse=True)
+        n_rows = int(rows.max()) + 1
+        presence = np.zeros((n_rows, tensor.n_days), dtype=bool)
+        presence[rows, tensor.day] = True
+        cumulative = np.cumsum(presence, axis=1)
+        row_candidate = np.zeros(n_rows, dtype=np.int64)
+        row_candidate[rows] = tensor.candidate
+
+        # Histogram of gaps between consecutive lesson days
+        row_scores = np.zeros(n_rows)
+        for gap in range(1, tensor.n_days):
+            both = presence[:, :-gap] & presence[:, gap:]
+            if gap > 1:
+                between = cumulative[:, gap - 1:-1] - cumulative[:, :-gap]
+                both &= between == 0
+            count = both.sum(axis=1)
+            if gap in (2, 3):
+                row_scores += 5.0 * count
+            elif gap == 1:
+                row_scores -= 2.0 * count
+            else:
+                row_scores -= 3.0 * count
+        return tensor.per_candidate(row_candidate, row_scores)
+
+    def _difficult_lessons_morning(self, tensor: TimetableTensor):
+        difficult = self._lesson_table(tensor, lambda name: 1.0 if name in DIFFICULT_LESSONS else 0.0)
+        slot = tensor.slot
+        # sabah +3, öğleden sonra (4-5) -1, geç saat -3
+        weights = np.where(slot <= 3, 3.0, np.where(slot <= 5, -1.0, -3.0))
+        return tensor.per_candidate(tensor.candidate, weights * difficult[tensor.lesson_idx])
+
+    def _consecutive_blocks(self, tensor: TimetableTensor):
+        cells = tensor.cells
+        same = (cells[:, :, :-1] == cells[:, :, 1:]) & (cells[:, :, :-1] >= 0)
+        scores = 5.0 * tensor.per_candidate(tensor.class_candidate, same.sum(axis=(1, 2)))
+        # Order of double-booked cells matters; use the manager
+        scores[tensor.conflicted] = np.nan
+        return scores
+
+    def _no_gaps(self, tensor: TimetableTensor):
+        occupied = tensor.occupancy > 0
+        active = occupied.any(axis=2)
+        first = occupied.argmax(axis=2)
+        last = tensor.n_slots - 1 - occupied[:, :, ::-1].argmax(axis=2)
+        gaps = ((last - first + 1) - occupied.sum(axis=2)) * active
+        return -10.0 * tensor.per_candidate(tensor.class_candidate, gaps.sum(axis=1))
+
+    def _lunch_break(self, tensor: TimetableTensor):
+        weights = self._lesson_table(
+            tensor, lambda name: 0.0 if name is None else (2.0 if name in LIGHT_LESSONS else -1.0)
+        )
+        at_lunch = np.isin(tensor.slot, LUNCH_SLOTS)
+        return tensor.per_candidate(tensor.candidate, weights[tensor.lesson_idx] * at_lunch)
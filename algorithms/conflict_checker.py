@@ -4,6 +4,8 @@ Conflict checker for the Class Scheduling Program
 
 import logging
 
+from algorithms.schedule_slot_index import ScheduleSlotIndex
+
 
 class ConflictChecker:
     """Handles conflict detection in schedules"""
@@ -11,6 +13,13 @@ class ConflictChecker:
     def __init__(self, db_manager):
         self.db_manager = db_manager
         self.logger = logging.getLogger(__name__)
+        # Atamalar oturum başına bir kez yüklenir, sonra değişiklik akışıyla güncellenir
+        self.slot_index = ScheduleSlotIndex.for_database(db_manager)
+
+    def _find_conflict(self, kind, resource_id, day, time_slot, exclude_entry_id):
+        """Synced O(1) slot lookup; returns (has_conflict, conflicting_entry)"""
+        self.slot_index.sync()
+        return self.slot_index.find(kind, resource_id, day, time_slot, exclude_entry_id)
 
     def check_teacher_conflict(self, teacher_id, day, time_slot, exclude_entry_id=None):
         """
@@ -18,20 +27,7 @@ class ConflictChecker:
         Returns (has_conflict, conflicting_entry)
         """
         try:
-            # Get all schedule entries for the current school type
-            schedule_entries = self.db_manager.get_schedule_by_school_type()
-
-            # Check for conflicts
-            for entry in schedule_entries:
-                # Skip the entry we're checking against (if specified)
-                if exclude_entry_id and entry.entry_id == exclude_entry_id:
-                    continue
-
-                # Check if same teacher at same time
-                if entry.teacher_id == teacher_id and entry.day == day and entry.time_slot == time_slot:
-                    return (True, entry)
-
-            return (False, None)
+            return self._find_conflict("teacher", teacher_id, day, time_slot, exclude_entry_id)
         except Exception as e:
             self.logger.error(f"Error checking teacher conflict: {e}", exc_info=True)
             raise
@@ -42,20 +38,7 @@ class ConflictChecker:
         Returns (has_conflict, conflicting_entry)
         """
         try:
-            # Get all schedule entries for the current school type
-            schedule_entries = self.db_manager.get_schedule_by_school_type()
-
-            # Check for conflicts
-            for entry in schedule_entries:
-                # Skip the entry we're checking against (if specified)
-                if exclude_entry_id and entry.entry_id == exclude_entry_id:
-                    continue
-
-                # Check if same class at same time
-                if entry.class_id == class_id and entry.day == day and entry.time_slot == time_slot:
-                    return (True, entry)
-
-            return (False, None)
+            return self._find_conflict("class", class_id, day, time_slot, exclude_entry_id)
         except Exception as e:
             self.logger.error(f"Error checking class conflict: {e}", exc_info=True)
             raise
@@ -66,20 +49,7 @@ class ConflictChecker:
         Returns (has_conflict, conflicting_entry)
         """
         try:
-            # Get all schedule entries for the current school type
-            schedule_entries = self.db_manager.get_schedule_by_school_type()
-
-            # Check for conflicts
-            for entry in schedule_entries:
-                # Skip the entry we're checking against (if specified)
-                if exclude_entry_id and entry.entry_id == exclude_entry_id:
-                    continue
-
-                # Check if same classroom at same time
-                if entry.classroom_id == classroom_id and entry.day == day and entry.time_slot == time_slot:
-                    return (True, entry)
-
-            return (False, None)
+            return self._find_conflict("classroom", classroom_id, day, time_slot, exclude_entry_id)
         except Exception as e:
             self.logger.error(f"Error checking classroom conflict: {e}", exc_info=True)
             raise
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+Conflict Index - Incremental conflict tracking
+Keeps slot occupancy keyed by (teacher, day, slot), (class, day, slot) and
+(classroom, day, slot) so that every edit is checked in O(1)
+"""
+
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple
+
+# (resource type, resource id, day, slot)
+ConflictKey = Tuple[str, int, int, int]
+
+# Resource type -> entry field
+RESOURCE_FIELDS = (
+    ("class", "class_id"),
+    ("teacher", "teacher_id"),
+    ("classroom", "classroom_id"),
+)
+
+
+@dataclass
+class ConflictDelta:
+    """Conflicts introduced and resolved by a single edit"""
+
+    introduced: List[ConflictKey] = field(default_factory=list)
+    resolved: List[ConflictKey] = field(default_factory=list)
+
+    def merge(self, other: "ConflictDelta") -> "ConflictDelta":
+        """Combine two deltas, cancelling keys that were resolved and re-introduced"""
+        introduced = list(self.introduced)
+        resolved = list(self.resolved)
+        for key in other.introduced:
+            if key in resolved:
+                resolved.remove(key)
+            else:
+                introduced.append(key)
+        for key in other.resolved:
+            if key in introduced:
+                introduced.remove(key)
+            else:
+                resolved.append(key)
+        return ConflictDelta(introduced, resolved)
+
+    @property
+    def is_empty(self) -> bool:
+        """True if the edit did not change the conflict state"""
+        return not self.introduced and not self.resolved
+
+
+class ConflictIndex:
+    """
+    Incremental conflict index
+
+    Each entry is registered under an opaque token (any hashable the caller
+    keeps stable, e.g. ``id(entry)``). A key holding two or more tokens is a
+    conflict.
+
+    Performance: O(1) per add/remove/move vs O(n) full rescans
+    """
+
+    def __init__(self, track_classrooms: bool = True):
+        """
+        Initialize conflict index
+
+        Args:
+            track_classrooms: Also report (classroom, day, slot) double bookings
+        """
+        self.logger = logging.getLogger(__name__)
+        self.track_classrooms = track_classrooms
+
+        # key -> ordered set of tokens (dict keys keep insertion order)
+        self.occupants: Dict[ConflictKey, Dict[Hashable, None]] = defaultdict(dict)
+        # token -> entry
+        self.entries: Dict[Hashable, Dict] = {}
+        # Keys currently holding more than one token
+        self.conflict_keys: Set[ConflictKey] = set()
+
+    def _keys_for(self, entry: Dict, day: Optional[int] = None, slot: Optional[int] = None) -> List[ConflictKey]:
+        """Index keys an entry occupies (optionally at another day/slot)"""
+        day = entry["day"] if day is None else day
+        slot = entry["time_slot"] if slot is None else slot
+        keys = []
+        for kind, field_name in RESOURCE_FIELDS:
+            if kind == "classroom" and not self.track_classrooms:
+                continue
+            resource_id = entry.get(field_name)
+            if resource_id is None:
+                continue
+            keys.append((kind, resource_id, day, slot))
+        return keys
+
+    def add(self, token: Hashable, entry: Dict) -> ConflictDelta:
+        """
+        Register an entry
+
+        Args:
+            token: Stable token for the entry
+            entry: Schedule entry dict
+
+        Returns:
+            ConflictDelta with the keys this entry now clashes on
+        """
+        delta = ConflictDelta()
+        self.entries[token] = entry
+        for key in self._keys_for(entry):
+            tokens = self.occupants[key]
+            tokens[token] = None
+            if len(tokens) > 1:
+                self.conflict_keys.add(key)
+                delta.introduced.append(key)
+        return delta
+
+    def remove(self, token: Hashable) -> ConflictDelta:
+        """
+        Unregister an entry
+
+        Args:
+            token: Token used when the entry was added
+
+        Returns:
+            ConflictDelta with the clashes this entry was part of
+        """
+        delta = ConflictDelta()
+        entry = self.entries.pop(token, None)
+        if entry is None:
+            return delta
+        for key in self._keys_for(entry):
+            tokens = self.occupants.get(key)
+            if not tokens or token not in tokens:
+                continue
+            if len(tokens) > 1:
+                delta.resolved.append(key)
+            del tokens[token]
+            if len(tokens) <= 1:
+                self.conflict_keys.discard(key)
+            if not tokens:
+                del self.occupants[key]
+        return delta
+
+    def move(self, token: Hashable, new_day: int, new_slot: int) -> ConflictDelta:
+        """
+        Move a registered entry to another day/slot (updates the entry dict)
+
+        Returns:
+            Net ConflictDelta of the move
+        """
+        entry = self.entries.get(token)
+        if entry is None:
+            return ConflictDelta()
+        delta = self.remove(token)
+        entry["day"] = new_day
+        entry["time_slot"] = new_slot
+        return delta.merge(self.add(token, entry))
+
+    def occupants_at(self, kind: str, resource_id: Any, day: int, slot: int) -> List[Hashable]:
+        """Tokens occupying a resource at a day/slot"""
+        tokens = self.occupants.get((kind, resource_id, day, slot))
+        return list(tokens) if tokens else []
+
+    def is_occupied(
+        self, kind: str, resource_id: Any, day: int, slot: int, exclude: Optional[Hashable] = None
+    ) -> bool:
+        """
+        Check if a resource is busy at a day/slot
+
+        O(1) lookup time
+        """
+        tokens = self.occupants.get((kind, resource_id, day, slot))
+        if not tokens:
+            return False
+        return len(tokens) > 1 or exclude not in tokens
+
+    def conflicts(self) -> List[Tuple[ConflictKey, List[Hashable]]]:
+        """Current conflicts as (key, tokens) pairs"""
+        return [(key, list(self.occupants[key])) for key in self.conflict_keys]
+
+    @property
+    def conflict_count(self) -> int:
+        """Number of conflicting keys"""
+        return len(self.conflict_keys)
+
+    def rebuild(self, tokens_and_entries) -> None:
+        """Rebuild the index from (token, entry) pairs"""
+        self.clear()
+        for token, entry in tokens_and_entries:
+            self.add(token, entry)
+
+    def clear(self):
+        """Clear all state"""
+        self.occupants.clear()
+        self.entries.clear()
+        self.conflict_keys.clear()
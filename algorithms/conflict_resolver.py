@@ -4,6 +4,8 @@ Conflict resolver for the Class Scheduling Program
 
 import logging
 
+from algorithms.schedule_slot_index import ScheduleSlotIndex
+
 
 class ConflictResolver:
     """Handles conflict resolution in schedules"""
@@ -11,6 +13,8 @@ class ConflictResolver:
     def __init__(self, db_manager):
         self.db_manager = db_manager
         self.logger = logging.getLogger(__name__)
+        # ConflictChecker ile aynı paylaşılan slot indeksi
+        self.slot_index = ScheduleSlotIndex.for_database(db_manager)
 
     def resolve_teacher_conflict(self, conflict):
         """
@@ -76,19 +80,22 @@ class ConflictResolver:
         if not class_obj or not teacher:
             return False
 
-        # Try to find an available slot for this class and teacher
-        for day in range(5):  # Monday to Friday
-            # Get school type to determine time slots
-            school_type = self.db_manager.get_school_type()
-            if not school_type:
-                school_type = "Lise"
+        # Get school type to determine time slots
+        school_type = self.db_manager.get_school_type()
+        if not school_type:
+            school_type = "Lise"
+
+        time_slots_count = 8  # Default to 8 time slots
+        if school_type == "İlkokul":
+            time_slots_count = 6
+        elif school_type == "Ortaokul":
+            time_slots_count = 7
 
-            time_slots_count = 8  # Default to 8 time slots
-            if school_type == "İlkokul":
-                time_slots_count = 6
-            elif school_type == "Ortaokul":
-                time_slots_count = 7
+        # Index is synced once per move; each slot check below is O(1)
+        self.slot_index.sync()
 
+        # Try to find an available slot for this class and teacher
+        for day in range(5):  # Monday to Friday
             for time_slot in range(time_slots_count):
                 # Skip the current slot
                 if day == entry.day and time_slot == entry.time_slot:
@@ -125,33 +132,11 @@ class ConflictResolver:
 
     def _check_class_conflict_at_time(self, class_id, day, time_slot, exclude_entry_id=None):
         """Check if a class has a conflict at a specific time"""
-        schedule_entries = self.db_manager.get_schedule_by_school_type()
-
-        for entry in schedule_entries:
-            # Skip the entry we're checking against (if specified)
-            if exclude_entry_id and entry.entry_id == exclude_entry_id:
-                continue
-
-            # Check if same class at same time
-            if entry.class_id == class_id and entry.day == day and entry.time_slot == time_slot:
-                return True
-
-        return False
+        return self.slot_index.is_busy("class", class_id, day, time_slot, exclude_entry_id)
 
     def _check_teacher_conflict_at_time(self, teacher_id, day, time_slot, exclude_entry_id=None):
         """Check if a teacher has a conflict at a specific time"""
-        schedule_entries = self.db_manager.get_schedule_by_school_type()
-
-        for entry in schedule_entries:
-            # Skip the entry we're checking against (if specified)
-            if exclude_entry_id and entry.entry_id == exclude_entry_id:
-                continue
-
-            # Check if same teacher at same time
-            if entry.teacher_id == teacher_id and entry.day == day and entry.time_slot == time_slot:
-                return True
-
-        return False
+        return self.slot_index.is_busy("teacher", teacher_id, day, time_slot, exclude_entry_id)
 
     def auto_resolve_conflicts(self, conflicts):
         """
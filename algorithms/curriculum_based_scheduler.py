@@ -87,7 +87,7 @@ class CurriculumBasedFullScheduleGenerator:
             class_scheduled = 0
             for assignment in class_assignments:
                 # Get weekly hours from curriculum
-                weekly_hours = self.db_manager.get_weekly_hours_for_lesson(assignment.lesson_id, class_obj.grade)
+                weekly_hours = self.db_manager.get_requirement_table().weekly_hours(class_obj.class_id, assignment.lesson_id)
                 
                 if weekly_hours and weekly_hours > 0:
                     teacher = self.db_manager.get_teacher_by_id(assignment.teacher_id)
@@ -1,14 +1,21 @@
 """
 Enhanced Logging Configuration for Optimized Scheduler
 Provides structured logging with performance metrics and diagnostics
+
+Hot loops (placement, backtracking, gap filling) log through ``SolverLog``:
+nothing is formatted unless the level is enabled, progress lines are rate
+limited per call site and per-slot debug events are sampled.
 """
 
 import logging
 import logging.handlers
 import os
 import sys
+import time
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from logging_config import clear_handlers, start_queue_listener
 
 
 class SchedulerFormatter(logging.Formatter):
@@ -58,7 +65,8 @@ def setup_enhanced_logging(
     log_file: Optional[str] = None,
     console_output: bool = True,
     max_file_size: int = 10 * 1024 * 1024,  # 10MB
-    backup_count: int = 5
+    backup_count: int = 5,
+    async_handlers: bool = True
 ) -> logging.Logger:
     """
     Setup enhanced logging for the optimized scheduler
@@ -69,6 +77,7 @@ def setup_enhanced_logging(
         console_output: Whether to output to console
         max_file_size: Maximum log file size in bytes
         backup_count: Number of backup files to keep
+        async_handlers: Write records on a background thread
         
     Returns:
         Configured logger instance
@@ -78,8 +87,9 @@ def setup_enhanced_logging(
     logger = logging.getLogger("OptimizedScheduler")
     logger.setLevel(getattr(logging, log_level.upper()))
     
-    # Clear existing handlers
-    logger.handlers.clear()
+    # Clear existing handlers (and the writer thread of the previous run)
+    clear_handlers(logger)
+    handlers = []
     
     # Create formatter
     formatter = SchedulerFormatter()
@@ -93,7 +103,7 @@ def setup_enhanced_logging(
         console_handler.setLevel(logging.INFO)
         console_handler.setFormatter(formatter)
         console_handler.addFilter(perf_filter)
-        logger.addHandler(console_handler)
+        handlers.append(console_handler)
     
     # File handler with rotation
     if log_file:
@@ -111,7 +121,13 @@ def setup_enhanced_logging(
         file_handler.setLevel(getattr(logging, log_level.upper()))
         file_handler.setFormatter(formatter)
         file_handler.addFilter(perf_filter)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
+    
+    if async_handlers and handlers:
+        start_queue_listener(logger, handlers)
+    else:
+        for handler in handlers:
+            logger.addHandler(handler)
     
     # Prevent propagation to root logger
     logger.propagate = False
@@ -225,6 +241,100 @@ def create_scheduler_logger(
     return main_logger, metrics_logger
 
 
+class LazyMessage:
+    """Message (or argument) built only when a handler actually formats it"""
+
+    __slots__ = ("func", "args")
+
+    def __init__(self, func: Callable[..., Any], *args):
+        self.func = func
+        self.args = args
+
+    def __str__(self) -> str:
+        return str(self.func(*self.args))
+
+
+def lazy(func: Callable[..., Any], *args) -> LazyMessage:
+    """``logger.debug("%s", lazy(expensive_summary, state))``"""
+    return LazyMessage(func, *args)
+
+
+class SolverLog:
+    """
+    Logging for scheduler hot loops
+
+    - ``%``-style arguments: nothing is formatted when the level is disabled
+    - ``progress``: at most one INFO record per call site every ``interval``
+      seconds; suppressed calls are counted into the next record
+    - ``sample``: one DEBUG record out of every ``sample_every`` calls per call site
+    - records keep the caller's module, function and line number
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        interval: float = 1.0,
+        sample_every: int = 100,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.logger = logger
+        self.interval = interval
+        self.sample_every = max(1, sample_every)
+        self.clock = clock
+        # call site -> [last emit time, suppressed count]
+        self._rate: Dict[Tuple[str, int], list] = {}
+        # call site -> calls seen
+        self._samples: Dict[Tuple[str, int], int] = {}
+
+    @staticmethod
+    def _call_site() -> Tuple[str, int]:
+        frame = sys._getframe(2)
+        return frame.f_code.co_filename, frame.f_lineno
+
+    def debug(self, msg: str, *args):
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(msg, *args, stacklevel=2)
+
+    def info(self, msg: str, *args):
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(msg, *args, stacklevel=2)
+
+    def warning(self, msg: str, *args):
+        self.logger.warning(msg, *args, stacklevel=2)
+
+    def progress(self, msg: str, *args, level: int = logging.INFO):
+        """Rate-limited progress line"""
+        if not self.logger.isEnabledFor(level):
+            return
+        site = self._call_site()
+        now = self.clock()
+        state = self._rate.get(site)
+        if state is not None and now - state[0] < self.interval:
+            state[1] += 1
+            return
+        suppressed = state[1] if state is not None else 0
+        self._rate[site] = [now, 0]
+        if suppressed:
+            msg, args = msg + " (+%d bastırıldı)", args + (suppressed,)
+        self.logger.log(level, msg, *args, stacklevel=2)
+
+    def sample(self, msg: str, *args):
+        """Sampled debug event (first call, then every ``sample_every``-th)"""
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+        site = self._call_site()
+        seen = self._samples.get(site, 0)
+        self._samples[site] = seen + 1
+        if seen % self.sample_every == 0:
+            self.logger.debug(msg + " [1/%d örnek]", *args, self.sample_every, stacklevel=2)
+
+    def stats(self) -> Dict[str, int]:
+        """Calls that did not produce a record"""
+        suppressed = sum(state[1] for state in self._rate.values())
+        unsampled = sum(seen - (seen + self.sample_every - 1) // self.sample_every for seen in self._samples.values())
+        return {"suppressed": suppressed, "unsampled": unsampled}
+
+
 # Global logger instances for easy access
 _global_logger = None
 _global_metrics_logger = None
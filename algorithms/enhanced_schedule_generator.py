@@ -4,7 +4,7 @@ Implements improved scheduling with better filling strategies
 """
 import random
 import time
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple
 from algorithms.base_scheduler import BaseScheduler
 from algorithms.monitoring import PerformanceMonitor
 from utils.progress_tracker import SchedulerProgressTracker
@@ -36,6 +36,10 @@ class EnhancedScheduleGenerator(BaseScheduler):
         self.aggressive_placement = True
         self.flexible_constraints = True
         
+    def _weekly_hours(self, assignment) -> Optional[int]:
+        """Curriculum hours of an assignment, read from the materialized requirement table"""
+        return self.db_manager.get_requirement_table().weekly_hours(assignment.class_id, assignment.lesson_id)
+
     def generate_schedule(self) -> List[Dict[str, Any]]:
         """
         Generate enhanced schedule with BLOCK RULES enforcement
@@ -85,7 +89,7 @@ class EnhancedScheduleGenerator(BaseScheduler):
         for assignment in assignments:
             class_obj = next((c for c in self.classes if c.class_id == assignment.class_id), None)
             if class_obj:
-                weekly_hours = self.db_manager.get_weekly_hours_for_lesson(assignment.lesson_id, class_obj.grade)
+                weekly_hours = self._weekly_hours(assignment)
                 
                 if weekly_hours:
                     # Calculate difficulty: fewer available slots = higher priority
@@ -147,7 +151,7 @@ class EnhancedScheduleGenerator(BaseScheduler):
         if not class_obj:
             return False
             
-        weekly_hours = self.db_manager.get_weekly_hours_for_lesson(assignment.lesson_id, class_obj.grade)
+        weekly_hours = self._weekly_hours(assignment)
         if not weekly_hours:
             return False
         
@@ -325,7 +329,7 @@ class EnhancedScheduleGenerator(BaseScheduler):
                 
                 class_obj = next((c for c in self.classes if c.class_id == class_id), None)
                 if class_obj:
-                    weekly_hours = self.db_manager.get_weekly_hours_for_lesson(assignment.lesson_id, class_obj.grade)
+                    weekly_hours = self._weekly_hours(assignment)
                     
                     if current_count < weekly_hours:
                         new_entry = {
@@ -360,7 +364,7 @@ class EnhancedScheduleGenerator(BaseScheduler):
             
             class_obj = next((c for c in self.classes if c.class_id == assignment.class_id), None)
             if class_obj:
-                weekly_hours = self.db_manager.get_weekly_hours_for_lesson(assignment.lesson_id, class_obj.grade)
+                weekly_hours = self._weekly_hours(assignment)
                 
                 if weekly_hours and placed_count < weekly_hours:
                     remaining.append(assignment)
@@ -375,7 +379,7 @@ class EnhancedScheduleGenerator(BaseScheduler):
         if not class_obj:
             return
             
-        weekly_hours = self.db_manager.get_weekly_hours_for_lesson(assignment.lesson_id, class_obj.grade)
+        weekly_hours = self._weekly_hours(assignment)
         if not weekly_hours:
             return
         
@@ -455,7 +459,7 @@ class EnhancedScheduleGenerator(BaseScheduler):
         if not class_obj:
             return
             
-        weekly_hours = self.db_manager.get_weekly_hours_for_lesson(assignment.lesson_id, class_obj.grade)
+        weekly_hours = self._weekly_hours(assignment)
         if not weekly_hours:
             return
         
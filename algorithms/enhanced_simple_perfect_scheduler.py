@@ -180,7 +180,7 @@ class EnhancedSimplePerfectScheduler(SimplePerfectScheduler):
             
             class_obj = next((c for c in self.db_manager.get_all_classes() if c.class_id == class_id), None)
             if class_obj:
-                weekly_hours = self.db_manager.get_weekly_hours_for_lesson(assignment.lesson_id, class_obj.grade)
+                weekly_hours = self.db_manager.get_requirement_table().weekly_hours(class_obj.class_id, assignment.lesson_id)
                 
                 if weekly_hours and current_count < weekly_hours:
                     # Try to place this assignment in the empty slot
@@ -228,7 +228,7 @@ class EnhancedSimplePerfectScheduler(SimplePerfectScheduler):
             
             class_obj = next((c for c in self.db_manager.get_all_classes() if c.class_id == assignment.class_id), None)
             if class_obj:
-                weekly_hours = self.db_manager.get_weekly_hours_for_lesson(assignment.lesson_id, class_obj.grade)
+                weekly_hours = self.db_manager.get_requirement_table().weekly_hours(class_obj.class_id, assignment.lesson_id)
                 
                 if weekly_hours and placed_count < weekly_hours:
                     unplaced.append(assignment)
@@ -243,7 +243,7 @@ class EnhancedSimplePerfectScheduler(SimplePerfectScheduler):
         if not class_obj:
             return
             
-        weekly_hours = self.db_manager.get_weekly_hours_for_lesson(assignment.lesson_id, class_obj.grade)
+        weekly_hours = self.db_manager.get_requirement_table().weekly_hours(class_obj.class_id, assignment.lesson_id)
         if not weekly_hours:
             return
         
@@ -336,7 +336,7 @@ class EnhancedSimplePerfectScheduler(SimplePerfectScheduler):
         if not class_obj:
             return
             
-        weekly_hours = self.db_manager.get_weekly_hours_for_lesson(assignment.lesson_id, class_obj.grade)
+        weekly_hours = self.db_manager.get_requirement_table().weekly_hours(class_obj.class_id, assignment.lesson_id)
         if not weekly_hours:
             return
         
@@ -170,10 +170,12 @@ class EnhancedStrictScheduler:
         """Sınıfın derslerini al"""
         class_lessons = []
 
+        requirements = self.db_manager.get_requirement_table()
+
         for lesson in lessons:
             assignment_key = (class_obj.class_id, lesson.lesson_id)
             if assignment_key in assignment_map:
-                weekly_hours = self.db_manager.get_weekly_hours_for_lesson(lesson.lesson_id, class_obj.grade)
+                weekly_hours = requirements.weekly_hours(class_obj.class_id, lesson.lesson_id)
 
                 if weekly_hours and weekly_hours > 0:
                     teacher_id = assignment_map[assignment_key]
@@ -0,0 +1,346 @@
+# -*- coding: utf-8 -*-
+"""
+Generation Jobs - Arayüzsüz program oluşturma (tek okul veya toplu)
+Bir veritabanı için ön kontrol → zamanlayıcı → toplu kayıt akışını, masaüstü
+uygulamasındaki ScheduleGenerationThread ile aynı sırada çalıştırır. Qt içe
+aktarılmaz; zamanlayıcılar kayıt defterinden (scheduler_registry) yüklenir.
+
+Toplu çalıştırmada her iş kendi sürecinde (spawn) çalışır: süre sınırını aşan
+bir iş öldürülür, diğerleri etkilenmez. Aynı anda en fazla ``workers`` süreç açılır.
+
+Usage:
+    result = run_generation(GenerationJob("okul.db", algorithm="simple_perfect"))
+    results = run_batch([GenerationJob(p, deadline=600) for p in paths], workers=4)
+"""
+
+import logging
+import multiprocessing
+import os
+import queue as queue_module
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional, Sequence
+
+from algorithms.scheduler_registry import get_scheduler_registry
+
+logger = logging.getLogger(__name__)
+
+STATUS_OK = "ok"
+STATUS_INCOMPLETE = "incomplete"  # program kaydedildi, ama tüm saatler yerleşmedi
+STATUS_INFEASIBLE = "infeasible"  # ön kontrol yapılamazlık kanıtladı, çözücü çalışmadı
+STATUS_TIMEOUT = "timeout"
+STATUS_ERROR = "error"
+STATUS_CANCELLED = "cancelled"
+
+# Facade (algorithms.scheduler.Scheduler) en uygun zamanlayıcıyı kendisi seçer
+AUTO_ALGORITHM = "auto"
+DEFAULT_ALGORITHM = "optimized_curriculum"
+
+# Zamanlayıcının kendi süre sınırı, sürecin öldürülmesinden önce dolsun
+SOFT_DEADLINE_SHARE = 0.8
+
+ProgressCallback = Callable[[str, float], None]
+
+
+@dataclass
+class GenerationJob:
+    """One database to generate a timetable for"""
+
+    db_path: str
+    algorithm: str = DEFAULT_ALGORITHM
+    deadline: Optional[float] = None  # saniye; None = sınırsız
+    school_type: Optional[str] = None  # None = veritabanında kayıtlı okul türü
+
+
+@dataclass
+class GenerationResult:
+    """Outcome of a generation job"""
+
+    db_path: str
+    algorithm: str
+    status: str
+    scheduler: Optional[str] = None  # çalışan zamanlayıcı sınıfı
+    school_type: Optional[str] = None
+    placements: int = 0
+    required_hours: int = 0
+    coverage: float = 0.0
+    saved: int = 0
+    wall_time_s: float = 0.0
+    error: Optional[str] = None
+    feasibility: Optional[str] = None  # yapılamazlık açıklaması
+    run: Optional[dict] = None  # RunRecord.to_dict(); alt süreçte çalışanlar için üst süreç kaydeder
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def _cap_time_limit(scheduler, deadline: Optional[float]):
+    """Lower ``time_limit`` of schedulers that have one below the job deadline"""
+    if deadline is None:
+        return
+    for target in (scheduler, getattr(scheduler, "active_scheduler", None)):
+        limit = getattr(target, "time_limit", None)
+        if isinstance(limit, (int, float)):
+            target.time_limit = min(limit, deadline * SOFT_DEADLINE_SHARE)
+
+
+def placement_rows(entries: Sequence[Dict]) -> List[tuple]:
+    """
+    Rows for ``db_manager.replace_schedule`` from scheduler entries
+
+    Entries without a class, teacher or lesson, or left unplaced
+    (day/time_slot missing or -1), are skipped.
+    """
+    rows = []
+    for e in entries:
+        required = [e.get(k) for k in ("class_id", "teacher_id", "lesson_id", "day", "time_slot")]
+        if None in required or e["day"] < 0 or e["time_slot"] < 0:
+            continue
+        class_id, teacher_id, lesson_id, day, time_slot = required
+        rows.append((class_id, teacher_id, lesson_id, e.get("classroom_id") or 1, day, time_slot))
+    return rows
+
+
+def _build_scheduler(job: GenerationJob, db_manager, progress_callback: Optional[ProgressCallback]):
+    if job.algorithm == AUTO_ALGORITHM:
+        from algorithms.scheduler import Scheduler
+
+        return Scheduler(db_manager, progress_callback=progress_callback)
+    return get_scheduler_registry().create(job.algorithm, db_manager, progress_callback=progress_callback)
+
+
+def run_generation(
+    job: GenerationJob, progress_callback: Optional[ProgressCallback] = None, record_history: bool = True
+) -> GenerationResult:
+    """
+    Generate and store the timetable of one database in this process
+
+    The previous timetable is replaced in a single transaction, and only
+    when the solver finished; an infeasible instance or a solver error
+    leaves it untouched.
+
+    Args:
+        job: Database, algorithm and deadline
+        progress_callback: Called with (message, percentage)
+        record_history: Add the run to the algorithm selector's run history
+
+    Returns:
+        GenerationResult
+    """
+    from database.db_manager import DatabaseManager
+    from utils.feasibility_presolver import presolve
+    from utils.metrics_registry import track_solve
+    from utils.run_history import InstanceFeatures, RunRecord, get_run_history
+
+    def progress(message: str, percentage: float):
+        if progress_callback is not None:
+            progress_callback(message, percentage)
+
+    start = time.perf_counter()
+    result = GenerationResult(job.db_path, job.algorithm, STATUS_ERROR)
+    if not os.path.exists(job.db_path):
+        result.error = f"Database not found: {job.db_path}"
+        return result
+
+    db_manager = DatabaseManager(job.db_path)
+    try:
+        if job.school_type:
+            db_manager.set_school_type(job.school_type)
+        result.school_type = db_manager.school_type
+        counts = db_manager.get_instance_counts()
+        result.required_hours = counts["assigned_hours"]
+        if not counts["assignments"]:
+            result.error = "No lesson assignments (schedule_entries) in the database"
+            return result
+
+        progress("🧮 Yapılabilirlik ön kontrolü yapılıyor...", 5)
+        certificate = presolve(db_manager)
+        if not certificate.feasible:
+            result.status = STATUS_INFEASIBLE
+            result.feasibility = certificate.describe()
+            return result
+
+        # Çözücü ilerlemesi 10-90 aralığına ölçeklenir
+        scheduler = _build_scheduler(
+            job, db_manager, lambda message, percentage: progress(message, 10 + percentage * 0.8)
+        )
+        _cap_time_limit(scheduler, job.deadline)
+        active = getattr(scheduler, "active_scheduler", scheduler)
+        result.scheduler = type(active).__name__ if active is not None else type(scheduler).__name__
+        progress(f"🎯 {result.scheduler} çalışıyor...", 10)
+
+        features = InstanceFeatures.from_database(db_manager)
+        solve_start = time.perf_counter()
+        if job.algorithm == AUTO_ALGORITHM:
+            # Facade metrikleri ve çalışma geçmişini kendisi kaydeder
+            entries = scheduler.generate_schedule() or []
+        else:
+            with track_solve(result.scheduler) as solve:
+                entries = scheduler.generate_schedule() or []
+                solve.observe_scheduler(scheduler, entries)
+        solve_time = time.perf_counter() - solve_start
+
+        placed = placement_rows(entries)
+        progress("💾 Veritabanına kaydediliyor...", 92)
+        schedule_ids = db_manager.replace_schedule(placed)
+        if schedule_ids is None:
+            result.error = "Timetable could not be written"
+            return result
+
+        result.placements = len(placed)
+        result.saved = len(schedule_ids)
+        result.coverage = round(min(1.0, len(placed) / result.required_hours), 4) if result.required_hours else 1.0
+        result.status = STATUS_OK if len(placed) >= result.required_hours else STATUS_INCOMPLETE
+        result.run = RunRecord(result.scheduler, solve_time, result.coverage, features).to_dict()
+        if record_history and job.algorithm != AUTO_ALGORITHM:
+            # Gece çalışmaları da algoritma seçicinin öğrendiği geçmişe eklenir
+            try:
+                get_run_history().record(features, result.scheduler, solve_time, result.coverage)
+            except Exception as e:
+                logger.debug(f"Run history not recorded: {e}")
+        progress(f"✅ Tamamlandı! {result.saved} ders yerleştirildi", 100)
+        return result
+    except Exception as e:
+        logger.exception(f"Generation failed for {job.db_path}")
+        result.status = STATUS_ERROR
+        result.error = f"{type(e).__name__}: {e}"
+        return result
+    finally:
+        result.wall_time_s = round(time.perf_counter() - start, 4)
+        db_manager.close_connection()
+
+
+def _record_run(result: GenerationResult):
+    """Add a run finished in a worker process to the run history of this process"""
+    from utils.run_history import RunRecord, get_run_history
+
+    if not result.run:
+        return
+    run = RunRecord.from_dict(result.run)
+    try:
+        get_run_history().record(run.features, run.algorithm, run.wall_time, run.coverage)
+    except Exception as e:
+        logger.debug(f"Run history not recorded: {e}")
+
+
+def _child(queue, job: GenerationJob, log_level: int):
+    from utils.run_history import get_run_history
+
+    logging.basicConfig(level=log_level, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    logging.getLogger().setLevel(log_level)
+    # Geçmiş dosyasını yalnızca üst süreç yazar; eşzamanlı işler birbirinin kaydını ezmesin
+    get_run_history().path = None
+    try:
+        result = run_generation(
+            job, lambda message, percentage: queue.put(("progress", message, percentage)), record_history=False
+        )
+    except BaseException as e:
+        result = GenerationResult(job.db_path, job.algorithm, STATUS_ERROR, error=f"{type(e).__name__}: {e}")
+    queue.put(("result", result.to_dict()))
+
+
+def run_isolated(
+    job: GenerationJob,
+    progress_callback: Optional[ProgressCallback] = None,
+    log_level: int = logging.WARNING,
+    poll_interval: float = 0.5,
+    cancel: Optional[threading.Event] = None,
+) -> GenerationResult:
+    """
+    Run ``run_generation`` in a fresh process, killing it at ``job.deadline``
+
+    Args:
+        job: Generation job
+        progress_callback: Called in this process with (message, percentage)
+        log_level: Logging level of the child process
+        poll_interval: How often a silent child is checked for a crash or cancellation
+        cancel: Set to kill the child early
+
+    Returns:
+        GenerationResult (status ``timeout`` or ``cancelled`` when the child was killed)
+    """
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=_child, args=(queue, job, log_level))
+    start = time.perf_counter()
+    process.start()
+    result = None
+    try:
+        while result is None:
+            remaining = None if job.deadline is None else job.deadline - (time.perf_counter() - start)
+            if (remaining is not None and remaining <= 0) or (cancel is not None and cancel.is_set()):
+                break
+            try:
+                message = queue.get(timeout=poll_interval if remaining is None else min(poll_interval, remaining))
+            except queue_module.Empty:
+                if not process.is_alive() and queue.empty():
+                    result = GenerationResult(
+                        job.db_path, job.algorithm, STATUS_ERROR,
+                        error=f"Worker process exited with code {process.exitcode}",
+                    )
+                continue
+            if message[0] == "progress":
+                if progress_callback is not None:
+                    progress_callback(message[1], message[2])
+            else:
+                result = GenerationResult(**message[1])
+    finally:
+        process.join(0 if result is None else 5)
+        if process.is_alive():
+            process.kill()
+            process.join()
+
+    if result is None and cancel is not None and cancel.is_set():
+        result = GenerationResult(job.db_path, job.algorithm, STATUS_CANCELLED, error="Cancelled")
+    elif result is None:
+        result = GenerationResult(job.db_path, job.algorithm, STATUS_TIMEOUT, error=f"Deadline of {job.deadline}s exceeded")
+    if result.status in (STATUS_TIMEOUT, STATUS_CANCELLED):
+        result.wall_time_s = round(time.perf_counter() - start, 4)
+    _record_run(result)
+    return result
+
+
+def run_batch(
+    jobs: Sequence[GenerationJob],
+    workers: Optional[int] = None,
+    on_progress: Optional[Callable[[GenerationJob, str, float], None]] = None,
+    on_result: Optional[Callable[[GenerationJob, GenerationResult], None]] = None,
+    log_level: int = logging.WARNING,
+) -> List[GenerationResult]:
+    """
+    Run jobs concurrently, each in its own process
+
+    Args:
+        jobs: Generation jobs
+        workers: Concurrent processes (default: CPU count)
+        on_progress: Called with (job, message, percentage)
+        on_result: Called with (job, result) as each job finishes
+        log_level: Logging level of the worker processes
+
+    Returns:
+        Results in job order
+    """
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs) or 1))
+
+    def run(job: GenerationJob) -> GenerationResult:
+        callback = None
+        if on_progress is not None:
+            callback = lambda message, percentage: on_progress(job, message, percentage)  # noqa: E731
+        result = run_isolated(job, callback, log_level)
+        if on_result is not None:
+            on_result(job, result)
+        return result
+
+    # Her iş parçacığı tek bir alt süreci bekler; asıl iş süreçlerde yapılır
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="generation") as executor:
+        return list(executor.map(run, jobs))
+
+
+def summarize(results: Sequence[GenerationResult]) -> Dict[str, int]:
+    """Number of jobs per status"""
+    summary: Dict[str, int] = {}
+    for result in results:
+        summary[result.status] = summary.get(result.status, 0) + 1
+    return summary
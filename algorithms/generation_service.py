@@ -0,0 +1,438 @@
+# -*- coding: utf-8 -*-
+"""
+Generation Service - Yerel HTTP program oluşturma servisi (yalnızca standart kütüphane)
+Birden çok kullanıcı, masaüstü arayüzünü açmadan aynı makinenin çekirdeklerini
+paylaşarak program oluşturabilir. İşler sınırlı bir kuyruğa alınır; en fazla
+``workers`` iş aynı anda, her biri kendi sürecinde ve kendi süre sınırıyla
+çalışır (bkz. generation_jobs.run_isolated). Zamanlayıcıların progress_callback
+bildirimleri server-sent events olarak yayınlanır; sonuç toplu kayıt yoluyla
+(DatabaseManager.replace_schedule) veritabanına yazılır.
+
+Endpoints:
+    POST   /jobs              {"db": "okul.db", "algorithm": "simple_perfect", "deadline": 600}
+    GET    /jobs              tüm işler
+    GET    /jobs/<id>         iş durumu ve sonucu
+    GET    /jobs/<id>/events  ilerleme akışı (text/event-stream, Last-Event-ID destekli)
+    DELETE /jobs/<id>         sıradaki veya çalışan işi iptal et
+    GET    /health            kuyruk ve çalışan sayıları
+
+Usage:
+    python main.py serve --port 8765 --workers 4 --root /srv/okullar
+    curl -X POST localhost:8765/jobs -d '{"db": "a.db", "deadline": 600}'
+    curl -N localhost:8765/jobs/1/events
+"""
+
+import json
+import logging
+import os
+import queue as queue_module
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import TYPE_CHECKING, Deque, Dict, List, Optional, Sequence, Tuple
+
+from algorithms.generation_jobs import (
+    AUTO_ALGORITHM,
+    DEFAULT_ALGORITHM,
+    STATUS_CANCELLED,
+    STATUS_ERROR,
+    GenerationJob,
+    GenerationResult,
+    run_isolated,
+)
+from algorithms.scheduler_registry import get_scheduler_registry
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+
+# İş başına saklanan en fazla olay; geç bağlanan okuyucu son olayları alır
+MAX_EVENTS = 1000
+KEEPALIVE_SECONDS = 15.0
+
+
+class JobRejected(Exception):
+    """A job request the service cannot accept (carries the HTTP status)"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class ServiceEvent:
+    """One server-sent event of a job"""
+
+    seq: int
+    event: str  # "status" | "progress" | "result"
+    data: dict
+
+    def to_sse(self) -> bytes:
+        payload = json.dumps(self.data, ensure_ascii=False)
+        return f"id: {self.seq}\nevent: {self.event}\ndata: {payload}\n\n".encode("utf-8")
+
+
+@dataclass
+class JobState:
+    """A submitted job, its progress events and its result"""
+
+    id: str
+    job: GenerationJob
+    status: str = JOB_QUEUED
+    created: float = field(default_factory=time.time)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    result: Optional[GenerationResult] = None
+    events: Deque[ServiceEvent] = field(default_factory=lambda: deque(maxlen=MAX_EVENTS))
+    cancel: threading.Event = field(default_factory=threading.Event)
+    last_seq: int = 0
+
+    @property
+    def done(self) -> bool:
+        return self.finished is not None
+
+    def to_dict(self) -> dict:
+        progress = next((e.data for e in reversed(self.events) if e.event == "progress"), None)
+        result = None
+        if self.result is not None:
+            result = {key: value for key, value in self.result.to_dict().items() if key != "run"}
+        return {
+            "id": self.id,
+            "db": self.job.db_path,
+            "algorithm": self.job.algorithm,
+            "deadline": self.job.deadline,
+            "status": self.status,
+            "created": _isoformat(self.created),
+            "started": _isoformat(self.started),
+            "finished": _isoformat(self.finished),
+            "progress": progress,
+            "result": result,
+        }
+
+
+def _isoformat(timestamp: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(timestamp).isoformat(timespec="seconds") if timestamp is not None else None
+
+
+class GenerationService:
+    """Bounded queue of generation jobs run by a fixed pool of worker processes"""
+
+    def __init__(
+        self,
+        workers: int = 2,
+        max_queue: int = 32,
+        default_deadline: Optional[float] = None,
+        roots: Optional[Sequence[str]] = None,
+        max_jobs: int = 200,
+        log_level: int = logging.WARNING,
+    ):
+        """
+        Initialize service (call :meth:`start` to run jobs)
+
+        Args:
+            workers: Jobs run at the same time (one process each)
+            max_queue: Waiting jobs accepted before new ones are refused
+            default_deadline: Deadline in seconds for jobs that give none
+            roots: Directories databases must live in (default: current directory);
+                relative paths are resolved against the first one
+            max_jobs: Finished jobs kept for status queries
+            log_level: Logging level of the worker processes
+        """
+        self.workers = max(1, workers)
+        self.default_deadline = default_deadline
+        self.roots = [os.path.realpath(root) for root in (roots or [os.getcwd()])]
+        self.max_jobs = max_jobs
+        self.log_level = log_level
+        self._queue: "queue_module.Queue[Optional[JobState]]" = queue_module.Queue(maxsize=max(1, max_queue))
+        self._jobs: Dict[str, JobState] = {}
+        self._changed = threading.Condition()
+        self._next_id = 0
+        self._threads: List[threading.Thread] = []
+        self._server: Optional["ThreadingHTTPServer"] = None
+
+    # ---- Jobs ----
+
+    def start(self) -> "GenerationService":
+        """Start the worker threads (each waits on one worker process at a time)"""
+        if not self._threads:
+            for index in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f"GenerationWorker-{index}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        return self
+
+    def submit(
+        self,
+        db: str,
+        algorithm: str = DEFAULT_ALGORITHM,
+        deadline: Optional[float] = None,
+        school_type: Optional[str] = None,
+    ) -> JobState:
+        """
+        Queue a generation job
+
+        Raises:
+            JobRejected: Invalid request (400), database outside the roots (403)
+                or missing (404), a job for the database is pending (409),
+                queue full (503)
+        """
+        if algorithm != AUTO_ALGORITHM and algorithm not in get_scheduler_registry().names():
+            raise JobRejected(400, f"Unknown algorithm '{algorithm}'")
+        if deadline is None:
+            deadline = self.default_deadline
+        elif not isinstance(deadline, (int, float)) or deadline <= 0:
+            raise JobRejected(400, "'deadline' must be a positive number of seconds")
+        db_path = self._resolve(db)
+
+        with self._changed:
+            if any(s.job.db_path == db_path and not s.done for s in self._jobs.values()):
+                raise JobRejected(409, f"A job for {db} is already queued or running")
+            self._next_id += 1
+            state = JobState(str(self._next_id), GenerationJob(db_path, algorithm, deadline, school_type))
+            try:
+                self._queue.put_nowait(state)
+            except queue_module.Full:
+                raise JobRejected(503, "Job queue is full, try again later") from None
+            self._jobs[state.id] = state
+            self._emit(state, "status", {"status": JOB_QUEUED})
+        logger.info(f"Job {state.id} queued: {db_path} ({algorithm})")
+        return state
+
+    def get(self, job_id: str) -> JobState:
+        """Raises KeyError for unknown (or expired) jobs"""
+        with self._changed:
+            return self._jobs[job_id]
+
+    def jobs(self) -> List[JobState]:
+        with self._changed:
+            return list(self._jobs.values())
+
+    def snapshot(self, state: JobState) -> dict:
+        """JSON view of a job, consistent with concurrently added events"""
+        with self._changed:
+            return state.to_dict()
+
+    def cancel(self, job_id: str) -> JobState:
+        """Cancel a queued job, or kill the process of a running one"""
+        state = self.get(job_id)
+        state.cancel.set()
+        with self._changed:
+            if state.status == JOB_QUEUED:
+                # Kuyruktaki iş sırası gelince atlanır
+                self._finish(state, GenerationResult(state.job.db_path, state.job.algorithm, STATUS_CANCELLED, error="Cancelled"))
+        return state
+
+    def wait_events(self, job_id: str, after: int = 0, timeout: float = KEEPALIVE_SECONDS) -> Tuple[List[ServiceEvent], bool]:
+        """
+        Events of a job newer than ``after``, waiting up to ``timeout`` for one
+
+        Returns:
+            (events, done) - ``done`` once the job finished and all events were returned
+        """
+        state = self.get(job_id)
+        with self._changed:
+            self._changed.wait_for(lambda: state.last_seq > after or state.done, timeout)
+            events = [e for e in state.events if e.seq > after]
+            return events, state.done
+
+    def stats(self) -> dict:
+        with self._changed:
+            statuses = [s.status for s in self._jobs.values()]
+        return {
+            "workers": self.workers,
+            "queued": statuses.count(JOB_QUEUED),
+            "running": statuses.count(JOB_RUNNING),
+            "jobs": len(statuses),
+            "roots": self.roots,
+        }
+
+    def shutdown(self, timeout: float = 10.0):
+        """Stop the HTTP server, cancel all unfinished jobs and stop the workers"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        for state in self.jobs():
+            if not state.done:
+                self.cancel(state.id)
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _resolve(self, db: str) -> str:
+        if not isinstance(db, str) or not db:
+            raise JobRejected(400, "'db' must be a database path")
+        path = os.path.realpath(os.path.join(self.roots[0], os.path.expanduser(db)))
+        if not any(os.path.commonpath([path, root]) == root for root in self.roots):
+            raise JobRejected(403, f"{db} is outside the served directories")
+        if not os.path.isfile(path):
+            raise JobRejected(404, f"Database not found: {db}")
+        return path
+
+    def _work(self):
+        while True:
+            state = self._queue.get()
+            if state is None:
+                return
+            with self._changed:
+                if state.done:  # kuyruktayken iptal edildi
+                    continue
+                state.status = JOB_RUNNING
+                state.started = time.time()
+                self._emit(state, "status", {"status": JOB_RUNNING})
+            logger.info(f"Job {state.id} started: {state.job.db_path}")
+
+            def progress(message: str, percentage: float, state=state):
+                with self._changed:
+                    self._emit(state, "progress", {"message": message, "percentage": round(percentage, 1)})
+
+            try:
+                result = run_isolated(state.job, progress, self.log_level, cancel=state.cancel)
+            except Exception as e:
+                logger.exception(f"Job {state.id} failed")
+                result = GenerationResult(state.job.db_path, state.job.algorithm, STATUS_ERROR, error=f"{type(e).__name__}: {e}")
+            with self._changed:
+                self._finish(state, result)
+            logger.info(f"Job {state.id} {result.status}: {result.placements}/{result.required_hours} h")
+
+    def _emit(self, state: JobState, event: str, data: dict):
+        """Append an event and wake the readers (caller holds the lock)"""
+        state.last_seq += 1
+        state.events.append(ServiceEvent(state.last_seq, event, data))
+        self._changed.notify_all()
+
+    def _finish(self, state: JobState, result: GenerationResult):
+        """Store the result and drop the oldest finished jobs (caller holds the lock)"""
+        state.result = result
+        state.status = result.status
+        state.finished = time.time()
+        self._emit(state, "result", state.to_dict())
+        finished = [s for s in self._jobs.values() if s.done]
+        for old in finished[: max(0, len(finished) - self.max_jobs)]:
+            del self._jobs[old.id]
+
+    # ---- HTTP ----
+
+    def serve(self, port: int = 8765, host: str = "127.0.0.1") -> "ThreadingHTTPServer":
+        """
+        Serve the job API from a daemon thread (starts the workers)
+
+        Returns:
+            The running server (``server.server_address`` has the bound port)
+        """
+        if self._server is not None:
+            return self._server
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        service = self.start()
+
+        class JobHandler(BaseHTTPRequestHandler):
+            def _route(self) -> Tuple[List[str], Dict[str, str]]:
+                path, _, query = self.path.partition("?")
+                params = dict(part.partition("=")[::2] for part in query.split("&") if part)
+                return [part for part in path.split("/") if part], params
+
+            def _send_json(self, status: int, payload):
+                body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                if status == 503:
+                    self.send_header("Retry-After", "30")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _job(self, job_id: str) -> Optional[JobState]:
+                try:
+                    return service.get(job_id)
+                except KeyError:
+                    self._send_json(404, {"error": f"Unknown job {job_id}"})
+                    return None
+
+            def do_GET(self):
+                parts, params = self._route()
+                if parts == ["health"]:
+                    self._send_json(200, service.stats())
+                elif parts == ["jobs"]:
+                    self._send_json(200, [service.snapshot(state) for state in service.jobs()])
+                elif len(parts) == 2 and parts[0] == "jobs":
+                    state = self._job(parts[1])
+                    if state is not None:
+                        self._send_json(200, service.snapshot(state))
+                elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "events":
+                    if self._job(parts[1]) is not None:
+                        after = self.headers.get("Last-Event-ID") or params.get("after") or "0"
+                        self._stream(parts[1], int(after) if after.isdigit() else 0)
+                else:
+                    self._send_json(404, {"error": "Not found"})
+
+            def do_POST(self):
+                parts, _ = self._route()
+                if parts != ["jobs"]:
+                    self._send_json(404, {"error": "Not found"})
+                    return
+                try:
+                    length = int(self.headers.get("Content-Length") or 0)
+                    request = json.loads(self.rfile.read(length) or b"{}")
+                    if not isinstance(request, dict):
+                        raise ValueError("expected a JSON object")
+                except ValueError as e:
+                    self._send_json(400, {"error": f"Invalid JSON body: {e}"})
+                    return
+                try:
+                    state = service.submit(
+                        request.get("db"),
+                        request.get("algorithm", DEFAULT_ALGORITHM),
+                        request.get("deadline"),
+                        request.get("school_type"),
+                    )
+                except JobRejected as e:
+                    self._send_json(e.status, {"error": str(e)})
+                    return
+                payload = service.snapshot(state)
+                payload["events"] = f"/jobs/{state.id}/events"
+                self._send_json(202, payload)
+
+            def do_DELETE(self):
+                parts, _ = self._route()
+                if len(parts) != 2 or parts[0] != "jobs":
+                    self._send_json(404, {"error": "Not found"})
+                    return
+                if self._job(parts[1]) is not None:
+                    self._send_json(202, service.snapshot(service.cancel(parts[1])))
+
+            def _stream(self, job_id: str, after: int):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                try:
+                    while True:
+                        events, done = service.wait_events(job_id, after)
+                        for event in events:
+                            self.wfile.write(event.to_sse())
+                            after = event.seq
+                        if not events:
+                            self.wfile.write(b": keepalive\n\n")
+                        self.wfile.flush()
+                        if done:
+                            return
+                except (BrokenPipeError, ConnectionResetError, KeyError):
+                    # İstemci ayrıldı ya da iş listeden düştü
+                    return
+
+            def log_message(self, format, *args):
+                logger.debug("generation service: " + format % args)
+
+        self._server = ThreadingHTTPServer((host, port), JobHandler)
+        threading.Thread(target=self._server.serve_forever, name="GenerationService", daemon=True).start()
+        logger.info(f"Generation service: http://{host}:{self._server.server_address[1]}/jobs")
+        return self._server
@@ -6,9 +6,14 @@ import random
 import time
 from typing import List, Dict, Any
 from algorithms.base_scheduler import BaseScheduler
+from algorithms.batch_scoring import BatchScheduleScorer
 from algorithms.monitoring import PerformanceMonitor
+from utils.memory_budget import estimate_size, get_memory_budget
 from utils.progress_tracker import SchedulerProgressTracker
 
+# Bellek baskısında popülasyon bu boyutun altına küçültülmez
+MIN_POPULATION_SIZE = 4
+
 
 class GeneticAlgorithmScheduler(BaseScheduler):
     """
@@ -34,6 +39,16 @@ class GeneticAlgorithmScheduler(BaseScheduler):
         school_config = self._get_school_config()
         self.time_slots = school_config["time_slots_count"]
         self.days = 5  # Assuming 5 days per week
+        self.batch_scorer = BatchScheduleScorer(days=self.days, slots=self.time_slots)
+        
+        # Current generation, kept on the instance so the memory budget can shrink it
+        self.population: List[List[Dict[str, Any]]] = []
+        self.fitness_scores: List[float] = []
+        self.memory_budget = get_memory_budget()
+        self.memory_budget.register(
+            "ga_population", self, GeneticAlgorithmScheduler._population_bytes,
+            GeneticAlgorithmScheduler._evict_weakest, value=2.0
+        )
         
     def generate_schedule(self) -> List[Dict[str, Any]]:
         """
@@ -50,7 +65,7 @@ class GeneticAlgorithmScheduler(BaseScheduler):
         start_time = time.time()
         
         # Initialize population
-        population = self._initialize_population()
+        self.population = self._initialize_population()
         
         best_solution = None
         best_fitness = float('-inf')
@@ -58,13 +73,17 @@ class GeneticAlgorithmScheduler(BaseScheduler):
         # Evolution loop
         for generation in range(self.max_generations):
             # Evaluate fitness for all individuals
-            fitness_scores = [self._calculate_fitness(individual) for individual in population]
+            self.fitness_scores = self._calculate_population_fitness(self.population)
             
             # Track best solution
-            for i, fitness in enumerate(fitness_scores):
+            for i, fitness in enumerate(self.fitness_scores):
                 if fitness > best_fitness:
                     best_fitness = fitness
-                    best_solution = population[i].copy()
+                    best_solution = self.population[i].copy()
+            
+            # Bütçe aşıldıysa en zayıf bireyler atılır (popülasyon kalıcı olarak küçülür)
+            self.memory_budget.enforce()
+            population, fitness_scores = self.population, self.fitness_scores
             
             # Report progress every 10 generations
             if generation % 10 == 0:
@@ -91,8 +110,9 @@ class GeneticAlgorithmScheduler(BaseScheduler):
                 
                 new_population.append(child)
             
-            population = new_population
+            self.population = new_population
         
+        self.population, self.fitness_scores = [], []
         total_time = time.time() - start_time
         print(f"Evolution completed in {total_time:.2f} seconds")
         print(f"Best fitness: {best_fitness}")
@@ -103,6 +123,32 @@ class GeneticAlgorithmScheduler(BaseScheduler):
         
         return schedule
         
+    def _population_bytes(self) -> int:
+        """Approximate size of the current population"""
+        if not self.population:
+            return 0
+        return estimate_size(self.population[0]) * len(self.population)
+    
+    def _evict_weakest(self, target_bytes: int) -> int:
+        """
+        Drop the lowest-fitness individuals and shrink the population size
+        
+        Returns:
+            Estimated bytes freed
+        """
+        removable = len(self.population) - MIN_POPULATION_SIZE
+        if removable <= 0 or len(self.fitness_scores) != len(self.population):
+            return 0
+        per_individual = max(1, estimate_size(self.population[0]))
+        count = min(removable, -(-target_bytes // per_individual))
+        keep = sorted(range(len(self.population)), key=lambda i: self.fitness_scores[i], reverse=True)
+        keep = sorted(keep[:len(self.population) - count])
+        self.population = [self.population[i] for i in keep]
+        self.fitness_scores = [self.fitness_scores[i] for i in keep]
+        self.population_size = len(self.population)
+        print(f"Memory budget: population reduced to {self.population_size} individuals")
+        return count * per_individual
+    
     def _initialize_population(self) -> List[List[Dict[str, Any]]]:
         """
         Initialize population with random schedules
@@ -123,7 +169,7 @@ class GeneticAlgorithmScheduler(BaseScheduler):
                 # Get weekly hours for this assignment
                 class_obj = next((c for c in self.classes if c.class_id == assignment.class_id), None)
                 if class_obj:
-                    weekly_hours = self.db_manager.get_weekly_hours_for_lesson(assignment.lesson_id, class_obj.grade)
+                    weekly_hours = self.db_manager.get_requirement_table().weekly_hours(class_obj.class_id, assignment.lesson_id)
                     if weekly_hours:
                         # Try to place the required number of hours
                         hours_placed = 0
@@ -180,19 +226,28 @@ class GeneticAlgorithmScheduler(BaseScheduler):
         if not schedule:
             return 0.0
         
-        # Calculate coverage (how many slots are filled)
-        classes = self.db_manager.get_all_classes()
-        school_config = self._get_school_config()
-        daily_hours = school_config["time_slots_count"]
-        theoretical_capacity = len(classes) * 5 * daily_hours
-        coverage = len(schedule) / theoretical_capacity if theoretical_capacity > 0 else 0
-        
         # Check conflicts (penalize heavily)
         conflicts = self._detect_conflicts_in_schedule(schedule)
-        conflict_penalty = len(conflicts) * 1000  # Heavy penalty for conflicts
+        return self._fitness_from_conflicts(schedule, len(conflicts))
+    
+    def _calculate_population_fitness(self, population: List[List[Dict[str, Any]]]) -> List[float]:
+        """
+        Fitness of every individual; conflicts of the whole population are
+        counted in one batched call
+        """
+        conflict_counts = self.batch_scorer.score_schedules(population).hard_violations
+        return [
+            self._fitness_from_conflicts(individual, conflicts) if individual else 0.0
+            for individual, conflicts in zip(population, conflict_counts)
+        ]
+    
+    def _fitness_from_conflicts(self, schedule: List[Dict[str, Any]], conflict_count: int) -> float:
+        """Fitness of a non-empty schedule with a known conflict count"""
+        # Calculate coverage (how many slots are filled)
+        theoretical_capacity = len(self.classes) * self.days * self.time_slots
+        coverage = len(schedule) / theoretical_capacity if theoretical_capacity > 0 else 0
         
-        # Calculate soft constraints satisfaction
-        soft_score = self._calculate_soft_constraints_score(schedule)
+        conflict_penalty = conflict_count * 1000  # Heavy penalty for conflicts
         
         # Final fitness: prioritize valid solutions
         if conflict_penalty > 0:
@@ -200,7 +255,7 @@ class GeneticAlgorithmScheduler(BaseScheduler):
             fitness = coverage * 100 - conflict_penalty
         else:
             # If no conflicts, reward coverage and soft constraints
-            fitness = coverage * 1000 + soft_score
+            fitness = coverage * 1000 + self._calculate_soft_constraints_score(schedule)
         
         return max(0, fitness)  # Ensure non-negative
     
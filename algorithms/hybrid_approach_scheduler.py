@@ -278,7 +278,7 @@ class HybridApproachScheduler:
             teacher_id = assignment_map[key]
 
             # Check if this lesson needs more hours
-            weekly_hours = self.db_manager.get_weekly_hours_for_lesson(lesson.lesson_id, class_obj.grade)
+            weekly_hours = self.db_manager.get_requirement_table().weekly_hours(class_obj.class_id, lesson.lesson_id)
             if not weekly_hours:
                 continue
 
@@ -33,6 +33,7 @@ except ImportError:
     print("⚠️  CSP Solver bulunamadı")
 
 try:
+    from algorithms.compiled_soft_constraints import CompiledSoftConstraintEvaluator
     from algorithms.soft_constraints import SoftConstraintManager
 
     SOFT_CONSTRAINTS_AVAILABLE = True
@@ -148,6 +149,10 @@ class HybridOptimalScheduler:
         # Modülleri başlat
         self.explainer = SchedulerExplainer(db_manager) if EXPLAINER_AVAILABLE else None
         self.soft_constraints = SoftConstraintManager(db_manager) if SOFT_CONSTRAINTS_AVAILABLE else None
+        # Vektörel değerlendirici (NumPy yoksa manager'a düşer)
+        self.compiled_soft_constraints = (
+            CompiledSoftConstraintEvaluator(self.soft_constraints) if self.soft_constraints else None
+        )
         self.heuristics = ScheduleHeuristics(db_manager) if HEURISTICS_AVAILABLE else None
 
         # Performance optimizer ekleme
@@ -299,10 +304,12 @@ class HybridOptimalScheduler:
         # Komşu üreteç
         neighbor_gen = ScheduleNeighborGenerator(self.db_manager, config["time_slots_count"])
 
-        # Değerlendirme fonksiyonu
+        # Değerlendirme fonksiyonu - programı bir kez tensöre çevirip skorlar
+        evaluator = self.compiled_soft_constraints
+        evaluator.slots = config["time_slots_count"]
+
         def evaluate(sch):
-            result = self.soft_constraints.evaluate_schedule(sch)
-            return result["total_score"]
+            return evaluator.total_score(sch)
 
         # Hard constraint kontrolü
         def check_constraints(sch):
@@ -370,7 +377,7 @@ class HybridOptimalScheduler:
             for lesson in config["lessons"]:
                 key = (class_obj.class_id, lesson.lesson_id)
                 if key in config["assignment_map"]:
-                    weekly_hours = self.db_manager.get_weekly_hours_for_lesson(lesson.lesson_id, class_obj.grade)
+                    weekly_hours = self.db_manager.get_requirement_table().weekly_hours(class_obj.class_id, lesson.lesson_id)
                     if weekly_hours:
                         total_required += weekly_hours
 
@@ -5,11 +5,17 @@ Allows users to lock entries, get suggestions, and validate in real-time
 """
 
 import io
+import logging
 import sys
 import time
 import threading
-from collections import defaultdict
-from typing import Dict, List, Optional, Callable, Tuple
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Callable, Set, Tuple
+
+from algorithms.conflict_index import ConflictDelta, ConflictIndex
+from algorithms.slot_suggestion_engine import SlotSuggestionEngine
 
 # Set encoding for Windows
 if sys.platform.startswith("win"):
@@ -19,6 +25,22 @@ if sys.platform.startswith("win"):
         sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8")
 
 
+@dataclass
+class EditOperation:
+    """
+    One reversible edit in the undo/redo log
+
+    Stores only what the edit touched, so each history step costs O(edit)
+    memory instead of a full schedule copy.
+    """
+
+    op: str  # "move", "add", "remove", "lock", "unlock"
+    index: int
+    entry: Optional[Dict] = None
+    old_position: Optional[Tuple[int, int]] = None
+    new_position: Optional[Tuple[int, int]] = None
+
+
 class InteractiveScheduler:
     """
     Interactive scheduler for user-driven editing
@@ -32,12 +54,14 @@ class InteractiveScheduler:
     - Quality scoring
     """
 
-    def __init__(self, db_manager):
+    def __init__(self, db_manager, check_classrooms: bool = False):
         """
         Initialize interactive scheduler
 
         Args:
             db_manager: Database manager instance
+            check_classrooms: Report classroom double bookings too (off by default
+                because generated schedules use classroom 1 as a placeholder)
         """
         self.db_manager = db_manager
         self.logger = logging.getLogger(__name__)
@@ -48,13 +72,17 @@ class InteractiveScheduler:
         # Locked entries (cannot be modified by auto-scheduler)
         self.locked_entries: Set[int] = set()  # Set of entry indices
 
-        # History for undo/redo
-        self.history: List[List[Dict]] = []
-        self.history_index = -1
+        # Operation log for undo/redo: each step is a transaction of EditOperations
+        self.undo_stack: Deque[List[EditOperation]] = deque()
+        self.redo_stack: List[List[EditOperation]] = []
+        self._transaction: Optional[List[EditOperation]] = None
+        self._transaction_depth = 0
 
-        # Real-time optimization thread
+        # Real-time optimization thread (woken by edits, not by polling)
         self.optimization_thread = None
         self.stop_optimization = threading.Event()
+        self.edit_event = threading.Event()
+        self._lock = threading.RLock()
 
         # Performance monitoring
         self.performance_stats = {
@@ -64,10 +92,27 @@ class InteractiveScheduler:
             'suggestions_generated': 0
         }
 
-        self.max_history: int = 50
+        # Maximum number of undo steps (None = unbounded)
+        self.max_history: Optional[int] = None
 
-        # Conflict tracking
-        self.conflicts: List[Dict] = []
+        # Conflict tracking: incremental index keyed by (resource, day, slot)
+        self.conflict_index = ConflictIndex(track_classrooms=check_classrooms)
+        self.last_conflict_delta = ConflictDelta()
+        self._conflicts_cache: Optional[List[Dict]] = None
+
+        # Free-slot bitmasks for fast suggestions (kept in sync with the conflict index)
+        self.suggestion_engine = SlotSuggestionEngine(
+            availability_provider=self._load_unavailable_mask,
+            lesson_name_provider=self._get_lesson_name,
+            track_classrooms=check_classrooms,
+        )
+
+    @property
+    def conflicts(self) -> List[Dict]:
+        """Current conflicts, materialized from the conflict index on demand"""
+        if self._conflicts_cache is None:
+            self._conflicts_cache = self._materialize_conflicts()
+        return self._conflicts_cache
 
     def load_schedule(self, schedule: List[Dict]):
         """
@@ -76,9 +121,11 @@ class InteractiveScheduler:
         Args:
             schedule: Schedule entries
         """
-        self.schedule = schedule.copy()
-        self._save_to_history()
-        self._detect_conflicts()
+        with self._lock:
+            self.schedule = schedule.copy()
+            self.locked_entries = set()
+            self.clear_history()
+            self._detect_conflicts()
 
         self.logger.info(f"Loaded schedule with {len(schedule)} entries")
 
@@ -93,7 +140,9 @@ class InteractiveScheduler:
             True if locked successfully
         """
         if 0 <= entry_index < len(self.schedule):
-            self.locked_entries.add(entry_index)
+            if entry_index not in self.locked_entries:
+                self.locked_entries.add(entry_index)
+                self._log_operation(EditOperation("lock", entry_index))
             self.logger.info(f"Locked entry {entry_index}")
             return True
         return False
@@ -110,6 +159,7 @@ class InteractiveScheduler:
         """
         if entry_index in self.locked_entries:
             self.locked_entries.remove(entry_index)
+            self._log_operation(EditOperation("unlock", entry_index))
             self.logger.info(f"Unlocked entry {entry_index}")
             return True
         return False
@@ -130,35 +180,35 @@ class InteractiveScheduler:
         Returns:
             (success, error_message) tuple
         """
-        # Check if entry exists
-        if entry_index < 0 or entry_index >= len(self.schedule):
-            return False, "Entry index out of range"
+        # Check and move under one lock so two callers cannot both claim the slot
+        with self._lock:
+            # Check if entry exists
+            if entry_index < 0 or entry_index >= len(self.schedule):
+                return False, "Entry index out of range"
 
-        # Check if locked
-        if self.is_locked(entry_index):
-            return False, "Entry is locked"
+            # Check if locked
+            if self.is_locked(entry_index):
+                return False, "Entry is locked"
 
-        entry = self.schedule[entry_index]
-        old_day = entry["day"]
-        old_slot = entry["time_slot"]
-
-        # Check if new slot is valid
-        can_place, reason = self._can_place_at(
-            entry["class_id"], entry["teacher_id"], new_day, new_slot, exclude_index=entry_index
-        )
+            entry = self.schedule[entry_index]
+            old_day = entry["day"]
+            old_slot = entry["time_slot"]
 
-        if not can_place:
-            return False, reason
+            # Check if new slot is valid
+            can_place, reason = self._can_place_at(
+                entry["class_id"], entry["teacher_id"], new_day, new_slot, exclude_index=entry_index
+            )
 
-        # Move entry
-        entry["day"] = new_day
-        entry["time_slot"] = new_slot
+            if not can_place:
+                return False, reason
 
-        # Save to history before modification
-        self._save_to_history()
+            # Move entry (updates the conflict index in O(1))
+            self._record_delta(self._index_move(entry, new_day, new_slot))
 
-        # Update conflicts
-        self._detect_conflicts()
+            # Log the inverse delta
+            self._log_operation(
+                EditOperation("move", entry_index, entry, (old_day, old_slot), (new_day, new_slot))
+            )
 
         self.logger.info(
             f"Moved entry {entry_index} from Day {old_day} Slot {old_slot} " f"to Day {new_day} Slot {new_slot}"
@@ -170,6 +220,9 @@ class InteractiveScheduler:
         """
         Suggest alternative slots for an entry
 
+        Feasible slots come from ANDing the class, teacher and availability
+        bitmasks; no schedule scan or per-slot database call is needed.
+
         Args:
             entry_index: Index of entry
             max_suggestions: Maximum number of suggestions
@@ -181,38 +234,120 @@ class InteractiveScheduler:
             return []
 
         entry = self.schedule[entry_index]
+        suggestions = [
+            {
+                "day": day,
+                "slot": slot,
+                "score": score,
+                "reason": self._get_slot_reason(day, slot, score),
+            }
+            for day, slot, score in self.suggestion_engine.suggest(entry, max_suggestions)
+        ]
+        self.performance_stats["suggestions_generated"] += len(suggestions)
+
+        return suggestions
+
+    def suggest_swaps(self, entry_index: int, max_suggestions: int = 5) -> List[Dict]:
+        """
+        Suggest two-entry exchanges that make an otherwise infeasible move legal
+
+        For every slot the entry cannot move to directly, the entries blocking
+        it (same class or same teacher) are tried as swap partners.
+
+        Args:
+            entry_index: Index of entry
+            max_suggestions: Maximum number of suggestions
+
+        Returns:
+            List of suggestion dicts with 'day', 'slot', 'swap_with', 'score', 'reason'
+        """
+        if entry_index < 0 or entry_index >= len(self.schedule):
+            return []
+
+        engine = self.suggestion_engine
+        entry = self.schedule[entry_index]
+        direct = engine.feasible_mask(entry, exclude=[entry])
+        available = engine.full_mask & ~engine.unavailable_mask(entry["teacher_id"])
+        blocked = available & ~direct
+
+        positions = None
         suggestions = []
+        while blocked:
+            low_bit = blocked & -blocked
+            blocked ^= low_bit
+            day, slot = divmod(low_bit.bit_length() - 1, engine.slots_per_day)
+            if day == entry["day"] and slot == entry["time_slot"]:
+                continue
 
-        # Try all possible slots
-        for day in range(5):
-            for slot in range(8):
-                # Skip current slot
-                if day == entry["day"] and slot == entry["time_slot"]:
+            blockers = self.conflict_index.occupants_at("class", entry["class_id"], day, slot)
+            blockers += self.conflict_index.occupants_at("teacher", entry["teacher_id"], day, slot)
+            for token in dict.fromkeys(blockers):
+                other = self.conflict_index.entries.get(token)
+                if other is None or other is entry or not engine.can_swap(entry, other):
                     continue
-
-                # Check if can place
-                can_place, reason = self._can_place_at(
-                    entry["class_id"], entry["teacher_id"], day, slot, exclude_index=entry_index
+                if positions is None:
+                    positions = {id(e): i for i, e in enumerate(self.schedule)}
+                other_index = positions.get(token, -1)
+                if other_index < 0 or self.is_locked(other_index):
+                    continue
+                score = engine.score_mask(entry, low_bit, exclude=[entry, other])[0][2]
+                suggestions.append(
+                    {
+                        "day": day,
+                        "slot": slot,
+                        "swap_with": other_index,
+                        "score": score,
+                        "reason": self._get_slot_reason(day, slot, score),
+                    }
                 )
 
-                if can_place:
-                    # Calculate score for this slot
-                    score = self._score_slot(entry["class_id"], entry["lesson_id"], entry["teacher_id"], day, slot)
+        suggestions.sort(key=lambda x: x["score"], reverse=True)
+        self.performance_stats["suggestions_generated"] += min(len(suggestions), max_suggestions)
 
-                    suggestions.append(
-                        {
-                            "day": day,
-                            "slot": slot,
-                            "score": score,
-                            "reason": self._get_slot_reason(day, slot, score),
-                        }
-                    )
+        return suggestions[:max_suggestions]
 
-        # Sort by score (descending)
-        suggestions.sort(key=lambda x: x["score"], reverse=True)
+    def swap_entries(self, first_index: int, second_index: int) -> Tuple[bool, Optional[str]]:
+        """
+        Exchange the slots of two entries as a single undo step
+
+        Returns:
+            (success, error_message) tuple
+        """
+        with self._lock:
+            for index in (first_index, second_index):
+                if index < 0 or index >= len(self.schedule):
+                    return False, "Entry index out of range"
+                if self.is_locked(index):
+                    return False, "Entry is locked"
+
+            first, second = self.schedule[first_index], self.schedule[second_index]
+            if not self.suggestion_engine.can_swap(first, second):
+                return False, "Swap would create a conflict"
+
+            first_position = (first["day"], first["time_slot"])
+            second_position = (second["day"], second["time_slot"])
+            with self.transaction():
+                delta = self._index_move(first, *second_position)
+                delta = delta.merge(self._index_move(second, *first_position))
+                self._record_delta(delta)
+                self._log_operation(
+                    EditOperation("move", first_index, first, first_position, second_position)
+                )
+                self._log_operation(
+                    EditOperation("move", second_index, second, second_position, first_position)
+                )
+
+        self.logger.info(f"Swapped entries {first_index} and {second_index}")
+        return True, None
 
     def start_realtime_optimization(self, interval: float = 1.0):
-        """Gerçek zamanlı optimizasyon thread'ini başlat"""
+        """
+        Gerçek zamanlı optimizasyon thread'ini başlat
+
+        Args:
+            interval: Minimum time between two optimization passes; bursts of
+                edits inside this window are handled by a single pass
+        """
         if self.optimization_thread and self.optimization_thread.is_alive():
             return
 
@@ -225,32 +360,40 @@ class InteractiveScheduler:
     def stop_realtime_optimization(self):
         """Gerçek zamanlı optimizasyon thread'ini durdur"""
         self.stop_optimization.set()
+        self.edit_event.set()  # Wake the thread so it can exit
         if self.optimization_thread:
             self.optimization_thread.join(timeout=2.0)
         self.logger.info("Gerçek zamanlı optimizasyon durduruldu")
 
     def _realtime_optimization_loop(self, interval: float):
-        """Gerçek zamanlı optimizasyon döngüsü"""
+        """Gerçek zamanlı optimizasyon döngüsü (yalnızca düzenlemelerle uyanır)"""
+        last_run = 0.0
         while not self.stop_optimization.is_set():
+            # Düzenleme gelene kadar bekle (busy-polling yok)
+            self.edit_event.wait()
+            if self.stop_optimization.is_set():
+                break
+
+            # Aynı pencere içindeki düzenlemeleri tek geçişte topla
+            remaining = interval - (time.perf_counter() - last_run)
+            if remaining > 0 and self.stop_optimization.wait(remaining):
+                break
+            self.edit_event.clear()
+
             try:
                 # Performansı kaydet
-                start_time = time.time()
+                start_time = time.perf_counter()
 
                 # Çakışmaları tespit et ve otomatik çözmeye çalış
-                initial_conflicts = len(self.conflicts)
-                if initial_conflicts > 0:
+                if self.conflict_index.conflict_count > 0:
                     self._auto_resolve_conflicts()
 
                 # Performansı güncelle
-                end_time = time.time()
-                self.performance_stats['optimization_time'] += (end_time - start_time)
-
-                # Kısa bir bekleme
-                time.sleep(interval)
+                last_run = time.perf_counter()
+                self.performance_stats['optimization_time'] += (last_run - start_time)
 
             except Exception as e:
                 self.logger.error(f"Gerçek zamanlı optimizasyon hatası: {e}")
-                time.sleep(interval)
 
     def _auto_resolve_conflicts(self):
         """Otomatik çakışma çözümü"""
@@ -259,9 +402,8 @@ class InteractiveScheduler:
 
         resolved_count = 0
 
-        for conflict in self.conflicts[:]:  # Copy list to avoid modification during iteration
+        for conflict in list(self.conflicts):  # Snapshot; moves refresh the conflict list
             if self._try_resolve_conflict(conflict):
-                self.conflicts.remove(conflict)
                 resolved_count += 1
 
         if resolved_count > 0:
@@ -271,15 +413,16 @@ class InteractiveScheduler:
     def _try_resolve_conflict(self, conflict: Dict) -> bool:
         """Tek bir çakışmayı çözmeye çalış"""
         try:
-            # Basit heuristic: Rastgele bir çakışan entry'i başka bir slot'a taşı
+            # Basit heuristic: Çakışan entry'lerden kilitli olmayanı başka bir slot'a taşı
             conflicting_entries = conflict.get('entries', [])
 
             if len(conflicting_entries) >= 2:
-                # İlk entry'i başka bir slot'a taşı
-                entry_to_move = conflicting_entries[0]
-                entry_index = self._find_entry_index(entry_to_move)
+                for entry_to_move in conflicting_entries:
+                    entry_index = self._find_entry_index(entry_to_move)
+
+                    if entry_index < 0 or self.is_locked(entry_index):
+                        continue
 
-                if entry_index >= 0 and not self.is_locked(entry_index):
                     # Uygun alternatif slotlar bul
                     alternatives = self.suggest_alternatives(entry_index, max_suggestions=3)
 
@@ -295,6 +438,9 @@ class InteractiveScheduler:
 
     def _find_entry_index(self, target_entry: Dict) -> int:
         """Entry'nin schedule'daki index'ini bul"""
+        for i, entry in enumerate(self.schedule):
+            if entry is target_entry:
+                return i
         for i, entry in enumerate(self.schedule):
             if (entry['class_id'] == target_entry['class_id'] and
                 entry['teacher_id'] == target_entry['teacher_id'] and
@@ -304,53 +450,6 @@ class InteractiveScheduler:
                 return i
         return -1
 
-    def _score_slot(self, class_id: int, lesson_id: int, teacher_id: int, day: int, slot: int) -> float:
-        """Slot için puan hesapla (yüksek = daha iyi)"""
-        score = 50.0  # Base score
-
-        # Gün tercihi (Pazartesi daha iyi)
-        score += (4 - day) * 2
-
-        # Slot tercihi (Sabah saatleri daha iyi)
-        if slot <= 2:
-            score += 10
-        elif slot <= 4:
-            score += 5
-        elif slot >= 6:
-            score -= 5
-
-        # Öğretmen uygunluğu kontrolü
-        try:
-            if not self.db_manager.is_teacher_available(teacher_id, day, slot):
-                score -= 20
-        except:
-            pass
-
-        return score
-
-    def _get_slot_reason(self, day: int, slot: int, score: float) -> str:
-        """Slot için neden açıklama"""
-        reasons = []
-
-        if score >= 60:
-            reasons.append("Mükemmel tercih")
-        elif score >= 50:
-            reasons.append("İyi tercih")
-        elif score >= 40:
-            reasons.append("Uygun tercih")
-        else:
-            reasons.append("Son çare")
-
-        day_names = ["Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma"]
-        reasons.append(f"{day_names[day]} günü")
-
-        if slot <= 2:
-            reasons.append("Sabah saati")
-        elif slot >= 6:
-            reasons.append("Akşam saati")
-
-        return ", ".join(reasons)
-
     def get_performance_report(self) -> Dict:
         """Performans istatistiklerini döndür"""
         return self.performance_stats.copy()
@@ -390,13 +489,6 @@ class InteractiveScheduler:
         Returns:
             (success, error_message) tuple
         """
-        # Check if can place
-        can_place, reason = self._can_place_at(class_id, teacher_id, day, slot)
-
-        if not can_place:
-            return False, reason
-
-        # Add entry
         new_entry = {
             "class_id": class_id,
             "teacher_id": teacher_id,
@@ -406,13 +498,17 @@ class InteractiveScheduler:
             "time_slot": slot,
         }
 
-        self.schedule.append(new_entry)
+        # Check and add under one lock so two callers cannot both claim the slot
+        with self._lock:
+            can_place, reason = self._can_place_at(class_id, teacher_id, day, slot)
 
-        # Save to history
-        self._save_to_history()
+            if not can_place:
+                return False, reason
 
-        # Update conflicts
-        self._detect_conflicts()
+            self._record_delta(self._insert_at(len(self.schedule), new_entry))
+
+            # Log the inverse delta
+            self._log_operation(EditOperation("add", len(self.schedule) - 1, new_entry))
 
         self.logger.info(f"Added new entry: {new_entry}")
 
@@ -428,23 +524,19 @@ class InteractiveScheduler:
         Returns:
             (success, error_message) tuple
         """
-        if entry_index < 0 or entry_index >= len(self.schedule):
-            return False, "Entry index out of range"
-
-        if self.is_locked(entry_index):
-            return False, "Entry is locked"
-
-        # Remove entry
-        removed = self.schedule.pop(entry_index)
+        with self._lock:
+            if entry_index < 0 or entry_index >= len(self.schedule):
+                return False, "Entry index out of range"
 
-        # Save to history
-        self._save_to_history()
+            if self.is_locked(entry_index):
+                return False, "Entry is locked"
 
-        # Update locked entries indices
-        self.locked_entries = {i if i < entry_index else i - 1 for i in self.locked_entries if i != entry_index}
+            # Remove entry
+            removed = self.schedule[entry_index]
+            self._record_delta(self._pop_at(entry_index))
 
-        # Update conflicts
-        self._detect_conflicts()
+            # Log the inverse delta
+            self._log_operation(EditOperation("remove", entry_index, removed))
 
         self.logger.info(f"Removed entry {entry_index}: {removed}")
 
@@ -452,33 +544,79 @@ class InteractiveScheduler:
 
     def undo(self) -> bool:
         """
-        Undo last change
+        Undo last change (or transaction)
 
         Returns:
             True if undo successful
         """
-        if self.history_index > 0:
-            self.history_index -= 1
-            self.schedule = self.history[self.history_index].copy()
-            self._detect_conflicts()
-            self.logger.info("Undo successful")
-            return True
-        return False
+        with self._lock:
+            if not self.undo_stack or self._transaction is not None:
+                return False
+            operations = self.undo_stack.pop()
+            delta = ConflictDelta()
+            for operation in reversed(operations):
+                delta = delta.merge(self._apply_operation(operation, reverse=True))
+            self.redo_stack.append(operations)
+            self._record_delta(delta)
+        self.logger.info("Undo successful")
+        return True
 
     def redo(self) -> bool:
         """
-        Redo last undone change
+        Redo last undone change (or transaction)
 
         Returns:
             True if redo successful
         """
-        if self.history_index < len(self.history) - 1:
-            self.history_index += 1
-            self.schedule = self.history[self.history_index].copy()
-            self._detect_conflicts()
-            self.logger.info("Redo successful")
-            return True
-        return False
+        with self._lock:
+            if not self.redo_stack or self._transaction is not None:
+                return False
+            operations = self.redo_stack.pop()
+            delta = ConflictDelta()
+            for operation in operations:
+                delta = delta.merge(self._apply_operation(operation, reverse=False))
+            self.undo_stack.append(operations)
+            self._record_delta(delta)
+        self.logger.info("Redo successful")
+        return True
+
+    def can_undo(self) -> bool:
+        """Check if there is a change to undo"""
+        return bool(self.undo_stack)
+
+    def can_redo(self) -> bool:
+        """Check if there is a change to redo"""
+        return bool(self.redo_stack)
+
+    def clear_history(self):
+        """Drop the undo/redo log"""
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+        self._transaction = None
+        self._transaction_depth = 0
+
+    @contextmanager
+    def transaction(self):
+        """
+        Group several edits into a single undo/redo step
+
+        Example:
+            with scheduler.transaction():
+                scheduler.move_entry(0, 1, 2)
+                scheduler.move_entry(3, 0, 2)
+        """
+        with self._lock:
+            if self._transaction_depth == 0:
+                self._transaction = []
+            self._transaction_depth += 1
+            try:
+                yield
+            finally:
+                self._transaction_depth -= 1
+                if self._transaction_depth == 0:
+                    operations, self._transaction = self._transaction, None
+                    if operations:
+                        self._push_history(operations)
 
     def validate(self) -> Dict:
         """
@@ -487,8 +625,6 @@ class InteractiveScheduler:
         Returns:
             Dict with validation results
         """
-        self._detect_conflicts()
-
         # Calculate coverage
         classes = self.db_manager.get_all_classes()
         school_type = self.db_manager.get_school_type() or "Lise"
@@ -543,20 +679,16 @@ class InteractiveScheduler:
         slot: int,
         exclude_index: Optional[int] = None,
     ) -> Tuple[bool, Optional[str]]:
-        """Check if can place at slot"""
-        for i, entry in enumerate(self.schedule):
-            # Skip excluded entry
-            if exclude_index is not None and i == exclude_index:
-                continue
+        """Check if can place at slot (O(1) conflict index lookups)"""
+        exclude = id(self.schedule[exclude_index]) if exclude_index is not None else None
 
-            if entry["day"] == day and entry["time_slot"] == slot:
-                # Check class conflict
-                if entry["class_id"] == class_id:
-                    return False, "Class already has a lesson at this time"
+        # Check class conflict
+        if self.conflict_index.is_occupied("class", class_id, day, slot, exclude=exclude):
+            return False, "Class already has a lesson at this time"
 
-                # Check teacher conflict
-                if entry["teacher_id"] == teacher_id:
-                    return False, "Teacher already teaching at this time"
+        # Check teacher conflict
+        if self.conflict_index.is_occupied("teacher", teacher_id, day, slot, exclude=exclude):
+            return False, "Teacher already teaching at this time"
 
         # Check teacher availability
         try:
@@ -570,78 +702,39 @@ class InteractiveScheduler:
         return True, None
 
     def _detect_conflicts(self):
-        """Detect conflicts in current schedule"""
-        self.conflicts = []
-
-        # Check class conflicts
-        class_slots = defaultdict(list)
-        for i, entry in enumerate(self.schedule):
-            key = (entry["class_id"], entry["day"], entry["time_slot"])
-            class_slots[key].append(i)
-
-        for key, indices in class_slots.items():
-            if len(indices) > 1:
-                self.conflicts.append(
-                    {
-                        "type": "class_conflict",
-                        "indices": indices,
-                        "class_id": key[0],
-                        "day": key[1],
-                        "slot": key[2],
-                    }
-                )
-
-        # Check teacher conflicts
-        teacher_slots = defaultdict(list)
-        for i, entry in enumerate(self.schedule):
-            key = (entry["teacher_id"], entry["day"], entry["time_slot"])
-            teacher_slots[key].append(i)
-
-        for key, indices in teacher_slots.items():
-            if len(indices) > 1:
-                self.conflicts.append(
-                    {
-                        "type": "teacher_conflict",
-                        "indices": indices,
-                        "teacher_id": key[0],
-                        "day": key[1],
-                        "slot": key[2],
-                    }
-                )
-
-    def _score_slot(self, class_id: int, lesson_id: int, teacher_id: int, day: int, slot: int) -> float:
-        """Score a slot for quality"""
-        score = 50.0  # Base score
-
-        # Morning bonus for difficult lessons
-        lesson = self.db_manager.get_lesson_by_id(lesson_id)
-        if lesson:
-            difficult_lessons = ["Matematik", "Fizik", "Kimya", "Biyoloji"]
-            if lesson.name in difficult_lessons and slot < 4:
-                score += 15
-
-        # Avoid late slots
-        if slot >= 6:
-            score -= 10
-
-        # Check for gaps
-        class_slots_today = [e["time_slot"] for e in self.schedule if e["class_id"] == class_id and e["day"] == day]
-
-        if class_slots_today:
-            min_slot = min(class_slots_today)
-            max_slot = max(class_slots_today)
-
-            # Prefer slots that don't create gaps
-            if min_slot <= slot <= max_slot:
-                # Check if creates gap
-                all_slots = sorted(class_slots_today + [slot])
-                has_gap = any(all_slots[i + 1] - all_slots[i] > 1 for i in range(len(all_slots) - 1))
-                if has_gap:
-                    score -= 20
-                else:
-                    score += 10
+        """Rebuild the conflict index from the current schedule (full rescan)"""
+        self.conflict_index.rebuild((id(entry), entry) for entry in self.schedule)
+        self.suggestion_engine.rebuild(self.schedule)
+        self.last_conflict_delta = ConflictDelta()
+        self._conflicts_cache = None
+
+    def _record_delta(self, delta: ConflictDelta):
+        """Remember the conflicts introduced/resolved by the last edit and wake the optimizer"""
+        self.last_conflict_delta = delta
+        self._conflicts_cache = None
+        self.edit_event.set()
+
+    def _materialize_conflicts(self) -> List[Dict]:
+        """Build conflict dicts (with schedule indices) from the conflict index"""
+        conflict_pairs = self.conflict_index.conflicts()
+        if not conflict_pairs:
+            return []
 
-        return score
+        positions = {id(entry): i for i, entry in enumerate(self.schedule)}
+        conflicts = []
+        for (kind, resource_id, day, slot), tokens in conflict_pairs:
+            conflicts.append(
+                {
+                    "type": f"{kind}_conflict",
+                    "indices": sorted(positions[t] for t in tokens if t in positions),
+                    "entries": [self.conflict_index.entries[t] for t in tokens],
+                    f"{kind}_id": resource_id,
+                    "day": day,
+                    "slot": slot,
+                }
+            )
+        conflicts.sort(key=lambda c: (c["type"], c["indices"]))
+        return conflicts
 
     def _get_slot_reason(self, day: int, slot: int, score: float) -> str:
         """Get reason for slot score"""
@@ -712,17 +805,82 @@ class InteractiveScheduler:
 
         return min(distribution_score, 20.0)
 
-    def _save_to_history(self):
-        """Save current state to history"""
-        # Remove future history if we're not at the end
-        if self.history_index < len(self.history) - 1:
-            self.history = self.history[: self.history_index + 1]
-
-        # Add current state
-        self.history.append(self.schedule.copy())
-        self.history_index += 1
-
-        # Limit history size
-        if len(self.history) > self.max_history:
-            self.history.pop(0)
-            self.history_index -= 1
+    def _log_operation(self, operation: EditOperation):
+        """Append an edit to the open transaction, or log it as its own step"""
+        if operation.op not in ("lock", "unlock"):
+            self.performance_stats["total_moves"] += 1
+        if self._transaction is not None:
+            self._transaction.append(operation)
+        else:
+            self._push_history([operation])
+
+    def _push_history(self, operations: List[EditOperation]):
+        """Push a finished step; a new edit invalidates the redo log"""
+        self.redo_stack.clear()
+        self.undo_stack.append(operations)
+        if self.max_history is not None:
+            while len(self.undo_stack) > self.max_history:
+                self.undo_stack.popleft()
+
+    def _apply_operation(self, operation: EditOperation, reverse: bool) -> ConflictDelta:
+        """Apply an edit forwards (redo) or backwards (undo) in O(delta)"""
+        op = operation.op
+        if op == "move":
+            day, slot = operation.old_position if reverse else operation.new_position
+            return self._index_move(operation.entry, day, slot)
+        if op in ("add", "remove"):
+            if (op == "add") != reverse:
+                # redo add / undo remove
+                return self._insert_at(operation.index, operation.entry)
+            # undo add / redo remove
+            return self._pop_at(operation.index)
+        if (op == "lock") != reverse:
+            self.locked_entries.add(operation.index)
+        else:
+            self.locked_entries.discard(operation.index)
+        return ConflictDelta()
+
+    def _insert_at(self, index: int, entry: Dict) -> ConflictDelta:
+        """Insert an entry, shifting locked indices and updating the conflict index"""
+        self.schedule.insert(index, entry)
+        self.locked_entries = {i if i < index else i + 1 for i in self.locked_entries}
+        self.suggestion_engine.add(entry)
+        return self.conflict_index.add(id(entry), entry)
+
+    def _pop_at(self, index: int) -> ConflictDelta:
+        """Remove an entry, shifting locked indices and updating the conflict index"""
+        entry = self.schedule.pop(index)
+        self.locked_entries = {i if i < index else i - 1 for i in self.locked_entries if i != index}
+        self.suggestion_engine.remove(entry)
+        return self.conflict_index.remove(id(entry))
+
+    def _index_move(self, entry: Dict, new_day: int, new_slot: int) -> ConflictDelta:
+        """Move an entry in the conflict index and the suggestion masks"""
+        self.suggestion_engine.remove(entry)
+        delta = self.conflict_index.move(id(entry), new_day, new_slot)
+        self.suggestion_engine.add(entry)
+        return delta
+
+    def _load_unavailable_mask(self, teacher_id: int) -> int:
+        """Build a teacher's unavailable-slot mask with a single availability query"""
+        engine = self.suggestion_engine
+        rows = self.db_manager.get_teacher_availability(teacher_id)
+        mask = 0
+        if isinstance(rows, list):
+            for row in rows:
+                day, slot = row["day"], row["time_slot"]
+                if not row["is_available"] and 0 <= day < engine.days and 0 <= slot < engine.slots_per_day:
+                    mask |= 1 << engine.bit(day, slot)
+            return mask
+
+        # Fallback for database managers without bulk availability access
+        for day in range(engine.days):
+            for slot in range(engine.slots_per_day):
+                if not self.db_manager.is_teacher_available(teacher_id, day, slot):
+                    mask |= 1 << engine.bit(day, slot)
+        return mask
+
+    def _get_lesson_name(self, lesson_id: int) -> Optional[str]:
+        """Lesson name used by the soft slot scores"""
+        lesson = self.db_manager.get_lesson_by_id(lesson_id)
+        return lesson.name if lesson else None
@@ -4,9 +4,14 @@ ML Scheduler - Machine Learning Integration for Schedule Optimization
 Learns from historical schedules to predict optimal placements
 """
 
-import numpy as np
-from collections import Counter
+import io
 import json
+import logging
+import pickle
+import sys
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Set, Tuple
 
 # Set encoding for Windows
 if sys.platform.startswith("win"):
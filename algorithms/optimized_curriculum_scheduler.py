@@ -4,6 +4,7 @@ Implements intelligent backtracking, flexible constraint handling, and graduated
 """
 
 import logging
+import random
 import time
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Set, Tuple
@@ -13,6 +14,8 @@ from database.db_manager import DatabaseManager
 from algorithms.base_scheduler import BaseScheduler
 from algorithms.monitoring import PerformanceMonitor as EnhancedPerformanceMonitor, MetricType
 from algorithms.enhanced_logging import create_scheduler_logger, SchedulingMetricsLogger
+from algorithms.phase_profiler import phase, profiled
+from utils.memory_budget import PSUTIL_AVAILABLE, get_memory_budget
 
 
 class PlacementMethod(Enum):
@@ -112,15 +115,18 @@ class OptimizedCurriculumScheduler(BaseScheduler):
     - 60-second execution time target
     """
 
-    def __init__(self, db_manager: DatabaseManager, progress_callback=None):
+    def __init__(self, db_manager: DatabaseManager, progress_callback=None, seed: int = 0):
         """
         Initialize optimized curriculum scheduler
         
         Args:
             db_manager: Database manager instance
             progress_callback: Optional progress callback function
+            seed: Seed of the attempt randomization (same data + seed = same schedule)
         """
         super().__init__(db_manager, progress_callback)
+        self.seed = seed
+        self.rng = random.Random(seed)
         
         # Enhanced logging setup
         self.logger, self.metrics_logger = create_scheduler_logger(
@@ -141,6 +147,7 @@ class OptimizedCurriculumScheduler(BaseScheduler):
         self.enhanced_entries: List[EnhancedScheduleEntry] = []
         self.block_counter = 0  # For generating unique block IDs
         self.current_constraint_level = ConstraintLevel.STRICT
+        self.solution_validator = None  # Incremental SolutionValidator, created on first validation
         
         # Initialize enhanced components
         from algorithms.backtracking_manager import BacktrackingManager
@@ -153,6 +160,11 @@ class OptimizedCurriculumScheduler(BaseScheduler):
         self.constraint_relaxer = ConstraintRelaxationEngine(db_manager, self.logger)
         self.diagnostics = SchedulingDiagnostics(db_manager)
         
+        # Bellek bütçesi: geçmiş kayıtları snapshot'lardan önce feda edilir
+        self.memory_budget = get_memory_budget()
+        self.memory_budget.register_history("placement_attempts", self.block_flexibility, "placement_attempts", value=0.5)
+        self.memory_budget.register_history("failure_log", self.diagnostics, "failure_log", value=0.25)
+        
         # Statistics tracking
         self.backtrack_stats = {
             "total_backtracks": 0,
@@ -242,12 +254,13 @@ class OptimizedCurriculumScheduler(BaseScheduler):
             
             # Get all required data
             classes = self.db_manager.get_all_classes()
-            assignments = self.db_manager.get_schedule_by_school_type()
+            # Sınıf-ders gereksinimleri tek sorguyla (ders atamaları + müfredat saatleri)
+            requirements = self.db_manager.get_requirement_table()
             
-            self.logger.info(f"Processing {len(classes)} classes with {len(assignments)} assignments")
+            self.logger.info(f"Processing {len(classes)} classes with {len(requirements.assigned())} assignments")
             
             # Calculate total required hours
-            total_required_hours = self._calculate_total_required_hours(classes, assignments)
+            total_required_hours = self._calculate_total_required_hours(classes, requirements)
             result.total_hours = total_required_hours
             
             self.logger.info(f"Target: {total_required_hours} curriculum hours")
@@ -255,7 +268,7 @@ class OptimizedCurriculumScheduler(BaseScheduler):
             self._update_progress("Starting curriculum-based scheduling...", 10)
             
             # Main scheduling loop with graduated approach
-            scheduled_hours = self._schedule_with_graduated_approach(classes, assignments, start_time)
+            scheduled_hours = self._schedule_with_graduated_approach(classes, requirements, start_time)
             
             # Update result
             result.scheduled_hours = scheduled_hours
@@ -306,6 +319,7 @@ class OptimizedCurriculumScheduler(BaseScheduler):
         self.class_slots.clear()
         self.block_counter = 0
         self.current_constraint_level = ConstraintLevel.STRICT
+        self.solution_validator = None
         
         # Reset statistics
         self.backtrack_stats = {
@@ -328,23 +342,17 @@ class OptimizedCurriculumScheduler(BaseScheduler):
         
         self.logger.info("Enhanced scheduler state initialized")
 
-    def _calculate_total_required_hours(self, classes, assignments) -> int:
+    def _calculate_total_required_hours(self, classes, requirements) -> int:
         """Calculate total required curriculum hours"""
         total_hours = 0
         
         for class_obj in classes:
-            class_assignments = [a for a in assignments if a.class_id == class_obj.class_id]
-            
-            for assignment in class_assignments:
-                weekly_hours = self.db_manager.get_weekly_hours_for_lesson(
-                    assignment.lesson_id, class_obj.grade
-                )
-                if weekly_hours and weekly_hours > 0:
-                    total_hours += weekly_hours
+            for requirement in requirements.assignments_for(class_obj.class_id):
+                total_hours += requirement.weekly_hours
         
         return total_hours
 
-    def _schedule_with_graduated_approach(self, classes, assignments, start_time) -> int:
+    def _schedule_with_graduated_approach(self, classes, requirements, start_time) -> int:
         """
         Create multi-pass scheduling (strict → relaxed → backtrack)
         Implements graduated solution approach with quality optimization and randomization
@@ -354,8 +362,12 @@ class OptimizedCurriculumScheduler(BaseScheduler):
         """
         total_scheduled = 0
         
+        # Her çalıştırma aynı tohumla başlar: aynı veri her seferinde aynı programı üretir
+        self.rng.seed(self.seed)
+        self.backtrack_manager.set_randomization_seed(self.seed)
+        
         # Prepare lesson data for prioritization
-        lesson_data = self._prepare_lesson_data(classes, assignments)
+        lesson_data = self._prepare_lesson_data(classes, requirements)
         
         # Sort lessons by difficulty/constraints (larger blocks first)
         prioritized_lessons = self._prioritize_lessons_by_difficulty(lesson_data)
@@ -433,7 +445,8 @@ class OptimizedCurriculumScheduler(BaseScheduler):
         self.constraint_relaxer.relax_constraints(RelaxationLevel.STRICT)
         
         phase_start = time.time()
-        phase_scheduled = self._schedule_with_backtracking(prioritized_lessons, start_time)
+        with phase(f"pass:{self.current_constraint_level.value}"):
+            phase_scheduled = self._schedule_with_backtracking(prioritized_lessons, start_time)
         total_scheduled += phase_scheduled
         
         # Monitor performance and check early termination
@@ -456,7 +469,8 @@ class OptimizedCurriculumScheduler(BaseScheduler):
             
             # Get remaining unscheduled lessons
             remaining_lessons = self._get_remaining_lessons(prioritized_lessons)
-            phase_scheduled = self._schedule_with_backtracking(remaining_lessons, start_time)
+            with phase(f"pass:{self.current_constraint_level.value}"):
+                phase_scheduled = self._schedule_with_backtracking(remaining_lessons, start_time)
             total_scheduled += phase_scheduled
             
             # Monitor performance
@@ -474,7 +488,8 @@ class OptimizedCurriculumScheduler(BaseScheduler):
             self.backtrack_stats["constraint_relaxations"] += 1
             
             remaining_lessons = self._get_remaining_lessons(prioritized_lessons)
-            phase_scheduled = self._schedule_with_backtracking(remaining_lessons, start_time)
+            with phase(f"pass:{self.current_constraint_level.value}"):
+                phase_scheduled = self._schedule_with_backtracking(remaining_lessons, start_time)
             total_scheduled += phase_scheduled
             
             # Monitor performance
@@ -495,7 +510,8 @@ class OptimizedCurriculumScheduler(BaseScheduler):
             self.backtrack_stats["constraint_relaxations"] += 1
             
             remaining_lessons = self._get_remaining_lessons(prioritized_lessons)
-            phase_scheduled = self._schedule_with_backtracking(remaining_lessons, start_time)
+            with phase(f"pass:{self.current_constraint_level.value}"):
+                phase_scheduled = self._schedule_with_backtracking(remaining_lessons, start_time)
             total_scheduled += phase_scheduled
             
             # Final performance monitoring
@@ -511,8 +527,6 @@ class OptimizedCurriculumScheduler(BaseScheduler):
         Applies controlled randomization to lesson ordering and slot selection
         to explore different solution spaces and avoid getting stuck in local optima.
         """
-        import random
-        
         self.logger.info("Applying randomization to avoid local optima")
         
         # Strategy 1: Shuffle lessons within same priority groups
@@ -527,7 +541,7 @@ class OptimizedCurriculumScheduler(BaseScheduler):
         # Shuffle within each group
         for hours, group in priority_groups.items():
             if len(group) > 1:
-                random.shuffle(group)
+                self.rng.shuffle(group)
                 self.logger.debug(f"Shuffled {len(group)} lessons in {hours}-hour group")
         
         # Rebuild lessons list maintaining overall priority but with randomization within groups
@@ -539,8 +553,7 @@ class OptimizedCurriculumScheduler(BaseScheduler):
         self.backtrack_manager.enable_randomization(True)
         
         # Strategy 3: Set random seed for reproducible randomization
-        import time
-        random_seed = int(time.time() * 1000) % 10000
+        random_seed = self.rng.randrange(10000)
         self.backtrack_manager.set_randomization_seed(random_seed)
         
         self.logger.info(f"Randomization applied with seed: {random_seed}")
@@ -622,17 +635,18 @@ class OptimizedCurriculumScheduler(BaseScheduler):
         
         initial_hours = len(self.enhanced_entries)
         
-        # Step 1: Attempt workload rebalancing
-        if self.constraint_relaxer.attempt_workload_rebalancing():
-            self.logger.info("✓ Workload rebalancing successful")
-        else:
-            self.logger.info("⚠ Workload rebalancing had limited success")
-        
-        # Step 2: Try to consolidate fragmented blocks
-        consolidated_hours = self._consolidate_fragmented_blocks()
-        
-        # Step 3: Minimize gaps in teacher and class schedules
-        gap_minimized_hours = self._minimize_schedule_gaps()
+        with phase("gap_filling"):
+            # Step 1: Attempt workload rebalancing
+            if self.constraint_relaxer.attempt_workload_rebalancing():
+                self.logger.info("✓ Workload rebalancing successful")
+            else:
+                self.logger.info("⚠ Workload rebalancing had limited success")
+            
+            # Step 2: Try to consolidate fragmented blocks
+            consolidated_hours = self._consolidate_fragmented_blocks()
+            
+            # Step 3: Minimize gaps in teacher and class schedules
+            gap_minimized_hours = self._minimize_schedule_gaps()
         
         # Step 4: Final validation and cleanup
         final_hours = self._validate_and_cleanup_solution()
@@ -680,6 +694,7 @@ class OptimizedCurriculumScheduler(BaseScheduler):
         # For now, return current count
         return len(self.enhanced_entries)
 
+    @profiled("validation")
     def _validate_and_cleanup_solution(self) -> int:
         """
         Final validation and cleanup of the solution
@@ -687,30 +702,19 @@ class OptimizedCurriculumScheduler(BaseScheduler):
         Returns:
             Number of valid hours after cleanup
         """
+        from algorithms.solution_validator import SolutionIndex
+        
+        # Group once by (teacher, day, slot) and (class, day, slot) instead of
+        # comparing every pair of entries
+        index = SolutionIndex.build(self.enhanced_entries)
         valid_entries = []
         
-        # Validate each entry for conflicts
         for entry in self.enhanced_entries:
-            # Check for conflicts with other entries
-            has_conflict = False
-            
-            for other_entry in self.enhanced_entries:
-                if entry == other_entry:
-                    continue
-                    
-                # Check for same slot conflicts
-                if (entry.day == other_entry.day and 
-                    entry.time_slot == other_entry.time_slot):
-                    
-                    # Same teacher conflict
-                    if entry.teacher_id == other_entry.teacher_id:
-                        has_conflict = True
-                        break
-                    
-                    # Same class conflict
-                    if entry.class_id == other_entry.class_id:
-                        has_conflict = True
-                        break
+            slot_groups = (
+                index.teacher_slots[(entry.teacher_id, entry.day, entry.time_slot)],
+                index.class_slots[(entry.class_id, entry.day, entry.time_slot)],
+            )
+            has_conflict = any(other != entry for group in slot_groups for other in group)
             
             if not has_conflict:
                 valid_entries.append(entry)
@@ -728,7 +732,7 @@ class OptimizedCurriculumScheduler(BaseScheduler):
         self.logger.info(f"Solution validation: {len(valid_entries)} valid entries")
         return len(valid_entries)
 
-    def _schedule_all_classes(self, classes, assignments, start_time) -> int:
+    def _schedule_all_classes(self, classes, requirements, start_time) -> int:
         """Schedule lessons for all classes"""
         total_scheduled = 0
         
@@ -740,13 +744,14 @@ class OptimizedCurriculumScheduler(BaseScheduler):
             progress = 20 + (i / len(classes)) * 60  # 20-80% progress range
             self._update_progress(f"Scheduling {class_obj.name}...", int(progress))
             
-            class_scheduled = self._schedule_class_lessons(class_obj, assignments, start_time)
+            class_scheduled = self._schedule_class_lessons(class_obj, requirements, start_time)
             total_scheduled += class_scheduled
             
             self.logger.info(f"Class {class_obj.name}: {class_scheduled} hours scheduled")
         
         return total_scheduled
 
+    @profiled("construction")
     def _schedule_with_backtracking(self, lesson_data: List[Dict[str, Any]], start_time: float) -> int:
         """
         Core scheduling with intelligent backtracking (max depth 10)
@@ -805,33 +810,26 @@ class OptimizedCurriculumScheduler(BaseScheduler):
         
         return scheduled_hours
 
-    def _schedule_class_lessons(self, class_obj, assignments, start_time) -> int:
+    def _schedule_class_lessons(self, class_obj, requirements, start_time) -> int:
         """Schedule all lessons for a specific class"""
         class_scheduled = 0
-        class_assignments = [a for a in assignments if a.class_id == class_obj.class_id]
         
-        for assignment in class_assignments:
+        for requirement in requirements.assignments_for(class_obj.class_id):
             if not self._check_time_limit(start_time):
                 break
                 
-            weekly_hours = self.db_manager.get_weekly_hours_for_lesson(
-                assignment.lesson_id, class_obj.grade
-            )
-            
-            if weekly_hours and weekly_hours > 0:
-                teacher = self.db_manager.get_teacher_by_id(assignment.teacher_id)
-                lesson = self.db_manager.get_lesson_by_id(assignment.lesson_id)
-                
-                if teacher and lesson:
-                    scheduled_hours = self._schedule_lesson_enhanced(
-                        class_obj.class_id,
-                        assignment.lesson_id,
-                        assignment.teacher_id,
-                        weekly_hours,
-                        lesson.name,
-                        teacher.name
-                    )
-                    class_scheduled += scheduled_hours
+            teacher = self.db_manager.get_teacher_by_id(requirement.teacher_id)
+            
+            if teacher:
+                scheduled_hours = self._schedule_lesson_enhanced(
+                    class_obj.class_id,
+                    requirement.lesson_id,
+                    requirement.teacher_id,
+                    requirement.weekly_hours,
+                    requirement.lesson_name,
+                    teacher.name
+                )
+                class_scheduled += scheduled_hours
         
         return class_scheduled
 
@@ -968,44 +966,30 @@ class OptimizedCurriculumScheduler(BaseScheduler):
         Returns:
             True if memory pressure is detected
         """
-        try:
+        # Önce bütçe yapıları küçültülür; ancak hâlâ limit aşılıyorsa baskı vardır
+        self.memory_budget.enforce()
+        memory_mb = self.memory_budget.rss_mb()
+        if memory_mb is None:
+            return False
+        
+        # Log memory usage periodically
+        if len(self.enhanced_entries) % 100 == 0:  # Every 100 entries
+            self.logger.debug(f"Memory usage: {memory_mb:.1f}MB (limit {self.memory_budget.limit_mb:.0f}MB)")
+        
+        if memory_mb > self.memory_budget.limit_mb:
+            self.logger.warning(f"Process memory limit exceeded: {memory_mb:.1f}MB > {self.memory_budget.limit_mb:.0f}MB")
+            return True
+        
+        if PSUTIL_AVAILABLE:
             import psutil
-            import os
-            
-            # Get current process memory usage
-            process = psutil.Process(os.getpid())
-            memory_info = process.memory_info()
-            memory_mb = memory_info.rss / 1024 / 1024  # Convert to MB
             
-            # Check system memory
-            system_memory = psutil.virtual_memory()
-            memory_percent = system_memory.percent
-            
-            # Memory pressure thresholds
-            MEMORY_LIMIT_MB = 1024  # 1GB limit for this process
             SYSTEM_MEMORY_LIMIT = 85  # 85% system memory usage
-            
-            # Log memory usage periodically
-            if len(self.enhanced_entries) % 100 == 0:  # Every 100 entries
-                self.logger.debug(f"Memory usage: {memory_mb:.1f}MB, System: {memory_percent:.1f}%")
-            
-            # Check for memory pressure
-            if memory_mb > MEMORY_LIMIT_MB:
-                self.logger.warning(f"Process memory limit exceeded: {memory_mb:.1f}MB > {MEMORY_LIMIT_MB}MB")
-                return True
-            
+            memory_percent = psutil.virtual_memory().percent
             if memory_percent > SYSTEM_MEMORY_LIMIT:
                 self.logger.warning(f"System memory pressure: {memory_percent:.1f}% > {SYSTEM_MEMORY_LIMIT}%")
                 return True
-            
-            return False
-            
-        except ImportError:
-            # psutil not available, skip memory monitoring
-            return False
-        except Exception as e:
-            self.logger.debug(f"Memory monitoring error: {e}")
-            return False
+        
+        return False
 
     def _optimize_memory_usage(self) -> None:
         """
@@ -1015,7 +999,10 @@ class OptimizedCurriculumScheduler(BaseScheduler):
         - Limit solution stack depth
         - Clean up unused data structures
         - Compress historical data
+        - Enforce the configured memory budget
         """
+        self.memory_budget.enforce()
+        
         # Strategy 1: Limit backtracking solution stack
         if len(self.backtrack_manager.solution_stack) > self.max_backtrack_depth:
             # Remove oldest entries to maintain depth limit
@@ -1148,6 +1135,7 @@ class OptimizedCurriculumScheduler(BaseScheduler):
             "backtracked_blocks": len([e for e in self.enhanced_entries if e.placement_method == PlacementMethod.BACKTRACKED])
         }
     
+    @profiled("validation")
     def _validate_solution(self):
         """
         Validate the complete solution using SolutionValidator
@@ -1158,8 +1146,11 @@ class OptimizedCurriculumScheduler(BaseScheduler):
         try:
             from algorithms.solution_validator import SolutionValidator
             
-            validator = SolutionValidator(self.db_manager)
-            validation_report = validator.validate_complete_solution(self.enhanced_entries)
+            # Keep one validator per run so repeated calls only re-check the
+            # entries added or removed since the previous validation
+            if self.solution_validator is None:
+                self.solution_validator = SolutionValidator(self.db_manager)
+            validation_report = self.solution_validator.sync_incremental(self.enhanced_entries)
             
             self.logger.info(f"Solution validation completed:")
             self.logger.info(f"  Valid: {validation_report.is_valid}")
@@ -1232,7 +1223,8 @@ class OptimizedCurriculumScheduler(BaseScheduler):
             self.logger.error(f"Report generation failed: {e}")
             return f"Report generation failed: {e}"
 
-    def _prepare_lesson_data(self, classes, assignments) -> List[Dict[str, Any]]:
+    @profiled("setup")
+    def _prepare_lesson_data(self, classes, requirements) -> List[Dict[str, Any]]:
         """
         Prepare lesson data for prioritization and scheduling
         
@@ -1242,31 +1234,23 @@ class OptimizedCurriculumScheduler(BaseScheduler):
         lesson_data = []
         
         for class_obj in classes:
-            class_assignments = [a for a in assignments if a.class_id == class_obj.class_id]
-            
-            for assignment in class_assignments:
-                weekly_hours = self.db_manager.get_weekly_hours_for_lesson(
-                    assignment.lesson_id, class_obj.grade
-                )
+            for requirement in requirements.assignments_for(class_obj.class_id):
+                teacher = self.db_manager.get_teacher_by_id(requirement.teacher_id)
                 
-                if weekly_hours and weekly_hours > 0:
-                    teacher = self.db_manager.get_teacher_by_id(assignment.teacher_id)
-                    lesson = self.db_manager.get_lesson_by_id(assignment.lesson_id)
-                    
-                    if teacher and lesson:
-                        lesson_data.append({
-                            'class_id': class_obj.class_id,
-                            'class_name': class_obj.name,
-                            'lesson_id': assignment.lesson_id,
-                            'lesson_name': lesson.name,
-                            'teacher_id': assignment.teacher_id,
-                            'teacher_name': teacher.name,
-                            'weekly_hours': weekly_hours,
-                            'grade': class_obj.grade,
-                            'scheduled_hours': 0,  # Track scheduled hours
-                            'attempts': 0,  # Track scheduling attempts
-                            'last_failure_reason': None
-                        })
+                if teacher:
+                    lesson_data.append({
+                        'class_id': class_obj.class_id,
+                        'class_name': class_obj.name,
+                        'lesson_id': requirement.lesson_id,
+                        'lesson_name': requirement.lesson_name,
+                        'teacher_id': requirement.teacher_id,
+                        'teacher_name': teacher.name,
+                        'weekly_hours': requirement.weekly_hours,
+                        'grade': class_obj.grade,
+                        'scheduled_hours': 0,  # Track scheduled hours
+                        'attempts': 0,  # Track scheduling attempts
+                        'last_failure_reason': None
+                    })
         
         return lesson_data
 
@@ -1350,43 +1334,45 @@ class OptimizedCurriculumScheduler(BaseScheduler):
             lesson_data['scheduled_hours'] += scheduled_hours
             return scheduled_hours
         
-        # Method 2: Try alternative block configurations
-        if weekly_hours > 1:  # Only for multi-hour lessons
-            success, placements, config = self.block_flexibility.try_alternative_blocks(
-                lesson_id, class_id, teacher_id, weekly_hours, lesson_name, teacher_name,
-                self.teacher_slots, self.class_slots, self._place_lesson
-            )
+        # Standard placement failed: fall back to alternative blocks / relaxation
+        with phase("backtracking"):
+            # Method 2: Try alternative block configurations
+            if weekly_hours > 1:  # Only for multi-hour lessons
+                success, placements, config = self.block_flexibility.try_alternative_blocks(
+                    lesson_id, class_id, teacher_id, weekly_hours, lesson_name, teacher_name,
+                    self.teacher_slots, self.class_slots, self._place_lesson
+                )
             
-            if success:
-                self.backtrack_stats["alternative_blocks_used"] += 1
-                scheduled_hours = len(placements)
-                lesson_data['scheduled_hours'] += scheduled_hours
+                if success:
+                    self.backtrack_stats["alternative_blocks_used"] += 1
+                    scheduled_hours = len(placements)
+                    lesson_data['scheduled_hours'] += scheduled_hours
                 
-                # Convert placements to enhanced entries
-                for placement in placements:
-                    self._add_enhanced_entry_from_placement(placement, config)
+                    # Convert placements to enhanced entries
+                    for placement in placements:
+                        self._add_enhanced_entry_from_placement(placement, config)
                 
-                return scheduled_hours
-        
-        # Method 3: Try with constraint relaxation if not already flexible
-        from algorithms.constraint_relaxation_engine import RelaxationLevel
-        if self.constraint_relaxer.current_level == RelaxationLevel.STRICT:
-            # Temporarily relax constraints for this lesson
-            original_level = self.constraint_relaxer.current_level
-            self.constraint_relaxer.relax_constraints(RelaxationLevel.WORKLOAD_FLEX)
-            
-            success, placements = self.backtrack_manager.try_placement(
-                class_id, lesson_id, teacher_id, weekly_hours, lesson_name, teacher_name,
-                self.teacher_slots, self.class_slots
-            )
+                    return scheduled_hours
+        
+            # Method 3: Try with constraint relaxation if not already flexible
+            from algorithms.constraint_relaxation_engine import RelaxationLevel
+            if self.constraint_relaxer.current_level == RelaxationLevel.STRICT:
+                # Temporarily relax constraints for this lesson
+                original_level = self.constraint_relaxer.current_level
+                self.constraint_relaxer.relax_constraints(RelaxationLevel.WORKLOAD_FLEX)
+            
+                success, placements = self.backtrack_manager.try_placement(
+                    class_id, lesson_id, teacher_id, weekly_hours, lesson_name, teacher_name,
+                    self.teacher_slots, self.class_slots
+                )
             
-            # Restore original constraint level
-            self.constraint_relaxer.relax_constraints(original_level)
+                # Restore original constraint level
+                self.constraint_relaxer.relax_constraints(original_level)
             
-            if success:
-                scheduled_hours = self._process_successful_placements(placements, lesson_data, PlacementMethod.RELAXED)
-                lesson_data['scheduled_hours'] += scheduled_hours
-                return scheduled_hours
+                if success:
+                    scheduled_hours = self._process_successful_placements(placements, lesson_data, PlacementMethod.RELAXED)
+                    lesson_data['scheduled_hours'] += scheduled_hours
+                    return scheduled_hours
         
         # All methods failed
         lesson_data['last_failure_reason'] = "All scheduling methods failed"
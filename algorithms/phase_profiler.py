@@ -0,0 +1,450 @@
+# -*- coding: utf-8 -*-
+"""
+Phase Profiler - Zamanlayıcı fazları için düşük maliyetli profil aracı
+Fazları (yerleştirme, boşluk doldurma, geri izleme, doğrulama, kayıt)
+perf_counter_ns aralıklarıyla ölçer, isteğe bağlı olarak yığın örnekler ve
+speedscope / pstats dosyaları üretir.
+
+Varsayılan olarak kapalıdır; kapalıyken ``phase()`` paylaşılan boş bir
+context manager döndürür.
+
+Usage:
+    from algorithms.phase_profiler import get_profiler, phase
+
+    get_profiler().configure("profiles")          # opt-in (ör. --profile)
+    with get_profiler().session("schedule_generation"):
+        with phase("construction"):
+            ...
+"""
+
+import functools
+import json
+import logging
+import marshal
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# pstats anahtarı: (dosya, satır, fonksiyon)
+FrameKey = Tuple[str, int, str]
+
+PHASE_FILE = "<phase>"
+MAX_STACK_DEPTH = 256
+
+
+class _NullSpan:
+    """Shared no-op span used while no session is active on the thread"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _PhaseSpan:
+    __slots__ = ("session", "name", "listener")
+
+    def __init__(self, session: Optional["ProfileSession"], name: str, listener=None):
+        self.session = session
+        self.name = name
+        self.listener = listener
+
+    def __enter__(self):
+        if self.session is not None:
+            self.session.open_phase(self.name)
+        if self.listener is not None:
+            self.listener.push_scope(self.name)
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.listener is not None:
+            self.listener.pop_scope()
+        if self.session is not None:
+            self.session.close_phase(self.name)
+        return False
+
+
+class _StackSampler(threading.Thread):
+    """Samples the profiled thread's Python stack at a fixed interval"""
+
+    def __init__(self, session: "ProfileSession", interval: float):
+        super().__init__(name="PhaseProfilerSampler", daemon=True)
+        self.session = session
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self):
+        session = self.session
+        last = time.perf_counter_ns()
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(session.thread_id)
+            if frame is None:
+                continue
+            now = time.perf_counter_ns()
+            code_stack = []
+            while frame is not None and len(code_stack) < MAX_STACK_DEPTH:
+                code = frame.f_code
+                code_stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+            code_stack.reverse()
+            session.samples.append((now - last, tuple(session.phase_stack), tuple(code_stack)))
+            last = now
+
+
+class ProfileSession:
+    """
+    One profiled run on one thread
+
+    ``events`` holds (kind, phase, t_ns) open/close records ('O' / 'C');
+    ``samples`` holds (weight_ns, phase_stack, code_stack) tuples.
+    """
+
+    def __init__(self, name: str, sample_interval: float = 0.0):
+        self.name = name
+        self.thread_id = threading.get_ident()
+        self.start_ns = time.perf_counter_ns()
+        self.end_ns: Optional[int] = None
+        self.events: List[Tuple[str, str, int]] = []
+        self.phase_stack: List[str] = []
+        self.samples: List[Tuple[int, Tuple[str, ...], Tuple[FrameKey, ...]]] = []
+        self._sampler = _StackSampler(self, sample_interval) if sample_interval > 0 else None
+        if self._sampler:
+            self._sampler.start()
+
+    def open_phase(self, name: str):
+        self.phase_stack.append(name)
+        self.events.append(("O", name, time.perf_counter_ns()))
+
+    def close_phase(self, name: str):
+        self.events.append(("C", name, time.perf_counter_ns()))
+        self.phase_stack.pop()
+
+    def stop(self):
+        """Close open phases and stop the sampler"""
+        while self.phase_stack:
+            self.close_phase(self.phase_stack[-1])
+        self.end_ns = time.perf_counter_ns()
+        if self._sampler:
+            self._sampler.stopped.set()
+            self._sampler.join()
+
+    @property
+    def duration_ns(self) -> int:
+        return (self.end_ns or time.perf_counter_ns()) - self.start_ns
+
+    def phase_totals(self) -> Dict[str, Dict[str, float]]:
+        """
+        Time per phase name
+
+        Returns:
+            {phase: {'calls': int, 'total_ms': float, 'self_ms': float}}
+            (nested phases are included in their parent's total only)
+        """
+        totals = defaultdict(lambda: {"calls": 0, "total_ms": 0.0, "self_ms": 0.0})
+        stack: List[List] = []  # [name, start_ns, child_ns]
+        for kind, name, t_ns in self.events:
+            if kind == "O":
+                stack.append([name, t_ns, 0])
+                continue
+            phase_name, start_ns, child_ns = stack.pop()
+            elapsed = t_ns - start_ns
+            entry = totals[phase_name]
+            entry["calls"] += 1
+            if not any(open_name == phase_name for open_name, _, _ in stack):
+                entry["total_ms"] += elapsed / 1e6  # recursion counted once
+            entry["self_ms"] += (elapsed - child_ns) / 1e6
+            if stack:
+                stack[-1][2] += elapsed
+        return dict(totals)
+
+    def summary(self) -> str:
+        """Phases sorted by total time"""
+        lines = [f"Profile '{self.name}': {self.duration_ns / 1e6:.1f} ms, {len(self.samples)} samples"]
+        totals = sorted(self.phase_totals().items(), key=lambda item: item[1]["total_ms"], reverse=True)
+        for name, entry in totals:
+            lines.append(
+                f"   {name:<32} {entry['total_ms']:>10.1f} ms total "
+                f"{entry['self_ms']:>10.1f} ms self  ({entry['calls']} calls)"
+            )
+        return "\n".join(lines)
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+
+    def to_speedscope(self) -> Dict:
+        """
+        Speedscope document (https://www.speedscope.app/file-format-schema.json)
+
+        Contains an evented profile of the phase spans and, if the sampler
+        ran, a sampled profile whose stacks start with the active phases.
+        """
+        frames: List[Dict] = []
+        frame_index: Dict[FrameKey, int] = {}
+
+        def frame_for(key: FrameKey) -> int:
+            if key not in frame_index:
+                frame_index[key] = len(frames)
+                filename, line, func = key
+                if filename == PHASE_FILE:
+                    frames.append({"name": func})
+                else:
+                    frames.append({"name": func, "file": filename, "line": line})
+            return frame_index[key]
+
+        end = self.duration_ns
+        profiles = [
+            {
+                "type": "evented",
+                "name": f"{self.name} phases",
+                "unit": "nanoseconds",
+                "startValue": 0,
+                "endValue": end,
+                "events": [
+                    {"type": kind, "frame": frame_for(_phase_key(name)), "at": t_ns - self.start_ns}
+                    for kind, name, t_ns in self.events
+                ],
+            }
+        ]
+        if self.samples:
+            profiles.append(
+                {
+                    "type": "sampled",
+                    "name": f"{self.name} samples",
+                    "unit": "nanoseconds",
+                    "startValue": 0,
+                    "endValue": end,
+                    "samples": [[frame_for(key) for key in self._sample_stack(sample)] for sample in self.samples],
+                    "weights": [weight for weight, _, _ in self.samples],
+                }
+            )
+
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": self.name,
+            "exporter": "dersdagitim-phase-profiler",
+            "shared": {"frames": frames},
+            "profiles": profiles,
+        }
+
+    def export_speedscope(self, path: str) -> str:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_speedscope(), f)
+        return path
+
+    def to_pstats(self) -> Dict:
+        """
+        Stats dict in the format ``pstats.Stats`` loads
+
+        Built from the samples (time = sampled time, call counts = samples);
+        phases appear as functions in the '<phase>' file. Without samples the
+        phase spans are used instead.
+        """
+        stats: Dict[FrameKey, List] = {}
+
+        def add_stack(stack: Tuple[FrameKey, ...], seconds: float, leaf_calls_only: bool):
+            # seconds = self time of the leaf; every frame on the stack gets it
+            # as cumulative time, once per stack even when recursive
+            seen = set()
+            leaf = len(stack) - 1
+            for depth, key in enumerate(stack):
+                hits = 1 if depth == leaf or not leaf_calls_only else 0
+                entry = stats.setdefault(key, [0, 0, 0.0, 0.0, {}])
+                entry[0] += hits
+                entry[1] += hits
+                if key not in seen:
+                    seen.add(key)
+                    entry[3] += seconds
+                if depth:
+                    caller = entry[4].setdefault(stack[depth - 1], [0, 0, 0.0, 0.0])
+                    caller[0] += hits
+                    caller[1] += hits
+                    caller[3] += seconds
+                    if depth == leaf:
+                        caller[2] += seconds
+            if stack:
+                stats[stack[-1]][2] += seconds
+
+        if self.samples:
+            for sample in self.samples:
+                add_stack(self._sample_stack(sample), sample[0] / 1e9, False)
+        else:
+            open_spans: List[Tuple[str, int, int]] = []  # (name, start_ns, child_ns)
+            for kind, name, t_ns in self.events:
+                if kind == "O":
+                    open_spans.append((name, t_ns, 0))
+                    continue
+                _, start_ns, child_ns = open_spans.pop()
+                elapsed = t_ns - start_ns
+                stack = tuple(_phase_key(span[0]) for span in open_spans) + (_phase_key(name),)
+                add_stack(stack, (elapsed - child_ns) / 1e9, True)
+                if open_spans:
+                    parent = open_spans[-1]
+                    open_spans[-1] = (parent[0], parent[1], parent[2] + elapsed)
+
+        return {
+            key: (cc, nc, tt, ct, {caller: tuple(values) for caller, values in callers.items()})
+            for key, (cc, nc, tt, ct, callers) in stats.items()
+        }
+
+    def export_pstats(self, path: str) -> str:
+        with open(path, "wb") as f:
+            marshal.dump(self.to_pstats(), f)
+        return path
+
+    @staticmethod
+    def _sample_stack(sample) -> Tuple[FrameKey, ...]:
+        _, phases, code_stack = sample
+        return tuple(_phase_key(name) for name in phases) + code_stack
+
+
+def _phase_key(name: str) -> FrameKey:
+    return (PHASE_FILE, 0, name)
+
+
+class PhaseProfiler:
+    """
+    Opt-in profiler that attributes scheduler time to named phases
+
+    ``session()`` starts profiling on the calling thread (no-op unless
+    ``configure()`` was called); ``phase()`` marks a span inside it. Phase
+    spans cost two ``perf_counter_ns`` calls; the optional stack sampler runs
+    in its own thread and never touches the profiled code.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self.output_dir: Optional[str] = None
+        self.sample_interval = 0.0
+        self.last_session: Optional[ProfileSession] = None
+        self.scope_listener = None
+        self._local = threading.local()
+
+    @property
+    def enabled(self) -> bool:
+        return self.output_dir is not None
+
+    def configure(self, output_dir: str, sample_interval_ms: float = 2.0):
+        """
+        Enable profiling
+
+        Args:
+            output_dir: Directory for the exported .speedscope.json / .pstats files
+            sample_interval_ms: Stack sampling interval (0 = phase spans only)
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        self.output_dir = output_dir
+        self.sample_interval = max(0.0, sample_interval_ms) / 1000.0
+        self.logger.info(f"Phase profiler enabled → {output_dir} (sampling every {sample_interval_ms} ms)")
+
+    def disable(self):
+        self.output_dir = None
+
+    def attach_scope_listener(self, listener):
+        """
+        Mirror phase spans into another tool's scopes (e.g. the query monitor)
+
+        Args:
+            listener: Object with ``enabled``, ``push_scope(name)`` and ``pop_scope()``;
+                None detaches
+        """
+        self.scope_listener = listener
+
+    def phase(self, name: str):
+        """Context manager timing one phase on the current thread"""
+        session = getattr(self._local, "session", None)
+        listener = self.scope_listener
+        if listener is not None and not listener.enabled:
+            listener = None
+        if session is None and listener is None:
+            return _NULL_SPAN
+        return _PhaseSpan(session, name, listener)
+
+    @contextmanager
+    def session(self, name: str) -> Iterator[Optional[ProfileSession]]:
+        """
+        Profile the enclosed block on the current thread
+
+        Yields the ProfileSession (None if profiling is disabled or a session
+        is already running on this thread). On exit the profile is exported
+        to ``output_dir`` and a phase summary is logged.
+        """
+        if not self.enabled or getattr(self._local, "session", None) is not None:
+            yield None
+            return
+
+        session = ProfileSession(name, self.sample_interval)
+        self._local.session = session
+        try:
+            yield session
+        finally:
+            self._local.session = None
+            session.stop()
+            self.last_session = session
+            self._export(session)
+
+    def _export(self, session: ProfileSession):
+        output_dir = self.output_dir
+        if output_dir is None:
+            return
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        base = os.path.join(output_dir, f"{session.name}_{stamp}")
+        try:
+            session.export_speedscope(base + ".speedscope.json")
+            session.export_pstats(base + ".pstats")
+            self.logger.info(session.summary())
+            self.logger.info(f"Profile written: {base}.speedscope.json / .pstats")
+        except OSError as e:
+            self.logger.error(f"Failed to write profile: {e}")
+
+
+# Global instance
+_global_profiler = PhaseProfiler()
+
+
+def get_profiler() -> PhaseProfiler:
+    """Get global phase profiler instance"""
+    return _global_profiler
+
+
+def phase(name: str):
+    """
+    Convenience span using the global profiler
+
+    Usage:
+        with phase("validation"):
+            ...
+    """
+    return _global_profiler.phase(name)
+
+
+def profiled(name: str) -> Callable:
+    """
+    Decorator running the whole function inside a phase span
+
+    Usage:
+        @profiled("validation")
+        def _validate_solution(self):
+            ...
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _global_profiler.phase(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+Schedule Slot Index - Atamaların bellekteki slot haritası
+OptimizedConflictChecker'ın set tabanlı slot haritalarını schedule_entries
+tablosuyla senkron tutar. Program oturum başına bir kez yüklenir, sonrasında
+ScheduleRepository'nin atama değişiklik akışı (assignment_log) izlenir.
+
+Usage:
+    index = ScheduleSlotIndex.for_database(db_manager)
+    busy, entry = index.find("teacher", teacher_id, day, slot, exclude_entry_id=5)
+"""
+
+import weakref
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from algorithms.optimized_conflict_checker import OptimizedConflictChecker
+from database.change_log import OP_ADD, OP_DELETE, OP_UPDATE
+from database.models import ScheduleEntry
+
+# (kind, resource_id, day, time_slot)
+SlotKey = Tuple[str, Any, int, int]
+
+RESOURCE_FIELDS = (("class", "class_id"), ("teacher", "teacher_id"), ("classroom", "classroom_id"))
+
+# Bir db_manager için paylaşılan indeksler (checker ve resolver aynı indeksi kullanır)
+_INDEXES: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+class ScheduleSlotIndex(OptimizedConflictChecker):
+    """
+    OptimizedConflictChecker kept in sync with the schedule_entries table
+
+    The inherited slot sets answer "is this resource busy?" in O(1); the
+    occupant map remembers which entries hold a slot so that lookups can
+    return the clashing entry and skip the entry being moved.
+    """
+
+    def __init__(self, db_manager):
+        """
+        Initialize slot index
+
+        Args:
+            db_manager: DatabaseManager providing the assignments and their change feed
+        """
+        super().__init__()
+        self.db_manager = db_manager
+        self.revision: Optional[int] = None
+        self.school_type: Optional[str] = None
+        self.reloads = 0
+
+        # key -> {entry_id: ScheduleEntry}, insertion order = table order
+        self.occupants: Dict[SlotKey, Dict[Any, Any]] = defaultdict(dict)
+        # entry_id -> (ScheduleEntry, entry dict registered in the slot sets)
+        self.by_id: Dict[Any, Tuple[Any, Dict]] = {}
+
+    @classmethod
+    def for_database(cls, db_manager) -> "ScheduleSlotIndex":
+        """Shared index of a database manager (created on first use)"""
+        try:
+            index = _INDEXES.get(db_manager)
+            if index is None:
+                index = _INDEXES[db_manager] = cls(db_manager)
+            return index
+        except TypeError:  # weakref desteklemeyen nesneler
+            return cls(db_manager)
+
+    def load(self):
+        """Load all assignments of the current school type (one query)"""
+        self.clear()
+        self.school_type = self._current_school_type()
+        self.revision = self._feed_revision()
+        for entry in self.db_manager.get_schedule_by_school_type() or []:
+            self.add_schedule_entry(entry)
+        self.reloads += 1
+        self.logger.debug(f"Slot index loaded: {len(self.by_id)} entries (revision {self.revision})")
+
+    def sync(self):
+        """Bring the index up to date with the assignment change feed"""
+        feed = getattr(self.db_manager, "get_assignment_changes_since", None)
+        if self.revision is None or feed is None or self._current_school_type() != self.school_type:
+            self.load()
+            return
+
+        changes, revision = feed(self.revision)
+        if changes is None:
+            self.load()
+            return
+        for change in changes:
+            if change.op == OP_ADD and change.school_type in (None, self.school_type):
+                self.add_schedule_entry(ScheduleEntry(**change.to_dict()))
+            elif change.op == OP_UPDATE and change.entry_id in self.by_id:
+                self.add_schedule_entry(ScheduleEntry(**change.to_dict()))
+            elif change.op == OP_DELETE:
+                self.remove_schedule_entry(change.entry_id)
+        self.revision = revision
+
+    def add_schedule_entry(self, entry):
+        """
+        Register a ScheduleEntry (or any object with the entry attributes)
+
+        Args:
+            entry: Entry with entry_id, class_id, teacher_id, classroom_id, day, time_slot
+        """
+        if entry.entry_id in self.by_id:
+            self.remove_schedule_entry(entry.entry_id)
+        data = {
+            "entry_id": entry.entry_id,
+            "class_id": entry.class_id,
+            "teacher_id": entry.teacher_id,
+            "lesson_id": entry.lesson_id,
+            "classroom_id": entry.classroom_id,
+            "day": entry.day,
+            "time_slot": entry.time_slot,
+        }
+        self.add_entry(data)
+        self.by_id[entry.entry_id] = (entry, data)
+        for key in self._keys_for(data):
+            self.occupants[key][entry.entry_id] = entry
+
+    def remove_schedule_entry(self, entry_id):
+        """Unregister an entry by ID (unknown IDs are ignored)"""
+        registered = self.by_id.pop(entry_id, None)
+        if registered is None:
+            return
+        _, data = registered
+        self.remove_entry(data)
+        for key in self._keys_for(data):
+            holders = self.occupants.get(key)
+            if holders is None:
+                continue
+            holders.pop(entry_id, None)
+            if holders:
+                # Çifte rezervasyon: slot başka bir atama tarafından hâlâ dolu
+                if key[0] != "classroom" or key[1]:
+                    self._slot_map(key[0])[key[1]].add((key[2], key[3]))
+            else:
+                del self.occupants[key]
+
+    def find(self, kind: str, resource_id, day: int, time_slot: int, exclude_entry_id=None):
+        """
+        First entry holding a resource at a day/slot
+
+        O(1) lookup time
+
+        Args:
+            kind: "class", "teacher" or "classroom"
+            resource_id: Class, teacher or classroom ID
+            day: Day (0-4)
+            time_slot: Time slot
+            exclude_entry_id: Entry to ignore (the one being checked or moved)
+
+        Returns:
+            (has_conflict, conflicting_entry)
+        """
+        holders = self.occupants.get((kind, resource_id, day, time_slot))
+        if holders:
+            for entry_id, entry in holders.items():
+                if exclude_entry_id and entry_id == exclude_entry_id:
+                    continue
+                return (True, entry)
+        return (False, None)
+
+    def is_busy(self, kind: str, resource_id, day: int, time_slot: int, exclude_entry_id=None) -> bool:
+        """Whether a resource is held at a day/slot by another entry"""
+        if not exclude_entry_id and kind != "classroom":
+            slots = self._slot_map(kind).get(resource_id)
+            return bool(slots) and (day, time_slot) in slots
+        return self.find(kind, resource_id, day, time_slot, exclude_entry_id)[0]
+
+    def get_entry(self, entry_id):
+        """Indexed entry by ID, or None"""
+        registered = self.by_id.get(entry_id)
+        return registered[0] if registered else None
+
+    def clear(self):
+        """Clear all state (the next sync reloads)"""
+        super().clear()
+        self.occupants.clear()
+        self.by_id.clear()
+        self.revision = None
+
+    def _slot_map(self, kind: str) -> Dict:
+        return {"class": self.class_slots, "teacher": self.teacher_slots, "classroom": self.classroom_slots}[kind]
+
+    @staticmethod
+    def _keys_for(data: Dict) -> List[SlotKey]:
+        return [(kind, data.get(field), data.get("day"), data.get("time_slot")) for kind, field in RESOURCE_FIELDS]
+
+    def _current_school_type(self) -> Optional[str]:
+        getter = getattr(self.db_manager, "get_school_type", None)
+        return (getter() if getter else None) or "Lise"
+
+    def _feed_revision(self) -> Optional[int]:
+        getter = getattr(self.db_manager, "get_assignment_revision", None)
+        return getter() if getter else 0
+
@@ -6,117 +6,92 @@ import logging
 import random
 from typing import Any, Dict, List, Optional, Callable
 
-# Import hybrid optimal scheduler (NEW - Most Powerful!)
-try:
-    from algorithms.hybrid_optimal_scheduler import HybridOptimalScheduler
-
-    HYBRID_OPTIMAL_SCHEDULER_AVAILABLE = True
-except ImportError:
-    HYBRID_OPTIMAL_SCHEDULER_AVAILABLE = False
-
-# Import simple perfect scheduler (BEST - Pragmatic and Effective)
-try:
-    from algorithms.simple_perfect_scheduler import SimplePerfectScheduler
-
-    SIMPLE_PERFECT_SCHEDULER_AVAILABLE = True
-except ImportError:
-    SIMPLE_PERFECT_SCHEDULER_AVAILABLE = False
-
-# Import ultimate scheduler (ULTIMATE - True backtracking + CSP)
-try:
-    from algorithms.ultimate_scheduler import UltimateScheduler
-
-    ULTIMATE_SCHEDULER_AVAILABLE = True
-except ImportError:
-    ULTIMATE_SCHEDULER_AVAILABLE = False
-
-# Import enhanced strict scheduler (BEST - %100 coverage goal)
-try:
-    from algorithms.enhanced_strict_scheduler import EnhancedStrictScheduler
-
-    ENHANCED_STRICT_SCHEDULER_AVAILABLE = True
-except ImportError:
-    ENHANCED_STRICT_SCHEDULER_AVAILABLE = False
-
-# Import strict scheduler (new, guaranteed coverage)
-try:
-    from algorithms.strict_scheduler import StrictScheduler
-
-    STRICT_SCHEDULER_AVAILABLE = True
-except ImportError:
-    STRICT_SCHEDULER_AVAILABLE = False
-
-# Import performance monitor
-try:
-    from algorithms.performance_monitor import PerformanceMonitor
-
-    PERFORMANCE_MONITOR_AVAILABLE = True
-except ImportError:
-    PERFORMANCE_MONITOR_AVAILABLE = False
-
-# Import heuristics
-try:
-    from algorithms.heuristics import HeuristicManager
-
-    HEURISTICS_AVAILABLE = True
-except ImportError:
-    HEURISTICS_AVAILABLE = False
-
-# Import advanced metaheuristic scheduler
-try:
-    from algorithms.advanced_metaheuristic_scheduler import AdvancedMetaheuristicScheduler
-
-    ADVANCED_METAHEURISTIC_AVAILABLE = True
-except ImportError:
-    ADVANCED_METAHEURISTIC_AVAILABLE = False
-
-# Import genetic algorithm scheduler
-try:
-    from algorithms.genetic_algorithm_scheduler import GeneticAlgorithmScheduler
-
-    GENETIC_ALGORITHM_AVAILABLE = True
-except ImportError:
-    GENETIC_ALGORITHM_AVAILABLE = False
-
-# Import simulated annealing scheduler
-try:
-    from algorithms.simulated_annealing_scheduler import SimulatedAnnealingScheduler
-
-    SIMULATED_ANNEALING_AVAILABLE = True
-except ImportError:
-    SIMULATED_ANNEALING_AVAILABLE = False
-
-# Import ant colony optimization scheduler
-try:
-    from algorithms.ant_colony_scheduler import AntColonyOptimizationScheduler
-
-    ANT_COLONY_AVAILABLE = True
-except ImportError:
-    ANT_COLONY_AVAILABLE = False
-
-# Import enhanced schedule generator
-try:
-    from algorithms.enhanced_schedule_generator import EnhancedScheduleGenerator
-
-    ENHANCED_SCHEDULE_GENERATOR_AVAILABLE = True
-except ImportError:
-    ENHANCED_SCHEDULE_GENERATOR_AVAILABLE = False
-
-# Import enhanced simple perfect scheduler
-try:
-    from algorithms.enhanced_simple_perfect_scheduler import EnhancedSimplePerfectScheduler
-
-    ENHANCED_SIMPLE_PERFECT_AVAILABLE = True
-except ImportError:
-    ENHANCED_SIMPLE_PERFECT_AVAILABLE = False
-
-# Import optimized curriculum scheduler (LATEST - 100% completion target)
-try:
-    from algorithms.optimized_curriculum_scheduler import OptimizedCurriculumScheduler
-
-    OPTIMIZED_CURRICULUM_SCHEDULER_AVAILABLE = True
-except ImportError:
-    OPTIMIZED_CURRICULUM_SCHEDULER_AVAILABLE = False
+from algorithms.enhanced_logging import SolverLog
+from algorithms.scheduler_registry import SchedulerRegistry, SchedulerSpec, get_scheduler_registry
+from utils.feasibility_presolver import FeasibilityCertificate, presolve
+from utils.memory_budget import get_memory_budget
+from utils.metrics_registry import SolveObservation, track_solve
+from utils.run_history import InstanceFeatures, RunHistoryStore, get_run_history
+
+# Zamanlayıcılar modül yüklenirken değil, ilk kullanıldıklarında içe aktarılır
+# (algorithms/scheduler_registry.py). Eski modül öznitelikleri - X_AVAILABLE
+# bayrakları ve sınıf adları - __getattr__ ile çözülüp globals()'a yazılır,
+# böylece ``from algorithms.scheduler import SimplePerfectScheduler`` ve
+# ``patch("algorithms.scheduler.HEURISTICS_AVAILABLE", False)`` çalışmaya devam eder.
+_HELPERS = SchedulerRegistry(
+    [
+        SchedulerSpec("performance_monitor", "algorithms.performance_monitor", "PerformanceMonitor"),
+        SchedulerSpec("heuristics", "algorithms.heuristics", "HeuristicManager"),
+    ]
+)
+
+# Bayrak adı -> kayıt anahtarı
+_LAZY_FLAGS = {
+    "HYBRID_OPTIMAL_SCHEDULER_AVAILABLE": "hybrid_optimal",
+    "SIMPLE_PERFECT_SCHEDULER_AVAILABLE": "simple_perfect",
+    "ULTIMATE_SCHEDULER_AVAILABLE": "ultimate",
+    "ENHANCED_STRICT_SCHEDULER_AVAILABLE": "enhanced_strict",
+    "STRICT_SCHEDULER_AVAILABLE": "strict",
+    "PERFORMANCE_MONITOR_AVAILABLE": "performance_monitor",
+    "HEURISTICS_AVAILABLE": "heuristics",
+    "ADVANCED_METAHEURISTIC_AVAILABLE": "advanced_metaheuristic",
+    "GENETIC_ALGORITHM_AVAILABLE": "genetic_algorithm",
+    "SIMULATED_ANNEALING_AVAILABLE": "simulated_annealing",
+    "ANT_COLONY_AVAILABLE": "ant_colony",
+    "ENHANCED_SCHEDULE_GENERATOR_AVAILABLE": "enhanced_schedule_generator",
+    "ENHANCED_SIMPLE_PERFECT_AVAILABLE": "enhanced_simple_perfect",
+    "OPTIMIZED_CURRICULUM_SCHEDULER_AVAILABLE": "optimized_curriculum",
+}
+
+# Sınıf adı -> kayıt anahtarı
+_LAZY_CLASSES = {
+    "HybridOptimalScheduler": "hybrid_optimal",
+    "SimplePerfectScheduler": "simple_perfect",
+    "UltimateScheduler": "ultimate",
+    "EnhancedStrictScheduler": "enhanced_strict",
+    "StrictScheduler": "strict",
+    "PerformanceMonitor": "performance_monitor",
+    "HeuristicManager": "heuristics",
+    "AdvancedMetaheuristicScheduler": "advanced_metaheuristic",
+    "GeneticAlgorithmScheduler": "genetic_algorithm",
+    "SimulatedAnnealingScheduler": "simulated_annealing",
+    "AntColonyOptimizationScheduler": "ant_colony",
+    "EnhancedScheduleGenerator": "enhanced_schedule_generator",
+    "EnhancedSimplePerfectScheduler": "enhanced_simple_perfect",
+    "OptimizedCurriculumScheduler": "optimized_curriculum",
+}
+
+
+def _registry_for(key: str) -> SchedulerRegistry:
+    return _HELPERS if key in ("performance_monitor", "heuristics") else get_scheduler_registry()
+
+
+def _resolve(name: str) -> Any:
+    """Import a lazily exported flag or class and cache it as a module global"""
+    if name in _LAZY_FLAGS:
+        key = _LAZY_FLAGS[name]
+        value = _registry_for(key).is_available(key)
+    elif name in _LAZY_CLASSES:
+        key = _LAZY_CLASSES[name]
+        value = _registry_for(key).get(key)
+        if value is None:
+            raise AttributeError(f"{name} is not available: {_registry_for(key).error(key)}")
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def _lazy(name: str) -> Any:
+    """Module global ``name`` (patched value if any), imported on first use"""
+    try:
+        return globals()[name]
+    except KeyError:
+        return _resolve(name)
+
+
+def __getattr__(name: str) -> Any:
+    return _resolve(name)
 
 
 class Scheduler:
@@ -140,35 +115,41 @@ class Scheduler:
         use_ultra: bool = False,
         progress_callback: Optional[Callable[[str, int], None]] = None,
         enable_performance_monitor: bool = True,
+        refuse_infeasible: bool = False,
+        history: Optional[RunHistoryStore] = None,
     ) -> None:
         self.logger = logging.getLogger(__name__)
+        # Sıcak döngüler için: örneklenen debug ve hız sınırlı uyarılar
+        self.solver_log = SolverLog(self.logger)
         self.db_manager = db_manager
         self.progress_callback = progress_callback
+        # Ön kontrol kesin yapılamazlık bulursa çözücüyü hiç başlatma
+        self.refuse_infeasible = refuse_infeasible
+        self.last_feasibility: Optional[FeasibilityCertificate] = None
+        # Çalışmaların kaydedildiği ve algoritma seçicinin öğrendiği geçmiş (varsayılan: global)
+        self.history = history if history is not None else get_run_history()
         # NOTE: use_ultra is deprecated and removed.
-        self.use_hybrid = use_hybrid and HYBRID_OPTIMAL_SCHEDULER_AVAILABLE
-        self.use_simple_perfect = SIMPLE_PERFECT_SCHEDULER_AVAILABLE
-        self.use_ultimate = ULTIMATE_SCHEDULER_AVAILABLE
-        self.use_enhanced_strict = ENHANCED_STRICT_SCHEDULER_AVAILABLE
-        self.use_strict = STRICT_SCHEDULER_AVAILABLE
-        self.use_advanced = use_advanced and ENHANCED_STRICT_SCHEDULER_AVAILABLE
+        # use_* bayrakları özelliktir: ilgili modül yalnızca sorulduğunda içe aktarılır
+        self._use_hybrid = use_hybrid
+        self._use_advanced = use_advanced
 
         # Performance monitor
         self.performance_monitor = None
-        if enable_performance_monitor and PERFORMANCE_MONITOR_AVAILABLE:
-            self.performance_monitor = PerformanceMonitor()
+        if enable_performance_monitor and _lazy("PERFORMANCE_MONITOR_AVAILABLE"):
+            self.performance_monitor = _lazy("PerformanceMonitor")()
             self.logger.info("📊 Performance Monitor aktif - Algoritma performansı takip ediliyor")
 
         # Heuristics manager
         self.heuristics = None
-        if HEURISTICS_AVAILABLE:
-            self.heuristics = HeuristicManager()
+        if _lazy("HEURISTICS_AVAILABLE"):
+            self.heuristics = _lazy("HeuristicManager")()
             self.logger.info("🧠 Heuristics Manager aktif - Akıllı slot seçimi kullanılıyor")
 
         # Use OptimizedCurriculumScheduler as primary scheduler if available
         self.active_scheduler = None
-        if OPTIMIZED_CURRICULUM_SCHEDULER_AVAILABLE:
+        if _lazy("OPTIMIZED_CURRICULUM_SCHEDULER_AVAILABLE"):
             try:
-                self.active_scheduler = OptimizedCurriculumScheduler(db_manager, progress_callback)
+                self.active_scheduler = _lazy("OptimizedCurriculumScheduler")(db_manager, progress_callback)
                 self.logger.info(
                     "🚀 OPTIMIZED CURRICULUM SCHEDULER Aktif - 100% Completion Target!"
                 )
@@ -188,7 +169,7 @@ class Scheduler:
             try:
                 from algorithms.algorithm_selector import AlgorithmSelector
 
-                self.algorithm_selector = AlgorithmSelector()
+                self.algorithm_selector = AlgorithmSelector(history=self.history)
                 selected_algorithm_class = self.algorithm_selector.select_best_algorithm(db_manager)
                 self.active_scheduler = selected_algorithm_class(db_manager)
 
@@ -213,11 +194,10 @@ class Scheduler:
                 ]:
                     # Try enhanced schedule generator first (improves existing working algorithms)
                     if (
-                        "ENHANCED_SCHEDULE_GENERATOR_AVAILABLE" in globals()
-                        and ENHANCED_SCHEDULE_GENERATOR_AVAILABLE
+                        _lazy("ENHANCED_SCHEDULE_GENERATOR_AVAILABLE")
                     ):
                         try:
-                            self.active_scheduler = EnhancedScheduleGenerator(db_manager)
+                            self.active_scheduler = _lazy("EnhancedScheduleGenerator")(db_manager)
                             self.logger.info(
                                 "🔧 ENHANCED SCHEDULE GENERATOR Aktif - Mevcut algoritmaları geliştirir!"
                             )
@@ -228,11 +208,10 @@ class Scheduler:
                     # Try enhanced simple perfect scheduler (builds on proven working algorithm)
                     if (
                         self.active_scheduler is None
-                        and "ENHANCED_SIMPLE_PERFECT_AVAILABLE" in globals()
-                        and ENHANCED_SIMPLE_PERFECT_AVAILABLE
+                        and _lazy("ENHANCED_SIMPLE_PERFECT_AVAILABLE")
                     ):
                         try:
-                            self.active_scheduler = EnhancedSimplePerfectScheduler(
+                            self.active_scheduler = _lazy("EnhancedSimplePerfectScheduler")(
                                 db_manager, heuristics=self.heuristics
                             )
                             self.logger.info(
@@ -248,11 +227,10 @@ class Scheduler:
                 scheduler_tried = False
 
                 if (
-                    "ENHANCED_SCHEDULE_GENERATOR_AVAILABLE" in globals()
-                    and ENHANCED_SCHEDULE_GENERATOR_AVAILABLE
+                    _lazy("ENHANCED_SCHEDULE_GENERATOR_AVAILABLE")
                 ):
                     try:
-                        self.active_scheduler = EnhancedScheduleGenerator(db_manager)
+                        self.active_scheduler = _lazy("EnhancedScheduleGenerator")(db_manager)
                         self.logger.info(
                             "🔧 ENHANCED SCHEDULE GENERATOR Aktif - Mevcut algoritmaları geliştirir!"
                         )
@@ -263,11 +241,10 @@ class Scheduler:
 
                 if (
                     not scheduler_tried
-                    and "ENHANCED_SIMPLE_PERFECT_AVAILABLE" in globals()
-                    and ENHANCED_SIMPLE_PERFECT_AVAILABLE
+                    and _lazy("ENHANCED_SIMPLE_PERFECT_AVAILABLE")
                 ):
                     try:
-                        self.active_scheduler = EnhancedSimplePerfectScheduler(
+                        self.active_scheduler = _lazy("EnhancedSimplePerfectScheduler")(
                             db_manager, heuristics=self.heuristics
                         )
                         self.logger.info(
@@ -282,9 +259,9 @@ class Scheduler:
                 if not scheduler_tried:
                     scheduler_tried = False
 
-                    if "ANT_COLONY_AVAILABLE" in globals() and ANT_COLONY_AVAILABLE:
+                    if _lazy("ANT_COLONY_AVAILABLE"):
                         try:
-                            self.active_scheduler = AntColonyOptimizationScheduler(db_manager)
+                            self.active_scheduler = _lazy("AntColonyOptimizationScheduler")(db_manager)
                             self.logger.info(
                                 "🐜 ANT COLONY OPTIMIZATION SCHEDULER Aktif - Maksimum dolum hedefli!"
                             )
@@ -297,11 +274,10 @@ class Scheduler:
 
                     if (
                         not scheduler_tried
-                        and "SIMULATED_ANNEALING_AVAILABLE" in globals()
-                        and SIMULATED_ANNEALING_AVAILABLE
+                        and _lazy("SIMULATED_ANNEALING_AVAILABLE")
                     ):
                         try:
-                            self.active_scheduler = SimulatedAnnealingScheduler(db_manager)
+                            self.active_scheduler = _lazy("SimulatedAnnealingScheduler")(db_manager)
                             self.logger.info(
                                 "🌡️  SIMULATED ANNEALING SCHEDULER Aktif - Thermodynamic optimization!"
                             )
@@ -312,11 +288,10 @@ class Scheduler:
 
                     if (
                         not scheduler_tried
-                        and "GENETIC_ALGORITHM_AVAILABLE" in globals()
-                        and GENETIC_ALGORITHM_AVAILABLE
+                        and _lazy("GENETIC_ALGORITHM_AVAILABLE")
                     ):
                         try:
-                            self.active_scheduler = GeneticAlgorithmScheduler(db_manager)
+                            self.active_scheduler = _lazy("GeneticAlgorithmScheduler")(db_manager)
                             self.logger.info(
                                 "🧬 GENETIC ALGORITHM SCHEDULER Aktif - Evolutionary optimization!"
                             )
@@ -327,11 +302,10 @@ class Scheduler:
 
                     if (
                         not scheduler_tried
-                        and "ADVANCED_METAHEURISTIC_AVAILABLE" in globals()
-                        and ADVANCED_METAHEURISTIC_AVAILABLE
+                        and _lazy("ADVANCED_METAHEURISTIC_AVAILABLE")
                     ):
                         try:
-                            self.active_scheduler = AdvancedMetaheuristicScheduler(db_manager)
+                            self.active_scheduler = _lazy("AdvancedMetaheuristicScheduler")(db_manager)
                             self.logger.info(
                                 "🔍 ADVANCED METAHEURISTIC SCHEDULER Aktif - Maksimum dolum hedefli!"
                             )
@@ -344,17 +318,16 @@ class Scheduler:
                 if not scheduler_tried:
                     # Primary scheduler is Hybrid Optimal
                     if self.use_hybrid:
-                        self.active_scheduler = HybridOptimalScheduler(db_manager)
+                        self.active_scheduler = _lazy("HybridOptimalScheduler")(db_manager)
                         self.logger.info("🚀 HYBRID OPTIMAL SCHEDULER Aktif - En Güçlü Algoritma!")
                         self.logger.info("   ✅ Arc Consistency + Soft Constraints")
                     # Fallback to Simple Perfect (now enhanced version)
                     elif (
                         self.use_simple_perfect
-                        and "ENHANCED_SIMPLE_PERFECT_AVAILABLE" in globals()
-                        and ENHANCED_SIMPLE_PERFECT_AVAILABLE
+                        and _lazy("ENHANCED_SIMPLE_PERFECT_AVAILABLE")
                     ):
                         try:
-                            self.active_scheduler = EnhancedSimplePerfectScheduler(
+                            self.active_scheduler = _lazy("EnhancedSimplePerfectScheduler")(
                                 db_manager, heuristics=self.heuristics
                             )
                             self.logger.info(
@@ -362,14 +335,14 @@ class Scheduler:
                             )
                             self.logger.info("   ✅ Improved filling + Gap filling strategies")
                         except:
-                            self.active_scheduler = SimplePerfectScheduler(
+                            self.active_scheduler = _lazy("SimplePerfectScheduler")(
                                 db_manager, heuristics=self.heuristics
                             )
                             self.logger.info(
                                 "🎯 SIMPLE PERFECT SCHEDULER Aktif - Pragmatik ve %100 Etkili"
                             )
                     elif self.use_simple_perfect:
-                        self.active_scheduler = SimplePerfectScheduler(
+                        self.active_scheduler = _lazy("SimplePerfectScheduler")(
                             db_manager, heuristics=self.heuristics
                         )
                         self.logger.info(
@@ -377,19 +350,19 @@ class Scheduler:
                         )
                     # Fallback to Ultimate
                     elif self.use_ultimate:
-                        self.active_scheduler = UltimateScheduler(db_manager)
+                        self.active_scheduler = _lazy("UltimateScheduler")(db_manager)
                         self.logger.info(
                             "🎯 ULTIMATE SCHEDULER Aktif - Gerçek Backtracking + CSP + Forward Checking"
                         )
                     # Fallback to Enhanced Strict
                     elif self.use_enhanced_strict:
-                        self.active_scheduler = EnhancedStrictScheduler(db_manager)
+                        self.active_scheduler = _lazy("EnhancedStrictScheduler")(db_manager)
                         self.logger.info(
                             "🚀 ENHANCED STRICT SCHEDULER Aktif - Backtracking + %100 Kapsama Hedefi"
                         )
                     # Fallback to Strict
                     elif self.use_strict:
-                        self.active_scheduler = StrictScheduler(db_manager)
+                        self.active_scheduler = _lazy("StrictScheduler")(db_manager)
                         self.logger.info(
                             "🎯 STRICT SCHEDULER Aktif - Tam Kapsama ve Öğretmen Uygunluğu Garantili"
                         )
@@ -398,16 +371,86 @@ class Scheduler:
                         self.active_scheduler = None
                         self.logger.info("📋 Using Standard Scheduler")
 
+    @property
+    def use_hybrid(self) -> bool:
+        return bool(self._use_hybrid and _lazy("HYBRID_OPTIMAL_SCHEDULER_AVAILABLE"))
+
+    @property
+    def use_simple_perfect(self) -> bool:
+        return bool(_lazy("SIMPLE_PERFECT_SCHEDULER_AVAILABLE"))
+
+    @property
+    def use_ultimate(self) -> bool:
+        return bool(_lazy("ULTIMATE_SCHEDULER_AVAILABLE"))
+
+    @property
+    def use_enhanced_strict(self) -> bool:
+        return bool(_lazy("ENHANCED_STRICT_SCHEDULER_AVAILABLE"))
+
+    @property
+    def use_strict(self) -> bool:
+        return bool(_lazy("STRICT_SCHEDULER_AVAILABLE"))
+
+    @property
+    def use_advanced(self) -> bool:
+        return bool(self._use_advanced and _lazy("ENHANCED_STRICT_SCHEDULER_AVAILABLE"))
+
     def generate_schedule(self) -> List[Dict[str, Any]]:
         """
         Generate a schedule automatically using the best available lesson assignment algorithm.
         Returns a list of schedule entries.
         """
-        # Performance monitoring için dekoratör kullan
-        if self.performance_monitor:
-            return self.performance_monitor.timing_decorator(self._generate_schedule_with_monitor)()
-        else:
-            return self._generate_schedule_with_monitor()
+        self.last_feasibility = self.presolve()
+        if self.refuse_infeasible and self.last_feasibility is not None and not self.last_feasibility.feasible:
+            self.logger.error(f"Program oluşturma reddedildi:\n{self.last_feasibility.describe()}")
+            return []
+
+        algorithm = type(self.active_scheduler).__name__ if self.active_scheduler else "StandardScheduler"
+        features = self._instance_features()
+        with get_memory_budget().solve(algorithm), track_solve(algorithm) as solve:
+            # Performance monitoring için dekoratör kullan
+            if self.performance_monitor:
+                entries = self.performance_monitor.timing_decorator(self._generate_schedule_with_monitor)()
+            else:
+                entries = self._generate_schedule_with_monitor()
+            solve.observe_scheduler(self.active_scheduler, entries)
+        self._record_run(features, solve)
+        return entries
+
+    def _instance_features(self) -> Optional[InstanceFeatures]:
+        try:
+            return InstanceFeatures.from_database(self.db_manager)
+        except Exception as e:
+            self.logger.debug(f"Instance features unavailable: {e}")
+            return None
+
+    def _record_run(self, features: Optional[InstanceFeatures], solve: SolveObservation):
+        """Add the finished run to the history the algorithm selector learns from"""
+        if features is None:
+            return
+        coverage = solve.coverage
+        if coverage is None:
+            coverage = min(1.0, solve.placements / max(1, features.assigned_hours))
+        try:
+            self.history.record(features, solve.algorithm, solve.duration, coverage)
+        except Exception as e:
+            self.logger.debug(f"Run history not recorded: {e}")
+
+    def presolve(self) -> Optional[FeasibilityCertificate]:
+        """
+        Check capacity bounds and Hall conditions before any solver starts
+
+        Returns:
+            FeasibilityCertificate, or None if the check could not run
+        """
+        try:
+            certificate = presolve(self.db_manager)
+        except Exception as e:
+            self.logger.warning(f"Feasibility presolve skipped: {e}")
+            return None
+        if not certificate.feasible:
+            self.logger.warning(f"Yapılabilirlik ön kontrolü:\n{certificate.describe()}")
+        return certificate
 
     def _generate_schedule_with_monitor(self) -> List[Dict[str, Any]]:
         """
@@ -429,9 +472,10 @@ class Scheduler:
         classes = self.db_manager.get_all_classes()
         teachers = self.db_manager.get_all_teachers()
         lessons = self.db_manager.get_all_lessons()
+        lessons_by_id = {lesson.lesson_id: lesson for lesson in lessons}
 
-        # Get existing lesson assignments (from schedule table)
-        existing_assignments = self.db_manager.get_schedule_by_school_type()
+        # Sınıf-ders gereksinimleri: atanmış öğretmen + müfredat saati (tek sorgu)
+        requirements = self.db_manager.get_requirement_table()
 
         # Get school type and time slots
         school_type = self.db_manager.get_school_type()
@@ -451,76 +495,37 @@ class Scheduler:
             f"{len(teachers)} teachers, {len(lessons)} lessons"
         )
         self.logger.info(f"School type: {school_type}, Time slots: {time_slots_count}")
-        self.logger.info(f"Found {len(existing_assignments)} existing lesson assignments")
-
-        # Create lesson assignment map from existing assignments
-        lesson_assignments = {}  # {(class_id, lesson_id): teacher_id}
-        for assignment in existing_assignments:
-            key = (assignment.class_id, assignment.lesson_id)
-            lesson_assignments[key] = assignment.teacher_id
-
-        self.logger.info(f"Created {len(lesson_assignments)} lesson-teacher assignments")
-
-        # ALSO GET CURRICULUM REQUIREMENTS FOR FULL SCHEDULE GENERATION
-        # Get curriculum requirements for comprehensive scheduling
-        curriculum_requirements = []
-        for class_obj in classes:
-            for lesson in lessons:
-                # Check if this lesson is assigned to this class
-                assignment_key = (class_obj.class_id, lesson.lesson_id)
-                if assignment_key in lesson_assignments:
-                    # Get weekly hours from curriculum
-                    weekly_hours = self.db_manager.get_weekly_hours_for_lesson(
-                        lesson.lesson_id, class_obj.grade
-                    )
-                    if weekly_hours and weekly_hours > 0:
-                        assigned_teacher_id = lesson_assignments[assignment_key]
-                        curriculum_requirements.append(
-                            {
-                                "class_id": class_obj.class_id,
-                                "class_name": class_obj.name,
-                                "lesson_id": lesson.lesson_id,
-                                "lesson_name": lesson.name,
-                                "teacher_id": assigned_teacher_id,
-                                "weekly_hours": weekly_hours,
-                                "grade": class_obj.grade,
-                            }
-                        )
+        # Curriculum requirements with an assigned teacher
+        curriculum_requirements = requirements.assigned()
 
         self.logger.info(
             f"Curriculum requirements: {len(curriculum_requirements)} lesson-class combinations"
         )
-        total_required_hours = sum(req["weekly_hours"] for req in curriculum_requirements)
+        total_required_hours = sum(req.weekly_hours for req in curriculum_requirements)
         self.logger.info(f"Total required hours: {total_required_hours}")
 
         # For each class, try to schedule their lessons based on assignments
         for class_obj in classes:
-            self.logger.info(
-                f"\n=== Scheduling for class: {class_obj.name} (Grade {class_obj.grade}) ==="
-            )
+            self.logger.info("\n=== Scheduling for class: %s (Grade %s) ===", class_obj.name, class_obj.grade)
 
             # Get all lessons for this grade that have assignments
             class_lessons = []
-            for lesson in lessons:
-                # Check if this lesson is assigned to this class
-                assignment_key = (class_obj.class_id, lesson.lesson_id)
-                if assignment_key in lesson_assignments:
-                    # Get weekly hours from curriculum
-                    weekly_hours = self.db_manager.get_weekly_hours_for_lesson(
-                        lesson.lesson_id, class_obj.grade
+            for requirement in requirements.for_class(class_obj.class_id):
+                if not requirement.is_assigned or requirement.weekly_hours <= 0:
+                    continue
+                assigned_teacher = self.db_manager.get_teacher_by_id(requirement.teacher_id)
+                if assigned_teacher:
+                    lesson = lessons_by_id.get(requirement.lesson_id)
+                    if lesson is None:
+                        continue
+                    class_lessons.append((lesson, requirement.weekly_hours, assigned_teacher))
+                    self.logger.debug(
+                        "  📋 Found assignment: %s -> %s (%s hours)",
+                        lesson.name, assigned_teacher.name, requirement.weekly_hours,
                     )
-                    if weekly_hours and weekly_hours > 0:
-                        assigned_teacher_id = lesson_assignments[assignment_key]
-                        assigned_teacher = self.db_manager.get_teacher_by_id(assigned_teacher_id)
-                        if assigned_teacher:
-                            class_lessons.append((lesson, weekly_hours, assigned_teacher))
-                            self.logger.info(
-                                f"  📋 Found assignment: {lesson.name} -> "
-                                f"{assigned_teacher.name} ({weekly_hours} hours)"
-                            )
 
             if not class_lessons:
-                self.logger.warning(f"  ⚠️  No lesson assignments found for {class_obj.name}")
+                self.logger.warning("  ⚠️  No lesson assignments found for %s", class_obj.name)
                 continue
 
             # Sort lessons by weekly hours (descending) to schedule important lessons first
@@ -528,9 +533,8 @@ class Scheduler:
 
             # Schedule assigned lessons
             for lesson, weekly_hours, assigned_teacher in class_lessons:
-                self.logger.info(
-                    f"Scheduling assigned lesson: {lesson.name} ({weekly_hours} hours) "
-                    f"with {assigned_teacher.name}"
+                self.logger.debug(
+                    "Scheduling assigned lesson: %s (%s hours) with %s", lesson.name, weekly_hours, assigned_teacher.name
                 )
 
                 # Try to schedule this lesson with the assigned teacher
@@ -546,13 +550,13 @@ class Scheduler:
 
                 if not success:
                     self.logger.warning(
-                        f"⚠️  Could not fully schedule {lesson.name} for "
-                        f"{class_obj.name} with {assigned_teacher.name}"
+                        "⚠️  Could not fully schedule %s for %s with %s",
+                        lesson.name, class_obj.name, assigned_teacher.name,
                     )
 
             # Print class schedule summary
             class_total = len([e for e in schedule_entries if e["class_id"] == class_obj.class_id])
-            self.logger.info(f"✅ Class {class_obj.name} scheduled: {class_total} hours")
+            self.logger.info("✅ Class %s scheduled: %s hours", class_obj.name, class_total)
 
         # Final summary
         total_entries = len(schedule_entries)
@@ -594,8 +598,8 @@ class Scheduler:
     ):
         """Schedule additional hours for curriculum requirements"""
         self.logger.info(
-            f"  🚀 FULL SCHEDULING {lesson_obj.name} for {class_obj.name} "
-            f"with teacher {teacher_obj.name} ({weekly_hours} hours)"
+            "  🚀 FULL SCHEDULING %s for %s with teacher %s (%s hours)",
+            lesson_obj.name, class_obj.name, teacher_obj.name, weekly_hours,
         )
 
         scheduled_hours = 0
@@ -685,29 +689,27 @@ class Scheduler:
                                     schedule_entries.append(new_entry)
                                     scheduled_hours += 1
                                     teacher_daily_hours[day] += 1
-                                    self.logger.info(
-                                        f"    ✓ FULL SCHEDULE: {lesson_obj.name} - Day {day+1}, "
-                                        f"Slot {time_slot+1} ({teacher_obj.name})"
+                                    self.solver_log.sample(
+                                        "    ✓ FULL SCHEDULE: %s - Day %d, Slot %d (%s)",
+                                        lesson_obj.name, day + 1, time_slot + 1, teacher_obj.name,
                                     )
 
                             used_days.add(day)
                             break  # Move to next block
                         else:
                             if attempt < 5:  # Only show warnings for first few attempts
-                                self.logger.warning(
-                                    f"    ⚠️  Teacher {teacher_obj.name} not available on "
-                                    f"Day {day+1} for {block_size} slots"
+                                self.solver_log.progress(
+                                    "    ⚠️  Teacher %s not available on Day %d for %d slots",
+                                    teacher_obj.name, day + 1, block_size, level=logging.WARNING,
                                 )
 
         success_rate = (scheduled_hours / weekly_hours) * 100 if weekly_hours > 0 else 100
         if success_rate < 100:
             self.logger.warning(
-                f"    ⚠️  {lesson_obj.name}: {scheduled_hours}/{weekly_hours} hours scheduled ({success_rate:.1f}%)"
+                "    ⚠️  %s: %d/%d hours scheduled (%.1f%%)", lesson_obj.name, scheduled_hours, weekly_hours, success_rate
             )
         else:
-            self.logger.info(
-                f"    ✅ {lesson_obj.name}: {scheduled_hours}/{weekly_hours} hours scheduled (100%)"
-            )
+            self.logger.info("    ✅ %s: %d/%d hours scheduled (100%%)", lesson_obj.name, scheduled_hours, weekly_hours)
 
         return scheduled_hours >= weekly_hours  # ACCEPT PARTIAL SCHEDULING FOR BETTER COVERAGE
 
@@ -1886,8 +1888,8 @@ class Scheduler:
         teachers = self.db_manager.get_all_teachers()
         lessons = self.db_manager.get_all_lessons()
 
-        # Get existing lesson assignments (from schedule table)
-        existing_assignments = self.db_manager.get_schedule_by_school_type()
+        # Sınıf-ders gereksinimleri: atanmış öğretmen + müfredat saati (tek sorgu)
+        requirements = self.db_manager.get_requirement_table()
 
         # Get school type and time slots
         school_type = self.db_manager.get_school_type() or "Lise"
@@ -1901,46 +1903,17 @@ class Scheduler:
 
         self.logger.info(f"ENHANCED SCHEDULE GENERATION - Full curriculum scheduling")
         self.logger.info(f"School type: {school_type}, Time slots: {time_slots_count}")
-        self.logger.info(f"Found {len(existing_assignments)} existing lesson assignments")
-
-        # Create lesson assignment map from existing assignments
-        assignment_map = {}  # {(class_id, lesson_id): teacher_id}
-        for assignment in existing_assignments:
-            key = (assignment.class_id, assignment.lesson_id)
-            assignment_map[key] = assignment.teacher_id
-
-        self.logger.info(f"Created {len(assignment_map)} lesson-teacher assignments")
+        self.logger.info(f"Created {len(requirements.assigned())} lesson-teacher assignments")
 
         # Calculate total curriculum requirements
         total_required_hours = 0
         curriculum_requirements = []
 
-        for class_obj in classes:
-            for lesson in lessons:
-                # Check if this lesson is assigned to this class
-                assignment_key = (class_obj.class_id, lesson.lesson_id)
-                if assignment_key in assignment_map:
-                    # Get weekly hours from curriculum
-                    weekly_hours = self.db_manager.get_weekly_hours_for_lesson(
-                        lesson.lesson_id, class_obj.grade
-                    )
-                    if weekly_hours and weekly_hours > 0:
-                        teacher_id = assignment_map[assignment_key]
-                        teacher = self.db_manager.get_teacher_by_id(teacher_id)
-                        if teacher:
-                            curriculum_requirements.append(
-                                {
-                                    "class_id": class_obj.class_id,
-                                    "class_name": class_obj.name,
-                                    "lesson_id": lesson.lesson_id,
-                                    "lesson_name": lesson.name,
-                                    "teacher_id": teacher_id,
-                                    "teacher_name": teacher.name,
-                                    "weekly_hours": weekly_hours,
-                                    "grade": class_obj.grade,
-                                }
-                            )
-                            total_required_hours += weekly_hours
+        for requirement in requirements.assigned():
+            teacher = self.db_manager.get_teacher_by_id(requirement.teacher_id)
+            if teacher:
+                curriculum_requirements.append(dict(requirement.to_dict(), teacher_name=teacher.name))
+                total_required_hours += requirement.weekly_hours
 
         self.logger.info(
             f"Curriculum requirements: {len(curriculum_requirements)} lesson-class combinations"
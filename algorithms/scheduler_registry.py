@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+Scheduler Registry - Zamanlayıcıların ad → "modül:Sınıf" kaydı ve tembel yüklenmesi
+Zamanlayıcı modülleri (ve numpy gibi bağımlılıkları) uygulama açılırken değil,
+bir algoritma seçildiğinde içe aktarılır. Başarısız içe aktarmalar da önbelleğe
+alınır; aynı modül her seçimde yeniden denenmez.
+
+Usage:
+    registry = get_scheduler_registry()
+    if registry.is_available("simple_perfect"):
+        scheduler = registry.create("simple_perfect", db_manager, progress_callback=cb)
+"""
+
+import importlib
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SchedulerSpec:
+    """Where a lazily loaded class lives"""
+
+    name: str  # kayıt anahtarı (AlgorithmSelector / CLI adı)
+    module: str
+    class_name: str
+    description: str = ""
+
+    @property
+    def path(self) -> str:
+        return f"{self.module}:{self.class_name}"
+
+
+class SchedulerRegistry:
+    """Name → class registry that imports each module on first use"""
+
+    def __init__(self, specs: Iterable[SchedulerSpec] = ()):
+        self._specs: Dict[str, SchedulerSpec] = {}
+        self._classes: Dict[str, type] = {}
+        self._errors: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        for spec in specs:
+            self.register(spec)
+
+    def register(self, spec: SchedulerSpec):
+        """Add or replace an entry (a replaced entry is loaded again)"""
+        with self._lock:
+            self._specs[spec.name] = spec
+            self._classes.pop(spec.name, None)
+            self._errors.pop(spec.name, None)
+
+    def names(self) -> List[str]:
+        """Registered names in registration order"""
+        return list(self._specs)
+
+    def spec(self, name: str) -> SchedulerSpec:
+        try:
+            return self._specs[name]
+        except KeyError:
+            raise KeyError(f"Unknown scheduler '{name}' (known: {', '.join(self._specs)})") from None
+
+    def name_of(self, class_name: str) -> Optional[str]:
+        """Registry name of a class name, without importing anything"""
+        for spec in self._specs.values():
+            if spec.class_name == class_name:
+                return spec.name
+        return None
+
+    def load(self, name: str) -> type:
+        """
+        Import and return the class registered as ``name``
+
+        Raises:
+            KeyError: Unknown name
+            ImportError: The module (or one of its dependencies) cannot be imported
+        """
+        cls = self._classes.get(name)
+        if cls is not None:
+            return cls
+        spec = self.spec(name)
+        with self._lock:
+            if name in self._classes:
+                return self._classes[name]
+            if name in self._errors:
+                raise ImportError(self._errors[name])
+            try:
+                cls = getattr(importlib.import_module(spec.module), spec.class_name)
+            except Exception as e:  # ImportError, ama bozuk modüllerde SyntaxError da olabilir
+                self._errors[name] = f"{spec.path}: {type(e).__name__}: {e}"
+                logger.debug(f"Scheduler '{name}' not available: {self._errors[name]}")
+                raise ImportError(self._errors[name]) from e
+            self._classes[name] = cls
+            return cls
+
+    def get(self, name: str) -> Optional[type]:
+        """Like :meth:`load`, but ``None`` when the class cannot be imported"""
+        try:
+            return self.load(name)
+        except ImportError:
+            return None
+
+    def is_available(self, name: str) -> bool:
+        """True when the class imports (imports it on the first call)"""
+        return self.get(name) is not None
+
+    def is_loaded(self, name: str) -> bool:
+        """True when the class was already imported through the registry"""
+        return name in self._classes
+
+    def available(self, names: Optional[Iterable[str]] = None) -> List[str]:
+        """Names (all by default) whose classes import in this environment"""
+        return [name for name in (names or self._specs) if self.is_available(name)]
+
+    def error(self, name: str) -> Optional[str]:
+        """Why ``name`` could not be imported (after a failed load)"""
+        return self._errors.get(name)
+
+    def create(self, name: str, db_manager: Any, progress_callback: Optional[Callable] = None, **kwargs) -> Any:
+        """
+        Instantiate a scheduler, passing only the keyword arguments its constructor accepts
+
+        Args:
+            name: Registry name
+            db_manager: DatabaseManager instance
+            progress_callback: Progress callback (dropped when unsupported)
+            **kwargs: Extra constructor arguments (e.g. ``heuristics``)
+
+        Returns:
+            Scheduler instance
+        """
+        import inspect
+
+        cls = self.load(name)
+        if progress_callback is not None:
+            kwargs["progress_callback"] = progress_callback
+        parameters = inspect.signature(cls.__init__).parameters
+        if not any(p.kind == p.VAR_KEYWORD for p in parameters.values()):
+            kwargs = {key: value for key, value in kwargs.items() if key in parameters}
+        return cls(db_manager, **kwargs)
+
+
+# Tüm zamanlayıcıların ``Cls(db_manager).generate_schedule()`` arayüzü vardır
+SCHEDULER_SPECS = (
+    SchedulerSpec(
+        "optimized_curriculum", "algorithms.optimized_curriculum_scheduler", "OptimizedCurriculumScheduler",
+        "Müfredat odaklı, %100 tamamlama hedefli (varsayılan)",
+    ),
+    SchedulerSpec(
+        "hybrid_optimal", "algorithms.hybrid_optimal_scheduler", "HybridOptimalScheduler",
+        "Arc consistency + soft constraints",
+    ),
+    SchedulerSpec(
+        "simple_perfect", "algorithms.simple_perfect_scheduler", "SimplePerfectScheduler",
+        "Pragmatik, hızlı yerleştirme",
+    ),
+    SchedulerSpec(
+        "enhanced_simple_perfect", "algorithms.enhanced_simple_perfect_scheduler", "EnhancedSimplePerfectScheduler",
+        "Simple perfect + boşluk doldurma",
+    ),
+    SchedulerSpec(
+        "enhanced_schedule_generator", "algorithms.enhanced_schedule_generator", "EnhancedScheduleGenerator",
+        "Mevcut algoritmaları boşluk doldurmayla geliştirir",
+    ),
+    SchedulerSpec(
+        "ultimate", "algorithms.ultimate_scheduler", "UltimateScheduler",
+        "Backtracking + CSP + forward checking",
+    ),
+    SchedulerSpec(
+        "enhanced_strict", "algorithms.enhanced_strict_scheduler", "EnhancedStrictScheduler",
+        "Backtracking, %100 kapsama hedefi",
+    ),
+    SchedulerSpec(
+        "strict", "algorithms.strict_scheduler", "StrictScheduler",
+        "Tam kapsama ve öğretmen uygunluğu",
+    ),
+    SchedulerSpec(
+        "ultra_aggressive", "algorithms.ultra_aggressive_scheduler", "UltraAggressiveScheduler",
+        "Yinelemeli, maksimum doluluk",
+    ),
+    SchedulerSpec(
+        "advanced_metaheuristic", "algorithms.advanced_metaheuristic_scheduler", "AdvancedMetaheuristicScheduler",
+        "Large neighborhood search + local search",
+    ),
+    SchedulerSpec(
+        "genetic_algorithm", "algorithms.genetic_algorithm_scheduler", "GeneticAlgorithmScheduler",
+        "Genetik algoritma",
+    ),
+    SchedulerSpec(
+        "simulated_annealing", "algorithms.simulated_annealing_scheduler", "SimulatedAnnealingScheduler",
+        "Benzetimli tavlama",
+    ),
+    SchedulerSpec(
+        "ant_colony", "algorithms.ant_colony_scheduler", "AntColonyOptimizationScheduler",
+        "Karınca kolonisi optimizasyonu",
+    ),
+)
+
+_scheduler_registry = None
+
+
+def get_scheduler_registry() -> SchedulerRegistry:
+    """Get global scheduler registry instance"""
+    global _scheduler_registry
+    if _scheduler_registry is None:
+        _scheduler_registry = SchedulerRegistry(SCHEDULER_SPECS)
+    return _scheduler_registry
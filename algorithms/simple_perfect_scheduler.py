@@ -11,6 +11,9 @@ import sys
 from collections import defaultdict
 from typing import Any, Dict, List
 
+from algorithms.enhanced_logging import SolverLog
+from algorithms.phase_profiler import phase
+
 # Set encoding for Windows
 if sys.platform.startswith("win"):
     try:
@@ -43,6 +46,8 @@ class SimplePerfectScheduler:
         self.teacher_slots = defaultdict(set)  # {teacher_id: {(day, slot)}}
         self.class_slots = defaultdict(set)  # {class_id: {(day, slot)}}
         self.logger = logging.getLogger(__name__)
+        # Slot başına debug kayıtları örneklenir (sıcak döngü)
+        self.solver_log = SolverLog(self.logger)
         self.heuristics = heuristics  # Heuristics manager for smart slot selection
         self.relaxed_mode = relaxed_mode  # Relaxed mode: skip teacher availability checks for better coverage
 
@@ -58,9 +63,9 @@ class SimplePerfectScheduler:
 
         classes = self.db_manager.get_all_classes()
         teachers = self.db_manager.get_all_teachers()
-        lessons = self.db_manager.get_all_lessons()
         classrooms = self.db_manager.get_all_classrooms()
-        assignments = self.db_manager.get_schedule_by_school_type()
+        # Sınıf-ders gereksinimleri tek sorguyla (ders atamaları + müfredat saatleri)
+        requirements = self.db_manager.get_requirement_table().assigned()
 
         school_type = self.db_manager.get_school_type() or "Lise"
         time_slots_count = self.SCHOOL_TIME_SLOTS.get(school_type, 8)
@@ -68,34 +73,28 @@ class SimplePerfectScheduler:
         self.logger.info("\n📊 Konfigürasyon:")
         self.logger.info(f"   • Okul: {school_type} ({time_slots_count} saat/gün)")
         self.logger.info(f"   • Sınıf: {len(classes)} | Öğretmen: {len(teachers)}")
-        self.logger.info(f"   • Atamalar: {len(assignments)}")
+        self.logger.info(f"   • Atamalar: {len(requirements)}")
 
-        assignment_map = { (a.class_id, a.lesson_id): a.teacher_id for a in assignments }
+        teachers_by_id = {teacher.teacher_id: teacher for teacher in teachers}
 
         all_needs = []
         total_required = 0
         teacher_workload = defaultdict(int)
         class_workload = defaultdict(int)
 
-        for class_obj in classes:
-            for lesson in lessons:
-                key = (class_obj.class_id, lesson.lesson_id)
-                if key in assignment_map:
-                    weekly_hours = self.db_manager.get_weekly_hours_for_lesson(lesson.lesson_id, class_obj.grade)
-                    if weekly_hours and weekly_hours > 0:
-                        teacher_id = assignment_map[key]
-                        teacher = self.db_manager.get_teacher_by_id(teacher_id)
-                        if teacher:
-                            need = {
-                                "class_id": class_obj.class_id, "class_name": class_obj.name,
-                                "lesson_id": lesson.lesson_id, "lesson_name": lesson.name,
-                                "teacher_id": teacher_id, "teacher_name": teacher.name,
-                                "weekly_hours": weekly_hours, "scheduled": 0,
-                            }
-                            all_needs.append(need)
-                            total_required += weekly_hours
-                            teacher_workload[teacher_id] += weekly_hours
-                            class_workload[class_obj.class_id] += weekly_hours
+        for requirement in requirements:
+            teacher = teachers_by_id.get(requirement.teacher_id)
+            if teacher:
+                need = {
+                    "class_id": requirement.class_id, "class_name": requirement.class_name,
+                    "lesson_id": requirement.lesson_id, "lesson_name": requirement.lesson_name,
+                    "teacher_id": requirement.teacher_id, "teacher_name": teacher.name,
+                    "weekly_hours": requirement.weekly_hours, "scheduled": 0,
+                }
+                all_needs.append(need)
+                total_required += requirement.weekly_hours
+                teacher_workload[requirement.teacher_id] += requirement.weekly_hours
+                class_workload[requirement.class_id] += requirement.weekly_hours
 
         self.logger.info(f"\n📝 Toplam Gereksinim: {total_required} saat")
         self.logger.info(f"   {len(all_needs)} farklı ders ataması")
@@ -113,13 +112,14 @@ class SimplePerfectScheduler:
 
         self.logger.info("\n🚀 Yerleştirme başlıyor...")
         total_scheduled = 0
-        for idx, need in enumerate(all_needs):
-            if (idx + 1) % 10 == 0:
-                self.logger.info(f"   📊 İlerleme: {idx + 1}/{len(all_needs)} ders")
-            
-            scheduled = self._schedule_lesson(need, time_slots_count, classrooms, max_attempts=5)
-            need["scheduled"] = scheduled
-            total_scheduled += scheduled
+        with phase("construction"):
+            for idx, need in enumerate(all_needs):
+                if (idx + 1) % 10 == 0:
+                    self.logger.info(f"   📊 İlerleme: {idx + 1}/{len(all_needs)} ders")
+
+                scheduled = self._schedule_lesson(need, time_slots_count, classrooms, max_attempts=5)
+                need["scheduled"] = scheduled
+                total_scheduled += scheduled
 
         self.logger.info("\n" + "=" * 80)
         self.logger.info("🎯 SONUÇ")
@@ -138,14 +138,15 @@ class SimplePerfectScheduler:
             self.logger.info("\n🎉 TÜM DERSLER BAŞARIYLA YERLEŞTİRİLDİ!")
 
         self.logger.info("\n💾 Veritabanına kaydediliyor...")
-        self.db_manager.clear_schedule()
         saved = 0
-        for entry in self.schedule_entries:
-            if self.db_manager.add_schedule_program(
-                entry["class_id"], entry["teacher_id"], entry["lesson_id"],
-                entry["classroom_id"], entry["day"], entry["time_slot"],
-            ):
-                saved += 1
+        with phase("persistence"):
+            self.db_manager.clear_schedule()
+            for entry in self.schedule_entries:
+                if self.db_manager.add_schedule_program(
+                    entry["class_id"], entry["teacher_id"], entry["lesson_id"],
+                    entry["classroom_id"], entry["day"], entry["time_slot"],
+                ):
+                    saved += 1
         self.logger.info(f"✅ {saved} kayıt tamamlandı")
         
         # GAP FILLING - BLOK SİSTEMİNİ KORUMAK İÇİN DEVRE DIŞI
@@ -181,7 +182,7 @@ class SimplePerfectScheduler:
                 assignment_key = (class_obj.class_id, lesson.lesson_id)
                 if assignment_key in assignment_map:
                     # Get weekly hours from curriculum
-                    weekly_hours = self.db_manager.get_weekly_hours_for_lesson(lesson.lesson_id, class_obj.grade)
+                    weekly_hours = self.db_manager.get_requirement_table().weekly_hours(class_obj.class_id, lesson.lesson_id)
                     if weekly_hours and weekly_hours > 0:
                         teacher_id = assignment_map[assignment_key]
                         teacher = self.db_manager.get_teacher_by_id(teacher_id)
@@ -251,7 +252,7 @@ class SimplePerfectScheduler:
                         classroom_id = 1  # Default classroom
                         self._add_entry(class_id, teacher_id, lesson_id, classroom_id, day, time_slot)
                         scheduled_count += 1
-                        self.logger.debug(f"         ✓ Yerleştirildi: Gün {day+1}, Slot {time_slot+1}")
+                        self.solver_log.sample("         ✓ Yerleştirildi: Gün %d, Slot %d", day + 1, time_slot + 1)
                         break  # Move to next hour needed
         
         # If we couldn't place all hours, try aggressive placement
@@ -293,7 +294,7 @@ class SimplePerfectScheduler:
                             classroom_id = 1  # Default classroom
                             self._add_entry(class_id, teacher_id, lesson_id, classroom_id, day, time_slot)
                             placed_count += 1
-                            self.logger.debug(f"         ⚡ Agresif yerleştirme: Gün {day+1}, Slot {time_slot+1}")
+                            self.solver_log.sample("         ⚡ Agresif yerleştirme: Gün %d, Slot %d", day + 1, time_slot + 1)
                     except Exception:
                         pass  # Skip if availability check fails
 
@@ -351,7 +352,7 @@ class SimplePerfectScheduler:
             
             class_obj = next((c for c in self.db_manager.get_all_classes() if c.class_id == class_id), None)
             if class_obj:
-                weekly_hours = self.db_manager.get_weekly_hours_for_lesson(assignment.lesson_id, class_obj.grade)
+                weekly_hours = self.db_manager.get_requirement_table().weekly_hours(class_id, assignment.lesson_id)
                 
                 if weekly_hours and current_count < weekly_hours:
                     # Try to place this assignment in the empty slot
@@ -365,7 +366,7 @@ class SimplePerfectScheduler:
                         # Place the assignment
                         classroom_id = 1  # Default classroom
                         self._add_entry(class_id, teacher_id, lesson_id, classroom_id, day, time_slot)
-                        self.logger.debug(f"         ✨ Boş slot dolduruldu: {class_id} - Gün {day+1}, Slot {time_slot+1}")
+                        self.solver_log.sample("         ✨ Boş slot dolduruldu: %s - Gün %d, Slot %d", class_id, day + 1, time_slot + 1)
                         return True
         
         return False
@@ -483,7 +484,7 @@ class SimplePerfectScheduler:
             
             class_obj = next((c for c in self.db_manager.get_all_classes() if c.class_id == class_id), None)
             if class_obj:
-                weekly_hours = self.db_manager.get_weekly_hours_for_lesson(lesson_id, class_obj.grade)
+                weekly_hours = self.db_manager.get_requirement_table().weekly_hours(class_id, lesson_id)
                 
                 if weekly_hours and current_count < weekly_hours:
                     remaining_needs.append({
@@ -598,7 +599,9 @@ class SimplePerfectScheduler:
         success = backtrack(0)
         
         if success:
-            self.logger.debug(f"        ✓ {need['class_name']} - {need['lesson_name']}: {weekly_hours} saat blok olarak yerleştirildi")
+            self.logger.debug(
+                "        ✓ %s - %s: %d saat blok olarak yerleştirildi", need["class_name"], need["lesson_name"], weekly_hours
+            )
             return weekly_hours
         
         # Tam yerleşemedi - kısmi başarı için sadece 2'li blokları dene
@@ -952,9 +955,7 @@ class SimplePerfectScheduler:
                 key = (class_obj.class_id, lesson.lesson_id)
                 if key in assignment_map:
                     # Haftalık gereksinim
-                    weekly_hours = self.db_manager.get_weekly_hours_for_lesson(
-                        lesson.lesson_id, class_obj.grade
-                    )
+                    weekly_hours = self.db_manager.get_requirement_table().weekly_hours(class_obj.class_id, lesson.lesson_id)
                     
                     if not weekly_hours:
                         continue
@@ -971,7 +972,7 @@ class SimplePerfectScheduler:
                         remaining = weekly_hours - current_count
                         teacher_id = assignment_map[key]
                         
-                        self.logger.info(f"   📌 {class_obj.name} - {lesson.name}: {remaining} saat eksik")
+                        self.logger.info("   📌 %s - %s: %d saat eksik", class_obj.name, lesson.name, remaining)
                         
                         # Her gün, her slotu dene (öğretmen uygunluk kontrolü YOK)
                         for day in range(5):
@@ -997,7 +998,7 @@ class SimplePerfectScheduler:
                                     )
                                     remaining -= 1
                                     filled_count += 1
-                                    self.logger.debug(f"      ✅ Yerleştirildi: Gün {day+1}, Slot {slot+1}")
+                                    self.solver_log.sample("      ✅ Yerleştirildi: Gün %d, Slot %d", day + 1, slot + 1)
         
         return filled_count
     
@@ -1209,9 +1210,9 @@ class SimplePerfectScheduler:
                 for slot in slots:
                     self._add_entry(class_id, teacher_id, lesson_id, classroom_id, day, slot)
 
-                self.logger.debug(f"        ✓ BLOK yerleştirildi: Gün {day+1}, Saat {start_slot+1}-{start_slot+
-
-block_size}")
+                self.solver_log.sample(
+                    "        ✓ BLOK yerleştirildi: Gün %d, Saat %d-%d", day + 1, start_slot + 1, start_slot + block_size
+                )
                 return True
 
         return False
@@ -1288,7 +1289,7 @@ block_size}")
             
             class_obj = next((c for c in self.db_manager.get_all_classes() if c.class_id == class_id), None)
             if class_obj:
-                weekly_hours = self.db_manager.get_weekly_hours_for_lesson(assignment.lesson_id, class_obj.grade)
+                weekly_hours = self.db_manager.get_requirement_table().weekly_hours(class_id, assignment.lesson_id)
                 
                 if weekly_hours and current_count < weekly_hours:
                     # Try to place this assignment in the empty slot
@@ -1355,7 +1356,7 @@ block_size}")
             # Get required hours
             class_obj = next((c for c in self.db_manager.get_all_classes() if c.class_id == class_id), None)
             if class_obj:
-                weekly_hours = self.db_manager.get_weekly_hours_for_lesson(lesson_id, class_obj.grade)
+                weekly_hours = self.db_manager.get_requirement_table().weekly_hours(class_id, lesson_id)
                 
                 if weekly_hours and current_count < weekly_hours:
                     remaining_needs.append({
@@ -1417,7 +1418,7 @@ block_size}")
                 assignment_key = (class_obj.class_id, lesson.lesson_id)
                 if assignment_key in assignment_map:
                     # Get weekly hours from curriculum
-                    weekly_hours = self.db_manager.get_weekly_hours_for_lesson(lesson.lesson_id, class_obj.grade)
+                    weekly_hours = self.db_manager.get_requirement_table().weekly_hours(class_obj.class_id, lesson.lesson_id)
                     if weekly_hours and weekly_hours > 0:
                         teacher_id = assignment_map[assignment_key]
                         teacher = self.db_manager.get_teacher_by_id(teacher_id)
@@ -1487,7 +1488,7 @@ block_size}")
                         classroom_id = 1  # Default classroom
                         self._add_entry(class_id, teacher_id, lesson_id, classroom_id, day, time_slot)
                         scheduled_count += 1
-                        self.logger.debug(f"         ✓ Yerleştirildi: Gün {day+1}, Slot {time_slot+1}")
+                        self.solver_log.sample("         ✓ Yerleştirildi: Gün %d, Slot %d", day + 1, time_slot + 1)
                         break  # Move to next hour needed
         
         # If we couldn't place all hours, try aggressive placement
@@ -1529,7 +1530,7 @@ block_size}")
                             classroom_id = 1  # Default classroom
                             self._add_entry(class_id, teacher_id, lesson_id, classroom_id, day, time_slot)
                             placed_count += 1
-                            self.logger.debug(f"         ⚡ Agresif yerleştirme: Gün {day+1}, Slot {time_slot+1}")
+                            self.solver_log.sample("         ⚡ Agresif yerleştirme: Gün %d, Slot %d", day + 1, time_slot + 1)
                     except Exception:
                         pass  # Skip if availability check fails
 
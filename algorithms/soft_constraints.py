@@ -17,6 +17,29 @@ if sys.platform.startswith("win"):
     else:
         sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8")
 
+# Zor dersler - sabah saatlerine tercih edilir
+DIFFICULT_LESSONS = [
+    "Matematik",
+    "Fizik",
+    "Kimya",
+    "Biyoloji",
+    "Geometri",
+    "Analitik Geometri",
+    "Türk Dili ve Edebiyatı",
+]
+
+# Hafif dersler - öğle saatlerine tercih edilir
+LIGHT_LESSONS = [
+    "Beden Eğitimi",
+    "Beden Eğitimi ve Oyun",
+    "Beden Eğitimi ve Spor",
+    "Müzik",
+    "Görsel Sanatlar",
+    "Teknoloji Tasarım",
+    "Seçmeli Ders",
+    "Rehberlik",
+]
+
 
 class SoftConstraint:
     """Esnek kısıtlama - ihlal edilebilir ama maliyeti var"""
@@ -254,24 +277,13 @@ class SoftConstraintManager:
         """Zor derslerin sabaha yerleştirilmesi"""
         score = 0.0
 
-        # Zor dersler listesi
-        difficult_lessons = [
-            "Matematik",
-            "Fizik",
-            "Kimya",
-            "Biyoloji",
-            "Geometri",
-            "Analitik Geometri",
-            "Türk Dili ve Edebiyatı",
-        ]
-
         for entry in schedule:
             lesson_id = entry["lesson_id"]
             slot = entry["time_slot"]
 
             # Dersin adını al
             lesson = self.db_manager.get_lesson_by_id(lesson_id)
-            if lesson and lesson.name in difficult_lessons:
+            if lesson and lesson.name in DIFFICULT_LESSONS:
                 # Sabah saatleri (0-3)
                 if 0 <= slot <= 3:
                     score += 3.0  # Bonus
@@ -376,18 +388,6 @@ class SoftConstraintManager:
         # Öğle saatleri genellikle 3-4. slotlar
         lunch_slots = [3, 4]
 
-        # Hafif dersler
-        light_lessons = [
-            "Beden Eğitimi",
-            "Beden Eğitimi ve Oyun",
-            "Beden Eğitimi ve Spor",
-            "Müzik",
-            "Görsel Sanatlar",
-            "Teknoloji Tasarım",
-            "Seçmeli Ders",
-            "Rehberlik",
-        ]
-
         for entry in schedule:
             slot = entry["time_slot"]
             lesson_id = entry["lesson_id"]
@@ -395,7 +395,7 @@ class SoftConstraintManager:
             if slot in lunch_slots:
                 lesson = self.db_manager.get_lesson_by_id(lesson_id)
                 if lesson:
-                    if lesson.name in light_lessons:
+                    if lesson.name in LIGHT_LESSONS:
                         score += 2.0  # Hafif ders için bonus
                     else:
                         score -= 1.0  # Ağır ders için hafif ceza
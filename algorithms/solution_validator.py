@@ -18,12 +18,14 @@ Requirements addressed: 1.4, 3.5, 5.2
 """
 
 import logging
+import time
 from collections import defaultdict
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Set, Tuple
 from enum import Enum
 
 from database.models import Teacher, Class, Lesson
+from database.requirement_table import Requirement
 from algorithms.optimized_curriculum_scheduler import EnhancedScheduleEntry, WorkloadViolation
 
 
@@ -85,6 +87,147 @@ class ValidationReport:
     recommendations: List[str] = field(default_factory=list)
 
 
+# Validation unit keys used for incremental re-checks:
+# ("teacher_slot" | "class_slot", (id, day, slot)), ("block", block_id),
+# ("teacher", teacher_id), ("curriculum", (class_id, lesson_id))
+UnitKey = Tuple[str, Any]
+
+
+@dataclass
+class SolutionIndex:
+    """
+    Entries grouped once for every rule family
+
+    Built in a single pass over the solution; each rule then walks only its
+    own groups, so a full validation stays O(N). ``add``/``remove`` keep the
+    groups current and report which validation units they touched.
+    """
+    entries: Dict[int, EnhancedScheduleEntry] = field(default_factory=dict)  # id(entry) -> entry
+    teacher_slots: Dict[Tuple[int, int, int], List[EnhancedScheduleEntry]] = field(default_factory=lambda: defaultdict(list))
+    class_slots: Dict[Tuple[int, int, int], List[EnhancedScheduleEntry]] = field(default_factory=lambda: defaultdict(list))
+    blocks: Dict[str, List[EnhancedScheduleEntry]] = field(default_factory=lambda: defaultdict(list))
+    teacher_entries: Dict[int, List[EnhancedScheduleEntry]] = field(default_factory=lambda: defaultdict(list))
+    class_lesson_hours: Dict[int, Dict[int, int]] = field(default_factory=lambda: defaultdict(lambda: defaultdict(int)))
+
+    @classmethod
+    def build(cls, entries: List[EnhancedScheduleEntry]) -> "SolutionIndex":
+        """Group entries by teacher/class slot, block, teacher and class-lesson"""
+        index = cls()
+        for entry in entries:
+            index.add(entry)
+        return index
+
+    @property
+    def entry_count(self) -> int:
+        """Number of indexed entries"""
+        return len(self.entries)
+
+    @staticmethod
+    def unit_keys(entry: EnhancedScheduleEntry) -> List[UnitKey]:
+        """Validation units an entry contributes to"""
+        keys = [
+            ("teacher_slot", (entry.teacher_id, entry.day, entry.time_slot)),
+            ("class_slot", (entry.class_id, entry.day, entry.time_slot)),
+            ("teacher", entry.teacher_id),
+            ("curriculum", (entry.class_id, entry.lesson_id)),
+        ]
+        if entry.block_id:
+            keys.append(("block", entry.block_id))
+        return keys
+
+    def add(self, entry: EnhancedScheduleEntry, dirty: Optional[Set[UnitKey]] = None):
+        """Index an entry, recording the units it touches in ``dirty``"""
+        self.entries[id(entry)] = entry
+        self.teacher_slots[(entry.teacher_id, entry.day, entry.time_slot)].append(entry)
+        self.class_slots[(entry.class_id, entry.day, entry.time_slot)].append(entry)
+        if entry.block_id:
+            self.blocks[entry.block_id].append(entry)
+        self.teacher_entries[entry.teacher_id].append(entry)
+        self.class_lesson_hours[entry.class_id][entry.lesson_id] += 1
+        if dirty is not None:
+            dirty.update(self.unit_keys(entry))
+
+    def remove(self, entry: EnhancedScheduleEntry, dirty: Optional[Set[UnitKey]] = None) -> bool:
+        """
+        Drop an entry (matched by identity, else by value)
+
+        Returns:
+            True if the entry was indexed
+        """
+        entry = self.entries.get(id(entry)) or next(
+            (e for e in self.teacher_slots.get((entry.teacher_id, entry.day, entry.time_slot), []) if e == entry),
+            None,
+        )
+        if entry is None:
+            return False
+
+        del self.entries[id(entry)]
+        self._discard(self.teacher_slots, (entry.teacher_id, entry.day, entry.time_slot), entry)
+        self._discard(self.class_slots, (entry.class_id, entry.day, entry.time_slot), entry)
+        if entry.block_id:
+            self._discard(self.blocks, entry.block_id, entry)
+        self._discard(self.teacher_entries, entry.teacher_id, entry)
+        lesson_hours = self.class_lesson_hours[entry.class_id]
+        lesson_hours[entry.lesson_id] -= 1
+        if lesson_hours[entry.lesson_id] <= 0:
+            del lesson_hours[entry.lesson_id]
+        if dirty is not None:
+            dirty.update(self.unit_keys(entry))
+        return True
+
+    @staticmethod
+    def _discard(groups: Dict[Any, List[EnhancedScheduleEntry]], key: Any, entry: EnhancedScheduleEntry):
+        group = groups.get(key)
+        if not group:
+            return
+        for i, other in enumerate(group):
+            if other is entry:
+                del group[i]
+                break
+        if not group:
+            del groups[key]
+
+
+@dataclass
+class ValidationLookups:
+    """Curriculum requirements and teacher records, loaded once per validation"""
+    # Assigned (class, lesson) requirements with a positive number of hours
+    requirements: List[Requirement] = field(default_factory=list)
+    by_key: Dict[Tuple[int, int], Requirement] = field(default_factory=dict)
+    teachers: Dict[int, Optional[Teacher]] = field(default_factory=dict)
+    loaded: bool = False
+
+    def load(self, db_manager) -> "ValidationLookups":
+        """Read requirements from the cached requirement table (no-op once loaded)"""
+        if self.loaded or not db_manager:
+            return self
+        self.loaded = True
+        self.requirements = db_manager.get_requirement_table().assigned()
+        self.by_key = {(row.class_id, row.lesson_id): row for row in self.requirements}
+        return self
+
+    def teacher(self, db_manager, teacher_id: int) -> Optional[Teacher]:
+        """Teacher record (memoized)"""
+        if teacher_id not in self.teachers:
+            self.teachers[teacher_id] = db_manager.get_teacher_by_id(teacher_id) if db_manager else None
+        return self.teachers[teacher_id]
+
+
+@dataclass
+class IncrementalValidationState:
+    """Per-unit validation results cached between incremental validations"""
+    index: SolutionIndex
+    lookups: ValidationLookups
+    conflicts: Dict[UnitKey, ValidationViolation] = field(default_factory=dict)
+    # block_id -> (violations, time_slots, fragmented)
+    blocks: Dict[str, Tuple[List[ValidationViolation], List[Tuple[int, int]], bool]] = field(default_factory=dict)
+    # teacher_id -> (workload data, empty-day violation, overload hours)
+    workloads: Dict[int, Tuple[Dict[str, Any], Optional[WorkloadViolation], Optional[int]]] = field(default_factory=dict)
+    curriculum: Dict[Tuple[int, int], List[ValidationViolation]] = field(default_factory=dict)
+    availability: Dict[int, List[ValidationViolation]] = field(default_factory=dict)
+    report: Optional[ValidationReport] = None
+
+
 class SolutionValidator:
     """
     Comprehensive solution validator for scheduler optimization
@@ -115,6 +258,9 @@ class SolutionValidator:
             1: [(1,)]  # 1-hour lesson patterns
         }
         
+        # Cached per-unit results for incremental validation
+        self._incremental: Optional[IncrementalValidationState] = None
+        
         self.logger.info("SolutionValidator initialized")
     
     def validate_complete_solution(self, entries: List[EnhancedScheduleEntry]) -> ValidationReport:
@@ -129,45 +275,172 @@ class SolutionValidator:
         """
         self.logger.info(f"Starting comprehensive validation of {len(entries)} schedule entries")
         
+        start_time = time.perf_counter()
+        
+        # Single pass: every rule family reads from the same index
+        state = IncrementalValidationState(SolutionIndex.build(entries), ValidationLookups())
+        self._refresh_units(state)
+        report = self._assemble_report(state, start_time)
+        
+        # Log validation results
+        self.logger.info(f"Validation completed:")
+        self.logger.info(f"  Valid: {report.is_valid}")
+        self.logger.info(f"  Total violations: {report.total_violations}")
+        self.logger.info(f"  Critical: {len(report.critical_violations)}")
+        self.logger.info(f"  Major: {len(report.major_violations)}")
+        self.logger.info(f"  Minor: {len(report.minor_violations)}")
+        
+        return report
+    
+    # ------------------------------------------------------------------
+    # Incremental validation
+    # ------------------------------------------------------------------
+    
+    def begin_incremental(self, entries: List[EnhancedScheduleEntry]) -> ValidationReport:
+        """
+        Validate a solution fully and keep per-unit results for later deltas
+        
+        Entries are tracked by identity: replace an entry (remove + add)
+        instead of mutating it in place.
+        
+        Args:
+            entries: Baseline solution
+            
+        Returns:
+            ValidationReport for the baseline
+        """
+        start_time = time.perf_counter()
+        self._incremental = IncrementalValidationState(SolutionIndex.build(entries), ValidationLookups())
+        self._refresh_units(self._incremental)
+        self._incremental.report = self._assemble_report(self._incremental, start_time)
+        return self._incremental.report
+    
+    def validate_incremental(self, added: Optional[List[EnhancedScheduleEntry]] = None,
+                             removed: Optional[List[EnhancedScheduleEntry]] = None) -> ValidationReport:
+        """
+        Update the cached report with a changeset
+        
+        Only the teacher/class slots, blocks, teachers and (class, lesson)
+        counters touched by the changeset are re-evaluated.
+        
+        Args:
+            added: Entries added since the last validation
+            removed: Entries removed since the last validation
+            
+        Returns:
+            Updated ValidationReport
+        """
+        if self._incremental is None:
+            self.begin_incremental([])
+        
+        start_time = time.perf_counter()
+        state = self._incremental
+        dirty: Set[UnitKey] = set()
+        for entry in removed or []:
+            state.index.remove(entry, dirty)
+        for entry in added or []:
+            state.index.add(entry, dirty)
+        
+        if dirty:
+            self._refresh_units(state, dirty)
+            state.report = self._assemble_report(state, start_time)
+        state.report.validation_metrics["units_revalidated"] = len(dirty)
+        return state.report
+    
+    def sync_incremental(self, entries: List[EnhancedScheduleEntry]) -> ValidationReport:
+        """
+        Bring the cached report in line with ``entries`` (identity diff)
+        
+        Args:
+            entries: Current solution
+            
+        Returns:
+            Updated ValidationReport
+        """
+        if self._incremental is None:
+            return self.begin_incremental(entries)
+        
+        known = self._incremental.index.entries
+        current = {id(entry): entry for entry in entries}
+        removed = [entry for key, entry in known.items() if key not in current]
+        added = [entry for key, entry in current.items() if key not in known]
+        return self.validate_incremental(added, removed)
+    
+    def reset_incremental(self):
+        """Forget cached incremental state (e.g. after curriculum changes)"""
+        self._incremental = None
+    
+    @property
+    def incremental_report(self) -> Optional[ValidationReport]:
+        """Last report produced by incremental validation"""
+        return self._incremental.report if self._incremental else None
+    
+    def _refresh_units(self, state: IncrementalValidationState, dirty: Optional[Set[UnitKey]] = None):
+        """
+        Re-evaluate validation units
+        
+        Args:
+            state: Incremental state to update
+            dirty: Units to re-check (all units if None)
+        """
+        index, lookups = state.index, state.lookups
+        if dirty is None:
+            lookups.load(self.db_manager)
+            dirty = set()
+            dirty.update(("teacher_slot", key) for key in index.teacher_slots)
+            dirty.update(("class_slot", key) for key in index.class_slots)
+            dirty.update(("block", key) for key in index.blocks)
+            dirty.update(("teacher", key) for key in index.teacher_entries)
+            dirty.update(("curriculum", key) for key in lookups.by_key)
+        
+        for unit in dirty:
+            kind, key = unit
+            if kind in ("teacher_slot", "class_slot"):
+                groups = index.teacher_slots if kind == "teacher_slot" else index.class_slots
+                violation = self._slot_conflict(kind, key, groups.get(key, []))
+                if violation:
+                    state.conflicts[unit] = violation
+                else:
+                    state.conflicts.pop(unit, None)
+            elif kind == "block":
+                if key in index.blocks:
+                    state.blocks[key] = self._check_block(key, index.blocks[key])
+                else:
+                    state.blocks.pop(key, None)
+            elif kind == "teacher":
+                teacher_entries = index.teacher_entries.get(key)
+                if teacher_entries:
+                    state.workloads[key] = self._check_teacher_workload(key, teacher_entries, lookups)
+                    state.availability[key] = self._check_teacher_availability(key, teacher_entries, lookups)
+                else:
+                    state.workloads.pop(key, None)
+                    state.availability.pop(key, None)
+            elif kind == "curriculum" and self.db_manager:
+                class_id, lesson_id = key
+                scheduled_hours = index.class_lesson_hours.get(class_id, {}).get(lesson_id, 0)
+                requirement = lookups.by_key.get(key)
+                violation = self._check_curriculum(requirement, scheduled_hours) if requirement else None
+                if violation:
+                    state.curriculum[key] = [violation]
+                else:
+                    state.curriculum.pop(key, None)
+    
+    def _assemble_report(self, state: IncrementalValidationState, start_time: float) -> ValidationReport:
+        """Build a ValidationReport from cached per-unit results"""
         report = ValidationReport(is_valid=True, total_violations=0)
-        all_violations = []
-        
-        # Step 1: Validate teacher and class conflicts
-        self.logger.debug("Validating conflicts...")
-        conflict_violations = self._validate_conflicts(entries)
-        all_violations.extend(conflict_violations)
-        
-        # Step 2: Validate block rules
-        self.logger.debug("Validating block rules...")
-        block_result = self._validate_block_rules(entries)
-        report.block_validation = block_result
-        all_violations.extend(block_result.violations)
-        
-        # Step 3: Validate workload distribution
-        self.logger.debug("Validating workload distribution...")
-        workload_result = self._validate_workload_distribution(entries)
-        report.workload_validation = workload_result
-        all_violations.extend([
-            ValidationViolation(
-                violation_type=ViolationType.WORKLOAD_VIOLATION,
-                severity="major",
-                description=f"Teacher {v.teacher_name} has {v.empty_days} empty days (max: {self.max_empty_days})",
-                affected_entries=[],
-                context={"teacher_id": v.teacher_id, "empty_days": v.empty_days},
-                suggested_fix="Redistribute lessons to reduce empty days"
-            )
-            for v in workload_result.violations
-        ])
         
-        # Step 4: Validate curriculum requirements
-        self.logger.debug("Validating curriculum requirements...")
-        curriculum_violations = self._validate_curriculum_requirements(entries)
-        all_violations.extend(curriculum_violations)
+        all_violations = list(state.conflicts.values())
         
-        # Step 5: Validate teacher availability
-        self.logger.debug("Validating teacher availability...")
-        availability_violations = self._validate_teacher_availability(entries)
-        all_violations.extend(availability_violations)
+        report.block_validation = self._fold_block_results(state.blocks)
+        all_violations.extend(report.block_validation.violations)
+        
+        report.workload_validation = self._fold_workload_results(state.workloads)
+        all_violations.extend(self._workload_to_violation(v) for v in report.workload_validation.violations)
+        
+        for violations in state.curriculum.values():
+            all_violations.extend(violations)
+        for violations in state.availability.values():
+            all_violations.extend(violations)
         
         # Categorize violations by severity
         for violation in all_violations:
@@ -191,136 +464,157 @@ class SolutionValidator:
         report.conflict_summary = self._generate_conflict_summary(all_violations)
         
         # Generate validation metrics
-        report.validation_metrics = self._generate_validation_metrics(entries, all_violations)
+        report.validation_metrics = self._generate_validation_metrics(state.index.entries, all_violations)
+        report.validation_metrics["validation_time_ms"] = round((time.perf_counter() - start_time) * 1000, 3)
         
         # Generate recommendations
         report.recommendations = self._generate_validation_recommendations(report)
         
-        # Log validation results
-        self.logger.info(f"Validation completed:")
-        self.logger.info(f"  Valid: {report.is_valid}")
-        self.logger.info(f"  Total violations: {report.total_violations}")
-        self.logger.info(f"  Critical: {len(report.critical_violations)}")
-        self.logger.info(f"  Major: {len(report.major_violations)}")
-        self.logger.info(f"  Minor: {len(report.minor_violations)}")
-        
         return report
     
-    def _validate_conflicts(self, entries: List[EnhancedScheduleEntry]) -> List[ValidationViolation]:
+    def _workload_to_violation(self, violation: WorkloadViolation) -> ValidationViolation:
+        """Report form of an empty-day workload violation"""
+        return ValidationViolation(
+            violation_type=ViolationType.WORKLOAD_VIOLATION,
+            severity="major",
+            description=f"Teacher {violation.teacher_name} has {violation.empty_days} empty days (max: {self.max_empty_days})",
+            affected_entries=[],
+            context={"teacher_id": violation.teacher_id, "empty_days": violation.empty_days},
+            suggested_fix="Redistribute lessons to reduce empty days"
+        )
+    
+    # ------------------------------------------------------------------
+    # Rule families
+    # ------------------------------------------------------------------
+    
+    def _validate_conflicts(self, entries: List[EnhancedScheduleEntry],
+                            index: Optional[SolutionIndex] = None) -> List[ValidationViolation]:
         """
         Check for conflicts between classes and teachers
         
         Args:
             entries: Schedule entries to validate
+            index: Prebuilt solution index (built from entries if omitted)
             
         Returns:
             List of conflict violations
         """
+        index = index or SolutionIndex.build(entries)
         violations = []
         
-        # Group entries by time slot for conflict detection
-        slot_entries = defaultdict(list)  # (day, time_slot) -> [entries]
+        for kind, groups in (("teacher_slot", index.teacher_slots), ("class_slot", index.class_slots)):
+            for key, slot_entries in groups.items():
+                violation = self._slot_conflict(kind, key, slot_entries)
+                if violation:
+                    violations.append(violation)
         
-        for entry in entries:
-            slot_key = (entry.day, entry.time_slot)
-            slot_entries[slot_key].append(entry)
+        return violations
+    
+    def _slot_conflict(self, kind: str, key: Tuple[int, int, int],
+                       slot_entries: List[EnhancedScheduleEntry]) -> Optional[ValidationViolation]:
+        """
+        Conflict violation for one (teacher|class, day, slot) group
         
-        # Check each time slot for conflicts
-        for (day, time_slot), slot_entries_list in slot_entries.items():
-            if len(slot_entries_list) <= 1:
-                continue  # No conflicts possible with single entry
-            
-            # Check for teacher conflicts
-            teacher_entries = defaultdict(list)
-            for entry in slot_entries_list:
-                teacher_entries[entry.teacher_id].append(entry)
-            
-            for teacher_id, teacher_slot_entries in teacher_entries.items():
-                if len(teacher_slot_entries) > 1:
-                    # Teacher conflict detected
-                    violations.append(ValidationViolation(
-                        violation_type=ViolationType.TEACHER_CONFLICT,
-                        severity="critical",
-                        description=f"Teacher {teacher_id} scheduled for multiple classes at Day {day}, Slot {time_slot}",
-                        affected_entries=teacher_slot_entries,
-                        context={
-                            "teacher_id": teacher_id,
-                            "day": day,
-                            "time_slot": time_slot,
-                            "conflicting_classes": [e.class_id for e in teacher_slot_entries]
-                        },
-                        suggested_fix="Reschedule one of the conflicting lessons to a different time slot"
-                    ))
-            
-            # Check for class conflicts
-            class_entries = defaultdict(list)
-            for entry in slot_entries_list:
-                class_entries[entry.class_id].append(entry)
+        Args:
+            kind: "teacher_slot" or "class_slot"
+            key: (resource_id, day, time_slot)
+            slot_entries: Entries in the group
             
-            for class_id, class_slot_entries in class_entries.items():
-                if len(class_slot_entries) > 1:
-                    # Class conflict detected
-                    violations.append(ValidationViolation(
-                        violation_type=ViolationType.CLASS_CONFLICT,
-                        severity="critical",
-                        description=f"Class {class_id} scheduled for multiple lessons at Day {day}, Slot {time_slot}",
-                        affected_entries=class_slot_entries,
-                        context={
-                            "class_id": class_id,
-                            "day": day,
-                            "time_slot": time_slot,
-                            "conflicting_lessons": [e.lesson_id for e in class_slot_entries]
-                        },
-                        suggested_fix="Reschedule one of the conflicting lessons to a different time slot"
-                    ))
-        
-        return violations
+        Returns:
+            ValidationViolation if more than one entry shares the slot
+        """
+        if len(slot_entries) <= 1:
+            return None
+        
+        resource_id, day, time_slot = key
+        affected = list(slot_entries)
+        if kind == "teacher_slot":
+            return ValidationViolation(
+                violation_type=ViolationType.TEACHER_CONFLICT,
+                severity="critical",
+                description=f"Teacher {resource_id} scheduled for multiple classes at Day {day}, Slot {time_slot}",
+                affected_entries=affected,
+                context={
+                    "teacher_id": resource_id,
+                    "day": day,
+                    "time_slot": time_slot,
+                    "conflicting_classes": [e.class_id for e in affected]
+                },
+                suggested_fix="Reschedule one of the conflicting lessons to a different time slot"
+            )
+        return ValidationViolation(
+            violation_type=ViolationType.CLASS_CONFLICT,
+            severity="critical",
+            description=f"Class {resource_id} scheduled for multiple lessons at Day {day}, Slot {time_slot}",
+            affected_entries=affected,
+            context={
+                "class_id": resource_id,
+                "day": day,
+                "time_slot": time_slot,
+                "conflicting_lessons": [e.lesson_id for e in affected]
+            },
+            suggested_fix="Reschedule one of the conflicting lessons to a different time slot"
+        )
     
-    def _validate_block_rules(self, entries: List[EnhancedScheduleEntry]) -> BlockValidationResult:
+    def _validate_block_rules(self, entries: List[EnhancedScheduleEntry],
+                              index: Optional[SolutionIndex] = None) -> BlockValidationResult:
         """
         Validate block rules and workload distribution
         
         Args:
             entries: Schedule entries to validate
+            index: Prebuilt solution index (built from entries if omitted)
             
         Returns:
             BlockValidationResult with detailed block validation
         """
-        result = BlockValidationResult(is_valid=True)
+        index = index or SolutionIndex.build(entries)
+        return self._fold_block_results({
+            block_id: self._check_block(block_id, block_entries)
+            for block_id, block_entries in index.blocks.items()
+            if block_entries
+        })
+    
+    def _check_block(self, block_id: str, block_entries: List[EnhancedScheduleEntry]
+                     ) -> Tuple[List[ValidationViolation], List[Tuple[int, int]], bool]:
+        """
+        Validate a single block
         
-        # Group entries by block_id
-        block_entries = defaultdict(list)
-        for entry in entries:
-            if entry.block_id:
-                block_entries[entry.block_id].append(entry)
+        Returns:
+            (violations, time_slots, fragmented)
+        """
+        # Sort entries by day and time_slot
+        block_entry_list = sorted(block_entries, key=lambda e: (e.day, e.time_slot))
         
-        # Validate each block
-        for block_id, block_entry_list in block_entries.items():
-            if not block_entry_list:
-                continue
-            
-            # Sort entries by day and time_slot
-            block_entry_list.sort(key=lambda e: (e.day, e.time_slot))
-            
-            # Extract time slots for this block
-            time_slots = [(e.day, e.time_slot) for e in block_entry_list]
+        # Extract time slots for this block
+        time_slots = [(e.day, e.time_slot) for e in block_entry_list]
+        
+        # Validate block pattern
+        violations = self._validate_single_block_pattern(block_id, block_entry_list, time_slots)
+        
+        # Check for fragmentation
+        fragmented = self._is_block_fragmented(time_slots)
+        if fragmented:
+            violations.append(ValidationViolation(
+                violation_type=ViolationType.BLOCK_RULE_VIOLATION,
+                severity="major",
+                description=f"Block {block_id} is fragmented across non-consecutive time slots",
+                affected_entries=block_entry_list,
+                context={"block_id": block_id, "time_slots": time_slots},
+                suggested_fix="Reschedule block to consecutive time slots"
+            ))
+        
+        return violations, time_slots, fragmented
+    
+    def _fold_block_results(self, block_results: Dict[str, Tuple[List[ValidationViolation], List[Tuple[int, int]], bool]]
+                            ) -> BlockValidationResult:
+        """Combine per-block results into a BlockValidationResult"""
+        result = BlockValidationResult(is_valid=True)
+        for block_id, (violations, time_slots, fragmented) in block_results.items():
             result.block_patterns[block_id] = time_slots
-            
-            # Validate block pattern
-            block_violations = self._validate_single_block_pattern(block_id, block_entry_list, time_slots)
-            result.violations.extend(block_violations)
-            
-            # Check for fragmentation
-            if self._is_block_fragmented(time_slots):
+            result.violations.extend(violations)
+            if fragmented:
                 result.fragmented_blocks.append(block_id)
-                result.violations.append(ValidationViolation(
-                    violation_type=ViolationType.BLOCK_RULE_VIOLATION,
-                    severity="major",
-                    description=f"Block {block_id} is fragmented across non-consecutive time slots",
-                    affected_entries=block_entry_list,
-                    context={"block_id": block_id, "time_slots": time_slots},
-                    suggested_fix="Reschedule block to consecutive time slots"
-                ))
         
         # Update overall validity
         result.is_valid = len(result.violations) == 0
@@ -450,54 +744,74 @@ class SolutionValidator:
         
         return True
     
-    def _validate_workload_distribution(self, entries: List[EnhancedScheduleEntry]) -> WorkloadValidationResult:
+    def _validate_workload_distribution(self, entries: List[EnhancedScheduleEntry],
+                                       index: Optional[SolutionIndex] = None,
+                                       lookups: Optional[ValidationLookups] = None) -> WorkloadValidationResult:
         """
         Validate workload distribution for all teachers
         
         Args:
             entries: Schedule entries to validate
+            index: Prebuilt solution index (built from entries if omitted)
+            lookups: Shared teacher/requirement cache
             
         Returns:
             WorkloadValidationResult with workload analysis
         """
-        result = WorkloadValidationResult(is_valid=True)
+        index = index or SolutionIndex.build(entries)
+        lookups = lookups or ValidationLookups()
+        return self._fold_workload_results({
+            teacher_id: self._check_teacher_workload(teacher_id, teacher_entry_list, lookups)
+            for teacher_id, teacher_entry_list in index.teacher_entries.items()
+        })
+    
+    def _check_teacher_workload(self, teacher_id: int, teacher_entry_list: List[EnhancedScheduleEntry],
+                                lookups: ValidationLookups
+                                ) -> Tuple[Dict[str, Any], Optional[WorkloadViolation], Optional[int]]:
+        """
+        Validate a single teacher's workload
         
-        # Group entries by teacher
-        teacher_entries = defaultdict(list)
-        for entry in entries:
-            teacher_entries[entry.teacher_id].append(entry)
+        Returns:
+            (workload data, empty-day violation or None, overload hours or None)
+        """
+        workload_data = self._analyze_teacher_workload(teacher_id, teacher_entry_list)
+        violation = None
+        
+        # Check for empty day violations
+        empty_days = workload_data.get('empty_days', 0)
+        if empty_days > self.max_empty_days:
+            # Get teacher name if available
+            teacher = lookups.teacher(self.db_manager, teacher_id)
+            teacher_name = teacher.name if teacher else f"Teacher_{teacher_id}"
+            
+            violation = WorkloadViolation(
+                teacher_id=teacher_id,
+                teacher_name=teacher_name,
+                empty_days=empty_days,
+                working_days=set(workload_data.get('working_days', [])),
+                violation_severity="major" if empty_days > 2 else "minor"
+            )
         
-        # Analyze each teacher's workload
-        for teacher_id, teacher_entry_list in teacher_entries.items():
-            workload_data = self._analyze_teacher_workload(teacher_id, teacher_entry_list)
+        # Check for overload violations
+        overload = None
+        daily_hours = workload_data.get('daily_hours', {})
+        for day, hours in daily_hours.items():
+            if hours > self.max_daily_hours:
+                overload = hours
+        
+        return workload_data, violation, overload
+    
+    def _fold_workload_results(self, workload_results: Dict[int, Tuple[Dict[str, Any], Optional[WorkloadViolation], Optional[int]]]
+                               ) -> WorkloadValidationResult:
+        """Combine per-teacher results into a WorkloadValidationResult"""
+        result = WorkloadValidationResult(is_valid=True)
+        for teacher_id, (workload_data, violation, overload) in workload_results.items():
             result.teacher_workloads[teacher_id] = workload_data
-            
-            # Check for empty day violations
-            empty_days = workload_data.get('empty_days', 0)
-            if empty_days > self.max_empty_days:
-                result.empty_day_violations[teacher_id] = empty_days
-                
-                # Get teacher name if available
-                teacher_name = f"Teacher_{teacher_id}"
-                if self.db_manager:
-                    teacher = self.db_manager.get_teacher_by_id(teacher_id)
-                    if teacher:
-                        teacher_name = teacher.name
-                
-                violation = WorkloadViolation(
-                    teacher_id=teacher_id,
-                    teacher_name=teacher_name,
-                    empty_days=empty_days,
-                    working_days=set(workload_data.get('working_days', [])),
-                    violation_severity="major" if empty_days > 2 else "minor"
-                )
+            if violation is not None:
+                result.empty_day_violations[teacher_id] = violation.empty_days
                 result.violations.append(violation)
-            
-            # Check for overload violations
-            daily_hours = workload_data.get('daily_hours', {})
-            for day, hours in daily_hours.items():
-                if hours > self.max_daily_hours:
-                    result.overload_violations[teacher_id] = hours
+            if overload is not None:
+                result.overload_violations[teacher_id] = overload
         
         # Update overall validity
         result.is_valid = len(result.violations) == 0 and len(result.overload_violations) == 0
@@ -543,12 +857,16 @@ class SolutionValidator:
             'min_daily_hours': min(daily_hours.values()) if daily_hours else 0
         }
     
-    def _validate_curriculum_requirements(self, entries: List[EnhancedScheduleEntry]) -> List[ValidationViolation]:
+    def _validate_curriculum_requirements(self, entries: List[EnhancedScheduleEntry],
+                                          index: Optional[SolutionIndex] = None,
+                                          lookups: Optional[ValidationLookups] = None) -> List[ValidationViolation]:
         """
         Validate curriculum requirements are met
         
         Args:
             entries: Schedule entries to validate
+            index: Prebuilt solution index (built from entries if omitted)
+            lookups: Shared requirement cache (loaded here if needed)
             
         Returns:
             List of curriculum violations
@@ -558,113 +876,118 @@ class SolutionValidator:
         if not self.db_manager:
             return violations  # Cannot validate without database access
         
-        # Group entries by class and lesson
-        class_lesson_hours = defaultdict(lambda: defaultdict(int))
-        for entry in entries:
-            class_lesson_hours[entry.class_id][entry.lesson_id] += 1
+        index = index or SolutionIndex.build(entries)
+        lookups = (lookups or ValidationLookups()).load(self.db_manager)
         
-        # Check each class's curriculum requirements
-        classes = self.db_manager.get_all_classes()
-        for class_obj in classes:
-            class_id = class_obj.class_id
-            
-            # Get curriculum requirements for this class
-            assignments = self.db_manager.get_schedule_by_school_type()
-            class_assignments = [a for a in assignments if a.class_id == class_id]
-            
-            for assignment in class_assignments:
-                lesson_id = assignment.lesson_id
-                required_hours = self.db_manager.get_weekly_hours_for_lesson(lesson_id, class_obj.grade)
-                
-                if required_hours and required_hours > 0:
-                    scheduled_hours = class_lesson_hours[class_id].get(lesson_id, 0)
-                    
-                    if scheduled_hours < required_hours:
-                        lesson = self.db_manager.get_lesson_by_id(lesson_id)
-                        lesson_name = lesson.name if lesson else f"Lesson_{lesson_id}"
-                        
-                        violations.append(ValidationViolation(
-                            violation_type=ViolationType.CURRICULUM_VIOLATION,
-                            severity="critical",
-                            description=f"Class {class_obj.name} missing {required_hours - scheduled_hours} hours of {lesson_name}",
-                            affected_entries=[],
-                            context={
-                                "class_id": class_id,
-                                "lesson_id": lesson_id,
-                                "required_hours": required_hours,
-                                "scheduled_hours": scheduled_hours,
-                                "missing_hours": required_hours - scheduled_hours
-                            },
-                            suggested_fix=f"Schedule additional {required_hours - scheduled_hours} hours of {lesson_name}"
-                        ))
-                    elif scheduled_hours > required_hours:
-                        lesson = self.db_manager.get_lesson_by_id(lesson_id)
-                        lesson_name = lesson.name if lesson else f"Lesson_{lesson_id}"
-                        
-                        violations.append(ValidationViolation(
-                            violation_type=ViolationType.CURRICULUM_VIOLATION,
-                            severity="minor",
-                            description=f"Class {class_obj.name} has {scheduled_hours - required_hours} extra hours of {lesson_name}",
-                            affected_entries=[],
-                            context={
-                                "class_id": class_id,
-                                "lesson_id": lesson_id,
-                                "required_hours": required_hours,
-                                "scheduled_hours": scheduled_hours,
-                                "extra_hours": scheduled_hours - required_hours
-                            },
-                            suggested_fix=f"Remove {scheduled_hours - required_hours} hours of {lesson_name}"
-                        ))
+        for requirement in lookups.requirements:
+            scheduled_hours = index.class_lesson_hours.get(requirement.class_id, {}).get(requirement.lesson_id, 0)
+            violation = self._check_curriculum(requirement, scheduled_hours)
+            if violation:
+                violations.append(violation)
         
         return violations
     
-    def _validate_teacher_availability(self, entries: List[EnhancedScheduleEntry]) -> List[ValidationViolation]:
+    def _check_curriculum(self, requirement: Requirement, scheduled_hours: int) -> Optional[ValidationViolation]:
+        """
+        Compare scheduled and required hours of one (class, lesson)
+        
+        Returns:
+            Curriculum violation, or None if the counts match
+        """
+        class_id, lesson_id = requirement.class_id, requirement.lesson_id
+        required_hours, lesson_name = requirement.weekly_hours, requirement.lesson_name
+        
+        if scheduled_hours < required_hours:
+            return ValidationViolation(
+                violation_type=ViolationType.CURRICULUM_VIOLATION,
+                severity="critical",
+                description=f"Class {requirement.class_name} missing {required_hours - scheduled_hours} hours of {lesson_name}",
+                affected_entries=[],
+                context={
+                    "class_id": class_id,
+                    "lesson_id": lesson_id,
+                    "required_hours": required_hours,
+                    "scheduled_hours": scheduled_hours,
+                    "missing_hours": required_hours - scheduled_hours
+                },
+                suggested_fix=f"Schedule additional {required_hours - scheduled_hours} hours of {lesson_name}"
+            )
+        if scheduled_hours > required_hours:
+            return ValidationViolation(
+                violation_type=ViolationType.CURRICULUM_VIOLATION,
+                severity="minor",
+                description=f"Class {requirement.class_name} has {scheduled_hours - required_hours} extra hours of {lesson_name}",
+                affected_entries=[],
+                context={
+                    "class_id": class_id,
+                    "lesson_id": lesson_id,
+                    "required_hours": required_hours,
+                    "scheduled_hours": scheduled_hours,
+                    "extra_hours": scheduled_hours - required_hours
+                },
+                suggested_fix=f"Remove {scheduled_hours - required_hours} hours of {lesson_name}"
+            )
+        return None
+    
+    def _validate_teacher_availability(self, entries: List[EnhancedScheduleEntry],
+                                       index: Optional[SolutionIndex] = None,
+                                       lookups: Optional[ValidationLookups] = None) -> List[ValidationViolation]:
         """
         Validate teacher availability constraints
         
         Args:
             entries: Schedule entries to validate
+            index: Prebuilt solution index (built from entries if omitted)
+            lookups: Shared teacher/requirement cache
             
         Returns:
             List of availability violations
         """
         violations = []
         
+        index = index or SolutionIndex.build(entries)
+        lookups = lookups or ValidationLookups()
+        
+        # Check each teacher's schedule against availability
+        for teacher_id, teacher_entry_list in index.teacher_entries.items():
+            violations.extend(self._check_teacher_availability(teacher_id, teacher_entry_list, lookups))
+        
+        return violations
+    
+    def _check_teacher_availability(self, teacher_id: int, teacher_entry_list: List[EnhancedScheduleEntry],
+                                    lookups: ValidationLookups) -> List[ValidationViolation]:
+        """
+        Validate a single teacher's slots
+        
+        Returns:
+            List of availability violations for this teacher
+        """
+        violations = []
+        
         if not self.db_manager:
             return violations  # Cannot validate without database access
         
-        # Get teacher availability data
         try:
-            # This would need to be implemented based on your availability system
-            # For now, we'll do basic validation
-            
-            # Group entries by teacher
-            teacher_entries = defaultdict(list)
-            for entry in entries:
-                teacher_entries[entry.teacher_id].append(entry)
+            teacher = lookups.teacher(self.db_manager, teacher_id)
+            if not teacher:
+                return violations
             
-            # Check each teacher's schedule against availability
-            for teacher_id, teacher_entry_list in teacher_entries.items():
-                teacher = self.db_manager.get_teacher_by_id(teacher_id)
-                if not teacher:
-                    continue
-                
-                # Basic availability check - could be enhanced with actual availability data
-                for entry in teacher_entry_list:
-                    # Check for unreasonable scheduling (e.g., too early or too late)
-                    if entry.time_slot < 0 or entry.time_slot > 7:  # Assuming 8 slots per day (0-7)
-                        violations.append(ValidationViolation(
-                            violation_type=ViolationType.AVAILABILITY_VIOLATION,
-                            severity="major",
-                            description=f"Teacher {teacher.name} scheduled at invalid time slot {entry.time_slot}",
-                            affected_entries=[entry],
-                            context={
-                                "teacher_id": teacher_id,
-                                "day": entry.day,
-                                "time_slot": entry.time_slot
-                            },
-                            suggested_fix="Reschedule to valid time slot (0-7)"
-                        ))
+            # Basic availability check - could be enhanced with actual availability data
+            for entry in teacher_entry_list:
+                # Check for unreasonable scheduling (e.g., too early or too late)
+                if entry.time_slot < 0 or entry.time_slot > 7:  # Assuming 8 slots per day (0-7)
+                    violations.append(ValidationViolation(
+                        violation_type=ViolationType.AVAILABILITY_VIOLATION,
+                        severity="major",
+                        description=f"Teacher {teacher.name} scheduled at invalid time slot {entry.time_slot}",
+                        affected_entries=[entry],
+                        context={
+                            "teacher_id": teacher_id,
+                            "day": entry.day,
+                            "time_slot": entry.time_slot
+                        },
+                        suggested_fix="Reschedule to valid time slot (0-7)"
+                    ))
         
         except Exception as e:
             self.logger.warning(f"Could not validate teacher availability: {e}")
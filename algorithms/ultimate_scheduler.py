@@ -5,11 +5,14 @@ Ultimate Scheduler - Gerçek Backtracking + Gelişmiş Slot Optimizasyonu
 """
 
 import io
+import logging
 import sys
 from collections import defaultdict
 from copy import deepcopy
 from typing import Dict, List, Optional, Set, Tuple
 
+from algorithms.enhanced_logging import SolverLog
+
 # Set encoding for Windows
 if sys.platform.startswith("win"):
     if hasattr(sys.stdout, "reconfigure"):
@@ -59,6 +62,8 @@ class UltimateScheduler:
 
     def __init__(self, db_manager):
         self.db_manager = db_manager
+        self.logger = logging.getLogger(__name__)
+        self.solver_log = SolverLog(self.logger)
         self.time_slots_count = 7
         self.state = SchedulingState()
         self.lesson_requirements = []  # [(class_obj, lesson_info, remaining_hours)]
@@ -68,9 +73,9 @@ class UltimateScheduler:
 
     def generate_schedule(self) -> List[Dict]:
         """Ana program oluşturma fonksiyonu"""
-        print("\n" + "=" * 80)
-        print("🎯 ULTIMATE SCHEDULER - Backtracking + CSP + Forward Checking")
-        print("=" * 80)
+        self.logger.info("\n" + "=" * 80)
+        self.logger.info("🎯 ULTIMATE SCHEDULER - Backtracking + CSP + Forward Checking")
+        self.logger.info("=" * 80)
 
         # Hazırlık
         self.state = SchedulingState()
@@ -86,10 +91,10 @@ class UltimateScheduler:
         school_type = self.db_manager.get_school_type() or "Lise"
         self.time_slots_count = self.SCHOOL_TIME_SLOTS.get(school_type, 8)
 
-        print(f"\n📊 Konfigürasyon:")
-        print(f"   • Okul: {school_type} | Günlük Saat: {self.time_slots_count}")
-        print(f"   • Sınıf: {len(classes)} | Öğretmen: {len(teachers)}")
-        print(f"   • Atamalar: {len(assignments)}")
+        self.logger.info(f"\n📊 Konfigürasyon:")
+        self.logger.info(f"   • Okul: {school_type} | Günlük Saat: {self.time_slots_count}")
+        self.logger.info(f"   • Sınıf: {len(classes)} | Öğretmen: {len(teachers)}")
+        self.logger.info(f"   • Atamalar: {len(assignments)}")
 
         # Atama haritası
         assignment_map = {}
@@ -98,7 +103,7 @@ class UltimateScheduler:
             assignment_map[key] = assignment.teacher_id
 
         # 1. Ders gereksinimlerini topla
-        print(f"\n📝 1. Adım: Ders gereksinimleri toplanıyor...")
+        self.logger.info(f"\n📝 1. Adım: Ders gereksinimleri toplanıyor...")
         total_hours = 0
 
         for class_obj in classes:
@@ -119,39 +124,39 @@ class UltimateScheduler:
                 key = (class_obj.class_id, lesson_info["lesson_id"])
                 self.state.lesson_progress[key] = 0
 
-        print(f"   ✅ {len(self.lesson_requirements)} ders gereksinimi ({total_hours} saat)")
+        self.logger.info(f"   ✅ {len(self.lesson_requirements)} ders gereksinimi ({total_hours} saat)")
 
         # 2. Domain'leri hesapla (her ders için geçerli slotlar)
-        print(f"\n🔍 2. Adım: Domain'ler hesaplanıyor...")
+        self.logger.info(f"\n🔍 2. Adım: Domain'ler hesaplanıyor...")
         self._initialize_domains(classrooms)
-        print(f"   ✅ Domain'ler hazır")
+        self.logger.info(f"   ✅ Domain'ler hazır")
 
         # 3. Dersleri önceliklendir (MRV - Minimum Remaining Values)
-        print(f"\n🎯 3. Adım: Dersler önceliklendiriliyor (MRV)...")
+        self.logger.info(f"\n🎯 3. Adım: Dersler önceliklendiriliyor (MRV)...")
         self._prioritize_lessons()
-        print(f"   ✅ En kısıtlı dersler önce yerleştirilecek")
+        self.logger.info(f"   ✅ En kısıtlı dersler önce yerleştirilecek")
 
         # 4. CSP ile çöz (backtracking)
-        print(f"\n🚀 4. Adım: CSP çözücü başlatılıyor...")
+        self.logger.info(f"\n🚀 4. Adım: CSP çözücü başlatılıyor...")
         success = self._solve_csp(0, classrooms)
 
         # Sonuç
-        print(f"\n{'='*80}")
-        print(f"🎯 SONUÇ")
-        print(f"{'='*80}")
-        print(f"📊 Toplam Gereksinim: {total_hours} saat")
-        print(f"✅ Yerleştirilen: {len(self.state.assignments)} saat")
+        self.logger.info(f"\n{'='*80}")
+        self.logger.info(f"🎯 SONUÇ")
+        self.logger.info(f"{'='*80}")
+        self.logger.info(f"📊 Toplam Gereksinim: {total_hours} saat")
+        self.logger.info(f"✅ Yerleştirilen: {len(self.state.assignments)} saat")
         coverage = (len(self.state.assignments) / total_hours * 100) if total_hours > 0 else 0
-        print(f"📈 Kapsama: {coverage:.1f}%")
-        print(f"🔄 Backtrack Sayısı: {self.backtrack_count}")
+        self.logger.info(f"📈 Kapsama: {coverage:.1f}%")
+        self.logger.info(f"🔄 Backtrack Sayısı: {self.backtrack_count}")
 
         if success:
-            print(f"\n🎉 BAŞARILI! Tüm dersler yerleştirildi!")
+            self.logger.info(f"\n🎉 BAŞARILI! Tüm dersler yerleştirildi!")
         else:
-            print(f"\n⚠️  Bazı dersler yerleştirilemedi (max backtrack limiti)")
+            self.logger.info(f"\n⚠️  Bazı dersler yerleştirilemedi (max backtrack limiti)")
 
         # Veritabanına kaydet
-        print(f"\n💾 Veritabanına kaydediliyor...")
+        self.logger.info(f"\n💾 Veritabanına kaydediliyor...")
         self.db_manager.clear_schedule()
 
         saved_count = 0
@@ -166,7 +171,7 @@ class UltimateScheduler:
             ):
                 saved_count += 1
 
-        print(f"✅ {saved_count} program girişi kaydedildi")
+        self.logger.info(f"✅ {saved_count} program girişi kaydedildi")
 
         return self.state.assignments
 
@@ -177,7 +182,7 @@ class UltimateScheduler:
         for lesson in lessons:
             assignment_key = (class_obj.class_id, lesson.lesson_id)
             if assignment_key in assignment_map:
-                weekly_hours = self.db_manager.get_weekly_hours_for_lesson(lesson.lesson_id, class_obj.grade)
+                weekly_hours = self.db_manager.get_requirement_table().weekly_hours(class_obj.class_id, lesson.lesson_id)
 
                 if weekly_hours and weekly_hours > 0:
                     teacher_id = assignment_map[assignment_key]
@@ -254,7 +259,9 @@ class UltimateScheduler:
 
         # Backtrack limiti kontrolü
         if self.backtrack_count >= self.max_backtracks:
-            print(f"   ⚠️  Max backtrack limitine ulaşıldı ({self.max_backtracks})")
+            self.solver_log.progress(
+                "   ⚠️  Max backtrack limitine ulaşıldı (%d)", self.max_backtracks, level=logging.WARNING
+            )
             return False
 
         # Mevcut dersi al
@@ -275,8 +282,8 @@ class UltimateScheduler:
 
         # İlerleme gösterimi
         if index % 5 == 0 and len(self.lesson_requirements) > 0:
-            progress = index / len(self.lesson_requirements) * 100
-            print(f"   📊 İlerleme: {progress:.0f}% ({index}/{len(self.lesson_requirements)} ders)")
+            total = len(self.lesson_requirements)
+            self.solver_log.progress("   📊 İlerleme: %.0f%% (%d/%d ders)", index / total * 100, index, total)
 
         # Domain'den slot seç (LCV - Least Constraining Value)
         domain = self._get_current_domain(class_id, lesson_id, teacher_id)
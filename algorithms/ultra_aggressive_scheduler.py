@@ -214,7 +214,7 @@ class UltraAggressiveScheduler:
             for lesson in config["lessons"]:
                 key = (class_obj.class_id, lesson.lesson_id)
                 if key in config["assignment_map"]:
-                    weekly_hours = self.db_manager.get_weekly_hours_for_lesson(lesson.lesson_id, class_obj.grade)
+                    weekly_hours = self.db_manager.get_requirement_table().weekly_hours(class_obj.class_id, lesson.lesson_id)
                     if weekly_hours:
                         class_required += weekly_hours
                         total_required += weekly_hours
@@ -381,7 +381,7 @@ class UltraAggressiveScheduler:
                 continue
 
             teacher_id = config["assignment_map"][key]
-            weekly_hours = self.db_manager.get_weekly_hours_for_lesson(lesson.lesson_id, class_obj.grade)
+            weekly_hours = self.db_manager.get_requirement_table().weekly_hours(class_obj.class_id, lesson.lesson_id)
             if not weekly_hours:
                 continue
 
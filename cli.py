@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Class Scheduling Program - Headless command line
+Programları arayüz açmadan oluşturur; gece toplu yeniden oluşturma için birden
+çok okul veritabanını süreç havuzunda eşzamanlı işler; ``serve`` aynı işleri
+yerel bir HTTP servisi üzerinden kuyruğa alır. PyQt5 içe aktarılmaz.
+
+Usage:
+    python main.py generate --db okul.db --algorithm simple_perfect --deadline 600
+    python main.py generate --manifest okullar.txt --workers 4 --output sonuc.json
+    python cli.py generate --db a.db --db b.db --algorithm auto
+    python main.py serve --port 8765 --workers 4 --root /srv/okullar
+
+Manifest: one database path per line ('#' starts a comment), or a JSON list of
+paths / objects ``{"db": ..., "algorithm": ..., "deadline": ..., "school_type": ...}``.
+Relative paths are resolved against the manifest's directory.
+
+Exit codes: 0 all complete, 1 error, 2 usage, 3 incomplete timetable,
+4 infeasible instance, 5 deadline exceeded, 6 cancelled (the most severe job wins).
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from algorithms.generation_jobs import (  # noqa: E402
+    AUTO_ALGORITHM,
+    DEFAULT_ALGORITHM,
+    STATUS_CANCELLED,
+    STATUS_ERROR,
+    STATUS_INCOMPLETE,
+    STATUS_INFEASIBLE,
+    STATUS_OK,
+    STATUS_TIMEOUT,
+    GenerationJob,
+    GenerationResult,
+    run_batch,
+    summarize,
+)
+from algorithms.scheduler_registry import get_scheduler_registry  # noqa: E402
+
+logger = logging.getLogger("cli")
+
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_USAGE = 2
+EXIT_INCOMPLETE = 3
+EXIT_INFEASIBLE = 4
+EXIT_TIMEOUT = 5
+EXIT_CANCELLED = 6
+
+# Birden çok iş varsa en ağır sonuç çıkış kodunu belirler (sıra: hafiften ağıra)
+STATUS_EXIT_CODES = {
+    STATUS_OK: EXIT_OK,
+    STATUS_INCOMPLETE: EXIT_INCOMPLETE,
+    STATUS_INFEASIBLE: EXIT_INFEASIBLE,
+    STATUS_TIMEOUT: EXIT_TIMEOUT,
+    STATUS_CANCELLED: EXIT_CANCELLED,
+    STATUS_ERROR: EXIT_ERROR,
+}
+_SEVERITY = list(STATUS_EXIT_CODES)
+
+
+class ManifestError(ValueError):
+    """The manifest cannot be read or has an invalid entry"""
+
+
+def algorithm_names() -> List[str]:
+    """Values accepted by ``--algorithm``"""
+    return [AUTO_ALGORITHM, *get_scheduler_registry().names()]
+
+
+def read_manifest(
+    path: str, algorithm: str = DEFAULT_ALGORITHM, deadline: Optional[float] = None, school_type: Optional[str] = None
+) -> List[GenerationJob]:
+    """
+    Read generation jobs from a manifest file
+
+    Args:
+        path: Text (one path per line) or JSON manifest
+        algorithm: Default algorithm of entries without one
+        deadline: Default deadline of entries without one
+        school_type: Default school type of entries without one
+
+    Returns:
+        GenerationJob list in manifest order
+    """
+    base = os.path.dirname(os.path.abspath(path))
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+    except OSError as e:
+        raise ManifestError(f"Cannot read manifest {path}: {e}") from e
+
+    if text.lstrip().startswith("["):
+        try:
+            entries = json.loads(text)
+        except ValueError as e:
+            raise ManifestError(f"Invalid JSON manifest {path}: {e}") from e
+    else:
+        entries = [line.split("#", 1)[0].strip() for line in text.splitlines()]
+        entries = [entry for entry in entries if entry]
+
+    jobs = []
+    for index, entry in enumerate(entries, 1):
+        if isinstance(entry, str):
+            entry = {"db": entry}
+        if not isinstance(entry, dict) or not entry.get("db"):
+            raise ManifestError(f"{path}: entry {index} has no 'db' path")
+        jobs.append(
+            GenerationJob(
+                db_path=os.path.join(base, os.path.expanduser(entry["db"])),
+                algorithm=entry.get("algorithm", algorithm),
+                deadline=entry.get("deadline", deadline),
+                school_type=entry.get("school_type", school_type),
+            )
+        )
+    return jobs
+
+
+def exit_code(results: Sequence[GenerationResult]) -> int:
+    """Exit code of the most severe result (0 for an empty batch)"""
+    worst = max((_SEVERITY.index(result.status) for result in results), default=0)
+    return STATUS_EXIT_CODES[_SEVERITY[worst]]
+
+
+def build_report(results: Sequence[GenerationResult], workers: int, deadline: Optional[float]) -> Dict:
+    """JSON-serialisable batch summary"""
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "workers": workers,
+        "deadline_s": deadline,
+        "summary": summarize(results),
+        "exit_code": exit_code(results),
+        "results": [result.to_dict() for result in results],
+    }
+
+
+def _format_result(result: GenerationResult) -> str:
+    text = f"{result.status:<10} {result.db_path}"
+    if result.scheduler:
+        text += f" [{result.scheduler}]"
+    if result.status in (STATUS_OK, STATUS_INCOMPLETE):
+        text += f" {result.placements}/{result.required_hours} h ({result.coverage:.1%})"
+    text += f" {result.wall_time_s:.1f}s"
+    if result.error:
+        text += f" - {result.error}"
+    return text
+
+
+def cmd_generate(args) -> int:
+    """``generate`` subcommand"""
+    names = algorithm_names()
+    jobs = [
+        GenerationJob(os.path.abspath(path), args.algorithm, args.deadline, args.school_type) for path in args.db or []
+    ]
+    if args.manifest:
+        try:
+            jobs.extend(read_manifest(args.manifest, args.algorithm, args.deadline, args.school_type))
+        except ManifestError as e:
+            logger.error(str(e))
+            return EXIT_USAGE
+    if not jobs:
+        logger.error("Nothing to do: give --db and/or --manifest")
+        return EXIT_USAGE
+    unknown = sorted({job.algorithm for job in jobs if job.algorithm not in names})
+    if unknown:
+        logger.error(f"Unknown algorithm(s): {', '.join(unknown)} (choose from: {', '.join(names)})")
+        return EXIT_USAGE
+
+    workers = max(1, min(args.workers or os.cpu_count() or 1, len(jobs)))
+    logger.info(f"Generating {len(jobs)} timetable(s) with {workers} worker(s)")
+
+    def on_progress(job: GenerationJob, message: str, percentage: float):
+        logger.debug(f"{os.path.basename(job.db_path)} {percentage:5.1f}% {message}")
+
+    def on_result(job: GenerationJob, result: GenerationResult):
+        logger.info(_format_result(result))
+
+    log_level = logging.DEBUG if args.debug else logging.WARNING
+    results = run_batch(jobs, workers, on_progress, on_result, log_level)
+    report = build_report(results, workers, args.deadline)
+
+    if args.output:
+        directory = os.path.dirname(os.path.abspath(args.output))
+        os.makedirs(directory, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        logger.info(f"Results written to {args.output}")
+    else:
+        json.dump(report, sys.stdout, indent=2, ensure_ascii=False)
+        sys.stdout.write("\n")
+
+    logger.info(
+        "Summary: " + ", ".join(f"{status} {count}" for status, count in report["summary"].items())
+        + f" (exit code {report['exit_code']})"
+    )
+    return report["exit_code"]
+
+
+def cmd_serve(args) -> int:
+    """``serve`` subcommand: run the local generation service until interrupted"""
+    import signal
+    import threading
+
+    from algorithms.generation_service import GenerationService
+
+    service = GenerationService(
+        workers=args.workers or 2,
+        max_queue=args.queue_size,
+        default_deadline=args.deadline,
+        roots=args.root,
+        log_level=logging.DEBUG if args.debug else logging.WARNING,
+    )
+    try:
+        service.serve(port=args.port, host=args.host)
+    except OSError as e:
+        logger.error(f"Cannot listen on {args.host}:{args.port}: {e}")
+        return EXIT_ERROR
+    logger.info(f"Serving databases under: {', '.join(service.roots)}")
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    try:
+        while not stop.wait(1.0):
+            pass
+    except KeyboardInterrupt:
+        pass
+    logger.info("Shutting down generation service...")
+    service.shutdown()
+    return EXIT_OK
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="main.py", description="Class Scheduling Program (headless)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    generate = subparsers.add_parser("generate", help="Generate timetables without the GUI")
+    generate.add_argument("--db", action="append", metavar="PATH", help="School database (repeatable)")
+    generate.add_argument("--manifest", metavar="PATH", help="File listing many databases (text or JSON)")
+    generate.add_argument(
+        "--algorithm",
+        default=DEFAULT_ALGORITHM,
+        help=f"Scheduler registry name or '{AUTO_ALGORITHM}' (default: {DEFAULT_ALGORITHM})",
+    )
+    generate.add_argument("--workers", type=int, default=None, metavar="N", help="Concurrent processes (default: CPUs)")
+    generate.add_argument("--deadline", type=float, default=None, metavar="S", help="Per-database time limit in seconds")
+    generate.add_argument("--school-type", default=None, help="Override the school type stored in each database")
+    generate.add_argument("--output", default=None, metavar="PATH", help="Write the JSON summary here (default: stdout)")
+    generate.add_argument("--debug", action="store_true", help="Verbose logs, including worker progress")
+    generate.set_defaults(func=cmd_generate)
+
+    serve = subparsers.add_parser("serve", help="Local HTTP service that queues generation jobs")
+    serve.add_argument("--host", default="127.0.0.1", help="Bind address (default: 127.0.0.1)")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--workers", type=int, default=None, metavar="N", help="Jobs run at the same time (default: 2)")
+    serve.add_argument("--queue-size", type=int, default=32, metavar="N", help="Waiting jobs before new ones get 503")
+    serve.add_argument("--deadline", type=float, default=None, metavar="S", help="Default per-job time limit in seconds")
+    serve.add_argument(
+        "--root", action="append", metavar="DIR", help="Directory jobs may use databases from (repeatable, default: cwd)"
+    )
+    serve.add_argument("--debug", action="store_true", help="Verbose logs")
+    serve.set_defaults(func=cmd_serve)
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    # Özet JSON stdout'a yazılabildiği için loglar stderr'e gider
+    logging.basicConfig(
+        level=logging.DEBUG if args.debug else logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+        stream=sys.stderr,
+    )
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.deadline is not None and args.deadline <= 0:
+        parser.error("--deadline must be positive")
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""
+Schedule change feed - revision counter and per-entry delta log.
+Written by ScheduleRepository mutations so that viewers can refresh only what changed.
+One log follows the schedule program (timetable) table, another the
+schedule_entries (assignments) table.
+"""
+
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, List, Optional, Tuple
+
+# Operation types recorded in the log
+OP_ADD = "add"
+OP_UPDATE = "update"
+OP_DELETE = "delete"
+OP_RESET = "reset"
+
+
+@dataclass(frozen=True)
+class ScheduleChange:
+    """A single change to a schedule table."""
+
+    revision: int
+    op: str
+    entry_id: Optional[int] = None
+    class_id: Optional[int] = None
+    teacher_id: Optional[int] = None
+    lesson_id: Optional[int] = None
+    classroom_id: Optional[int] = None
+    day: Optional[int] = None
+    time_slot: Optional[int] = None
+    school_type: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        """Return the entry fields in the dict shape used by the schedulers."""
+        return {
+            "entry_id": self.entry_id,
+            "class_id": self.class_id,
+            "teacher_id": self.teacher_id,
+            "lesson_id": self.lesson_id,
+            "classroom_id": self.classroom_id,
+            "day": self.day,
+            "time_slot": self.time_slot,
+        }
+
+
+class ScheduleChangeLog:
+    """
+    Thread-safe, bounded change log with a monotonically increasing revision.
+
+    Readers remember the last revision they saw and call ``changes_since``.
+    When the requested revision has already been evicted from the log (or a
+    bulk operation reset the table) the reader gets ``None`` and must reload
+    the full program once.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        """
+        Initialize change log
+
+        Args:
+            max_entries: Maximum number of deltas kept in memory
+        """
+        self._lock = threading.Lock()
+        self._changes: Deque[ScheduleChange] = deque(maxlen=max_entries)
+        self._revision = 0
+        # Oldest revision a reader may still resume from
+        self._base_revision = 0
+
+    @property
+    def revision(self) -> int:
+        """Current schedule revision"""
+        return self._revision
+
+    def record(self, op: str, entry_id: Optional[int] = None, **fields) -> int:
+        """
+        Record a per-entry change and bump the revision
+
+        Args:
+            op: One of OP_ADD, OP_UPDATE, OP_DELETE
+            entry_id: Schedule row ID
+            **fields: class_id, teacher_id, lesson_id, classroom_id, day, time_slot
+
+        Returns:
+            New revision number
+        """
+        with self._lock:
+            self._revision += 1
+            if len(self._changes) == self._changes.maxlen:
+                # The oldest delta is about to be evicted
+                self._base_revision = self._changes[0].revision
+            self._changes.append(ScheduleChange(self._revision, op, entry_id, **fields))
+            return self._revision
+
+    def reset(self) -> int:
+        """
+        Record a bulk change (table cleared, cascading deletes, ...)
+
+        Readers older than this revision have to reload everything.
+
+        Returns:
+            New revision number
+        """
+        with self._lock:
+            self._revision += 1
+            self._changes.clear()
+            self._changes.append(ScheduleChange(self._revision, OP_RESET))
+            self._base_revision = self._revision - 1
+            return self._revision
+
+    def changes_since(self, revision: int) -> Tuple[Optional[List[ScheduleChange]], int]:
+        """
+        Get the deltas recorded after ``revision``
+
+        Args:
+            revision: Last revision seen by the caller
+
+        Returns:
+            (changes, current_revision) tuple. ``changes`` is None when the
+            caller has to reload the full program.
+        """
+        with self._lock:
+            current = self._revision
+            if revision == current:
+                return [], current
+            if revision < self._base_revision or revision > current:
+                return None, current
+            changes = [c for c in self._changes if c.revision > revision]
+            if any(c.op == OP_RESET for c in changes):
+                return None, current
+            return changes, current
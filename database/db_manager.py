@@ -6,13 +6,27 @@ import os
 import secrets
 import sqlite3
 import threading
-from typing import List, Optional, Union
+from typing import List, Optional, Sequence, Tuple, Union
 
 from database.models import Class, Classroom, Curriculum, Lesson, ScheduleEntry, Teacher, User
 from database.repositories.teacher_repository import TeacherRepository
 from database.repositories.lesson_repository import LessonRepository
 from database.repositories.class_repository import ClassRepository
 from database.repositories.schedule_repository import ScheduleRepository
+from database.query_monitor import query_scope
+from database.requirement_table import RequirementTable
+from utils.cache_manager import ReadThroughCache
+from utils.memory_budget import get_memory_budget
+from utils.metrics_registry import track_cache
+from utils.teacher_assignment import TeacherAssignmentEngine, weekly_slot_count
+
+def _evict_cache_entries(cache: ReadThroughCache, target_bytes: int) -> int:
+    """Memory budget evictor: drop least recently used cached reads"""
+    if not cache.size():
+        return 0
+    per_entry = max(1, cache.approximate_bytes() // cache.size())
+    return cache.evict(-(-target_bytes // per_entry)) * per_entry
+
 
 # Import password hasher utility
 try:
@@ -31,6 +45,13 @@ class DatabaseManager:
         self.db_path = db_path
         self.local = threading.local()  # Thread-local storage for connections
 
+        # Okuma önbelleği: sık kullanılan getter'lar; repository yazma metotları etiketle geçersiz kılar
+        self.cache = ReadThroughCache()
+        track_cache("db", self.cache)
+        get_memory_budget().register(
+            "db_cache", self.cache, ReadThroughCache.approximate_bytes, _evict_cache_entries, value=0.1
+        )
+
         # Instantiate repositories with the manager itself for thread-safe connection handling
         self.teachers = TeacherRepository(self)
         self.lessons = LessonRepository(self)
@@ -95,8 +116,27 @@ class DatabaseManager:
                 return False
         return False
 
+    def _cached(self, key: tuple, loader, *tags: str):
+        """Read-through lookup in ``self.cache`` (see ``ReadThroughCache.get_or_load``)"""
+        return self.cache.get_or_load(key, loader, tags)
+
+    def invalidate_cache(self, *tags: str) -> int:
+        """Drop cached reads carrying one of ``tags``; without tags clear the whole cache."""
+        if not tags:
+            size = self.cache.size()
+            self.cache.clear()
+            return size
+        return self.cache.invalidate(*tags)
+
+    def get_cache_stats(self) -> dict:
+        """Hit/miss statistics of the read cache."""
+        return self.cache.get_stats()
+
     def get_school_type(self) -> Optional[str]:
         """Get the school type from settings."""
+        return self._cached(("setting", "school_type"), self._load_school_type, "setting:school_type")
+
+    def _load_school_type(self) -> Optional[str]:
         if not self._ensure_connection():
             return None
         try:
@@ -124,6 +164,8 @@ class DatabaseManager:
         except sqlite3.Error as e:
             logging.error(f"Error setting school type: {e}")
             return False
+        finally:
+            self.cache.invalidate("setting:school_type")
 
     def get_setting(self, key: str) -> Optional[Union[str, dict, list]]:
         """Get a setting value from the database."""
@@ -169,6 +211,8 @@ class DatabaseManager:
         except sqlite3.Error as e:
             logging.error(f"Error setting setting '{key}': {e}")
             return False
+        finally:
+            self.cache.invalidate(f"setting:{key}")
 
     def _get_current_school_type(self, default="Lise") -> str:
         """Get the current school type from settings, returning a default if not set."""
@@ -363,7 +407,7 @@ class DatabaseManager:
     def get_all_lessons(self) -> List[Lesson]:
         """Get all unique lessons for the current school type via repository."""
         school_type = self._get_current_school_type()
-        return self.lessons.get_all_lessons(school_type)
+        return self._cached(("all_lessons", school_type), lambda: self.lessons.get_all_lessons(school_type), "lessons")
 
     def update_lesson(self, lesson_id: int, name: str) -> bool:
         """Update a lesson's name via repository."""
@@ -376,7 +420,11 @@ class DatabaseManager:
     def get_curriculum_for_lesson(self, lesson_id: int) -> List[Curriculum]:
         """Get all curriculum entries for a specific lesson via repository."""
         school_type = self._get_current_school_type()
-        return self.lessons.get_curriculum_for_lesson(lesson_id, school_type)
+        return self._cached(
+            ("curriculum_for_lesson", lesson_id, school_type),
+            lambda: self.lessons.get_curriculum_for_lesson(lesson_id, school_type),
+            "curriculum",
+        )
 
     def add_lesson_weekly_hours(self, lesson_id: int, grade: int, school_type: str, weekly_hours: int) -> bool:
         """Add or update weekly hours for a lesson at a specific grade via repository."""
@@ -390,17 +438,30 @@ class DatabaseManager:
     def get_weekly_hours_for_lesson(self, lesson_id: int, grade: int) -> Optional[int]:
         """Get the weekly hours for a specific lesson and grade via repository."""
         school_type = self._get_current_school_type()
-        return self.lessons.get_weekly_hours_for_lesson(lesson_id, grade, school_type)
+        return self._cached(
+            ("weekly_hours", lesson_id, grade, school_type),
+            lambda: self.lessons.get_weekly_hours_for_lesson(lesson_id, grade, school_type),
+            "curriculum",
+        )
+
+    def get_requirement_table(self) -> RequirementTable:
+        """Get the materialized (class, lesson) requirement table for the current school type via repository."""
+        school_type = self._get_current_school_type()
+        return self._cached(
+            ("requirements", school_type),
+            lambda: self.lessons.get_requirement_table(school_type),
+            "classes", "lessons", "curriculum", "assignments",
+        )
 
     def get_all_teachers(self) -> List[Teacher]:
         """Get all teachers for the current school type via repository."""
         school_type = self._get_current_school_type()
-        return self.teachers.get_all_teachers(school_type)
+        return self._cached(("all_teachers", school_type), lambda: self.teachers.get_all_teachers(school_type), "teachers")
 
     def get_all_classes(self) -> List[Class]:
         """Get all classes for the current school type via repository."""
         school_type = self._get_current_school_type()
-        return self.classes.get_all_classes(school_type)
+        return self._cached(("all_classes", school_type), lambda: self.classes.get_all_classes(school_type), "classes")
 
     def get_schedule_by_school_type(self) -> List[ScheduleEntry]:
         """Get all schedule entries for the current school type (assignments) via repository."""
@@ -412,26 +473,50 @@ class DatabaseManager:
         school_type = self._get_current_school_type()
         return self.schedule.get_schedule_program_by_school_type(school_type)
 
+    def get_schedule_revision(self) -> int:
+        """Get the current schedule program revision via repository."""
+        return self.schedule.get_schedule_revision()
+
+    def get_schedule_changes_since(self, revision: int):
+        """Get schedule program deltas recorded after a revision via repository."""
+        return self.schedule.get_schedule_changes_since(revision)
+
+    def get_assignment_revision(self) -> int:
+        """Get the current schedule_entries (assignments) revision via repository."""
+        return self.schedule.get_assignment_revision()
+
+    def get_assignment_changes_since(self, revision: int):
+        """Get assignment deltas recorded after a revision via repository."""
+        return self.schedule.get_assignment_changes_since(revision)
+
     def get_lesson_by_id(self, lesson_id: int) -> Optional[Lesson]:
         """Get a lesson by its ID via repository."""
-        return self.lessons.get_lesson_by_id(lesson_id)
+        return self._cached(("lesson", lesson_id), lambda: self.lessons.get_lesson_by_id(lesson_id), f"lesson:{lesson_id}")
 
     def get_lesson_by_name(self, name: str) -> Optional[Lesson]:
         """Get a lesson by its name for the current school type via repository."""
         school_type = self._get_current_school_type()
-        return self.lessons.get_lesson_by_name(name, school_type)
+        return self._cached(
+            ("lesson_by_name", name, school_type), lambda: self.lessons.get_lesson_by_name(name, school_type), "lessons"
+        )
 
     def get_teacher_by_id(self, teacher_id: int) -> Optional[Teacher]:
         """Get a teacher by its ID via repository."""
-        return self.teachers.get_teacher_by_id(teacher_id)
+        return self._cached(
+            ("teacher", teacher_id), lambda: self.teachers.get_teacher_by_id(teacher_id), f"teacher:{teacher_id}"
+        )
 
     def get_class_by_id(self, class_id: int) -> Optional[Class]:
         """Get a class by its ID via repository."""
-        return self.classes.get_class_by_id(class_id)
+        return self._cached(("class", class_id), lambda: self.classes.get_class_by_id(class_id), f"class:{class_id}")
 
     def get_classroom_by_id(self, classroom_id: int) -> Optional[Classroom]:
         """Get a classroom by its ID via repository."""
-        return self.classes.get_classroom_by_id(classroom_id)
+        return self._cached(
+            ("classroom", classroom_id),
+            lambda: self.classes.get_classroom_by_id(classroom_id),
+            f"classroom:{classroom_id}",
+        )
 
     def add_schedule_entry(
         self,
@@ -446,6 +531,11 @@ class DatabaseManager:
         school_type = self._get_current_school_type()
         return self.schedule.add_schedule_entry(class_id, teacher_id, lesson_id, classroom_id, day, time_slot, school_type)
 
+    def add_schedule_entries(self, entries: Sequence[Tuple[int, int, int, int, int, int]]) -> List[int]:
+        """Add many assignments (class_id, teacher_id, lesson_id, classroom_id, day, time_slot) in one transaction."""
+        school_type = self._get_current_school_type()
+        return self.schedule.add_schedule_entries(entries, school_type)
+
     def add_schedule_by_school_type(
         self,
         class_id: int,
@@ -471,6 +561,11 @@ class DatabaseManager:
         school_type = self._get_current_school_type()
         return self.schedule.add_schedule_program_entry(class_id, teacher_id, lesson_id, classroom_id, day, time_slot, school_type)
 
+    def replace_schedule(self, entries: Sequence[Tuple[int, int, int, int, int, int]]) -> Optional[List[int]]:
+        """Replace the timetable with (class_id, teacher_id, lesson_id, classroom_id, day, time_slot) rows in one transaction."""
+        school_type = self._get_current_school_type()
+        return self.schedule.replace_schedule_program(entries, school_type)
+
     def get_schedule_for_specific_class(self, class_id: int) -> List[ScheduleEntry]:
         """Get schedule program for a specific class (from schedule table) via repository."""
         school_type = self._get_current_school_type()
@@ -545,6 +640,14 @@ class DatabaseManager:
         """Set teacher availability for a specific day and time slot via repository."""
         return self.teachers.set_teacher_availability(teacher_id, day, time_slot, is_available)
 
+    def get_instance_counts(self) -> dict:
+        """Get row counts and curriculum hours of the current school type with COUNT(*) queries via repository."""
+        return self.schedule.get_instance_counts(self._get_current_school_type())
+
+    def get_teacher_unavailable_slots(self) -> dict:
+        """Get {teacher_id: {(day, time_slot), ...}} of all unavailable slots in one query via repository."""
+        return self.teachers.get_unavailable_slots()
+
     def is_teacher_available(self, teacher_id: int, day: int, time_slot: int) -> bool:
         """Check if a teacher is available at a specific day and time slot via repository."""
         return self.teachers.is_teacher_available(teacher_id, day, time_slot)
@@ -552,7 +655,9 @@ class DatabaseManager:
     def get_all_classrooms(self) -> List[Classroom]:
         """Get all classrooms for the current school type via repository."""
         school_type = self._get_current_school_type()
-        return self.classes.get_all_classrooms(school_type)
+        return self._cached(
+            ("all_classrooms", school_type), lambda: self.classes.get_all_classrooms(school_type), "classrooms"
+        )
 
     def get_user(self, username: str, password: str) -> Optional[User]:
         """Get a user by username and password"""
@@ -636,7 +741,7 @@ class DatabaseManager:
     def get_all_curriculum(self) -> List[Curriculum]:
         """Get all curriculum entries for the current school type via repository."""
         school_type = self._get_current_school_type()
-        return self.lessons.get_all_curriculum(school_type)
+        return self._cached(("all_curriculum", school_type), lambda: self.lessons.get_all_curriculum(school_type), "curriculum")
 
     def find_missing_assignments(self) -> dict:
         """
@@ -653,48 +758,26 @@ class DatabaseManager:
             return {}
 
         result = {}
+        classes_by_id = {c.class_id: c for c in self.get_all_classes()}
 
-        # Get all classes
-        all_classes = self.get_all_classes()
-
-        # Get all curriculum entries
-        all_curriculum = self.get_all_curriculum()
-
-        # Get all current assignments
-        all_assignments = self.get_schedule_by_school_type()
-
-        # Create a set of (class_id, lesson_id) for quick lookup
-        assigned_combinations = set()
-        for assignment in all_assignments:
-            assigned_combinations.add((assignment.class_id, assignment.lesson_id))
-
-        # For each class, find missing lessons
-        for class_obj in all_classes:
-            missing_lessons = []
-
-            # Get curriculum for this grade
-            grade_curriculum = [c for c in all_curriculum if c.grade == class_obj.grade]
-
-            for curriculum_entry in grade_curriculum:
-                # Check if this lesson is assigned to this class
-                if (class_obj.class_id, curriculum_entry.lesson_id) not in assigned_combinations:
-                    # This lesson is missing
-                    lesson = self.get_lesson_by_id(curriculum_entry.lesson_id)
-                    if lesson:
-                        missing_lessons.append((curriculum_entry.lesson_id, lesson.name, curriculum_entry.weekly_hours))
+        # Atanmamış müfredat satırları, sınıf başına curriculum sırasıyla (lesson_id)
+        for requirement in sorted(self.get_requirement_table().missing(), key=lambda r: r.lesson_id):
+            class_obj = classes_by_id.get(requirement.class_id)
+            if class_obj is None:
+                continue
+            entry = result.setdefault(class_obj.class_id, {"class": class_obj, "missing_lessons": []})
+            entry["missing_lessons"].append((requirement.lesson_id, requirement.lesson_name, requirement.weekly_hours))
 
-            if missing_lessons:
-                result[class_obj.class_id] = {
-                    "class": class_obj,
-                    "missing_lessons": missing_lessons,
-                }
-
-        return result
+        # Sınıf sırasını get_all_classes ile aynı tut
+        return {class_id: result[class_id] for class_id in classes_by_id if class_id in result}
 
+    @query_scope("auto_fill_assignments")
     def auto_fill_assignments(self) -> dict:
         """
         Automatically fill missing lesson assignments.
-        Tries to match teachers by subject.
+        Matches teachers by subject within their weekly capacity, balancing loads
+        (min-cost flow, see utils/teacher_assignment.py), and writes all new
+        assignments in one transaction.
         Returns a dictionary with assignment results:
         {
             'success': [(class_name, lesson_name, teacher_name), ...],
@@ -706,92 +789,43 @@ class DatabaseManager:
 
         result = {"success": [], "failed": []}
 
-        # Find missing assignments
-        missing_data = self.find_missing_assignments()
-
-        if not missing_data:
+        requirements = self.get_requirement_table()
+        missing = requirements.missing()
+        if not missing:
             return result
 
-        # Get all teachers
+        # Öğretmen kapasitesi: haftalık ders saati - kapalı saatler
         all_teachers = self.get_all_teachers()
+        weekly_slots = weekly_slot_count(self._get_current_school_type())
+        unavailable = self.teachers.get_unavailable_slot_counts()
+        capacity = {t.teacher_id: weekly_slots - unavailable.get(t.teacher_id, 0) for t in all_teachers}
 
-        # Get all current assignments to calculate teacher workload
-        all_assignments = self.get_schedule_by_school_type()
-
-        # Calculate workload for each teacher (total weekly hours)
-        teacher_workload = {}
-        for teacher in all_teachers:
-            total_hours = 0
-            for assignment in all_assignments:
-                if assignment.teacher_id == teacher.teacher_id:
-                    # Get the class to determine grade
-                    class_obj = self.get_class_by_id(assignment.class_id)
-                    if class_obj:
-                        # Get weekly hours for this lesson
-                        weekly_hours = self.get_weekly_hours_for_lesson(assignment.lesson_id, class_obj.grade)
-                        if weekly_hours:
-                            total_hours += weekly_hours
-            teacher_workload[teacher.teacher_id] = total_hours
+        # Tüm eksik atamalar tek seferde: branş uyumu + kapasite + dengeli yük (min-cost flow)
+        engine = TeacherAssignmentEngine(all_teachers, requirements.teacher_hours(), capacity)
+        plan = engine.solve(missing)
 
         # Default classroom (assuming ID 1 exists)
         default_classroom_id = 1
 
-        # For each class with missing lessons
-        for class_id, data in missing_data.items():
-            class_obj = data["class"]
-            missing_lessons = data["missing_lessons"]
-
-            for lesson_id, lesson_name, weekly_hours in missing_lessons:
-                # Try to find a suitable teacher
-                # Match by subject name (e.g., "Matematik" lesson needs "Matematik" teacher)
-                suitable_teachers = [
-                    t
-                    for t in all_teachers
-                    if t.subject.lower() in lesson_name.lower() or lesson_name.lower() in t.subject.lower()
-                ]
-
-                if not suitable_teachers:
-                    # No exact match, try more flexible matching
-                    # For example, "Fen Bilimleri" could match "Fen" or "Fizik" teachers
-                    for teacher in all_teachers:
-                        # Check if any word from lesson name is in teacher's subject
-                        lesson_words = lesson_name.lower().split()
-                        subject_words = teacher.subject.lower().split()
-                        if any(word in subject_words for word in lesson_words if len(word) > 3):
-                            suitable_teachers.append(teacher)
-                            break
-
-                if suitable_teachers:
-                    # DENGELI DAĞITIM: En az yüklü öğretmeni seç
-                    # Öğretmenleri yüke göre sırala (en az yüklü önce)
-                    suitable_teachers.sort(key=lambda t: teacher_workload.get(t.teacher_id, 0))
-                    teacher = suitable_teachers[0]
-
-                    # Create assignment (day=-1, time_slot=-1 means not yet scheduled)
-                    entry_id = self.add_schedule_entry(
-                        class_id,
-                        teacher.teacher_id,
-                        lesson_id,
-                        default_classroom_id,
-                        -1,  # Not yet scheduled to a specific day
-                        -1,  # Not yet scheduled to a specific time slot
-                    )
-
-                    if entry_id:
-                        # Öğretmen yükünü güncelle (dengeli dağıtım için)
-                        teacher_workload[teacher.teacher_id] = (
-                            teacher_workload.get(teacher.teacher_id, 0) + weekly_hours
-                        )
-                        result["success"].append((class_obj.name, lesson_name, teacher.name))
-                        logging.info(
-                            f"Auto-assigned {lesson_name} to {class_obj.name} with teacher {teacher.name} (yük: {teacher_workload[teacher.teacher_id]} saat)"
-                        )
-                    else:
-                        result["failed"].append((class_obj.name, lesson_name, "Veritabanı hatası"))
-                        logging.error(f"Failed to auto-assign {lesson_name} to {class_obj.name}")
-                else:
-                    # No suitable teacher found
-                    result["failed"].append((class_obj.name, lesson_name, "Uygun öğretmen bulunamadı"))
-                    logging.warning(f"No suitable teacher found for {lesson_name} in {class_obj.name}")
+        # day=-1, time_slot=-1: henüz programa yerleştirilmedi
+        entry_ids = self.add_schedule_entries(
+            [(req.class_id, teacher_id, req.lesson_id, default_classroom_id, -1, -1) for req, teacher_id in plan.assignments]
+        )
+
+        teacher_names = {t.teacher_id: t.name for t in all_teachers}
+        for req, teacher_id in plan.assignments:
+            if entry_ids:
+                result["success"].append((req.class_name, req.lesson_name, teacher_names[teacher_id]))
+                logging.info(
+                    f"Auto-assigned {req.lesson_name} to {req.class_name} with teacher {teacher_names[teacher_id]} "
+                    f"(yük: {plan.teacher_hours[teacher_id]} saat)"
+                )
+            else:
+                result["failed"].append((req.class_name, req.lesson_name, "Veritabanı hatası"))
+                logging.error(f"Failed to auto-assign {req.lesson_name} to {req.class_name}")
+
+        for req, reason in plan.unassigned:
+            result["failed"].append((req.class_name, req.lesson_name, reason))
+            logging.warning(f"No suitable teacher found for {req.lesson_name} in {req.class_name}: {reason}")
 
         return result
@@ -0,0 +1,422 @@
+# -*- coding: utf-8 -*-
+"""
+Query Monitor - Repository SQL enstrümantasyonu
+BaseRepository._execute_query/_execute_write üzerinden geçen her ifadenin
+süresini, satır sayısını ve çağrı yerini kaydeder; yavaş sorguları loglar,
+aynı faz içinde tekrar eden ifadeleri (N+1) işaretler ve en yavaş
+ifadeler için EXPLAIN QUERY PLAN çıktısını saklar.
+
+Yavaş sorgu logu her zaman açıktır (eşik karşılaştırması dışında maliyeti
+yoktur); ifade istatistikleri ve N+1 tespiti ``configure()`` ile açılır.
+
+Usage:
+    from database.query_monitor import get_query_monitor, query_scope
+
+    get_query_monitor().configure(slow_query_ms=50, n_plus_one_threshold=20)
+    with get_query_monitor().scope("auto_fill_assignments"):
+        ...
+    print(get_query_monitor().summary())
+"""
+
+import functools
+import heapq
+import logging
+import os
+import re
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Çağrı yeri aranırken atlanan modüller (repository katmanının kendisi)
+_INTERNAL_DIRS = (
+    os.path.join("database", "repositories") + os.sep,
+    os.path.join("database", "db_manager.py"),
+    os.path.join("database", "query_monitor.py"),
+)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_statement(query: str) -> str:
+    """
+    Reduce a statement to its shape: literals become ?, whitespace collapses
+
+    Args:
+        query: SQL statement
+
+    Returns:
+        Normalized statement used as the grouping key
+    """
+    shape = _STRING_LITERAL.sub("?", query)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    shape = _WHITESPACE.sub(" ", shape).strip()
+    return _IN_LIST.sub("(?...)", shape)
+
+
+def find_call_site(depth: int = 2) -> str:
+    """
+    First stack frame outside the repository layer as ``file:line in func``
+
+    Args:
+        depth: Frames to skip before the search starts
+    """
+    frame = sys._getframe(depth)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if not any(part in filename for part in _INTERNAL_DIRS):
+            return f"{os.path.basename(filename)}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return "<unknown>"
+
+
+@dataclass
+class StatementStats:
+    """Aggregated timings for one statement shape"""
+
+    shape: str
+    calls: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    rows: int = 0
+    call_sites: Counter = field(default_factory=Counter)
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_seconds * 1000 / self.calls if self.calls else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "statement": self.shape,
+            "calls": self.calls,
+            "total_ms": round(self.total_seconds * 1000, 3),
+            "avg_ms": round(self.avg_ms, 3),
+            "max_ms": round(self.max_seconds * 1000, 3),
+            "rows": self.rows,
+            "call_sites": dict(self.call_sites.most_common(5)),
+        }
+
+
+@dataclass(order=True)
+class SlowStatement:
+    """One captured slow execution together with its query plan"""
+
+    elapsed_ms: float
+    statement: str = field(compare=False)
+    params: Tuple = field(compare=False, default=())
+    repository: str = field(compare=False, default="")
+    method: str = field(compare=False, default="")
+    call_site: str = field(compare=False, default="")
+    scope: Optional[str] = field(compare=False, default=None)
+    plan: List[str] = field(compare=False, default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "elapsed_ms": round(self.elapsed_ms, 3),
+            "statement": self.statement,
+            "params": list(self.params),
+            "repository": self.repository,
+            "method": self.method,
+            "call_site": self.call_site,
+            "scope": self.scope,
+            "plan": self.plan,
+        }
+
+
+@dataclass
+class RepeatedStatement:
+    """N+1 finding: one statement shape run too often inside a single scope"""
+
+    scope: str
+    shape: str
+    count: int
+    call_site: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"scope": self.scope, "statement": self.shape, "count": self.count, "call_site": self.call_site}
+
+
+class _Scope:
+    __slots__ = ("name", "counts", "first_site", "flagged")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.counts: Counter = Counter()
+        self.first_site: Dict[str, str] = {}
+        self.flagged: Dict[str, RepeatedStatement] = {}
+
+
+class QueryMonitor:
+    """
+    Per-statement SQL instrumentation for the repository layer
+
+    ``record()`` is called by BaseRepository after every statement. With the
+    monitor disabled it only compares the elapsed time against the slow-query
+    threshold; ``configure()`` turns on per-shape statistics, call-site
+    attribution, N+1 detection inside scopes and EXPLAIN QUERY PLAN capture
+    for the slowest statements.
+    """
+
+    def __init__(self, slow_query_ms: float = 100.0):
+        self.logger = logging.getLogger(__name__)
+        self.slow_query_ms = slow_query_ms
+        self.n_plus_one_threshold = 50
+        self.explain_top = 10
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def configure(
+        self,
+        slow_query_ms: Optional[float] = None,
+        n_plus_one_threshold: Optional[int] = None,
+        explain_top: Optional[int] = None,
+    ):
+        """
+        Enable statement statistics and N+1 detection
+
+        Args:
+            slow_query_ms: Log statements slower than this (milliseconds)
+            n_plus_one_threshold: Flag a shape run more than K times in one scope
+            explain_top: Number of slowest statements kept with their query plan
+        """
+        if slow_query_ms is not None:
+            self.slow_query_ms = slow_query_ms
+        if n_plus_one_threshold is not None:
+            self.n_plus_one_threshold = n_plus_one_threshold
+        if explain_top is not None:
+            self.explain_top = explain_top
+        self.enabled = True
+        self.logger.info(
+            f"Query monitor enabled (slow ≥ {self.slow_query_ms} ms, "
+            f"N+1 > {self.n_plus_one_threshold}/scope, explain top {self.explain_top})"
+        )
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        """Drop collected statistics and findings"""
+        with self._lock:
+            self.statements: Dict[str, StatementStats] = {}
+            self.slowest: List[SlowStatement] = []  # min-heap, en yavaş N ifade
+            self.repeated: List[RepeatedStatement] = []
+            self.slow_count = 0
+            self._plans: Dict[str, List[str]] = {}
+
+    # ---- Scopes (scheduler phases, bulk operations) ----
+
+    def push_scope(self, name: str):
+        stack = getattr(self._local, "scopes", None)
+        if stack is None:
+            stack = self._local.scopes = []
+        stack.append(_Scope(name))
+
+    def pop_scope(self):
+        stack = getattr(self._local, "scopes", None)
+        if stack:
+            scope = stack.pop()
+            if scope.flagged:
+                with self._lock:
+                    for finding in scope.flagged.values():
+                        finding.count = scope.counts[finding.shape]
+                        self.repeated.append(finding)
+
+    @contextmanager
+    def scope(self, name: str):
+        """
+        Group statements for N+1 detection (no-op while disabled)
+
+        Args:
+            name: Scope label, e.g. a scheduler phase or bulk operation
+        """
+        if not self.enabled:
+            yield
+            return
+        self.push_scope(name)
+        try:
+            yield
+        finally:
+            self.pop_scope()
+
+    def current_scope(self) -> Optional[str]:
+        stack = getattr(self._local, "scopes", None)
+        return stack[-1].name if stack else None
+
+    # ---- Recording ----
+
+    def record(
+        self,
+        repository: str,
+        method: str,
+        query: str,
+        params: Tuple,
+        elapsed: float,
+        rows: int,
+        connection=None,
+    ):
+        """
+        Record one executed statement
+
+        Args:
+            repository: Repository class name
+            method: Repository method that issued the statement
+            query: SQL statement
+            params: Bound parameters
+            elapsed: Wall time in seconds
+            rows: Rows returned (SELECT) or affected (writes)
+            connection: Connection used, for EXPLAIN QUERY PLAN capture
+        """
+        elapsed_ms = elapsed * 1000
+        slow = elapsed_ms >= self.slow_query_ms
+        if not self.enabled and not slow:
+            return
+
+        call_site = find_call_site(3)
+        shape = normalize_statement(query)
+
+        if slow:
+            self.slow_count += 1
+            self.logger.warning(
+                f"Slow query ({elapsed_ms:.1f} ms, {rows} rows) {repository}.{method} "
+                f"from {call_site}: {shape}"
+            )
+
+        if not self.enabled:
+            return
+
+        with self._lock:
+            stats = self.statements.get(shape)
+            if stats is None:
+                stats = self.statements[shape] = StatementStats(shape)
+            stats.calls += 1
+            stats.total_seconds += elapsed
+            stats.max_seconds = max(stats.max_seconds, elapsed)
+            stats.rows += max(rows, 0)
+            stats.call_sites[call_site] += 1
+
+        self._count_in_scope(shape, call_site)
+        self._capture_slowest(shape, query, params, repository, method, call_site, elapsed_ms, connection)
+
+    def _count_in_scope(self, shape: str, call_site: str):
+        stack = getattr(self._local, "scopes", None)
+        if not stack:
+            return
+        scope = stack[-1]
+        scope.counts[shape] += 1
+        count = scope.counts[shape]
+        scope.first_site.setdefault(shape, call_site)
+        if count == self.n_plus_one_threshold + 1:
+            scope.flagged[shape] = RepeatedStatement(scope.name, shape, count, scope.first_site[shape])
+            self.logger.warning(
+                f"Possible N+1: statement ran more than {self.n_plus_one_threshold} times "
+                f"in '{scope.name}' (first from {scope.first_site[shape]}): {shape}"
+            )
+
+    def _capture_slowest(self, shape, query, params, repository, method, call_site, elapsed_ms, connection):
+        if self.explain_top <= 0:
+            return
+        with self._lock:
+            if len(self.slowest) >= self.explain_top and elapsed_ms <= self.slowest[0].elapsed_ms:
+                return
+            plan = self._plans.get(shape)
+        if plan is None:
+            plan = self._explain(connection, query, params)
+            with self._lock:
+                self._plans[shape] = plan
+        entry = SlowStatement(
+            elapsed_ms, query, tuple(params), repository, method, call_site, self.current_scope(), plan
+        )
+        with self._lock:
+            if len(self.slowest) < self.explain_top:
+                heapq.heappush(self.slowest, entry)
+            else:
+                heapq.heappushpop(self.slowest, entry)
+
+    def _explain(self, connection, query: str, params: Tuple) -> List[str]:
+        """EXPLAIN QUERY PLAN rows for a statement (empty if unavailable)"""
+        if connection is None:
+            return []
+        try:
+            cursor = connection.cursor()
+            cursor.execute(f"EXPLAIN QUERY PLAN {query}", params)
+            return [row[-1] for row in cursor.fetchall()]
+        except Exception as e:
+            self.logger.debug(f"EXPLAIN QUERY PLAN failed: {e}")
+            return []
+
+    # ---- Reporting ----
+
+    def report(self, top: int = 10) -> Dict[str, Any]:
+        """
+        Snapshot of the collected statistics
+
+        Returns:
+            Dictionary with 'statements' (by total time), 'slowest' (with
+            plans), 'repeated' (N+1 findings) and 'slow_queries'
+        """
+        with self._lock:
+            statements = sorted(self.statements.values(), key=lambda s: s.total_seconds, reverse=True)
+            slowest = sorted(self.slowest, reverse=True)
+            repeated = list(self.repeated)
+            slow_count = self.slow_count
+        return {
+            "statements": [s.to_dict() for s in statements[:top]],
+            "slowest": [s.to_dict() for s in slowest],
+            "repeated": [r.to_dict() for r in repeated],
+            "slow_queries": slow_count,
+        }
+
+    def summary(self, top: int = 5) -> str:
+        """Human-readable report for the log"""
+        report = self.report(top)
+        lines = [f"Query monitor: {len(self.statements)} statement shapes, {report['slow_queries']} slow"]
+        for stats in report["statements"]:
+            lines.append(
+                f"  {stats['total_ms']:9.1f} ms  {stats['calls']:6d}×  {stats['avg_ms']:7.3f} ms avg  {stats['statement']}"
+            )
+        for finding in report["repeated"]:
+            lines.append(
+                f"  N+1 in '{finding['scope']}': {finding['count']}× from {finding['call_site']}: {finding['statement']}"
+            )
+        for slow in report["slowest"][:top]:
+            if slow["plan"]:
+                lines.append(f"  plan ({slow['elapsed_ms']:.1f} ms) {slow['statement']}")
+                lines.extend(f"    {step}" for step in slow["plan"])
+        return "\n".join(lines)
+
+
+# Global instance
+_global_monitor = QueryMonitor()
+
+
+def get_query_monitor() -> QueryMonitor:
+    """Get global query monitor instance"""
+    return _global_monitor
+
+
+def query_scope(name: str) -> Callable:
+    """
+    Decorator running the whole function inside a query monitor scope
+
+    Usage:
+        @query_scope("auto_fill_assignments")
+        def auto_fill_assignments(self):
+            ...
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _global_monitor.scope(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -4,11 +4,20 @@ Provides a base class with common CRUD operations and database connection handli
 """
 
 import logging
+import sys
+import time
 from typing import Any, Dict, List, Optional, Tuple, TypeVar, Generic
 from abc import ABC, abstractmethod
 
+from database.query_monitor import get_query_monitor
+from utils.metrics_registry import db_query_histogram
+
 T = TypeVar('T')
 
+# Sorgu gecikmesi (repository, çağıran metot) etiketleriyle
+QUERY_SECONDS = db_query_histogram()
+QUERY_MONITOR = get_query_monitor()
+
 class BaseRepository(ABC, Generic[T]):
     """
     Base repository class providing common database operations.
@@ -61,15 +70,21 @@ class BaseRepository(ABC, Generic[T]):
         Returns:
             List of dictionaries representing rows
         """
+        start = time.perf_counter()
+        conn = None
+        rows = []
         try:
             conn = self._get_connection()
             cursor = conn.cursor()
             cursor.execute(query, params)
             columns = [desc[0] for desc in cursor.description] if cursor.description else []
-            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+            rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+            return rows
         except Exception as e:
             self.logger.error(f"Error executing query '{query}': {e}")
             return []
+        finally:
+            self._observe_query(start, sys._getframe(1).f_code.co_name, query, params, len(rows), conn)
 
     def _execute_write(self, query: str, params: Tuple = ()) -> Optional[int]:
         """
@@ -82,6 +97,9 @@ class BaseRepository(ABC, Generic[T]):
         Returns:
             Last row ID for INSERT operations, rowcount for UPDATE/DELETE operations
         """
+        start = time.perf_counter()
+        conn = None
+        cursor = None
         try:
             conn = self._get_connection()
             cursor = conn.cursor()
@@ -98,6 +116,49 @@ class BaseRepository(ABC, Generic[T]):
         except Exception as e:
             self.logger.error(f"Error executing write query '{query}': {e}")
             return None
+        finally:
+            rowcount = cursor.rowcount if cursor is not None else 0
+            self._observe_query(start, sys._getframe(1).f_code.co_name, query, params, rowcount, conn)
+
+    def _observe_query(self, start: float, method: str, query: str, params: Tuple, rows: int, conn=None):
+        """
+        Record statement latency, row count and call site
+
+        Args:
+            start: perf_counter() value taken before execution
+            method: Repository method that issued the statement
+            query: SQL statement
+            params: Bound parameters
+            rows: Rows returned (SELECT) or affected (writes)
+            conn: Connection used, for EXPLAIN QUERY PLAN capture
+        """
+        elapsed = time.perf_counter() - start
+        repository = self.__class__.__name__
+        QUERY_SECONDS.labels(repository, method).observe(elapsed)
+        QUERY_MONITOR.record(repository, method, query, params, elapsed, rows, conn)
+
+    def _invalidate(self, *tags: str):
+        """
+        Drop cached DatabaseManager reads affected by a write.
+
+        Args:
+            tags: Cache tags ("teachers", "lesson:5", "curriculum", ...)
+        """
+        cache = getattr(self.db_manager, "cache", None)
+        if cache is not None:
+            cache.invalidate(*tags)
+
+    def _schedule_program_changed(self):
+        """
+        Signal a bulk change to the schedule program and assignment tables.
+
+        Cascading deletes issued outside ScheduleRepository call this so that
+        change-feed readers fall back to a full reload.
+        """
+        schedule_repository = getattr(self.db_manager, "schedule", None)
+        if schedule_repository is not None:
+            schedule_repository.reset_change_logs()
+        self._invalidate("assignments")
 
     @abstractmethod
     def _row_to_entity(self, row: Dict[str, Any]) -> Optional[T]:
@@ -42,12 +42,15 @@ class ClassRepository(BaseRepository[Class]):
     def add_class(self, name: str, grade: int, school_type: str) -> Optional[int]:
         """Add a new class."""
         query = "INSERT INTO classes (name, grade, school_type) VALUES (?, ?, ?)"
-        return self._execute_write(query, (name, grade, school_type))
+        class_id = self._execute_write(query, (name, grade, school_type))
+        self._invalidate("classes", f"class:{class_id}")
+        return class_id
 
     def update_class(self, class_id: int, name: str, grade: int) -> bool:
         """Update an existing class."""
         query = "UPDATE classes SET name = ?, grade = ? WHERE class_id = ?"
         result = self._execute_write(query, (name, grade, class_id))
+        self._invalidate("classes", f"class:{class_id}")
         return result is not None
 
     def delete_class(self, class_id: int) -> bool:
@@ -57,12 +60,15 @@ class ClassRepository(BaseRepository[Class]):
             self._execute_write("DELETE FROM schedule_entries WHERE class_id = ?", (class_id,))
             # Delete from schedule
             self._execute_write("DELETE FROM schedule WHERE class_id = ?", (class_id,))
+            self._schedule_program_changed()
             # Finally, delete the class
             result = self._execute_write("DELETE FROM classes WHERE class_id = ?", (class_id,))
             return result is not None
         except Exception as e:
             self.logger.error(f"Error deleting class: {e}")
             return False
+        finally:
+            self._invalidate("classes", f"class:{class_id}")
 
     # Classroom operations
     def get_all_classrooms(self, school_type: str) -> List[Classroom]:
@@ -91,4 +97,6 @@ class ClassRepository(BaseRepository[Class]):
     def add_classroom(self, name: str, capacity: int, school_type: str) -> Optional[int]:
         """Add a new classroom."""
         query = "INSERT INTO classrooms (name, capacity, school_type) VALUES (?, ?, ?)"
-        return self._execute_write(query, (name, capacity, school_type))
+        classroom_id = self._execute_write(query, (name, capacity, school_type))
+        self._invalidate("classrooms", f"classroom:{classroom_id}")
+        return classroom_id
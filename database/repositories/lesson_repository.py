@@ -4,6 +4,7 @@ Repository for all database operations related to Lessons.
 from typing import List, Optional
 from database.models import Lesson, Curriculum
 from database.repositories.base_repository import BaseRepository
+from database.requirement_table import RequirementTable
 
 
 class LessonRepository(BaseRepository[Lesson]):
@@ -42,12 +43,15 @@ class LessonRepository(BaseRepository[Lesson]):
     def add_lesson(self, name: str, school_type: str, weekly_hours: int = 0) -> Optional[int]:
         """Add a new lesson."""
         query = "INSERT INTO lessons (name, school_type, weekly_hours) VALUES (?, ?, ?)"
-        return self._execute_write(query, (name, school_type, weekly_hours))
+        lesson_id = self._execute_write(query, (name, school_type, weekly_hours))
+        self._invalidate("lessons", f"lesson:{lesson_id}")
+        return lesson_id
 
     def update_lesson(self, lesson_id: int, name: str) -> bool:
         """Update an existing lesson."""
         query = "UPDATE lessons SET name = ? WHERE lesson_id = ?"
         result = self._execute_write(query, (name, lesson_id))
+        self._invalidate("lessons", f"lesson:{lesson_id}")
         return result is not None
 
     def delete_lesson(self, lesson_id: int) -> bool:
@@ -59,12 +63,15 @@ class LessonRepository(BaseRepository[Lesson]):
             self._execute_write("DELETE FROM schedule_entries WHERE lesson_id = ?", (lesson_id,))
             # Delete from schedule
             self._execute_write("DELETE FROM schedule WHERE lesson_id = ?", (lesson_id,))
+            self._schedule_program_changed()
             # Finally, delete the lesson
             result = self._execute_write("DELETE FROM lessons WHERE lesson_id = ?", (lesson_id,))
             return result is not None
         except Exception as e:
             self.logger.error(f"Error deleting lesson: {e}")
             return False
+        finally:
+            self._invalidate("lessons", f"lesson:{lesson_id}", "curriculum")
 
     def get_curriculum_for_lesson(self, lesson_id: int, school_type: str) -> List[Curriculum]:
         """Get all curriculum entries for a specific lesson."""
@@ -94,6 +101,22 @@ class LessonRepository(BaseRepository[Lesson]):
         rows = self._execute_query(query, (lesson_id, grade, school_type))
         return rows[0]["weekly_hours"] if rows else None
 
+    def get_requirement_table(self, school_type: str) -> RequirementTable:
+        """Build the class/lesson requirement table with one join (see database/requirement_table.py)."""
+        query = """
+            SELECT c.class_id, c.name AS class_name, c.grade,
+                   l.lesson_id, l.name AS lesson_name, cu.weekly_hours,
+                   se.entry_id, se.teacher_id
+            FROM classes c
+            JOIN curriculum cu ON cu.grade = c.grade AND cu.school_type = c.school_type
+            JOIN lessons l ON l.lesson_id = cu.lesson_id AND l.school_type = c.school_type
+            LEFT JOIN schedule_entries se
+                   ON se.class_id = c.class_id AND se.lesson_id = l.lesson_id AND se.school_type = c.school_type
+            WHERE c.school_type = ?
+            ORDER BY c.name, c.class_id, l.name, l.lesson_id, cu.curriculum_id, se.entry_id
+        """
+        return RequirementTable.from_join(self._execute_query(query, (school_type,)))
+
     def add_or_update_curriculum(self, lesson_id: int, grade: int, weekly_hours: int, school_type: str) -> bool:
         """Add or update a curriculum entry for a lesson at a specific grade."""
         try:
@@ -102,7 +125,7 @@ class LessonRepository(BaseRepository[Lesson]):
             result = self._execute_write(update_query, (weekly_hours, lesson_id, grade, school_type))
 
             # If no rows were updated, insert a new record
-            if result is None:
+            if not result:
                 insert_query = "INSERT INTO curriculum (lesson_id, grade, weekly_hours, school_type) VALUES (?, ?, ?, ?)"
                 result = self._execute_write(insert_query, (lesson_id, grade, weekly_hours, school_type))
 
@@ -110,3 +133,5 @@ class LessonRepository(BaseRepository[Lesson]):
         except Exception as e:
             self.logger.error(f"Error adding/updating curriculum: {e}")
             return False
+        finally:
+            self._invalidate("curriculum")
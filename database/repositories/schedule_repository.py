@@ -1,7 +1,9 @@
 """
 Repository for all database operations related to Schedule Entries.
 """
-from typing import List, Optional
+import time
+from typing import List, Optional, Sequence, Tuple
+from database.change_log import OP_ADD, OP_DELETE, OP_UPDATE, ScheduleChangeLog
 from database.models import ScheduleEntry
 from database.repositories.base_repository import BaseRepository
 
@@ -9,6 +11,13 @@ from database.repositories.base_repository import BaseRepository
 class ScheduleRepository(BaseRepository[ScheduleEntry]):
     """Handles all database operations for schedule entries and programs."""
 
+    def __init__(self, db_manager: 'DBManager'):
+        super().__init__(db_manager)
+        # Change feed for the schedule program table (see database/change_log.py)
+        self.change_log = ScheduleChangeLog()
+        # Same feed for the schedule_entries (assignments) table
+        self.assignment_log = ScheduleChangeLog()
+
     def _row_to_entity(self, row: dict) -> Optional[ScheduleEntry]:
         """Convert database row to ScheduleEntry entity."""
         return ScheduleEntry(
@@ -60,7 +69,59 @@ class ScheduleRepository(BaseRepository[ScheduleEntry]):
         query = """INSERT INTO schedule_entries
                    (class_id, teacher_id, lesson_id, classroom_id, day, time_slot, school_type)
                    VALUES (?, ?, ?, ?, ?, ?, ?)"""
-        return self._execute_write(query, (class_id, teacher_id, lesson_id, classroom_id, day, time_slot, school_type))
+        entry_id = self._execute_write(query, (class_id, teacher_id, lesson_id, classroom_id, day, time_slot, school_type))
+        if entry_id is not None:
+            self._invalidate("assignments")
+            self.assignment_log.record(
+                OP_ADD, entry_id, class_id=class_id, teacher_id=teacher_id, lesson_id=lesson_id,
+                classroom_id=classroom_id, day=day, time_slot=time_slot, school_type=school_type
+            )
+        return entry_id
+
+    def add_schedule_entries(self, entries: Sequence[Tuple[int, int, int, int, int, int]], school_type: str) -> List[int]:
+        """
+        Add many schedule entries (assignments) in a single transaction.
+
+        Args:
+            entries: (class_id, teacher_id, lesson_id, classroom_id, day, time_slot) tuples
+            school_type: School type of the entries
+
+        Returns:
+            New entry IDs in input order, or an empty list if nothing was written
+        """
+        if not entries:
+            return []
+        query = """INSERT INTO schedule_entries
+                   (class_id, teacher_id, lesson_id, classroom_id, day, time_slot, school_type)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)"""
+        start = time.perf_counter()
+        conn = None
+        entry_ids: List[int] = []
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor()
+            for entry in entries:
+                cursor.execute(query, (*entry, school_type))
+                entry_ids.append(cursor.lastrowid)
+            if not self._safe_commit():
+                conn.rollback()
+                entry_ids = []
+        except Exception as e:
+            self.logger.error(f"Error adding {len(entries)} schedule entries: {e}")
+            if conn is not None:
+                conn.rollback()
+            entry_ids = []
+        finally:
+            self._observe_query(start, "add_schedule_entries", query, (*entries[-1], school_type), len(entry_ids), conn)
+
+        if entry_ids:
+            self._invalidate("assignments")
+            for entry_id, (class_id, teacher_id, lesson_id, classroom_id, day, time_slot) in zip(entry_ids, entries):
+                self.assignment_log.record(
+                    OP_ADD, entry_id, class_id=class_id, teacher_id=teacher_id, lesson_id=lesson_id,
+                    classroom_id=classroom_id, day=day, time_slot=time_slot, school_type=school_type
+                )
+        return entry_ids
 
     def add_schedule_program_entry(self, class_id: int, teacher_id: int, lesson_id: int,
                                  classroom_id: int, day: int, time_slot: int, school_type: str) -> Optional[int]:
@@ -68,7 +129,61 @@ class ScheduleRepository(BaseRepository[ScheduleEntry]):
         query = """INSERT INTO schedule
                    (class_id, teacher_id, lesson_id, classroom_id, day, time_slot, school_type)
                    VALUES (?, ?, ?, ?, ?, ?, ?)"""
-        return self._execute_write(query, (class_id, teacher_id, lesson_id, classroom_id, day, time_slot, school_type))
+        entry_id = self._execute_write(query, (class_id, teacher_id, lesson_id, classroom_id, day, time_slot, school_type))
+        if entry_id is not None:
+            self.change_log.record(
+                OP_ADD, entry_id, class_id=class_id, teacher_id=teacher_id, lesson_id=lesson_id,
+                classroom_id=classroom_id, day=day, time_slot=time_slot
+            )
+        return entry_id
+
+    def replace_schedule_program(self, entries: Sequence[Tuple[int, int, int, int, int, int]],
+                                 school_type: str) -> Optional[List[int]]:
+        """
+        Replace the timetable of a school type in a single transaction.
+
+        The old program is kept when any insert fails, so a crashed or
+        rejected generation never leaves a half-written timetable behind.
+
+        Args:
+            entries: (class_id, teacher_id, lesson_id, classroom_id, day, time_slot) tuples
+            school_type: School type of the program
+
+        Returns:
+            New schedule IDs in input order, or None if nothing was written
+        """
+        delete_query = "DELETE FROM schedule WHERE school_type = ?"
+        insert_query = """INSERT INTO schedule
+                          (class_id, teacher_id, lesson_id, classroom_id, day, time_slot, school_type)
+                          VALUES (?, ?, ?, ?, ?, ?, ?)"""
+        start = time.perf_counter()
+        conn = None
+        schedule_ids: Optional[List[int]] = []
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor()
+            cursor.execute(delete_query, (school_type,))
+            for entry in entries:
+                cursor.execute(insert_query, (*entry, school_type))
+                schedule_ids.append(cursor.lastrowid)
+            if not self._safe_commit():
+                conn.rollback()
+                schedule_ids = None
+        except Exception as e:
+            self.logger.error(f"Error replacing schedule program with {len(entries)} entries: {e}")
+            if conn is not None:
+                conn.rollback()
+            schedule_ids = None
+        finally:
+            params = (*entries[-1], school_type) if entries else (school_type,)
+            self._observe_query(
+                start, "replace_schedule_program", insert_query if entries else delete_query, params,
+                len(schedule_ids or ()), conn
+            )
+
+        if schedule_ids is not None:
+            self.change_log.reset()
+        return schedule_ids
 
     def update_schedule_entry(self, entry_id: int, class_id: int, teacher_id: int, lesson_id: int,
                              classroom_id: int, day: int, time_slot: int) -> bool:
@@ -77,6 +192,12 @@ class ScheduleRepository(BaseRepository[ScheduleEntry]):
                    class_id = ?, teacher_id = ?, lesson_id = ?, classroom_id = ?,
                    day = ?, time_slot = ? WHERE entry_id = ?"""
         result = self._execute_write(query, (class_id, teacher_id, lesson_id, classroom_id, day, time_slot, entry_id))
+        if result:
+            self._invalidate("assignments")
+            self.assignment_log.record(
+                OP_UPDATE, entry_id, class_id=class_id, teacher_id=teacher_id, lesson_id=lesson_id,
+                classroom_id=classroom_id, day=day, time_slot=time_slot
+            )
         return result is not None
 
     def delete_schedule_entry(self, entry_id: int, school_type: str) -> bool:
@@ -84,20 +205,78 @@ class ScheduleRepository(BaseRepository[ScheduleEntry]):
         # Delete from schedule_entries table (school_type kontrolü olmadan)
         query = "DELETE FROM schedule_entries WHERE entry_id = ?"
         result = self._execute_write(query, (entry_id,))
+        if result:
+            self._invalidate("assignments")
+            self.assignment_log.record(OP_DELETE, entry_id)
         return result is not None and result > 0
 
     def delete_all_schedule_entries(self, school_type: str) -> int:
         """Delete all schedule entries for school type."""
         query = "DELETE FROM schedule_entries WHERE school_type = ?"
         result = self._execute_write(query, (school_type,))
+        if result:
+            self._invalidate("assignments")
+            self.assignment_log.reset()
         return result or 0
 
     def clear_schedule_program(self, school_type: str) -> int:
         """Clear all schedule program entries for school type."""
         query = "DELETE FROM schedule WHERE school_type = ?"
         result = self._execute_write(query, (school_type,))
+        if result:
+            self.change_log.reset()
         return result or 0
 
+    def get_instance_counts(self, school_type: str) -> dict:
+        """
+        Count the size of the scheduling instance with one aggregate query.
+
+        Returns:
+            Dict with classes, teachers, lessons, assignments, required_hours
+            (curriculum hours of all class/lesson pairs), assigned_hours (hours
+            of pairs with a teacher) and unavailable_slots
+        """
+        query = """
+            SELECT
+                (SELECT COUNT(*) FROM classes WHERE school_type = ?) AS classes,
+                (SELECT COUNT(*) FROM teachers WHERE school_type = ?) AS teachers,
+                (SELECT COUNT(*) FROM lessons WHERE school_type = ?) AS lessons,
+                (SELECT COUNT(*) FROM schedule_entries WHERE school_type = ?) AS assignments,
+                (SELECT COALESCE(SUM(cu.weekly_hours), 0)
+                   FROM classes c JOIN curriculum cu ON cu.grade = c.grade AND cu.school_type = c.school_type
+                   WHERE c.school_type = ?) AS required_hours,
+                (SELECT COALESCE(SUM(cu.weekly_hours), 0)
+                   FROM (SELECT DISTINCT class_id, lesson_id FROM schedule_entries WHERE school_type = ?) se
+                   JOIN classes c ON c.class_id = se.class_id
+                   JOIN curriculum cu ON cu.grade = c.grade AND cu.lesson_id = se.lesson_id
+                                     AND cu.school_type = c.school_type) AS assigned_hours,
+                (SELECT COUNT(*) FROM teacher_availability ta JOIN teachers t ON t.teacher_id = ta.teacher_id
+                   WHERE ta.is_available = 0 AND t.school_type = ?) AS unavailable_slots
+        """
+        rows = self._execute_query(query, (school_type,) * query.count("?"))
+        return rows[0] if rows else {}
+
+    def get_schedule_revision(self) -> int:
+        """Get the current revision of the schedule program."""
+        return self.change_log.revision
+
+    def get_schedule_changes_since(self, revision: int):
+        """Get program deltas after a revision; (None, rev) means a full reload is needed."""
+        return self.change_log.changes_since(revision)
+
+    def get_assignment_revision(self) -> int:
+        """Get the current revision of the schedule_entries (assignments) table."""
+        return self.assignment_log.revision
+
+    def get_assignment_changes_since(self, revision: int):
+        """Get assignment deltas after a revision; (None, rev) means a full reload is needed."""
+        return self.assignment_log.changes_since(revision)
+
+    def reset_change_logs(self):
+        """Force every change-feed reader to reload (bulk or external writes)."""
+        self.change_log.reset()
+        self.assignment_log.reset()
+
     def get_schedule_for_class(self, class_id: int, school_type: str) -> List[ScheduleEntry]:
         """Get schedule program for a specific class."""
         query = "SELECT * FROM schedule WHERE class_id = ? AND school_type = ? ORDER BY day, time_slot"
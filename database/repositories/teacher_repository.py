@@ -1,7 +1,7 @@
 """
 Repository for all database operations related to Teachers.
 """
-from typing import List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 from database.models import Teacher, ScheduleEntry
 from database.repositories.base_repository import BaseRepository
 
@@ -42,12 +42,15 @@ class TeacherRepository(BaseRepository[Teacher]):
     def add_teacher(self, name: str, subject: str, school_type: str) -> Optional[int]:
         """Add a new teacher."""
         query = "INSERT INTO teachers (name, subject, school_type) VALUES (?, ?, ?)"
-        return self._execute_write(query, (name, subject, school_type))
+        teacher_id = self._execute_write(query, (name, subject, school_type))
+        self._invalidate("teachers", f"teacher:{teacher_id}")
+        return teacher_id
 
     def update_teacher(self, teacher_id: int, name: str, subject: str) -> bool:
         """Update an existing teacher."""
         query = "UPDATE teachers SET name = ?, subject = ? WHERE teacher_id = ?"
         result = self._execute_write(query, (name, subject, teacher_id))
+        self._invalidate("teachers", f"teacher:{teacher_id}")
         return result is not None
 
     def delete_teacher(self, teacher_id: int) -> bool:
@@ -57,6 +60,7 @@ class TeacherRepository(BaseRepository[Teacher]):
             self._execute_write("DELETE FROM schedule_entries WHERE teacher_id = ?", (teacher_id,))
             # Delete from the main schedule program table
             self._execute_write("DELETE FROM schedule WHERE teacher_id = ?", (teacher_id,))
+            self._schedule_program_changed()
             # Delete related teacher availability records
             self._execute_write("DELETE FROM teacher_availability WHERE teacher_id = ?", (teacher_id,))
             # Finally, delete the teacher
@@ -65,6 +69,8 @@ class TeacherRepository(BaseRepository[Teacher]):
         except Exception as e:
             self.logger.error(f"Error deleting teacher: {e}")
             return False
+        finally:
+            self._invalidate("teachers", f"teacher:{teacher_id}")
 
     def get_teacher_availability(self, teacher_id: int) -> List[dict]:
         """Get teacher availability data."""
@@ -72,6 +78,19 @@ class TeacherRepository(BaseRepository[Teacher]):
         rows = self._execute_query(query, (teacher_id,))
         return rows
 
+    def get_unavailable_slot_counts(self) -> Dict[int, int]:
+        """Get the number of slots each teacher is marked unavailable."""
+        query = "SELECT teacher_id, COUNT(*) AS slots FROM teacher_availability WHERE is_available = 0 GROUP BY teacher_id"
+        return {row["teacher_id"]: row["slots"] for row in self._execute_query(query)}
+
+    def get_unavailable_slots(self) -> Dict[int, Set[Tuple[int, int]]]:
+        """Get the (day, time_slot) pairs each teacher is marked unavailable."""
+        query = "SELECT teacher_id, day, time_slot FROM teacher_availability WHERE is_available = 0"
+        slots: Dict[int, Set[Tuple[int, int]]] = {}
+        for row in self._execute_query(query):
+            slots.setdefault(row["teacher_id"], set()).add((row["day"], row["time_slot"]))
+        return slots
+
     def set_teacher_availability(self, teacher_id: int, day: int, time_slot: int, is_available: bool) -> bool:
         """Set teacher availability for a specific day and time slot."""
         try:
@@ -80,7 +99,7 @@ class TeacherRepository(BaseRepository[Teacher]):
             result = self._execute_write(update_query, (1 if is_available else 0, teacher_id, day, time_slot))
 
             # If no rows were updated, insert a new record
-            if result is None:
+            if not result:
                 insert_query = "INSERT INTO teacher_availability (teacher_id, day, time_slot, is_available) VALUES (?, ?, ?, ?)"
                 result = self._execute_write(insert_query, (teacher_id, day, time_slot, 1 if is_available else 0))
 
@@ -0,0 +1,158 @@
+"""
+Curriculum requirement table - what every class has to be taught.
+One row per (class, lesson) the curriculum requires, with the assigned
+teacher (if any), the weekly hours and the default block pattern. Built from
+a single join of classes, curriculum and schedule_entries and cached by
+DatabaseManager until one of those tables is written.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def block_pattern(weekly_hours: int) -> Tuple[int, ...]:
+    """
+    Default block split of weekly hours: 2-hour blocks, a single hour for odd totals.
+
+    Examples: 1 -> (1,), 3 -> (2, 1), 5 -> (2, 2, 1), 6 -> (2, 2, 2)
+    """
+    if not weekly_hours or weekly_hours <= 0:
+        return ()
+    return (2,) * (weekly_hours // 2) + ((1,) if weekly_hours % 2 else ())
+
+
+@dataclass(frozen=True)
+class Requirement:
+    """A lesson the curriculum requires for one class."""
+
+    class_id: int
+    class_name: str
+    grade: int
+    lesson_id: int
+    lesson_name: str
+    weekly_hours: int
+    teacher_id: Optional[int] = None
+    assignment_id: Optional[int] = None  # schedule_entries row the teacher comes from
+
+    @property
+    def block_pattern(self) -> Tuple[int, ...]:
+        return block_pattern(self.weekly_hours)
+
+    @property
+    def is_assigned(self) -> bool:
+        return self.teacher_id is not None
+
+    def to_dict(self) -> dict:
+        """Return the requirement in the dict shape used by the schedulers."""
+        return {
+            "class_id": self.class_id,
+            "class_name": self.class_name,
+            "lesson_id": self.lesson_id,
+            "lesson_name": self.lesson_name,
+            "teacher_id": self.teacher_id,
+            "weekly_hours": self.weekly_hours,
+            "grade": self.grade,
+        }
+
+
+class RequirementTable:
+    """
+    Materialized (class, lesson) requirements with lookups by class and by key.
+
+    Rows are ordered by class name, then lesson name - the order in which
+    get_all_classes() and get_all_lessons() return them.
+    """
+
+    def __init__(self, rows: Iterable[Requirement] = ()):
+        self.rows: List[Requirement] = list(rows)
+        self._by_key: Dict[Tuple[int, int], Requirement] = {}
+        self._by_class: Dict[int, List[Requirement]] = defaultdict(list)
+        self._assignments: Dict[int, List[Requirement]] = defaultdict(list)
+        for row in self.rows:
+            self._by_key[(row.class_id, row.lesson_id)] = row
+            self._by_class[row.class_id].append(row)
+            if row.is_assigned and row.weekly_hours > 0:
+                self._assignments[row.class_id].append(row)
+        for rows in self._assignments.values():
+            rows.sort(key=lambda row: row.assignment_id)
+
+    @classmethod
+    def from_join(cls, join_rows: Iterable[dict]) -> "RequirementTable":
+        """
+        Fold rows of the classes x curriculum x schedule_entries join.
+
+        A (class, lesson) pair may come back several times: once per assignment
+        row, or once per duplicate curriculum row. The first curriculum hours
+        and the newest assignment (highest entry_id) win, matching the old
+        per-lesson lookups.
+        """
+        folded: Dict[Tuple[int, int], dict] = {}
+        for row in join_rows:
+            key = (row["class_id"], row["lesson_id"])
+            current = folded.get(key)
+            if current is None:
+                folded[key] = current = dict(row)
+            elif row["entry_id"] is not None and (current["entry_id"] is None or row["entry_id"] > current["entry_id"]):
+                current["entry_id"] = row["entry_id"]
+                current["teacher_id"] = row["teacher_id"]
+        return cls(
+            Requirement(
+                class_id=row["class_id"],
+                class_name=row["class_name"],
+                grade=row["grade"],
+                lesson_id=row["lesson_id"],
+                lesson_name=row["lesson_name"],
+                weekly_hours=row["weekly_hours"],
+                teacher_id=row["teacher_id"],
+                assignment_id=row["entry_id"],
+            )
+            for row in folded.values()
+        )
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def get(self, class_id: int, lesson_id: int) -> Optional[Requirement]:
+        """Requirement of a class for a lesson, or None."""
+        return self._by_key.get((class_id, lesson_id))
+
+    def weekly_hours(self, class_id: int, lesson_id: int) -> Optional[int]:
+        """Curriculum hours of a lesson for a class (None when not in the curriculum)."""
+        row = self._by_key.get((class_id, lesson_id))
+        return row.weekly_hours if row else None
+
+    def for_class(self, class_id: int) -> List[Requirement]:
+        """Requirements of one class."""
+        return self._by_class.get(class_id, [])
+
+    def assignments_for(self, class_id: int) -> List[Requirement]:
+        """Assigned requirements of one class in assignment order (as get_schedule_by_school_type lists them)."""
+        return self._assignments.get(class_id, [])
+
+    def assigned(self) -> List[Requirement]:
+        """Requirements with a teacher and a positive number of hours."""
+        return [row for row in self.rows if row.is_assigned and row.weekly_hours > 0]
+
+    def missing(self) -> List[Requirement]:
+        """Requirements no teacher is assigned to yet."""
+        return [row for row in self.rows if not row.is_assigned]
+
+    def teacher_hours(self) -> Dict[int, int]:
+        """Assigned weekly hours per teacher."""
+        load: Dict[int, int] = defaultdict(int)
+        for row in self.rows:
+            if row.is_assigned and row.weekly_hours > 0:
+                load[row.teacher_id] += row.weekly_hours
+        return dict(load)
+
+    def class_hours(self) -> Dict[int, int]:
+        """Assigned weekly hours per class."""
+        load: Dict[int, int] = defaultdict(int)
+        for row in self.rows:
+            if row.is_assigned and row.weekly_hours > 0:
+                load[row.class_id] += row.weekly_hours
+        return dict(load)
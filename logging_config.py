@@ -1,21 +1,121 @@
 # -*- coding: utf-8 -*-
 """
 Logging Configuration for Scheduler
+
+Handlers run on a background writer thread (QueueHandler -> QueueListener):
+the solver thread only interpolates the message and enqueues the record;
+timestamps, formatting and file/console I/O happen on the writer. A full
+queue drops records instead of blocking the solver.
 """
 
+import atexit
 import logging
 import logging.handlers
 import os
+import queue
+import threading
 from datetime import datetime
+from typing import Iterable, Optional
+
+DEFAULT_QUEUE_SIZE = 10000
+
+_listeners = []
+_listeners_lock = threading.Lock()
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that never blocks: records are dropped (and counted) when the queue is full"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
 
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Listener aynı süreçte çalışır: sadece mesajı birleştir, biçimlendirme
+        # (zaman damgası, traceback metni) yazıcı iş parçacığında yapılır
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
 
-def setup_logging(log_dir="logs", log_level=logging.INFO):
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def start_queue_listener(
+    logger: logging.Logger, handlers: Iterable[logging.Handler], queue_size: int = DEFAULT_QUEUE_SIZE
+) -> logging.handlers.QueueListener:
+    """
+    Move handlers behind a background writer thread
+
+    Args:
+        logger: Logger that gets the queue handler
+        handlers: Handlers the writer thread feeds (their levels are respected)
+        queue_size: Maximum queued records before new ones are dropped
+
+    Returns:
+        The started QueueListener (stopped automatically at exit)
+    """
+    log_queue = queue.Queue(maxsize=queue_size)
+    logger.addHandler(DroppingQueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    with _listeners_lock:
+        _listeners.append(listener)
+    return listener
+
+
+def stop_logging(listener: Optional[logging.handlers.QueueListener] = None):
+    """
+    Flush queued records and stop background writers
+
+    Args:
+        listener: Writer to stop (default: all of them)
+    """
+    with _listeners_lock:
+        targets = [listener] if listener is not None else list(_listeners)
+        for target in targets:
+            if target in _listeners:
+                _listeners.remove(target)
+    for target in targets:
+        if target._thread is not None:
+            target.stop()
+        for handler in target.handlers:
+            try:
+                handler.flush()
+            except (OSError, ValueError):
+                # Akış zaten kapatılmış (ör. yorumlayıcı kapanırken)
+                pass
+
+
+def clear_handlers(logger: logging.Logger):
+    """Remove a logger's handlers, stopping and closing the writers behind its queue handlers"""
+    for handler in list(logger.handlers):
+        if isinstance(handler, DroppingQueueHandler):
+            with _listeners_lock:
+                listeners = [listener for listener in _listeners if listener.queue is handler.queue]
+            for listener in listeners:
+                stop_logging(listener)
+                for target in listener.handlers:
+                    target.close()
+        logger.removeHandler(handler)
+
+
+atexit.register(stop_logging)
+
+
+def setup_logging(log_dir="logs", log_level=logging.INFO, async_handlers=True, queue_size=DEFAULT_QUEUE_SIZE):
     """
     Configure logging for the application
 
     Args:
         log_dir: Directory to store log files
         log_level: Logging level (default: INFO)
+        async_handlers: Write records on a background thread (default: True)
+        queue_size: Maximum queued records in async mode
     """
     # Create logs directory if not exists
     if not os.path.exists(log_dir):
@@ -35,14 +135,13 @@ def setup_logging(log_dir="logs", log_level=logging.INFO):
     root_logger = logging.getLogger()
     root_logger.setLevel(log_level)
 
-    # Remove existing handlers
-    root_logger.handlers.clear()
+    # Remove existing handlers (and the writer thread feeding them)
+    clear_handlers(root_logger)
 
     # Console Handler (INFO and above)
     console_handler = logging.StreamHandler()
     console_handler.setLevel(logging.INFO)
     console_handler.setFormatter(simple_formatter)
-    root_logger.addHandler(console_handler)
 
     # File Handler - All logs (rotating)
     log_file = os.path.join(log_dir, f"scheduler_{datetime.now():%Y%m%d}.log")
@@ -51,7 +150,6 @@ def setup_logging(log_dir="logs", log_level=logging.INFO):
     )
     file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(detailed_formatter)
-    root_logger.addHandler(file_handler)
 
     # File Handler - Errors only
     error_log_file = os.path.join(log_dir, f"scheduler_errors_{datetime.now():%Y%m%d}.log")
@@ -60,13 +158,20 @@ def setup_logging(log_dir="logs", log_level=logging.INFO):
     )
     error_handler.setLevel(logging.ERROR)
     error_handler.setFormatter(detailed_formatter)
-    root_logger.addHandler(error_handler)
+
+    handlers = [console_handler, file_handler, error_handler]
+    if async_handlers:
+        start_queue_listener(root_logger, handlers, queue_size)
+    else:
+        for handler in handlers:
+            root_logger.addHandler(handler)
 
     # Log startup
     root_logger.info("=" * 80)
     root_logger.info("Logging system initialized")
     root_logger.info(f"Log directory: {os.path.abspath(log_dir)}")
     root_logger.info(f"Log level: {logging.getLevelName(log_level)}")
+    root_logger.info(f"Async handlers: {async_handlers}")
     root_logger.info("=" * 80)
 
     return root_logger
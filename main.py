@@ -11,13 +11,9 @@ import sys
 # ---------- 1️⃣ PYTHON PATH ----------
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from PyQt5.QtCore import QLocale, Qt, QTranslator
-
 # ---------- 2️⃣ IMPORTS ----------
-from PyQt5.QtWidgets import QApplication
-
-from ui.main_window import MainWindow
-from utils.helpers import setup_logging
+# PyQt5 ve arayüz modülleri main() içinde yüklenir; "generate" ve "serve" Qt olmadan çalışır
+HEADLESS_COMMANDS = ("generate", "serve")
 
 
 # ---------- 3️⃣ LOGGING ----------
@@ -49,8 +45,23 @@ def _setup_logger(debug: bool):
 
 # ---------- 4️⃣ MAIN ----------
 def main():
+    # ---- Headless commands (no Qt) ----
+    if len(sys.argv) > 1 and sys.argv[1] in HEADLESS_COMMANDS:
+        from cli import main as cli_main
+
+        sys.exit(cli_main(sys.argv[1:]))
+
+    from PyQt5.QtCore import QLocale, QTranslator
+    from PyQt5.QtWidgets import QApplication
+
+    from ui.main_window import MainWindow
+    from utils.helpers import setup_logging
+
     # ---- CLI options ----
-    parser = argparse.ArgumentParser(description="Class Scheduling Program")
+    parser = argparse.ArgumentParser(
+        description="Class Scheduling Program",
+        epilog="Headless generation without the GUI: main.py generate --help",
+    )
     parser.add_argument("--debug", action="store_true", help="Run in debug mode (verbose logs)")
     parser.add_argument(
         "--lang",
@@ -58,6 +69,63 @@ def main():
         default=None,
         help="Set application language code (e.g., 'tr', 'en')",
     )
+    parser.add_argument(
+        "--profile",
+        metavar="DIR",
+        default=None,
+        help="Profile schedule generation phases and write speedscope/pstats files to DIR",
+    )
+    parser.add_argument(
+        "--profile-interval",
+        type=float,
+        default=2.0,
+        metavar="MS",
+        help="Stack sampling interval for --profile in milliseconds (0 = phase timings only)",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        metavar="PORT",
+        help="Serve OpenMetrics scheduler/DB metrics on http://127.0.0.1:PORT/metrics",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        default=None,
+        metavar="PATH",
+        help="Rewrite an OpenMetrics textfile at PATH after every schedule generation",
+    )
+    parser.add_argument(
+        "--sql-monitor",
+        action="store_true",
+        help="Collect per-statement SQL statistics, N+1 warnings and query plans (logged on exit)",
+    )
+    parser.add_argument(
+        "--slow-query-ms",
+        type=float,
+        default=None,
+        metavar="MS",
+        help="Log repository SQL statements slower than MS milliseconds (default 100)",
+    )
+    parser.add_argument(
+        "--n-plus-one",
+        type=int,
+        default=50,
+        metavar="K",
+        help="With --sql-monitor, flag a statement run more than K times in one scheduler phase",
+    )
+    parser.add_argument(
+        "--memory-limit",
+        type=float,
+        default=None,
+        metavar="MB",
+        help="Solver memory budget in MB (default: performance.memory_limit in config/scheduler_config.yaml)",
+    )
+    parser.add_argument(
+        "--memory-trace",
+        action="store_true",
+        help="Trace schedule generation with tracemalloc and log the peak allocation (slower)",
+    )
     args = parser.parse_args()
 
     # ---- Logger ----
@@ -67,6 +135,40 @@ def main():
     # ---- Setup logging from helpers (if any) ----
     setup_logging()  # your existing helper may override or add handlers
 
+    # ---- Profiling (opt-in) ----
+    if args.profile:
+        from algorithms.phase_profiler import get_profiler
+
+        get_profiler().configure(args.profile, sample_interval_ms=args.profile_interval)
+
+    # ---- Metrics (opt-in) ----
+    if args.metrics_port is not None or args.metrics_file:
+        from utils.metrics_registry import get_registry
+
+        registry = get_registry()
+        registry.textfile_path = args.metrics_file
+        if args.metrics_port is not None:
+            registry.serve(port=args.metrics_port)
+
+    # ---- SQL monitor ----
+    query_monitor = None
+    if args.sql_monitor or args.slow_query_ms is not None:
+        from algorithms.phase_profiler import get_profiler
+        from database.query_monitor import get_query_monitor
+
+        query_monitor = get_query_monitor()
+        if args.slow_query_ms is not None:
+            query_monitor.slow_query_ms = args.slow_query_ms
+        if args.sql_monitor:
+            query_monitor.configure(n_plus_one_threshold=args.n_plus_one)
+            get_profiler().attach_scope_listener(query_monitor)
+
+    # ---- Memory budget ----
+    if args.memory_limit is not None or args.memory_trace:
+        from utils.memory_budget import get_memory_budget
+
+        get_memory_budget().configure(limit_mb=args.memory_limit, trace_allocations=args.memory_trace)
+
     # ---- Qt Application ----
     app = QApplication(sys.argv)
     app.setApplicationName("Class Scheduling Program")
@@ -102,6 +204,8 @@ def main():
 
     # ---- Event Loop ----
     result = app.exec_()
+    if query_monitor is not None and query_monitor.enabled:
+        logger.info(query_monitor.summary())
     logger.info(f"Application exited with code: {result}")
     sys.exit(result)
 
@@ -2,6 +2,7 @@
 Report generation for the Class Scheduling Program
 """
 
+from database.query_monitor import query_scope
 from reports.excel_generator import ExcelGenerator
 from reports.pdf_generator import PDFGenerator
 
@@ -158,6 +159,7 @@ class ReportGenerator:
         headers[0] = f"Derslik: {classroom.name}"
         return headers, data
 
+    @query_scope("export_to_pdf")
     def export_to_pdf(self, report_type, identifier=None, filename=None):
         """
         Export report to PDF
@@ -174,6 +176,7 @@ class ReportGenerator:
         else:
             return "Geçersiz rapor türü"
 
+    @query_scope("export_to_excel")
     def export_to_excel(self, report_type, identifier=None, filename=None):
         """
         Export report to Excel
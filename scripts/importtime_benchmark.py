@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Import-Time Benchmark - Cold start cost of the application entry points
+Imports each target in a fresh ``python -X importtime`` process and reports
+the median cold import time together with the slowest modules, so heavy
+dependencies (numpy, matplotlib, reportlab, scheduler modules) that leak into
+start-up are easy to spot.
+
+Usage:
+    python scripts/importtime_benchmark.py
+    python scripts/importtime_benchmark.py --modules algorithms.scheduler main --repeat 7 --top 20
+    python scripts/importtime_benchmark.py --budget-ms 250 --output importtime.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+from datetime import datetime
+from typing import Dict, Optional, Sequence
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils.perf_gate import profile_import  # noqa: E402
+
+logger = logging.getLogger("importtime_benchmark")
+
+# Masaüstü uygulamasının ve başsız çalıştırmanın açılışta içe aktardığı modüller
+DEFAULT_MODULES = [
+    "algorithms.scheduler",
+    "algorithms.algorithm_selector",
+    "ui.main_window",
+    "ui.analytics_dashboard",
+    "main",
+]
+
+# Açılışta yüklenmemesi gereken ağır paketler
+HEAVY_PACKAGES = ["numpy", "matplotlib", "seaborn", "pandas", "sklearn", "reportlab", "openpyxl"]
+
+
+def run_benchmark(modules: Sequence[str], repeat: int = 5, top: int = 15, budget_ms: Optional[float] = None) -> Dict:
+    """
+    Profile the cold import of every module
+
+    Args:
+        modules: Dotted module names
+        repeat: Fresh processes per module (the median is reported)
+        top: Slowest modules listed per target
+        budget_ms: Median above this many milliseconds is marked as over budget
+
+    Returns:
+        JSON-serialisable report
+    """
+    results = []
+    for module in modules:
+        try:
+            profiles = [profile_import(module, cwd=ROOT) for _ in range(max(1, repeat))]
+        except ImportError as e:
+            logger.warning(f"  {module}: {e}")
+            results.append({"module": module, "status": "error", "error": str(e)})
+            continue
+        median = statistics.median(p.total for p in profiles)
+        # En yavaş modül listesi medyana en yakın ölçümden alınır
+        representative = min(profiles, key=lambda p: abs(p.total - median))
+        heavy = {name: representative.loaded(name)[:1] for name in HEAVY_PACKAGES}
+        result = {
+            "status": "ok",
+            **representative.to_dict(top),
+            "median_s": round(median, 6),
+            "samples": [round(p.total, 6) for p in profiles],
+            "heavy_packages": sorted(name for name, hits in heavy.items() if hits),
+        }
+        if budget_ms is not None:
+            result["over_budget"] = median * 1000 > budget_ms
+        logger.info(f"  {module}: {_format_result(result)}")
+        results.append(result)
+
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "budget_ms": budget_ms,
+        "results": results,
+    }
+
+
+def _format_result(result: Dict) -> str:
+    text = f"{result['median_s'] * 1000:.1f} ms, {result['modules_imported']} modules"
+    if result["heavy_packages"]:
+        text += f", heavy: {', '.join(result['heavy_packages'])}"
+    if result.get("over_budget"):
+        text += " [OVER BUDGET]"
+    return text
+
+
+def format_report(report: Dict, top: int = 10) -> str:
+    """Plain-text table of the slowest modules per target"""
+    lines = []
+    for result in report["results"]:
+        if result["status"] != "ok":
+            lines.append(f"{result['module']}: {result['error']}")
+            continue
+        lines.append(f"{result['module']}: {_format_result(result)}")
+        lines.append(f"    {'self':>9} {'cumulative':>11}  module")
+        for row in result["top_self"][:top]:
+            lines.append(f"    {row['self_s'] * 1000:>7.1f}ms {row['cumulative_s'] * 1000:>9.1f}ms  {row['module']}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold import-time benchmark (python -X importtime)")
+    parser.add_argument("--modules", nargs="+", default=DEFAULT_MODULES, help="Modules to import")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh processes per module")
+    parser.add_argument("--top", type=int, default=15, help="Slowest modules listed per target")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Exit with 1 when a median exceeds this")
+    parser.add_argument("--output", default=None, help="Write the report as JSON")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    report = run_benchmark(args.modules, args.repeat, args.top, args.budget_ms)
+    print(format_report(report, args.top))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        logger.info(f"Results written to {args.output}")
+    if any(r.get("over_budget") for r in report["results"]):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
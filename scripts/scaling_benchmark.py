@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Scaling Benchmark - Headless scheduler benchmark over synthetic schools
+Runs every available scheduler across a ladder of school sizes (10 → 200
+classes by default) and writes wall time, peak RSS, coverage and conflicts
+to JSON. Needs no plotting libraries.
+
+Each (instance, scheduler) pair runs in a fresh process on its own copy of
+the generated database, so peak RSS is per run and a hung scheduler can be
+killed at the timeout.
+
+Usage:
+    python scripts/scaling_benchmark.py --output scaling.json
+    python scripts/scaling_benchmark.py --classes 10 50 --schedulers simple_perfect optimized_curriculum
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from algorithms.scheduler_registry import SCHEDULER_SPECS, get_scheduler_registry  # noqa: E402
+from utils.synthetic_school import SchoolSpec, generate_school, scaling_ladder  # noqa: E402
+
+try:
+    import resource
+
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    RESOURCE_AVAILABLE = False
+
+logger = logging.getLogger("scaling_benchmark")
+
+# Benchmark adı → "modül:Sınıf" (hepsi ``Cls(db_manager).generate_schedule()`` destekler);
+# ultra_aggressive büyük örneklerde zaman aşımına takıldığı için dışarıda
+BENCHMARK_SCHEDULERS = {spec.name: spec.path for spec in SCHEDULER_SPECS if spec.name != "ultra_aggressive"}
+
+
+def load_scheduler(name: str):
+    """Import a benchmark scheduler class by name"""
+    return get_scheduler_registry().load(name)
+
+
+def available_schedulers(names: Optional[Sequence[str]] = None) -> List[str]:
+    """Scheduler names that import in this environment"""
+    result = []
+    for name in names or BENCHMARK_SCHEDULERS:
+        try:
+            load_scheduler(name)
+            result.append(name)
+        except Exception as e:  # ImportError, ama bozuk modüllerde SyntaxError da olabilir
+            logger.warning(f"Skipping scheduler '{name}': {e}")
+    return result
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB"""
+    if not RESOURCE_AVAILABLE:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux: KB, macOS: bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_case(db_path: str, scheduler_name: str, slots_per_day: int, required_hours: int) -> Dict:
+    """
+    Run one scheduler on one database in the current process
+
+    Args:
+        db_path: Generated instance database
+        scheduler_name: Key of BENCHMARK_SCHEDULERS
+        slots_per_day: Time slots per day (for conflict counting)
+        required_hours: Total weekly hours the instance asks for
+
+    Returns:
+        Result dictionary (status, wall time, peak RSS, coverage, conflicts)
+    """
+    from algorithms.batch_scoring import BatchScheduleScorer
+    from database.db_manager import DatabaseManager
+
+    scheduler_class = load_scheduler(scheduler_name)
+    db_manager = DatabaseManager(db_path)
+    baseline_rss = peak_rss_mb()
+    start = time.perf_counter()
+    entries = scheduler_class(db_manager).generate_schedule() or []
+    wall_time = time.perf_counter() - start
+
+    placed = [e for e in entries if e.get("day", -1) >= 0 and e.get("time_slot", -1) >= 0]
+    scores = BatchScheduleScorer(days=5, slots=slots_per_day).score_schedules([placed])
+    db_manager.close_connection()
+    return {
+        "status": "ok",
+        "wall_time_s": round(wall_time, 4),
+        "peak_rss_mb": peak_rss_mb(),
+        "baseline_rss_mb": baseline_rss,
+        "placements": len(placed),
+        "coverage": round(len(placed) / required_hours, 4) if required_hours else 0.0,
+        "teacher_conflicts": scores.teacher_conflicts[0],
+        "class_conflicts": scores.class_conflicts[0],
+    }
+
+
+def _child(queue, db_path, scheduler_name, slots_per_day, required_hours, log_level):
+    logging.basicConfig(level=log_level)
+    logging.getLogger().setLevel(log_level)
+    try:
+        queue.put(run_case(db_path, scheduler_name, slots_per_day, required_hours))
+    except Exception as e:
+        queue.put({"status": "error", "error": f"{type(e).__name__}: {e}"})
+
+
+def run_isolated(
+    db_path: str, scheduler_name: str, slots_per_day: int, required_hours: int, timeout: float, log_level=logging.WARNING
+) -> Dict:
+    """Run ``run_case`` in a fresh process, killing it after ``timeout`` seconds"""
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(
+        target=_child, args=(queue, db_path, scheduler_name, slots_per_day, required_hours, log_level)
+    )
+    start = time.perf_counter()
+    process.start()
+    try:
+        result = queue.get(timeout=timeout)
+    except Exception:
+        result = {"status": "timeout", "wall_time_s": round(time.perf_counter() - start, 4)}
+    process.join(5)
+    if process.is_alive():
+        process.kill()
+        process.join()
+    return result
+
+
+def run_benchmark(
+    specs: Sequence[SchoolSpec],
+    schedulers: Sequence[str],
+    timeout: float = 300.0,
+    isolated: bool = True,
+    work_dir: Optional[str] = None,
+) -> Dict:
+    """
+    Benchmark every scheduler on every instance
+
+    Args:
+        specs: Instances to generate (e.g. ``scaling_ladder()``)
+        schedulers: Scheduler names from BENCHMARK_SCHEDULERS
+        timeout: Per-run limit in seconds (isolated runs only)
+        isolated: Run each case in its own process
+        work_dir: Where instance databases are written (temporary by default)
+
+    Returns:
+        JSON-serialisable report
+    """
+    from database.db_manager import DatabaseManager
+
+    owns_dir = work_dir is None
+    work_dir = work_dir or tempfile.mkdtemp(prefix="scaling_benchmark_")
+    results = []
+    try:
+        for spec in specs:
+            template = os.path.join(work_dir, f"{spec.name}.db")
+            if os.path.exists(template):
+                os.remove(template)
+            db_manager = DatabaseManager(template)
+            school = generate_school(db_manager, spec)
+            db_manager.close_connection()
+            instance = school.to_dict()
+
+            for name in schedulers:
+                run_db = os.path.join(work_dir, f"{spec.name}.{name}.db")
+                shutil.copyfile(template, run_db)
+                logger.info(f"▶ {name} on {spec.name}")
+                if isolated:
+                    outcome = run_isolated(run_db, name, spec.slots_per_day, school.required_hours, timeout)
+                else:
+                    try:
+                        outcome = run_case(run_db, name, spec.slots_per_day, school.required_hours)
+                    except Exception as e:
+                        outcome = {"status": "error", "error": f"{type(e).__name__}: {e}"}
+                os.remove(run_db)
+                logger.info(f"  {name}: {_format_outcome(outcome)}")
+                results.append({"scheduler": name, "instance": spec.name, **instance, **outcome})
+    finally:
+        if owns_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timeout_s": timeout,
+        "results": results,
+    }
+
+
+def _format_outcome(outcome: Dict) -> str:
+    if outcome.get("status") != "ok":
+        return outcome.get("error") or outcome.get("status", "?")
+    return (
+        f"{outcome['wall_time_s']:.2f}s, {outcome['peak_rss_mb']} MB, coverage {outcome['coverage']:.1%}, "
+        f"conflicts {outcome['teacher_conflicts']}/{outcome['class_conflicts']}"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless scheduler scaling benchmark")
+    parser.add_argument("--classes", type=int, nargs="+", default=[10, 25, 50, 100, 200], help="Scaling ladder")
+    parser.add_argument("--schedulers", nargs="+", default=None, choices=sorted(BENCHMARK_SCHEDULERS))
+    parser.add_argument("--school-type", default="Lise")
+    parser.add_argument("--teachers", type=int, default=None, help="Teacher count (default: derived from load)")
+    parser.add_argument("--density", type=float, default=0.9, help="Teacher availability density (0-1)")
+    parser.add_argument("--tightness", type=float, default=0.85, help="Required hours / weekly slots")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--timeout", type=float, default=300.0, help="Per-run timeout in seconds")
+    parser.add_argument("--in-process", action="store_true", help="Run without process isolation (no timeout)")
+    parser.add_argument("--output", default="scaling_benchmark.json")
+    parser.add_argument("--debug", action="store_true")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    if not args.debug:
+        # Zamanlayıcı logları susturulur, yalnızca benchmark ilerlemesi görünür
+        logging.getLogger().setLevel(logging.WARNING)
+        logger.setLevel(logging.INFO)
+
+    specs = scaling_ladder(
+        args.classes,
+        school_type=args.school_type,
+        teacher_count=args.teachers,
+        availability_density=args.density,
+        curriculum_tightness=args.tightness,
+        seed=args.seed,
+    )
+    report = run_benchmark(specs, available_schedulers(args.schedulers), args.timeout, not args.in_process)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    logger.info(f"Results written to {args.output}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,23 @@ from PyQt5.QtWidgets import QApplication
 # Add parent directory to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from database.db_manager import DatabaseManager
+from utils import run_history
+from utils.perf_gate import BaselineStore, PerfGate
+from utils.synthetic_school import SchoolSpec, generate_school
+
+PERF_BASELINE_PATH = os.path.join(os.path.dirname(__file__), "perf_baselines.json")
+
+
+def pytest_addoption(parser):
+    """Performance gate options"""
+    group = parser.getgroup("perf", "performance regression gate")
+    group.addoption("--perf-baseline", default=PERF_BASELINE_PATH, help="Baseline JSON for the performance gate")
+    group.addoption("--perf-update", action="store_true", help="Record current timings as the new baselines")
+    group.addoption("--perf-tolerance", type=float, default=0.30, help="Allowed slowdown vs baseline (0.30 = 30%%)")
+    group.addoption(
+        "--perf-strict", action="store_true", help="Enforce baselines recorded on a different machine"
+    )
+    group.addoption("--perf-report", default=None, help="Write the performance gate results as JSON")
 
 
 # Ensure QApplication exists for pytest-qt
@@ -24,6 +41,14 @@ def qapp():
     yield app
 
 
+@pytest.fixture(autouse=True)
+def memory_history(monkeypatch):
+    """Keep runs recorded by tests in memory, out of the user's run history file"""
+    store = run_history.RunHistoryStore(None)
+    monkeypatch.setattr(run_history, "_run_history", store)
+    return store
+
+
 @pytest.fixture
 def db_manager():
     """Create a test database manager"""
@@ -34,6 +59,19 @@ def db_manager():
     return db
 
 
+@pytest.fixture
+def school_db():
+    """Factory writing a small synthetic Ortaokul (one class per grade) to a database file"""
+
+    def make(path, seed=42) -> str:
+        db = DatabaseManager(str(path))
+        generate_school(db, SchoolSpec(school_type="Ortaokul", classes_per_grade=1, seed=seed))
+        db.close_connection()
+        return str(path)
+
+    return make
+
+
 @pytest.fixture
 def sample_classes(db_manager):
     """Create sample classes for testing"""
@@ -142,3 +180,32 @@ def sample_schedule_data(db_manager, sample_classes, sample_teachers, sample_les
         "lessons": sample_lessons,
         "classroom_id": classroom_id,
     }
+
+
+@pytest.fixture(scope="session")
+def perf_gate(request):
+    """Session-wide performance gate; baselines are saved at the end with --perf-update"""
+    config = request.config
+    gate = PerfGate(
+        BaselineStore(config.getoption("--perf-baseline")),
+        tolerance=config.getoption("--perf-tolerance"),
+        update=config.getoption("--perf-update"),
+        strict=config.getoption("--perf-strict"),
+    )
+    config._perf_gate = gate
+    yield gate
+    gate.finish()
+    report_path = config.getoption("--perf-report")
+    if report_path:
+        import json
+
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump(gate.to_dict(), f, indent=2, ensure_ascii=False)
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """Print per-scenario / per-algorithm deltas after a performance run"""
+    gate = getattr(config, "_perf_gate", None)
+    if gate is not None and gate.verdicts:
+        terminalreporter.section("performance gate")
+        terminalreporter.write_line(gate.report())
@@ -470,6 +470,18 @@ class TestRandomizationFunctionality:
         assert new_order == original_order
         assert manager.stats["randomizations_applied"] == 0
 
+    def test_randomization_seed_is_reproducible(self, db_manager):
+        """The same seed gives the same slot order"""
+        orders = []
+        for _ in range(2):
+            manager = BacktrackingManager(db_manager)
+            manager.set_randomization_seed(1234)
+            slots = [TimeSlotScore(0, slot, 10.0 - slot) for slot in range(8)]
+            manager.apply_randomization(slots)
+            orders.append([(s.day, s.slot) for s in slots])
+
+        assert orders[0] == orders[1]
+
     def test_apply_randomization_insufficient_slots(self, db_manager):
         """Test randomization with insufficient slots"""
         manager = BacktrackingManager(db_manager)
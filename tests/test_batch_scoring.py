@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for batched scoring of candidate schedules
+"""
+
+import copy
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from algorithms.batch_scoring import BatchScheduleScorer, apply_move
+from algorithms.compiled_soft_constraints import NUMPY_AVAILABLE
+from algorithms.soft_constraints import SoftConstraintManager
+
+LESSON_NAMES = ["Matematik", "Müzik", "Fizik", "Tarih", "Beden Eğitimi", "Coğrafya"]
+
+
+class FakeLessonDB:
+    """Lesson lookups only"""
+
+    def get_lesson_by_id(self, lesson_id):
+        return SimpleNamespace(name=LESSON_NAMES[lesson_id % len(LESSON_NAMES)])
+
+
+def random_schedule(rng, size):
+    return [
+        {
+            "class_id": rng.randint(1, 6),
+            "teacher_id": rng.randint(1, 8),
+            "lesson_id": rng.randint(1, 12),
+            "day": rng.randint(0, 4),
+            "time_slot": rng.randint(0, 7),
+        }
+        for _ in range(size)
+    ]
+
+
+def reference_conflicts(schedule, owner_field):
+    seen, conflicts = set(), 0
+    for entry in schedule:
+        key = (entry[owner_field], entry["day"], entry["time_slot"])
+        conflicts += key in seen
+        seen.add(key)
+    return conflicts
+
+
+@pytest.fixture
+def manager():
+    return SoftConstraintManager(FakeLessonDB())
+
+
+@pytest.mark.skipif(not NUMPY_AVAILABLE, reason="NumPy not available")
+class TestBatchScheduleScorer:
+    """Batched results must equal per-schedule scoring"""
+
+    def test_schedules_match_individual_scoring(self, manager):
+        """Hard and soft scores of every candidate match the reference"""
+        rng = random.Random(7)
+        schedules = [random_schedule(rng, size) for size in (0, 1, 30, 60, 120, 45)]
+
+        scores = BatchScheduleScorer(manager).score_schedules(schedules)
+
+        assert len(scores) == len(schedules)
+        for k, schedule in enumerate(schedules):
+            expected = manager.evaluate_schedule(schedule)
+            assert scores.teacher_conflicts[k] == reference_conflicts(schedule, "teacher_id")
+            assert scores.class_conflicts[k] == reference_conflicts(schedule, "class_id")
+            assert scores.soft_scores[k] == pytest.approx(expected["total_score"])
+            for name, score in expected["constraint_scores"].items():
+                assert scores.constraint_scores[name][k] == pytest.approx(score), name
+
+    def test_moves_match_applied_schedules(self, manager):
+        """Scoring K moves equals scoring the K moved schedules"""
+        rng = random.Random(11)
+        base = random_schedule(rng, 50)
+        moves = [(rng.randrange(len(base)), rng.randint(0, 4), rng.randint(0, 7)) for _ in range(25)]
+        scorer = BatchScheduleScorer(manager)
+        original = copy.deepcopy(base)
+
+        batched = scorer.score_moves(base, moves)
+        expected = scorer.score_schedules([apply_move(base, move) for move in moves])
+
+        assert batched.hard_violations == expected.hard_violations
+        assert batched.soft_scores == pytest.approx(expected.soft_scores)
+        assert base == original
+
+    def test_hard_only_scoring(self):
+        """Without a soft manager only conflicts are counted"""
+        entry = {"class_id": 1, "teacher_id": 1, "lesson_id": 1, "day": 0, "time_slot": 0}
+        clash = dict(entry, class_id=2)
+
+        scores = BatchScheduleScorer().score_schedules([[entry], [entry, clash]])
+
+        assert scores.teacher_conflicts == [0, 1]
+        assert scores.class_conflicts == [0, 0]
+        assert scores.soft_scores == [0.0, 0.0]
+        assert scores.best_index() == 0
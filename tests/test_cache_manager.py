@@ -10,6 +10,7 @@ import pytest
 from utils.cache_manager import (
     CacheManager,
     LRUCache,
+    ReadThroughCache,
     ScheduleCache,
     cached,
     get_cache,
@@ -300,3 +301,68 @@ class TestCachePerformance:
         assert result1 == result2
         assert call_count == 1
         assert time2 < time1  # Cached call should be faster
+
+
+class TestReadThroughCache:
+    """Test ReadThroughCache and its DatabaseManager wiring"""
+
+    def test_tags_invalidate_precisely(self):
+        """Only entries carrying an invalidated tag are reloaded"""
+        cache = ReadThroughCache(max_size=10)
+        loads = []
+
+        def loader(value):
+            def load():
+                loads.append(value)
+                return [value]
+            return load
+
+        assert cache.get_or_load(("teacher", 1), loader("t1"), ["teacher:1"]) == ["t1"]
+        cache.get_or_load(("teacher", 2), loader("t2"), ["teacher:2"])
+        cache.get_or_load(("teacher", 1), loader("t1"), ["teacher:1"])
+
+        assert cache.invalidate("teacher:1") == 1
+        cache.get_or_load(("teacher", 1), loader("t1"), ["teacher:1"])
+        cache.get_or_load(("teacher", 2), loader("t2"), ["teacher:2"])
+
+        assert loads == ["t1", "t2", "t1"]
+        stats = cache.get_stats()
+        assert (stats["hits"], stats["misses"], stats["size"]) == (2, 3, 2)
+
+    def test_lru_bound_and_copies(self):
+        """The least recently used entry goes first; cached lists are not shared"""
+        cache = ReadThroughCache(max_size=2)
+        cache.get_or_load("a", lambda: [1], ["x"])
+        cache.get_or_load("b", lambda: [2], ["x"])
+        cache.get_or_load("a", lambda: [0], ["x"]).append(99)
+        cache.get_or_load("c", lambda: [3], ["x"])
+
+        assert cache.get_or_load("a", lambda: [0]) == [1]
+        assert cache.get_or_load("b", lambda: ["reloaded"]) == ["reloaded"]
+        assert cache.get_stats()["evictions"] >= 1
+
+    def test_database_manager_reads_after_writes(self, db_manager):
+        """Cached getters reflect every repository write"""
+        teacher_id = db_manager.add_teacher("Ayşe", "Matematik")
+        lesson_id = db_manager.add_lesson("Matematik")
+        db_manager.add_or_update_curriculum(lesson_id, 5, 4)
+
+        assert [t.name for t in db_manager.get_all_teachers()] == ["Ayşe"]
+        assert db_manager.get_weekly_hours_for_lesson(lesson_id, 5) == 4
+        db_manager.get_all_teachers()
+        assert db_manager.get_cache_stats()["hits"] >= 1
+
+        db_manager.update_teacher(teacher_id, "Ayşe Y.", "Matematik")
+        db_manager.add_or_update_curriculum(lesson_id, 5, 5)
+        db_manager.add_teacher("Can", "Fizik")
+
+        assert db_manager.get_teacher_by_id(teacher_id).name == "Ayşe Y."
+        assert db_manager.get_weekly_hours_for_lesson(lesson_id, 5) == 5
+        assert len(db_manager.get_all_teachers()) == 2
+
+        db_manager.delete_lesson(lesson_id)
+        assert db_manager.get_lesson_by_id(lesson_id) is None
+        assert db_manager.get_weekly_hours_for_lesson(lesson_id, 5) is None
+
+        db_manager.set_school_type("Lise")
+        assert db_manager.get_all_teachers() == []
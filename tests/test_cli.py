@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for headless generation jobs and the ``generate`` command
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import cli
+from algorithms import generation_jobs
+from algorithms.generation_jobs import (
+    STATUS_INFEASIBLE,
+    STATUS_OK,
+    GenerationJob,
+    GenerationResult,
+    placement_rows,
+    run_generation,
+)
+from database.db_manager import DatabaseManager
+from utils.synthetic_school import SchoolSpec
+
+
+class TestRunGeneration:
+    """Presolve, solve and bulk persistence in one process"""
+
+    def test_generates_and_replaces_program(self, tmp_path, school_db, memory_history):
+        """The timetable is stored, progress is reported and the run is recorded"""
+        path = school_db(tmp_path / "school.db")
+        events = []
+
+        result = run_generation(GenerationJob(path, "simple_perfect"), lambda m, p: events.append(p))
+
+        assert result.status == STATUS_OK and result.coverage == 1.0
+        assert result.placements == result.required_hours == result.saved > 0
+        db = DatabaseManager(path)
+        assert len(db.get_schedule_program_by_school_type()) == result.saved
+        db.close_connection()
+        assert events[0] == 5 and events[-1] == 100
+        assert [r.algorithm for r in memory_history.runs] == ["SimplePerfectScheduler"]
+
+    def test_placement_rows_skip_unplaced_entries(self):
+        """Unplaced or incomplete entries are not written; a missing classroom defaults to 1"""
+        entry = {"class_id": 1, "teacher_id": 2, "lesson_id": 3, "day": 0, "time_slot": 4}
+        entries = [
+            entry,
+            {**entry, "classroom_id": 5, "day": 1},
+            {**entry, "day": -1},
+            {**entry, "time_slot": None},
+            {key: value for key, value in entry.items() if key != "teacher_id"},
+        ]
+
+        assert placement_rows(entries) == [(1, 2, 3, 1, 0, 4), (1, 2, 3, 5, 1, 4)]
+
+    def test_infeasible_instance_is_not_solved(self, tmp_path, school_db):
+        """A failed presolve leaves the stored program untouched"""
+        path = school_db(tmp_path / "tight.db")
+        db = DatabaseManager(path)
+        # Öğretmeni haftanın tamamında müsait değil yap: ders saatleri sığmaz
+        entry = db.get_schedule_by_school_type()[0]
+        for day in range(5):
+            for slot in range(SchoolSpec(school_type="Ortaokul").slots_per_day):
+                db.set_teacher_availability(entry.teacher_id, day, slot, False)
+        db.add_schedule_program(entry.class_id, entry.teacher_id, entry.lesson_id, entry.classroom_id, 0, 0)
+
+        result = run_generation(GenerationJob(path, "simple_perfect"))
+
+        assert result.status == STATUS_INFEASIBLE and result.feasibility
+        assert result.scheduler is None and result.saved == 0
+        assert len(db.get_schedule_program_by_school_type()) == 1
+        db.close_connection()
+
+
+class TestGenerateCommand:
+    """Manifests, worker processes, JSON summaries and exit codes"""
+
+    def test_manifest_batch(self, tmp_path, school_db, memory_history):
+        """Two databases from a text manifest run in two worker processes"""
+        school_db(tmp_path / "a.db")
+        school_db(tmp_path / "b.db", seed=7)
+        manifest = tmp_path / "schools.txt"
+        manifest.write_text("# nightly\na.db\nb.db\n", encoding="utf-8")
+        output = tmp_path / "out" / "summary.json"
+
+        code = cli.main(["generate", "--manifest", str(manifest), "--algorithm", "simple_perfect",
+                         "--workers", "2", "--deadline", "120", "--output", str(output)])
+
+        report = json.loads(output.read_text(encoding="utf-8"))
+        assert code == cli.EXIT_OK == report["exit_code"]
+        assert report["summary"] == {"ok": 2} and report["workers"] == 2
+        assert [os.path.basename(r["db_path"]) for r in report["results"]] == ["a.db", "b.db"]
+        # Worker processes do not write the history; their runs are recorded here
+        assert len(memory_history.runs) == 2
+
+    def test_deadline_kills_worker(self, tmp_path, school_db):
+        """A job still running at its deadline is reported as a timeout"""
+        path = school_db(tmp_path / "school.db")
+        output = tmp_path / "summary.json"
+
+        code = cli.main(["generate", "--db", path, "--deadline", "0.01", "--output", str(output)])
+
+        assert code == cli.EXIT_TIMEOUT
+        assert json.loads(output.read_text(encoding="utf-8"))["results"][0]["status"] == "timeout"
+
+    def test_usage_errors(self, tmp_path):
+        """Unknown algorithms, bad manifests and empty runs exit with the usage code"""
+        manifest = tmp_path / "schools.json"
+        manifest.write_text(json.dumps([{"db": "a.db", "algorithm": "nope"}]), encoding="utf-8")
+
+        assert cli.main(["generate", "--manifest", str(manifest)]) == cli.EXIT_USAGE
+        assert cli.main(["generate"]) == cli.EXIT_USAGE
+        manifest.write_text("[{\"algorithm\": \"auto\"}]", encoding="utf-8")
+        assert cli.main(["generate", "--manifest", str(manifest)]) == cli.EXIT_USAGE
+
+    def test_exit_code_severity(self):
+        """The most severe job decides the exit code"""
+        def results(*statuses):
+            return [GenerationResult("x.db", "auto", status) for status in statuses]
+
+        assert cli.exit_code(results()) == cli.EXIT_OK
+        assert cli.exit_code(results("ok", "incomplete")) == cli.EXIT_INCOMPLETE
+        assert cli.exit_code(results("incomplete", "timeout", "infeasible")) == cli.EXIT_TIMEOUT
+        assert cli.exit_code(results("timeout", "cancelled")) == cli.EXIT_CANCELLED
+        assert cli.exit_code(results("timeout", "error", "ok")) == cli.EXIT_ERROR
+        assert set(cli.STATUS_EXIT_CODES) == {
+            value for name, value in vars(generation_jobs).items() if name.startswith("STATUS_")
+        }
+
+    def test_headless_import(self):
+        """The command line and main.py load without PyQt5"""
+        code = "import sys, cli, main\nprint(any(m.startswith('PyQt5') for m in sys.modules))"
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        result = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True)
+        assert result.stdout.strip() == "False"
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the compiled (vectorized) soft constraint evaluator
+"""
+
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from algorithms.compiled_soft_constraints import (
+    NUMPY_AVAILABLE,
+    CompiledSoftConstraintEvaluator,
+    TimetableTensor,
+)
+from algorithms.soft_constraints import SoftConstraint, SoftConstraintManager
+
+LESSON_NAMES = ["Matematik", "Müzik", "Fizik", "Tarih", "Beden Eğitimi", "Coğrafya"]
+
+
+class FakeLessonDB:
+    """Lesson lookups only; every 7th lesson id does not exist"""
+
+    def __init__(self):
+        self.lookups = 0
+
+    def get_lesson_by_id(self, lesson_id):
+        self.lookups += 1
+        if lesson_id % 7 == 0:
+            return None
+        return SimpleNamespace(name=LESSON_NAMES[lesson_id % len(LESSON_NAMES)])
+
+
+def random_schedule(seed, size):
+    rng = random.Random(seed)
+    return [
+        {
+            "class_id": rng.randint(1, 8),
+            "teacher_id": rng.randint(1, 10),
+            "lesson_id": rng.randint(1, 15),
+            "day": rng.randint(0, 4),
+            "time_slot": rng.randint(0, 7),
+        }
+        for _ in range(size)
+    ]
+
+
+@pytest.fixture
+def manager():
+    return SoftConstraintManager(FakeLessonDB())
+
+
+@pytest.mark.skipif(not NUMPY_AVAILABLE, reason="NumPy not available")
+class TestCompiledSoftConstraintEvaluator:
+    """Compiled scores must match SoftConstraintManager exactly"""
+
+    @pytest.mark.parametrize("seed,size", [(0, 0), (1, 1), (2, 40), (3, 150), (4, 400)])
+    def test_matches_python_evaluation(self, manager, seed, size):
+        """Every per-constraint score equals the reference implementation"""
+        schedule = random_schedule(seed, size)
+        expected = manager.evaluate_schedule(schedule)
+        actual = CompiledSoftConstraintEvaluator(manager).evaluate_schedule(schedule)
+
+        assert set(actual["constraint_scores"]) == set(expected["constraint_scores"])
+        for name, score in expected["constraint_scores"].items():
+            assert actual["constraint_scores"][name] == pytest.approx(score), name
+        assert actual["total_score"] == pytest.approx(expected["total_score"])
+        assert actual["num_violations"] == expected["num_violations"]
+
+    def test_lesson_names_cached(self, manager):
+        """Lesson names are looked up once per lesson, not per entry"""
+        evaluator = CompiledSoftConstraintEvaluator(manager)
+        schedule = random_schedule(5, 300)
+        evaluator.evaluate_schedule(schedule)
+        evaluator.evaluate_schedule(schedule)
+
+        distinct_lessons = len({entry["lesson_id"] for entry in schedule})
+        assert manager.db_manager.lookups == distinct_lessons
+
+    def test_custom_constraint_falls_back(self, manager):
+        """Constraints without a kernel are evaluated by the manager"""
+        manager.constraints.append(SoftConstraint("entry_count", 2.0, lambda schedule: float(len(schedule))))
+        schedule = random_schedule(6, 20)
+
+        result = CompiledSoftConstraintEvaluator(manager).evaluate_schedule(schedule)
+
+        assert result["constraint_scores"]["entry_count"] == 40.0
+
+    def test_tensor_encoding(self):
+        """The tensor holds one lesson per occupied class cell"""
+        schedule = [
+            {"class_id": 10, "teacher_id": 1, "lesson_id": 3, "day": 0, "time_slot": 0},
+            {"class_id": 10, "teacher_id": 1, "lesson_id": 3, "day": 0, "time_slot": 1},
+            {"class_id": 20, "teacher_id": 2, "lesson_id": 4, "day": 2, "time_slot": 5},
+        ]
+
+        tensor = TimetableTensor.from_schedule(schedule)
+
+        assert tensor.cells.shape == (2, 5, 8)
+        assert tensor.occupancy.sum() == 3
+        assert tensor.cells[0, 0, 0] == tensor.cells[0, 0, 1] != -1
+        assert not tensor.has_class_conflicts
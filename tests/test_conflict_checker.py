@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the indexed ConflictChecker / ConflictResolver
+"""
+
+from unittest.mock import patch
+
+from algorithms.conflict_checker import ConflictChecker
+from algorithms.conflict_resolver import ConflictResolver
+from algorithms.schedule_slot_index import ScheduleSlotIndex
+
+
+def _timetable(db_manager, sample_classes, sample_teachers, sample_lessons):
+    """Two entries of one teacher in the same slot plus one free entry"""
+    class_a, class_b = sample_classes[0], sample_classes[1]
+    teacher = sample_teachers[0]
+    lesson = sample_lessons[0]
+    room_a, room_b = db_manager.add_classroom("Derslik A", 30), db_manager.add_classroom("Derslik B", 30)
+    first = db_manager.add_schedule_entry(class_a.class_id, teacher.teacher_id, lesson.lesson_id, room_a, 0, 0)
+    second = db_manager.add_schedule_entry(class_b.class_id, teacher.teacher_id, lesson.lesson_id, room_b, 0, 0)
+    other = db_manager.add_schedule_entry(
+        class_a.class_id, sample_teachers[1].teacher_id, sample_lessons[1].lesson_id, room_a, 0, 1
+    )
+    return first, second, other
+
+
+class TestIndexedConflictChecker:
+    """Checks are answered from the shared slot index"""
+
+    def test_checks_load_program_once(self, db_manager, sample_classes, sample_teachers, sample_lessons):
+        """Repeated checks do not reload the assignments"""
+        first, second, _ = _timetable(db_manager, sample_classes, sample_teachers, sample_lessons)
+        checker = ConflictChecker(db_manager)
+        teacher_id = sample_teachers[0].teacher_id
+
+        with patch.object(db_manager, "get_schedule_by_school_type", wraps=db_manager.get_schedule_by_school_type) as load:
+            has_conflict, entry = checker.check_teacher_conflict(teacher_id, 0, 0, exclude_entry_id=first)
+            assert has_conflict and entry.entry_id == second
+            for entry in db_manager.schedule.get_schedule_entries_by_school_type("Ortaokul"):
+                checker.check_all_conflicts(entry)
+            assert load.call_count == 1
+
+        assert checker.check_class_conflict(sample_classes[0].class_id, 0, 1)[0]
+        room_b = checker.slot_index.get_entry(second).classroom_id
+        assert checker.check_classroom_conflict(room_b, 0, 0, exclude_entry_id=second) == (False, None)
+        assert ConflictResolver(db_manager).slot_index is checker.slot_index
+
+    def test_index_follows_repository_writes(self, db_manager, sample_classes, sample_teachers, sample_lessons):
+        """Adds, moves and deletes reach the index through the change feed"""
+        first, second, _ = _timetable(db_manager, sample_classes, sample_teachers, sample_lessons)
+        checker = ConflictChecker(db_manager)
+        teacher_id = sample_teachers[0].teacher_id
+        assert checker.check_teacher_conflict(teacher_id, 0, 0, exclude_entry_id=first)[0]
+        reloads = checker.slot_index.reloads
+
+        room_b = checker.slot_index.get_entry(second).classroom_id
+        db_manager.update_schedule_entry(
+            second, sample_classes[1].class_id, teacher_id, sample_lessons[0].lesson_id, room_b, 3, 4
+        )
+        assert not checker.check_teacher_conflict(teacher_id, 0, 0, exclude_entry_id=first)[0]
+        assert checker.check_teacher_conflict(teacher_id, 3, 4)[1].entry_id == second
+
+        db_manager.delete_schedule_entry(first)
+        assert not checker.check_teacher_conflict(teacher_id, 0, 0)[0]
+        assert checker.slot_index.reloads == reloads
+
+        # Bulk deletes force a full reload
+        db_manager.delete_all_schedule_entries()
+        assert checker.check_teacher_conflict(teacher_id, 3, 4) == (False, None)
+        assert checker.slot_index.reloads == reloads + 1
+
+    def test_double_booking_survives_single_removal(self, db_manager):
+        """Removing one of two entries in a slot keeps the slot busy"""
+        index = ScheduleSlotIndex(db_manager)
+        index.load()
+        for entry_id in (1, 2):
+            index.add_schedule_entry(type("Entry", (), dict(
+                entry_id=entry_id, class_id=entry_id, teacher_id=7, lesson_id=1, classroom_id=None, day=2, time_slot=3
+            ))())
+
+        index.remove_schedule_entry(1)
+
+        assert index.has_teacher_conflict(7, 2, 3)
+        assert index.is_busy("teacher", 7, 2, 3)
+        assert not index.is_busy("teacher", 7, 2, 3, exclude_entry_id=2)
+
+
+class TestIndexedConflictResolver:
+    """Resolution moves entries using O(1) slot checks"""
+
+    def test_move_resolves_teacher_conflict(self, db_manager, sample_classes, sample_teachers, sample_lessons):
+        """The other entry moves to the first slot free for its class and teacher, without reloads"""
+        first, second, _ = _timetable(db_manager, sample_classes, sample_teachers, sample_lessons)
+        checker = ConflictChecker(db_manager)
+        resolver = ConflictResolver(db_manager)
+        checker.slot_index.sync()
+        conflicts = checker.check_all_conflicts(checker.slot_index.get_entry(second))
+        assert [c["type"] for c in conflicts] == ["teacher"]
+
+        with patch.object(db_manager, "get_schedule_by_school_type", wraps=db_manager.get_schedule_by_school_type) as load:
+            assert resolver.auto_resolve_conflicts(conflicts) == 1
+            assert load.call_count == 0
+
+        checker.slot_index.sync()
+        moved = checker.slot_index.get_entry(first)
+        assert (moved.day, moved.time_slot) == (0, 2)
+        assert checker.check_all_conflicts(moved) == []
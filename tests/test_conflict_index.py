@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the incremental conflict index
+"""
+
+import pytest
+
+from algorithms.conflict_index import ConflictIndex
+
+
+def _entry(class_id, teacher_id, day, slot, classroom_id=None):
+    return {
+        "class_id": class_id,
+        "teacher_id": teacher_id,
+        "lesson_id": 1,
+        "classroom_id": classroom_id,
+        "day": day,
+        "time_slot": slot,
+    }
+
+
+class TestConflictIndex:
+    """Test ConflictIndex functionality"""
+
+    def test_add_without_conflict(self):
+        """Entries in different slots do not conflict"""
+        index = ConflictIndex()
+        assert index.add(1, _entry(1, 1, 0, 0)).is_empty
+        assert index.add(2, _entry(1, 1, 0, 1)).is_empty
+        assert index.conflict_count == 0
+
+    def test_add_reports_introduced_conflicts(self):
+        """Adding a clashing entry reports the exact keys"""
+        index = ConflictIndex()
+        index.add(1, _entry(1, 1, 0, 0))
+        delta = index.add(2, _entry(2, 1, 0, 0))
+        assert delta.introduced == [("teacher", 1, 0, 0)]
+        assert index.conflict_count == 1
+
+    def test_remove_reports_resolved_conflicts(self):
+        """Removing one side of a clash resolves it"""
+        index = ConflictIndex()
+        index.add(1, _entry(1, 1, 0, 0))
+        index.add(2, _entry(1, 2, 0, 0))
+        delta = index.remove(2)
+        assert delta.resolved == [("class", 1, 0, 0)]
+        assert index.conflict_count == 0
+
+    def test_move_nets_out_delta(self):
+        """Moving an entry out of a clash resolves it and updates the entry"""
+        index = ConflictIndex()
+        index.add(1, _entry(1, 1, 0, 0))
+        entry = _entry(1, 1, 0, 0)
+        index.add(2, entry)
+        assert index.conflict_count == 2
+
+        delta = index.move(2, 1, 3)
+        assert sorted(delta.resolved) == [("class", 1, 0, 0), ("teacher", 1, 0, 0)]
+        assert delta.introduced == []
+        assert entry["day"] == 1 and entry["time_slot"] == 3
+        assert index.is_occupied("class", 1, 1, 3)
+
+    def test_is_occupied_with_exclude(self):
+        """An entry does not block its own slot"""
+        index = ConflictIndex()
+        index.add(1, _entry(1, 1, 2, 2))
+        assert index.is_occupied("class", 1, 2, 2)
+        assert not index.is_occupied("class", 1, 2, 2, exclude=1)
+
+    @pytest.mark.parametrize("track, expected", [(True, 1), (False, 0)])
+    def test_classroom_tracking(self, track, expected):
+        """Classroom clashes are reported only when tracked"""
+        index = ConflictIndex(track_classrooms=track)
+        index.add(1, _entry(1, 1, 0, 0, classroom_id=5))
+        index.add(2, _entry(2, 2, 0, 0, classroom_id=5))
+        assert index.conflict_count == expected
@@ -468,6 +468,28 @@ class TestScheduleProgram:
         assert result is not None
         assert result > 0
 
+    def test_replace_schedule(self, db_manager):
+        """Test replacing the whole program in one transaction"""
+        db_manager.set_school_type("Lise")
+        class_id = db_manager.add_class("9-A", 9)
+        teacher_id = db_manager.add_teacher("Teacher", "Math")
+        lesson_id = db_manager.add_lesson("Math", 5)
+        classroom_id = db_manager.add_classroom("A101", 30)
+        db_manager.add_schedule_program(class_id, teacher_id, lesson_id, classroom_id, 0, 0)
+        revision = db_manager.get_schedule_revision()
+
+        rows = [(class_id, teacher_id, lesson_id, classroom_id, day, 1) for day in range(3)]
+        schedule_ids = db_manager.replace_schedule(rows)
+
+        assert len(schedule_ids) == 3
+        program = db_manager.get_schedule_program_by_school_type()
+        assert sorted((e.day, e.time_slot) for e in program) == [(0, 1), (1, 1), (2, 1)]
+        assert db_manager.get_schedule_revision() > revision
+
+        # A failing row rolls back the whole replacement
+        assert db_manager.replace_schedule(rows[:1] + [(99999, teacher_id, lesson_id, classroom_id, 4, 4)]) is None
+        assert len(db_manager.get_schedule_program_by_school_type()) == 3
+
 
 class TestMissingAssignments:
     """Test missing assignments analysis and auto-fill"""
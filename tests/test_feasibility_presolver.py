@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the feasibility presolver
+"""
+
+from utils.feasibility_presolver import FeasibilityPresolver
+
+
+def _assign(db_manager, class_obj, teacher, lesson, hours, room):
+    db_manager.add_lesson_weekly_hours(lesson.lesson_id, class_obj.grade, "Ortaokul", hours)
+    db_manager.add_schedule_entry(class_obj.class_id, teacher.teacher_id, lesson.lesson_id, room, -1, -1)
+
+
+def _close_all_but(db_manager, teacher, open_slots, days=5, slots=7):
+    for day in range(days):
+        for slot in range(slots):
+            if (day, slot) not in open_slots:
+                db_manager.set_teacher_availability(teacher.teacher_id, day, slot, False)
+
+
+class TestFeasibilityPresolver:
+    """Test bounds, Hall checks and the certificate"""
+
+    def test_feasible_instance(self, db_manager, sample_classes, sample_teachers, sample_lessons):
+        """Bounds come from the availability matrix; nothing is reported for a loose instance"""
+        room = db_manager.add_classroom("Derslik", 30)
+        _assign(db_manager, sample_classes[0], sample_teachers[0], sample_lessons[0], 5, room)
+        _close_all_but(db_manager, sample_teachers[0], {(0, s) for s in range(7)} | {(1, 0), (2, 0)})
+
+        certificate = FeasibilityPresolver(db_manager).run()
+
+        assert certificate.feasible and certificate.errors() == []
+        bounds = certificate.teacher_bounds[sample_teachers[0].teacher_id]
+        assert (bounds.demand, bounds.supply, bounds.per_day) == (5, 9, [7, 1, 1, 0, 0])
+        assert certificate.class_bounds[sample_classes[0].class_id].slack == 30
+        assert certificate.elapsed_ms < 1000
+
+    def test_teacher_capacity_and_block_days(self, db_manager, sample_classes, sample_teachers, sample_lessons):
+        """A teacher with fewer open slots than hours is an error; too few open days only a warning"""
+        room = db_manager.add_classroom("Derslik", 30)
+        teacher = sample_teachers[0]
+        _assign(db_manager, sample_classes[0], teacher, sample_lessons[0], 5, room)
+        _close_all_but(db_manager, teacher, {(0, 0), (0, 1), (0, 2), (0, 3)})
+
+        certificate = FeasibilityPresolver(db_manager).run()
+
+        assert not certificate.feasible
+        assert [(v.kind, v.demand, v.supply) for v in certificate.errors()] == [("teacher_capacity", 5, 4)]
+        assert "block_days" in [v.kind for v in certificate.warnings()]
+        assert "program bu verilerle oluşturulamaz" in certificate.describe()
+
+    def test_hall_violation(self, db_manager, sample_classes, sample_teachers, sample_lessons):
+        """Two teachers of one class sharing the same three slots cannot give four hours"""
+        room = db_manager.add_classroom("Derslik", 30)
+        class_obj = sample_classes[0]
+        shared = {(0, 0), (0, 1), (0, 2)}
+        for teacher, lesson in zip(sample_teachers[:2], sample_lessons[:2]):
+            _assign(db_manager, class_obj, teacher, lesson, 2, room)
+            _close_all_but(db_manager, teacher, shared)
+        _assign(db_manager, class_obj, sample_teachers[2], sample_lessons[2], 4, room)
+
+        certificate = FeasibilityPresolver(db_manager).run()
+
+        (violation,) = certificate.errors()
+        assert violation.kind == "hall" and violation.resource_id == class_obj.class_id
+        assert (violation.demand, violation.supply) == (4, 3)
+        assert violation.teacher_ids == sorted(t.teacher_id for t in sample_teachers[:2])
+        assert certificate.to_dict()["feasible"] is False
+        assert violation.to_dict()["teacher_ids"] == violation.teacher_ids
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the local generation service (job queue, cancellation, SSE progress)
+"""
+
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from algorithms.generation_service import GenerationService, JobRejected
+from database.db_manager import DatabaseManager
+
+
+def _wait(service, state, timeout=60.0):
+    after = 0
+    events = []
+    while True:
+        new, done = service.wait_events(state.id, after, timeout)
+        events.extend(new)
+        after = events[-1].seq if events else after
+        if done:
+            return events
+
+
+class TestJobQueue:
+    """Validation, bounded queue and cancellation"""
+
+    def test_rejected_requests(self, tmp_path, school_db):
+        """Bad requests are refused with the matching HTTP status"""
+        school_db(tmp_path / "a.db")
+        school_db(tmp_path / "b.db")
+        service = GenerationService(max_queue=1, roots=[str(tmp_path)])
+
+        def status(**request):
+            with pytest.raises(JobRejected) as info:
+                service.submit(**request)
+            return info.value.status
+
+        assert status(db="a.db", algorithm="nope") == 400
+        assert status(db="a.db", deadline=-1) == 400
+        assert status(db="../a.db") == 403
+        assert status(db="missing.db") == 404
+        assert service.submit("a.db").status == "queued"
+        assert status(db=str(tmp_path / "a.db")) == 409
+        assert status(db="b.db") == 503
+
+    def test_cancel_queued_and_running(self, tmp_path, school_db):
+        """A queued job is skipped, a running one is killed"""
+        school_db(tmp_path / "a.db")
+        school_db(tmp_path / "b.db")
+        service = GenerationService(workers=1, roots=[str(tmp_path)]).start()
+        try:
+            running = service.submit("a.db", deadline=60)
+            queued = service.submit("b.db")
+            service.wait_events(running.id, after=1, timeout=10)  # "running"
+
+            service.cancel(queued.id)
+            assert queued.status == "cancelled"
+            service.cancel(running.id)
+            events = _wait(service, running)
+        finally:
+            service.shutdown()
+
+        assert [e.event for e in events][-1] == "result"
+        assert running.status == "cancelled" and running.result.error == "Cancelled"
+        assert service.stats()["running"] == 0
+
+
+class TestHttpApi:
+    """Jobs submitted over HTTP report progress as server-sent events"""
+
+    def test_submit_and_stream(self, tmp_path, school_db):
+        """POST /jobs, then follow /jobs/<id>/events until the result is stored"""
+        path = school_db(tmp_path / "school.db")
+        service = GenerationService(workers=2, roots=[str(tmp_path)])
+        server = service.serve(port=0)
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            request = urllib.request.Request(
+                f"{base}/jobs", data=json.dumps({"db": "school.db", "algorithm": "simple_perfect"}).encode(),
+                method="POST",
+            )
+            with urllib.request.urlopen(request, timeout=10) as response:
+                assert response.status == 202
+                job = json.load(response)
+
+            with urllib.request.urlopen(base + job["events"], timeout=60) as response:
+                assert response.headers["Content-Type"].startswith("text/event-stream")
+                stream = response.read().decode("utf-8")
+            with pytest.raises(urllib.error.HTTPError) as info:
+                urllib.request.urlopen(f"{base}/jobs/999", timeout=10)
+            assert info.value.code == 404
+            with urllib.request.urlopen(f"{base}/health", timeout=10) as response:
+                assert json.load(response)["workers"] == 2
+        finally:
+            service.shutdown()
+
+        events = [block.split("\n") for block in stream.strip().split("\n\n")]
+        names = [lines[1].split(": ", 1)[1] for lines in events]
+        assert names[:2] == ["status", "status"] and names[-1] == "result" and "progress" in names
+        result = json.loads(events[-1][2].split(": ", 1)[1])["result"]
+        assert result["status"] == "ok" and result["saved"] > 0
+
+        db = DatabaseManager(path)
+        assert len(db.get_schedule_program_by_school_type()) == result["saved"]
+        db.close_connection()
@@ -3,6 +3,8 @@
 Unit tests for InteractiveScheduler
 """
 
+import time
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock
 
 import pytest
@@ -72,6 +74,25 @@ class TestInteractiveSchedulerUnit:
         assert success == False
         assert reason == "Class already has a lesson at this time"
 
+    def test_concurrent_edits_cannot_double_book(self, scheduler, monkeypatch):
+        scheduler.load_schedule(
+            [{"class_id": 1, "day": 0, "time_slot": 0, "teacher_id": 1, "lesson_id": 1}]
+        )
+        can_place = scheduler._can_place_at
+
+        def slow_can_place(*args, **kwargs):
+            result = can_place(*args, **kwargs)
+            time.sleep(0.01)  # widen the gap between the check and the edit
+            return result
+
+        monkeypatch.setattr(scheduler, "_can_place_at", slow_can_place)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda t: scheduler.add_entry(1, t, 2, 1, 1, 1), range(2, 10)))
+            results += list(pool.map(lambda _: scheduler.move_entry(0, 1, 1), range(4)))
+
+        assert sum(success for success, _ in results) == 1
+        assert scheduler.conflicts == []
+
     def test_remove_entry(self, scheduler):
         scheduler.load_schedule(
             [{"class_id": 1, "day": 0, "time_slot": 0, "teacher_id": 1, "lesson_id": 1}]
@@ -97,3 +118,120 @@ class TestInteractiveSchedulerUnit:
         assert len(scheduler.get_schedule()) == 0
         scheduler.redo()
         assert len(scheduler.get_schedule()) == 1
+
+    def test_edit_reports_conflict_delta(self, scheduler):
+        scheduler.load_schedule(
+            [
+                {"class_id": 1, "day": 0, "time_slot": 0, "teacher_id": 1, "lesson_id": 1},
+                {"class_id": 2, "day": 0, "time_slot": 1, "teacher_id": 2, "lesson_id": 2},
+            ]
+        )
+        success, _ = scheduler.move_entry(1, 2, 2)
+        assert success == True
+        assert scheduler.last_conflict_delta.is_empty
+        assert scheduler.conflicts == []
+
+    def test_conflicts_materialized_from_index(self, scheduler):
+        scheduler.load_schedule(
+            [
+                {"class_id": 1, "day": 0, "time_slot": 0, "teacher_id": 1, "lesson_id": 1},
+                {"class_id": 1, "day": 0, "time_slot": 0, "teacher_id": 2, "lesson_id": 2},
+            ]
+        )
+        assert len(scheduler.conflicts) == 1
+        assert scheduler.conflicts[0]["type"] == "class_conflict"
+        assert scheduler.conflicts[0]["indices"] == [0, 1]
+
+        success, _ = scheduler.remove_entry(1)
+        assert success == True
+        assert scheduler.last_conflict_delta.resolved == [("class", 1, 0, 0)]
+        assert scheduler.conflicts == []
+
+    def test_undo_redo_move(self, scheduler):
+        scheduler.load_schedule(
+            [{"class_id": 1, "day": 0, "time_slot": 0, "teacher_id": 1, "lesson_id": 1}]
+        )
+        scheduler.move_entry(0, 2, 3)
+        assert scheduler.undo() == True
+        assert (scheduler.get_schedule()[0]["day"], scheduler.get_schedule()[0]["time_slot"]) == (0, 0)
+        assert scheduler.redo() == True
+        assert (scheduler.get_schedule()[0]["day"], scheduler.get_schedule()[0]["time_slot"]) == (2, 3)
+
+    def test_undo_remove_restores_position_and_lock(self, scheduler):
+        scheduler.load_schedule(
+            [
+                {"class_id": 1, "day": 0, "time_slot": 0, "teacher_id": 1, "lesson_id": 1},
+                {"class_id": 2, "day": 0, "time_slot": 1, "teacher_id": 2, "lesson_id": 2},
+            ]
+        )
+        scheduler.lock_entry(1)
+        scheduler.remove_entry(0)
+        assert scheduler.is_locked(0) == True
+        scheduler.undo()
+        assert scheduler.get_schedule()[0]["class_id"] == 1
+        assert scheduler.is_locked(1) == True
+        scheduler.undo()
+        assert scheduler.is_locked(1) == False
+
+    def test_transaction_is_single_undo_step(self, scheduler):
+        scheduler.load_schedule([])
+        with scheduler.transaction():
+            scheduler.add_entry(1, 1, 1, 1, 0, 0)
+            scheduler.add_entry(2, 2, 2, 1, 0, 0)
+            scheduler.move_entry(0, 1, 1)
+        assert len(scheduler.get_schedule()) == 2
+        assert scheduler.undo() == True
+        assert scheduler.get_schedule() == []
+        assert scheduler.can_undo() == False
+        assert scheduler.redo() == True
+        assert len(scheduler.get_schedule()) == 2
+        assert scheduler.get_schedule()[0]["day"] == 1
+
+    def test_new_edit_clears_redo(self, scheduler):
+        scheduler.load_schedule([])
+        scheduler.add_entry(1, 1, 1, 1, 0, 0)
+        scheduler.undo()
+        scheduler.add_entry(2, 2, 2, 1, 0, 1)
+        assert scheduler.can_redo() == False
+
+    def test_suggest_alternatives(self, scheduler):
+        scheduler.load_schedule(
+            [
+                {"class_id": 1, "day": 0, "time_slot": 0, "teacher_id": 1, "lesson_id": 1},
+                {"class_id": 2, "day": 0, "time_slot": 1, "teacher_id": 1, "lesson_id": 2},
+            ]
+        )
+        suggestions = scheduler.suggest_alternatives(0, max_suggestions=50)
+        slots = {(s["day"], s["slot"]) for s in suggestions}
+        assert (0, 0) not in slots  # current slot
+        assert (0, 1) not in slots  # teacher busy
+        assert len(slots) == 5 * 8 - 2
+        assert suggestions == sorted(suggestions, key=lambda s: s["score"], reverse=True)
+
+    def test_suggest_alternatives_respects_availability(self, scheduler, mock_db_manager):
+        mock_db_manager.get_teacher_availability.return_value = [
+            {"day": 1, "time_slot": 2, "is_available": 0}
+        ]
+        scheduler.load_schedule(
+            [{"class_id": 1, "day": 0, "time_slot": 0, "teacher_id": 1, "lesson_id": 1}]
+        )
+        slots = {(s["day"], s["slot"]) for s in scheduler.suggest_alternatives(0, max_suggestions=50)}
+        assert (1, 2) not in slots
+
+    def test_suggest_and_apply_swap(self, scheduler):
+        scheduler.load_schedule(
+            [
+                {"class_id": 1, "day": 0, "time_slot": 0, "teacher_id": 1, "lesson_id": 1},
+                {"class_id": 1, "day": 0, "time_slot": 1, "teacher_id": 2, "lesson_id": 2},
+            ]
+        )
+        swaps = scheduler.suggest_swaps(0)
+        assert [(s["day"], s["slot"], s["swap_with"]) for s in swaps] == [(0, 1, 1)]
+
+        success, _ = scheduler.swap_entries(0, 1)
+        assert success == True
+        assert scheduler.get_schedule()[0]["time_slot"] == 1
+        assert scheduler.get_schedule()[1]["time_slot"] == 0
+        assert scheduler.conflicts == []
+        scheduler.undo()
+        assert scheduler.get_schedule()[0]["time_slot"] == 0
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the solver memory budget
+"""
+
+import gc
+
+from utils.memory_budget import MB, MemoryBudget, current_rss_mb, estimate_size
+
+
+class _Owner:
+    def __init__(self, items):
+        self.history = list(items)
+
+
+def _budget(rss_mb, limit_mb=100):
+    budget = MemoryBudget(limit_mb=limit_mb, check_interval=1)
+    budget.rss_reader = lambda: rss_mb
+    return budget
+
+
+class TestMemoryBudget:
+    """Test RSS accounting and eviction order"""
+
+    def test_rss_and_size_estimates(self):
+        """RSS is read from the OS and deep sizes scale with the content"""
+        assert current_rss_mb() > 0
+        small = estimate_size([{"day": d, "slot": s} for d in range(5) for s in range(2)])
+        large = estimate_size([{"day": d, "slot": s} for d in range(5) for s in range(200)])
+        assert 50 < large / small < 200
+
+    def test_evicts_least_valuable_first(self):
+        """Cheap history is evicted before snapshots; nothing happens under the limit"""
+        history, snapshots = _Owner(range(50000)), _Owner(range(50000))
+        budget = _budget(rss_mb=0.5, limit_mb=1)
+        budget.register_history("history", history, "history", value=0.1)
+        budget.register_history("snapshots", snapshots, "history", value=1.0)
+
+        assert budget.enforce() == 0
+        assert len(history.history) == 50000
+
+        # Low water mark is 0.85 MB: half of the history has to go
+        budget.rss_reader = lambda: 0.85 + estimate_size(history.history) / MB / 2
+        assert budget.enforce() > 0
+        assert 20000 < len(history.history) < 30000
+        assert len(snapshots.history) == 50000
+
+    def test_dead_owner_is_dropped(self):
+        """Structures disappear from the budget with their owner"""
+        budget = _budget(rss_mb=500)
+        owner = _Owner(range(10))
+        budget.register_history("history", owner, "history")
+        assert [s.name for s in budget.structures()] == ["history"]
+
+        del owner
+        gc.collect()
+        assert budget.structures() == []
+
+    def test_backtracking_snapshots_evicted(self, db_manager):
+        """Old SolutionState snapshots go, the newest stays"""
+        from algorithms.backtracking_manager import BacktrackingManager
+
+        manager = BacktrackingManager(db_manager, max_depth=20)
+        for index in range(10):
+            manager.current_state.teacher_slots[index] = {(index % 5, index % 8)}
+            manager.push_solution_state()
+        newest = manager.solution_stack[-1]
+
+        freed = manager._evict_old_snapshots(1 << 30)
+
+        assert freed > 0
+        assert manager.solution_stack == [newest]
+
+    def test_solve_report_with_tracemalloc(self):
+        """A traced solve reports the allocation peak and evictions"""
+        budget = _budget(rss_mb=200)
+        budget.configure(trace_allocations=True)
+        owner = _Owner(range(100))
+        budget.register_history("history", owner, "history")
+
+        with budget.solve("TestScheduler") as report:
+            block = [bytearray(1024) for _ in range(2048)]
+            budget.maybe_check()
+            del block
+
+        assert report.traced_peak_mb >= 2
+        assert report.peak_rss_mb == 200 and report.over_budget
+        assert report.evictions == {"history": 1}
+        assert budget.last_report is report
+        assert "tracemalloc peak" in report.describe()
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the OpenMetrics metrics registry
+"""
+
+import urllib.request
+from types import SimpleNamespace
+
+import pytest
+
+from utils.cache_manager import CacheManager
+from utils.metrics_registry import (
+    CONTENT_TYPE,
+    MetricsRegistry,
+    db_query_histogram,
+    performance_summary,
+    track_cache,
+    track_solve,
+)
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+class TestMetricsRegistry:
+    """Test MetricsRegistry functionality"""
+
+    def test_render_openmetrics_text(self, registry):
+        """Counters, gauges and cumulative histogram buckets are rendered"""
+        registry.counter("jobs", "Jobs run", ["kind"]).labels("full").inc(3)
+        registry.gauge("queue_depth", "Pending jobs").set(2)
+        histogram = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+        histogram.observe(5)
+
+        text = registry.render()
+
+        assert '# TYPE jobs counter' in text
+        assert 'jobs_total{kind="full"} 3' in text
+        assert "queue_depth 2" in text
+        assert 'latency_seconds_bucket{le="0.1"} 1' in text
+        assert 'latency_seconds_bucket{le="1.0"} 2' in text
+        assert 'latency_seconds_bucket{le="+Inf"} 3' in text
+        assert "latency_seconds_count 3" in text
+        assert text.endswith("# EOF\n")
+
+    def test_same_name_returns_same_metric(self, registry):
+        """Families are created once; a type clash is an error"""
+        assert registry.counter("runs", "Runs") is registry.counter("runs", "Runs")
+        with pytest.raises(ValueError):
+            registry.gauge("runs", "Runs")
+
+    def test_track_solve_records_run(self, registry):
+        """A scheduler run publishes latency, placements, coverage and backtracks"""
+        scheduler = SimpleNamespace(
+            target_hours=10,
+            backtrack_manager=SimpleNamespace(get_statistics=lambda: {"total_backtracks": 4}),
+        )
+
+        with track_solve("TestScheduler", registry) as solve:
+            solve.observe_scheduler(scheduler, [{}] * 8)
+        with pytest.raises(RuntimeError):
+            with track_solve("TestScheduler", registry):
+                raise RuntimeError("boom")
+
+        text = registry.render()
+        assert 'scheduler_runs_total{algorithm="TestScheduler",outcome="success"} 1' in text
+        assert 'scheduler_runs_total{algorithm="TestScheduler",outcome="error"} 1' in text
+        assert 'scheduler_placements_total{algorithm="TestScheduler"} 8' in text
+        assert 'scheduler_backtracks_total{algorithm="TestScheduler"} 4' in text
+        assert 'scheduler_coverage_ratio{algorithm="TestScheduler"} 0.8' in text
+
+        summary = performance_summary(registry)
+        assert summary["total_generations"] == 2
+        assert summary["success_rate"] == pytest.approx(50.0)
+
+    def test_cache_and_db_metrics(self, registry):
+        """Cache hit ratio and DB latency feed the dashboard summary"""
+        cache = CacheManager()
+        track_cache("test", cache, registry)
+        cache.set("a", 1)
+        cache.get("a")
+        cache.get("missing")
+        db_query_histogram(registry).labels("TeacherRepository", "get_all_teachers").observe(0.002)
+
+        text = registry.render()
+        summary = performance_summary(registry)
+
+        assert 'cache_hit_ratio{cache="test"} 0.5' in text
+        assert 'db_query_duration_seconds_count{repository="TeacherRepository",method="get_all_teachers"} 1' in text
+        assert summary["cache_hit_ratio"] == pytest.approx(50.0)
+        assert summary["avg_db_query_ms"] == pytest.approx(2.0)
+
+    def test_textfile_and_http_endpoint(self, registry, tmp_path):
+        """The exposition is readable from a file and over HTTP"""
+        registry.counter("scrapes", "Scrapes").inc()
+        path = registry.write_textfile(str(tmp_path / "scheduler.prom"))
+        assert "scrapes_total 1" in open(path, encoding="utf-8").read()
+
+        server = registry.serve(port=0)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            with urllib.request.urlopen(url, timeout=5) as response:
+                assert response.headers["Content-Type"] == CONTENT_TYPE
+                assert "scrapes_total 1" in response.read().decode("utf-8")
+        finally:
+            registry.shutdown()
+
+
+class TestRepositoryMetrics:
+    """Repository instrumentation feeds the global registry"""
+
+    def test_repository_queries_are_timed(self, db_manager):
+        """Repository queries are recorded under the calling method"""
+        child = db_query_histogram().labels("TeacherRepository", "get_all_teachers")
+        before = child.count
+
+        db_manager.get_all_teachers()
+
+        assert child.count == before + 1
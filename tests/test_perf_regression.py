@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+Performance regression gate - representative scenarios timed against stored baselines
+
+Baselines live in tests/perf_baselines.json. Record new ones with:
+    pytest tests/test_perf_regression.py --perf-update
+"""
+
+import importlib
+import os
+
+import pytest
+
+from database.db_manager import DatabaseManager
+from utils.perf_gate import (
+    IMPORTTIME_MARKER, BaselineStore, PerfGate, Timing, machine_fingerprint, measure_import, parse_importtime,
+)
+from utils.synthetic_school import SchoolSpec, generate_school
+
+# Her senaryo sabit tohumlu aynı sentetik okulda çalışır
+GATE_SCHOOL = SchoolSpec(school_type="Lise", class_count=12, availability_density=0.9, seed=2024)
+
+GENERATION_SCHEDULERS = [
+    "algorithms.simple_perfect_scheduler:SimplePerfectScheduler",
+    "algorithms.optimized_curriculum_scheduler:OptimizedCurriculumScheduler",
+    "algorithms.enhanced_strict_scheduler:EnhancedStrictScheduler",
+    "algorithms.strict_scheduler:StrictScheduler",
+    "algorithms.enhanced_schedule_generator:EnhancedScheduleGenerator",
+]
+
+# Soğuk açılışta içe aktarılan giriş noktaları (her ölçüm yeni bir süreç)
+COLD_START_MODULES = ["algorithms.scheduler", "algorithms.algorithm_selector"]
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _load(path):
+    module_name, class_name = path.split(":")
+    try:
+        return getattr(importlib.import_module(module_name), class_name)
+    except Exception as e:  # bozuk veya eksik bağımlılıklı zamanlayıcılar atlanır
+        pytest.skip(f"{class_name} not available: {e}")
+
+
+@pytest.fixture(scope="module")
+def gate_db():
+    """Synthetic school with one generated timetable"""
+    db = DatabaseManager(":memory:")
+    generate_school(db, GATE_SCHOOL)
+    scheduler_class = _load("algorithms.optimized_curriculum_scheduler:OptimizedCurriculumScheduler")
+    entries = scheduler_class(db).generate_schedule()
+    db.clear_schedule()
+    for entry in entries:
+        db.add_schedule_program(
+            entry["class_id"], entry["teacher_id"], entry["lesson_id"],
+            entry.get("classroom_id") or 1, entry["day"], entry["time_slot"],
+        )
+    return db
+
+
+def _gate(perf_gate, scenario, algorithm, func, repeat=5):
+    verdict = perf_gate.check(scenario, algorithm, func, repeat=repeat)
+    assert not verdict.failed, verdict.describe()
+    return verdict
+
+
+@pytest.mark.performance
+class TestPerformanceGate:
+    """Time scenarios and fail on regressions beyond the tolerance"""
+
+    @pytest.mark.parametrize("scheduler_path", GENERATION_SCHEDULERS, ids=lambda p: p.split(":")[1])
+    def test_generation(self, perf_gate, scheduler_path):
+        """Full schedule generation per algorithm"""
+        scheduler_class = _load(scheduler_path)
+        db = DatabaseManager(":memory:")
+        generate_school(db, GATE_SCHOOL)
+
+        _gate(perf_gate, "generation", scheduler_class.__name__, lambda: scheduler_class(db).generate_schedule(), repeat=3)
+
+    def test_validation(self, perf_gate, gate_db):
+        """Complete-solution validation of the stored timetable"""
+        from algorithms.optimized_curriculum_scheduler import EnhancedScheduleEntry
+        from algorithms.solution_validator import SolutionValidator
+
+        entries = [
+            EnhancedScheduleEntry(
+                schedule_id=index, class_id=e.class_id, teacher_id=e.teacher_id, lesson_id=e.lesson_id,
+                day=e.day, time_slot=e.time_slot, block_position=1, block_id=f"{e.class_id}_{e.lesson_id}",
+            )
+            for index, e in enumerate(gate_db.get_schedule_program_by_school_type())
+        ]
+        assert entries
+
+        _gate(perf_gate, "validation", "SolutionValidator",
+              lambda: SolutionValidator(gate_db).validate_complete_solution(entries))
+
+    def test_export_class_reports(self, perf_gate, gate_db):
+        """Report tables for every class and teacher (data behind the PDF/Excel exports)"""
+        pytest.importorskip("reportlab")
+        from reports.generator import ReportGenerator
+
+        def run():
+            generator = ReportGenerator(gate_db)
+            for class_obj in gate_db.get_all_classes():
+                generator.generate_class_schedule_report(class_obj.class_id)
+            for teacher in gate_db.get_all_teachers():
+                generator.generate_teacher_schedule_report(teacher.teacher_id)
+
+        _gate(perf_gate, "export", "ReportGenerator", run)
+
+    def test_dashboard_load(self, perf_gate, gate_db, monkeypatch):
+        """Analytics dashboard data loading (without rendering)"""
+        pytest.importorskip("PyQt5")
+        pytest.importorskip("matplotlib")
+        pytest.importorskip("seaborn")
+        import ui.analytics_dashboard as dashboard
+
+        monkeypatch.setattr(dashboard, "db_manager", gate_db)
+        loader = dashboard.DataLoaderThread()
+
+        def run():
+            data = {
+                "summary": loader._load_summary_stats(),
+                "schedule_analysis": loader._load_schedule_analysis(),
+                "teacher_workload": loader._load_teacher_workload(),
+                "class_utilization": loader._load_class_utilization(),
+                "time_distribution": loader._load_time_distribution(),
+            }
+            loader._generate_charts_data(data)
+
+        _gate(perf_gate, "dashboard", "DataLoaderThread", run)
+
+    @pytest.mark.parametrize("module", COLD_START_MODULES)
+    def test_cold_start(self, perf_gate, module):
+        """Cold import of an entry point (python -X importtime in fresh interpreters)"""
+        verdict = perf_gate.record("cold_start", module, measure_import(module, repeat=5, cwd=REPO_ROOT))
+        assert not verdict.failed, verdict.describe()
+
+
+
+class TestPerfGateThresholds:
+    """Threshold logic of PerfGate (no timing involved)"""
+
+    def _gate(self, tmp_path, machine=None, **kwargs):
+        store = BaselineStore(str(tmp_path / "baselines.json"))
+        store.scenarios["generation[X]"] = {"median_s": 1.0, "mad_s": 0.01}
+        store.machine = machine or machine_fingerprint()
+        return PerfGate(store, **kwargs)
+
+    def test_tolerance_and_noise(self, tmp_path):
+        """Slowdowns within tolerance pass, larger ones regress, big speedups are reported"""
+        gate = self._gate(tmp_path, tolerance=0.2)
+
+        assert gate.compare("generation", "X", Timing([1.15, 1.18, 1.19])).status == "ok"
+        regression = gate.compare("generation", "X", Timing([1.4, 1.5, 1.45]))
+        assert regression.failed and round(regression.delta_pct) == 45
+        assert gate.compare("generation", "X", Timing([0.5, 0.5, 0.5])).status == "improved"
+        assert gate.compare("generation", "Y", Timing([9.0])).status == "new"
+
+    def test_noisy_samples_widen_the_margin(self, tmp_path):
+        """A high MAD in the current samples raises the allowed median"""
+        gate = self._gate(tmp_path, tolerance=0.1)
+
+        assert gate.compare("generation", "X", Timing([1.2, 1.25, 0.9, 1.6, 1.9])).status == "ok"
+
+    def test_foreign_baseline_not_enforced(self, tmp_path):
+        """Baselines from another machine are reported but do not fail the run"""
+        verdict = self._gate(tmp_path, machine="other").compare("generation", "X", Timing([3.0]))
+        assert verdict.status == "regression" and not verdict.failed
+        strict = self._gate(tmp_path, machine="other", strict=True).compare("generation", "X", Timing([3.0]))
+        assert strict.failed
+
+    def test_update_writes_baselines(self, tmp_path):
+        """--perf-update stores the measured timings"""
+        gate = self._gate(tmp_path, update=True)
+        gate.check("validation", "Y", lambda: None, repeat=3, warmup=0)
+        gate.finish()
+
+        reloaded = BaselineStore(str(tmp_path / "baselines.json"))
+        assert len(reloaded.get("validation[Y]")["samples"]) == 3
+        assert "validation" in gate.report()
+
+
+class TestImportProfile:
+    """Parsing of python -X importtime output"""
+
+    def test_parse_importtime(self):
+        """Start-up imports before the marker are ignored; top-level cumulative times add up"""
+        output = "\n".join([
+            "import time: self [us] | cumulative | imported package",
+            "import time:       300 |        300 | site",
+            IMPORTTIME_MARKER,
+            "import time:       100 |        100 |   typing",
+            "import time:      2000 |       2000 |     numpy",
+            "import time:       500 |       2600 |   algorithms.scheduler_registry",
+            "import time:       200 |        200 | algorithms",
+            "import time:      1000 |       3800 | algorithms.scheduler",
+        ])
+
+        profile = parse_importtime(output, "algorithms.scheduler")
+
+        assert profile.total == pytest.approx(0.004)
+        assert "site" not in profile.modules and profile.loaded("numpy") == ["numpy"]
+        assert profile.top(1) == [("numpy", 0.002, 0.002)]
+        assert profile.top(1, cumulative=True)[0][0] == "algorithms.scheduler"
+        assert profile.to_dict()["modules_imported"] == 5
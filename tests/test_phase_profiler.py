@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the opt-in scheduler phase profiler
+"""
+
+import json
+import pstats
+import time
+
+from algorithms.phase_profiler import PhaseProfiler, get_profiler, profiled
+
+
+def busy(ms):
+    end = time.perf_counter() + ms / 1000
+    while time.perf_counter() < end:
+        pass
+
+
+class TestPhaseProfiler:
+    """Test PhaseProfiler functionality"""
+
+    def test_disabled_profiler_is_noop(self, tmp_path):
+        """Without configure() no session starts and nothing is written"""
+        profiler = PhaseProfiler()
+
+        with profiler.session("run") as session:
+            with profiler.phase("construction"):
+                pass
+
+        assert session is None
+        assert profiler.last_session is None
+        assert list(tmp_path.iterdir()) == []
+
+    def test_phase_totals_and_nesting(self, tmp_path):
+        """Nested phases count toward the parent's total but not its self time"""
+        profiler = PhaseProfiler()
+        profiler.configure(str(tmp_path), sample_interval_ms=0)
+
+        with profiler.session("run") as session:
+            with profiler.phase("construction"):
+                busy(5)
+                with profiler.phase("backtracking"):
+                    busy(10)
+            with profiler.phase("validation"):
+                busy(2)
+
+        totals = session.phase_totals()
+        assert totals["construction"]["calls"] == 1
+        assert totals["construction"]["total_ms"] >= totals["backtracking"]["total_ms"] >= 10
+        assert totals["construction"]["self_ms"] < totals["construction"]["total_ms"]
+        assert set(totals) == {"construction", "backtracking", "validation"}
+
+    def test_exports_speedscope_and_pstats(self, tmp_path):
+        """A session writes a valid speedscope document and a loadable pstats file"""
+        profiler = PhaseProfiler()
+        profiler.configure(str(tmp_path), sample_interval_ms=1)
+
+        with profiler.session("run"):
+            with profiler.phase("construction"):
+                busy(30)
+
+        speedscope_files = list(tmp_path.glob("run_*.speedscope.json"))
+        pstats_files = list(tmp_path.glob("run_*.pstats"))
+        assert len(speedscope_files) == len(pstats_files) == 1
+
+        document = json.loads(speedscope_files[0].read_text(encoding="utf-8"))
+        frame_names = [frame["name"] for frame in document["shared"]["frames"]]
+        evented = document["profiles"][0]
+        assert evented["type"] == "evented"
+        assert [event["type"] for event in evented["events"]] == ["O", "C"]
+        assert "construction" in frame_names
+        assert any(profile["type"] == "sampled" for profile in document["profiles"])
+
+        stats = pstats.Stats(str(pstats_files[0]))
+        assert stats.total_tt > 0
+        assert ("<phase>", 0, "construction") in stats.stats
+
+    def test_open_phases_closed_on_error(self, tmp_path):
+        """An exception inside a phase still produces a balanced profile"""
+        profiler = PhaseProfiler()
+        profiler.configure(str(tmp_path), sample_interval_ms=0)
+
+        try:
+            with profiler.session("run"):
+                with profiler.phase("persistence"):
+                    raise RuntimeError("db gone")
+        except RuntimeError:
+            pass
+
+        events = profiler.last_session.events
+        assert [kind for kind, _, _ in events] == ["O", "C"]
+        assert profiler.last_session.phase_totals()["persistence"]["calls"] == 1
+
+    def test_profiled_decorator_uses_global_profiler(self, tmp_path):
+        """@profiled records a span only while a global session is running"""
+
+        @profiled("validation")
+        def validate():
+            return 42
+
+        profiler = get_profiler()
+        assert validate() == 42  # disabled: plain call
+        profiler.configure(str(tmp_path), sample_interval_ms=0)
+        try:
+            with profiler.session("run") as session:
+                validate()
+        finally:
+            profiler.disable()
+
+        assert session.phase_totals()["validation"]["calls"] == 1
+
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for repository SQL instrumentation
+"""
+
+import logging
+
+import pytest
+
+from algorithms.phase_profiler import PhaseProfiler
+from database.query_monitor import QueryMonitor, get_query_monitor, normalize_statement
+
+
+@pytest.fixture
+def monitor():
+    """Enable the global monitor for one test and restore it afterwards"""
+    monitor = get_query_monitor()
+    saved = (monitor.enabled, monitor.slow_query_ms, monitor.n_plus_one_threshold, monitor.explain_top)
+    monitor.reset()
+    monitor.configure(slow_query_ms=10_000, n_plus_one_threshold=5, explain_top=3)
+    yield monitor
+    monitor.enabled, monitor.slow_query_ms, monitor.n_plus_one_threshold, monitor.explain_top = saved
+    monitor.reset()
+
+
+class TestQueryMonitor:
+    """Test QueryMonitor functionality"""
+
+    def test_normalize_statement(self):
+        """Literals and IN lists collapse so that loops share one shape"""
+        first = normalize_statement("SELECT * FROM classes\n  WHERE class_id = 3 AND name = 'A'")
+        second = normalize_statement("SELECT * FROM classes WHERE class_id = 17 AND name = 'B''s'")
+
+        assert first == second == "SELECT * FROM classes WHERE class_id = ? AND name = ?"
+        assert normalize_statement("DELETE FROM t WHERE id IN (?, ?, ?)") == "DELETE FROM t WHERE id IN (?...)"
+
+    def test_slow_query_logged_while_disabled(self, caplog):
+        """The slow-query log works without enabling statistics"""
+        monitor = QueryMonitor(slow_query_ms=5)
+
+        with caplog.at_level(logging.WARNING, logger="database.query_monitor"):
+            monitor.record("TeacherRepository", "get_all", "SELECT 1", (), 0.001, 1)
+            monitor.record("TeacherRepository", "get_all", "SELECT 2", (), 0.050, 1)
+
+        assert monitor.slow_count == 1
+        assert "Slow query (50.0 ms" in caplog.text
+        assert monitor.statements == {}
+
+    def test_statement_stats_and_call_site(self, monitor, db_manager):
+        """Repository calls are attributed to the caller outside the repository layer"""
+        # Repository'ye doğrudan: DatabaseManager getter'ları önbellekten döner
+        db_manager.teachers.get_all_teachers("Ortaokul")
+        db_manager.teachers.get_all_teachers("Ortaokul")
+
+        report = monitor.report()
+        stats = next(s for s in report["statements"] if "FROM teachers" in s["statement"])
+        assert stats["calls"] == 2
+        assert any(site.startswith("test_query_monitor.py:") for site in stats["call_sites"])
+
+    def test_n_plus_one_in_phase(self, monitor, db_manager, caplog):
+        """A lookup repeated inside one profiler phase is flagged once"""
+        class_id = db_manager.add_class("5A", 5)
+        profiler = PhaseProfiler()
+        profiler.attach_scope_listener(monitor)
+
+        with caplog.at_level(logging.WARNING, logger="database.query_monitor"):
+            with profiler.phase("validation"):
+                for _ in range(8):
+                    db_manager.classes.get_class_by_id(class_id)
+            with profiler.phase("construction"):
+                db_manager.classes.get_class_by_id(class_id)
+
+        repeated = monitor.report()["repeated"]
+        assert len(repeated) == 1
+        assert repeated[0]["scope"] == "validation"
+        assert repeated[0]["count"] == 8
+        assert caplog.text.count("Possible N+1") == 1
+
+    def test_slowest_statements_have_query_plan(self, monitor, db_manager):
+        """EXPLAIN QUERY PLAN is captured for the slowest statements"""
+        class_id = db_manager.add_class("6B", 6)
+        for _ in range(5):
+            db_manager.classes.get_class_by_id(class_id)
+
+        slowest = monitor.report()["slowest"]
+        assert 0 < len(slowest) <= 3
+        assert all(s["plan"] for s in slowest if s["statement"].lstrip().upper().startswith("SELECT"))
+        assert "Query monitor:" in monitor.summary()
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the materialized curriculum requirement table
+"""
+
+from unittest.mock import patch
+
+from database.requirement_table import RequirementTable, block_pattern
+
+
+def _curriculum(db_manager, lessons, hours, grades=(5, 6, 7, 8)):
+    for lesson, weekly_hours in zip(lessons, hours):
+        for grade in grades:
+            db_manager.add_lesson_weekly_hours(lesson.lesson_id, grade, "Ortaokul", weekly_hours)
+
+
+class TestRequirementTable:
+    """Test the join, the fold and the lookups"""
+
+    def test_block_pattern(self):
+        """Two-hour blocks, one single hour for odd totals"""
+        assert block_pattern(0) == ()
+        assert block_pattern(1) == (1,)
+        assert block_pattern(5) == (2, 2, 1)
+        assert block_pattern(6) == (2, 2, 2)
+
+    def test_fold_keeps_first_hours_and_newest_teacher(self):
+        """Duplicate join rows collapse to one requirement"""
+        row = dict(class_id=1, class_name="5A", grade=5, lesson_id=3, lesson_name="Matematik", weekly_hours=5)
+        table = RequirementTable.from_join(
+            [
+                dict(row, entry_id=4, teacher_id=10),
+                dict(row, entry_id=9, teacher_id=11),
+                dict(row, weekly_hours=2, entry_id=None, teacher_id=None),
+                dict(row, lesson_id=4, lesson_name="Müzik", weekly_hours=1, entry_id=None, teacher_id=None),
+            ]
+        )
+
+        assert len(table) == 2
+        assert table.get(1, 3).teacher_id == 11 and table.weekly_hours(1, 3) == 5
+        assert [r.lesson_name for r in table.missing()] == ["Müzik"]
+        assert table.teacher_hours() == {11: 5}
+        assert table.class_hours() == {1: 5}
+
+    def test_built_from_database(self, db_manager, sample_classes, sample_teachers, sample_lessons):
+        """One row per (class, lesson) of the curriculum, with the assigned teacher"""
+        _curriculum(db_manager, sample_lessons[:2], (5, 3))
+        class_a = sample_classes[0]
+        room = db_manager.add_classroom("Derslik", 30)
+        db_manager.add_schedule_by_school_type(class_a.class_id, sample_lessons[0].lesson_id, sample_teachers[0].teacher_id, room)
+
+        table = db_manager.get_requirement_table()
+
+        assert len(table) == len(sample_classes) * 2
+        assert [r.lesson_name for r in table.assignments_for(class_a.class_id)] == ["Matematik"]
+        assert table.get(class_a.class_id, sample_lessons[1].lesson_id).block_pattern == (2, 1)
+        assert db_manager.get_weekly_hours_for_lesson(sample_lessons[0].lesson_id, class_a.grade) == 5
+
+    def test_cached_until_written(self, db_manager, sample_classes, sample_teachers, sample_lessons):
+        """Reads share one join; curriculum and assignment writes rebuild it"""
+        _curriculum(db_manager, sample_lessons[:1], (4,))
+        class_id, lesson_id = sample_classes[0].class_id, sample_lessons[0].lesson_id
+        room = db_manager.add_classroom("Derslik", 30)
+
+        with patch.object(db_manager.lessons, "get_requirement_table", wraps=db_manager.lessons.get_requirement_table) as build:
+            first = db_manager.get_requirement_table()
+            assert db_manager.get_requirement_table() is first
+            assert build.call_count == 1
+
+            db_manager.add_schedule_entry(class_id, sample_teachers[0].teacher_id, lesson_id, room, -1, -1)
+            assert db_manager.get_requirement_table().get(class_id, lesson_id).is_assigned
+
+            db_manager.add_lesson_weekly_hours(lesson_id, sample_classes[0].grade, "Ortaokul", 6)
+            assert db_manager.get_requirement_table().weekly_hours(class_id, lesson_id) == 6
+            assert build.call_count == 3
+
+
+class TestAssignmentHelpers:
+    """find_missing_assignments / auto_fill_assignments read the table"""
+
+    def test_missing_and_auto_fill(self, db_manager, sample_classes, sample_teachers, sample_lessons):
+        """Missing lessons are listed per class and filled by the least loaded teacher"""
+        db_manager.add_classroom("Derslik", 30)
+        _curriculum(db_manager, sample_lessons[:2], (5, 4), grades=(5,))
+        class_a = sample_classes[0]
+        db_manager.add_schedule_entry(
+            class_a.class_id, sample_teachers[0].teacher_id, sample_lessons[0].lesson_id, 1, -1, -1
+        )
+
+        missing = db_manager.find_missing_assignments()
+        assert list(missing) == [c.class_id for c in sample_classes if c.grade == 5]
+        assert missing[class_a.class_id]["class"].name == class_a.name
+        assert missing[class_a.class_id]["missing_lessons"] == [(sample_lessons[1].lesson_id, "Türkçe", 4)]
+
+        with patch.object(db_manager, "get_weekly_hours_for_lesson") as lookup:
+            result = db_manager.auto_fill_assignments()
+            assert lookup.call_count == 0
+
+        assert len(result["success"]) == 3 and result["failed"] == []
+        assert db_manager.find_missing_assignments() == {}
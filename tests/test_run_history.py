@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the run history store and the learned algorithm predictor
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.run_history import DEFAULT_HISTORY_PATH, AlgorithmPredictor, InstanceFeatures, RunHistoryStore
+
+
+def _features(classes, unavailable=0):
+    return InstanceFeatures(
+        num_classes=classes, num_teachers=classes, num_lessons=10, num_assignments=classes * 8,
+        required_hours=classes * 30, assigned_hours=classes * 28, unavailable_slots=unavailable, slots_per_week=35,
+    )
+
+
+class TestInstanceFeatures:
+    """Features come from one COUNT(*) query"""
+
+    def test_from_database(self, db_manager, sample_classes, sample_teachers, sample_lessons):
+        """Counts, curriculum hours and availability tightness of the current school type"""
+        room = db_manager.add_classroom("Derslik", 30)
+        lesson = sample_lessons[0]
+        db_manager.add_lesson_weekly_hours(lesson.lesson_id, 5, "Ortaokul", 4)
+        db_manager.add_schedule_entry(sample_classes[0].class_id, sample_teachers[0].teacher_id, lesson.lesson_id, room, -1, -1)
+        db_manager.set_teacher_availability(sample_teachers[0].teacher_id, 0, 0, False)
+
+        features = InstanceFeatures.from_database(db_manager)
+
+        assert (features.num_classes, features.num_teachers, features.num_lessons) == (8, 5, 8)
+        assert (features.num_assignments, features.required_hours, features.assigned_hours) == (1, 8, 4)
+        assert features.unavailable_slots == 1 and features.slots_per_week == 35
+        assert features.availability_tightness == 1 / (5 * 35)
+        assert len(features.vector()) == 8
+
+
+class TestAlgorithmPredictor:
+    """k-NN predictions and the persisted history"""
+
+    def test_prefers_fastest_complete_algorithm(self, tmp_path):
+        """A fast algorithm that never reaches 100% loses to a slower complete one"""
+        store = RunHistoryStore(str(tmp_path / "runs.json"))
+        for classes in (8, 10, 12, 14):
+            store.record(_features(classes), "FastScheduler", 0.5, 0.92)
+            store.record(_features(classes), "SlowScheduler", 6.0, 1.0)
+            store.record(_features(classes), "SlowerScheduler", 20.0, 1.0)
+
+        predictions = store.predictor().predict(_features(11))
+
+        assert [p.algorithm for p in predictions] == ["SlowScheduler", "SlowerScheduler", "FastScheduler"]
+        assert predictions[0].p_complete == 1.0 and predictions[-1].p_complete == 0.0
+        assert abs(predictions[0].expected_time - 6.0) < 1e-6
+        # Yalnızca tamamlayamayan aday kaldıysa tahmin yok; seçici sezgisel puanlara döner
+        assert store.predictor().best(_features(11), candidates=["FastScheduler"]) is None
+
+    def test_neighbours_decide(self):
+        """Completion follows the runs on instances of similar size and tightness"""
+        predictor = AlgorithmPredictor(k=3)
+        store = RunHistoryStore(None)
+        for classes in (5, 6, 7):
+            store.record(_features(classes), "GreedyScheduler", 1.0, 1.0)
+            store.record(_features(classes * 10, unavailable=classes * 200), "GreedyScheduler", 3.0, 0.8)
+            store.record(_features(classes), "CspScheduler", 4.0, 1.0)
+            store.record(_features(classes * 10, unavailable=classes * 200), "CspScheduler", 9.0, 1.0)
+        predictor.fit(store.runs)
+
+        assert predictor.best(_features(6)).algorithm == "GreedyScheduler"
+        assert predictor.best(_features(60, unavailable=1200)).algorithm == "CspScheduler"
+
+    def test_persistence_and_empty_history(self, tmp_path):
+        """Runs survive a reload; without history there is no prediction"""
+        path = str(tmp_path / "nested" / "runs.json")
+        assert RunHistoryStore(path).predictor().best(_features(5)) is None
+
+        RunHistoryStore(path, max_records=2).record(_features(5), "A", 1.0, 1.0)
+        store = RunHistoryStore(path, max_records=2)
+        store.record(_features(6), "B", 2.0, 0.5)
+        store.record(_features(7), "C", 3.0, 1.5)
+
+        reloaded = RunHistoryStore(path)
+        assert [(r.algorithm, r.coverage) for r in reloaded.runs] == [("B", 0.5), ("C", 1.0)]
+        assert reloaded.runs[0].features == _features(6)
+
+    def test_concurrent_records_keep_file_valid(self, tmp_path):
+        """Parallel workers recording runs never leave a partial history file"""
+        path = str(tmp_path / "runs.json")
+        store = RunHistoryStore(path)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda i: store.record(_features(5 + i % 3), "A", 1.0, 1.0), range(40)))
+
+        assert len(RunHistoryStore(path).runs) == 40
+        assert os.listdir(tmp_path) == ["runs.json"]
+
+    def test_empty_instances_not_recorded(self, memory_history):
+        """Runs on empty databases (e.g. mocked in tests) do not train the model"""
+        assert os.path.isabs(DEFAULT_HISTORY_PATH)
+        assert memory_history.record(InstanceFeatures(), "A", 0.1, 0.0) is None
+        assert memory_history.record(_features(0), "A", 0.1, 0.0) is None
+        assert memory_history.runs == []
+
+    def test_selector_falls_back_below_threshold(self, db_manager, memory_history):
+        """Without a candidate likely to complete the recommendation stays heuristic"""
+        from algorithms.algorithm_selector import AlgorithmSelector
+
+        for classes in (8, 10, 12):
+            memory_history.record(_features(classes), "SimplePerfectScheduler", 0.5, 0.9)
+            memory_history.record(_features(classes), "HybridOptimalScheduler", 2.0, 0.8)
+        selector = AlgorithmSelector(history=memory_history)
+
+        assert selector.predict_best_algorithm(_features(10)) is None
+        recommendation = selector.get_algorithm_recommendation(db_manager)
+        assert recommendation["source"] == "heuristic" and recommendation["prediction"] is None
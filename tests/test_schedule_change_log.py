@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the schedule change feed
+"""
+
+import pytest
+
+from database.change_log import OP_ADD, OP_RESET, ScheduleChangeLog
+
+
+class TestScheduleChangeLog:
+    """Test ScheduleChangeLog functionality"""
+
+    def test_revision_increases(self):
+        """Every recorded change bumps the revision"""
+        log = ScheduleChangeLog()
+        assert log.revision == 0
+        assert log.record(OP_ADD, 1, class_id=1, day=0, time_slot=0) == 1
+        assert log.record(OP_ADD, 2, class_id=1, day=0, time_slot=1) == 2
+        assert log.revision == 2
+
+    def test_changes_since(self):
+        """Readers get only the deltas after their revision"""
+        log = ScheduleChangeLog()
+        log.record(OP_ADD, 1, class_id=1, day=0, time_slot=0)
+        log.record(OP_ADD, 2, class_id=2, day=1, time_slot=3)
+
+        changes, revision = log.changes_since(1)
+        assert revision == 2
+        assert [c.entry_id for c in changes] == [2]
+        assert changes[0].to_dict()["class_id"] == 2
+
+        changes, revision = log.changes_since(2)
+        assert changes == []
+
+    def test_reset_forces_full_reload(self):
+        """A bulk change makes older readers reload everything"""
+        log = ScheduleChangeLog()
+        log.record(OP_ADD, 1, class_id=1, day=0, time_slot=0)
+        log.reset()
+        changes, revision = log.changes_since(1)
+        assert changes is None
+        assert revision == 2
+
+        log.record(OP_ADD, 3, class_id=1, day=0, time_slot=0)
+        changes, _ = log.changes_since(2)
+        assert [c.op for c in changes] == [OP_ADD]
+
+    def test_evicted_revision_forces_full_reload(self):
+        """Readers older than the retained window reload everything"""
+        log = ScheduleChangeLog(max_entries=2)
+        for entry_id in range(1, 5):
+            log.record(OP_ADD, entry_id)
+
+        changes, _ = log.changes_since(1)
+        assert changes is None
+        changes, _ = log.changes_since(2)
+        assert [c.entry_id for c in changes] == [3, 4]
+
+
+@pytest.fixture
+def program_refs(db_manager):
+    """Create the rows a program entry refers to"""
+    class_id = db_manager.add_class("5A", 5)
+    teacher_id = db_manager.add_teacher("Ahmet Yılmaz", "Matematik")
+    lesson_id = db_manager.add_lesson("Matematik")
+    classroom_id = db_manager.add_classroom("Derslik 1", 30)
+    return class_id, teacher_id, lesson_id, classroom_id
+
+
+class TestScheduleRepositoryChangeFeed:
+    """Test that repository mutations feed the change log"""
+
+    def test_add_program_entry_recorded(self, db_manager, program_refs):
+        """Adding a program entry produces an add delta"""
+        class_id, teacher_id, lesson_id, classroom_id = program_refs
+        start = db_manager.get_schedule_revision()
+        entry_id = db_manager.add_schedule_program(class_id, teacher_id, lesson_id, classroom_id, 0, 4)
+
+        changes, revision = db_manager.get_schedule_changes_since(start)
+        assert revision == start + 1
+        assert len(changes) == 1
+        assert changes[0].op == OP_ADD
+        assert changes[0].entry_id == entry_id
+        assert changes[0].teacher_id == teacher_id
+        assert changes[0].time_slot == 4
+
+    def test_clear_schedule_resets_feed(self, db_manager, program_refs):
+        """Clearing the program forces a full reload"""
+        db_manager.add_schedule_program(*program_refs, 0, 0)
+        revision = db_manager.get_schedule_revision()
+        db_manager.clear_schedule()
+
+        changes, _ = db_manager.get_schedule_changes_since(revision)
+        assert changes is None
+        assert db_manager.schedule.change_log._changes[-1].op == OP_RESET
+
+    def test_cascading_delete_resets_feed(self, db_manager):
+        """Deleting a teacher also invalidates readers of the program"""
+        teacher_id = db_manager.add_teacher("Test Öğretmen", "Matematik")
+        revision = db_manager.get_schedule_revision()
+        db_manager.delete_teacher(teacher_id)
+
+        changes, _ = db_manager.get_schedule_changes_since(revision)
+        assert changes is None
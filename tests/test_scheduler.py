@@ -16,6 +16,7 @@ from typing import List, Dict, Any
 
 # Import the Scheduler class
 from algorithms.scheduler import Scheduler
+from database.requirement_table import RequirementTable
 
 
 class TestSchedulerInitialization:
@@ -210,7 +211,7 @@ class TestScheduleGeneration:
     def test_generate_schedule_with_active_scheduler(self):
         """Test generate_schedule delegates to active_scheduler"""
         db_manager = Mock()
-        mock_scheduler = Mock()
+        mock_scheduler = Mock(target_hours=2, backtrack_manager=None)
         mock_scheduler.generate_schedule.return_value = ["schedule_entry_1", "schedule_entry_2"]
 
         scheduler = Scheduler(db_manager)
@@ -229,7 +230,7 @@ class TestScheduleGeneration:
 
         scheduler = Scheduler(db_manager)
         scheduler.performance_monitor = mock_monitor
-        scheduler.active_scheduler = Mock()
+        scheduler.active_scheduler = Mock(target_hours=1, backtrack_manager=None)
 
         result = scheduler.generate_schedule()
 
@@ -269,7 +270,7 @@ class TestStandardScheduleGeneration:
         self.db_manager.get_all_classes.return_value = classes
         self.db_manager.get_all_teachers.return_value = teachers
         self.db_manager.get_all_lessons.return_value = lessons
-        self.db_manager.get_schedule_by_school_type.return_value = []
+        self.db_manager.get_requirement_table.return_value = RequirementTable()
         self.db_manager.get_school_type.return_value = "Lise"
 
         with patch.object(self.scheduler, '_schedule_additional_hours') as mock_schedule:
@@ -281,7 +282,7 @@ class TestStandardScheduleGeneration:
             self.db_manager.get_all_classes.assert_called_once()
             self.db_manager.get_all_teachers.assert_called_once()
             self.db_manager.get_all_lessons.assert_called_once()
-            self.db_manager.get_schedule_by_school_type.assert_called_once()
+            self.db_manager.get_requirement_table.assert_called_once()
             self.db_manager.get_school_type.assert_called_once()
 
             # Verify schedule method was called
@@ -292,7 +293,7 @@ class TestStandardScheduleGeneration:
         self.db_manager.get_all_classes.return_value = []
         self.db_manager.get_all_teachers.return_value = []
         self.db_manager.get_all_lessons.return_value = []
-        self.db_manager.get_schedule_by_school_type.return_value = []
+        self.db_manager.get_requirement_table.return_value = RequirementTable()
         self.db_manager.get_school_type.return_value = None  # Returns None
 
         self.scheduler._generate_schedule_standard()
@@ -630,7 +631,7 @@ class TestErrorHandling:
         self.db_manager.get_all_classes.return_value = []
         self.db_manager.get_all_teachers.return_value = []
         self.db_manager.get_all_lessons.return_value = []
-        self.db_manager.get_schedule_by_school_type.return_value = []
+        self.db_manager.get_requirement_table.return_value = RequirementTable()
         self.db_manager.get_school_type.return_value = "Lise"
 
         self.scheduler.active_scheduler = None
@@ -681,7 +682,7 @@ class TestIntegrationScenarios:
         db_manager.get_all_classes.return_value = classes
         db_manager.get_all_teachers.return_value = teachers
         db_manager.get_all_lessons.return_value = lessons
-        db_manager.get_schedule_by_school_type.return_value = []
+        db_manager.get_requirement_table.return_value = RequirementTable()
         db_manager.get_school_type.return_value = "Lise"
 
         scheduler = Scheduler(db_manager)
@@ -492,7 +492,7 @@ class TestEdgeCases:
         from algorithms.scheduler import Scheduler
 
         scheduler = Scheduler(self.db_manager)
-        scheduler.active_scheduler = Mock()
+        scheduler.active_scheduler = Mock(target_hours=0, backtrack_manager=None)
         scheduler.active_scheduler.generate_schedule.return_value = []
 
         # Generate schedule multiple times
@@ -566,7 +566,7 @@ class TestSchedulerPerformance:
 
         db_manager = Mock()
         scheduler = Scheduler(db_manager)
-        scheduler.active_scheduler = Mock()
+        scheduler.active_scheduler = Mock(target_hours=0, backtrack_manager=None)
         scheduler.active_scheduler.generate_schedule.return_value = []
 
         # Generate multiple schedules and check memory
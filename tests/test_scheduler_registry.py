@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the lazy scheduler registry and the lazily resolved Scheduler facade attributes
+"""
+
+import os
+import subprocess
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from algorithms.scheduler_registry import SchedulerRegistry, SchedulerSpec, get_scheduler_registry
+
+
+class _Recorder:
+    def __init__(self, db_manager, progress_callback=None):
+        self.db_manager = db_manager
+        self.progress_callback = progress_callback
+
+
+class TestSchedulerRegistry:
+    """Import on first use, cached failures and constructor argument filtering"""
+
+    def test_load_and_create(self):
+        """Classes are imported once; unsupported keyword arguments are dropped"""
+        registry = SchedulerRegistry([SchedulerSpec("recorder", __name__, "_Recorder")])
+        assert not registry.is_loaded("recorder")
+
+        scheduler = registry.create("recorder", "db", progress_callback=print, heuristics=object())
+
+        assert registry.is_loaded("recorder") and registry.load("recorder") is _Recorder
+        assert (scheduler.db_manager, scheduler.progress_callback) == ("db", print)
+        assert registry.name_of("_Recorder") == "recorder"
+
+    def test_unavailable_and_unknown(self):
+        """A failing import is reported once and cached; unknown names raise KeyError"""
+        registry = SchedulerRegistry([SchedulerSpec("missing", "algorithms.no_such_scheduler", "Missing")])
+
+        assert registry.get("missing") is None
+        assert not registry.is_available("missing")
+        assert "ModuleNotFoundError" in registry.error("missing")
+        with pytest.raises(ImportError):
+            registry.load("missing")
+        with pytest.raises(KeyError):
+            registry.load("nope")
+        assert registry.available() == []
+
+    def test_default_registry(self):
+        """Every scheduler of the default registry resolves to a class of that name"""
+        registry = get_scheduler_registry()
+        assert "optimized_curriculum" in registry.names()
+        cls = registry.load("strict")
+        assert cls.__name__ == registry.spec("strict").class_name
+
+
+class TestLazyFacade:
+    """algorithms.scheduler keeps its flags and class names without importing schedulers"""
+
+    def test_import_loads_no_scheduler(self):
+        """A cold import of the facade pulls in neither scheduler modules nor numpy"""
+        code = (
+            "import sys, algorithms.scheduler\n"
+            "loaded = [m for m in sys.modules if m.endswith('_scheduler') or m == 'numpy']\n"
+            "print(','.join(loaded))"
+        )
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        result = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True)
+        assert result.stdout.strip() == ""
+
+    def test_attributes_resolve_and_patch(self):
+        """Flags and classes resolve on access and can still be patched"""
+        import algorithms.scheduler as facade
+        from algorithms.strict_scheduler import StrictScheduler
+
+        assert facade.STRICT_SCHEDULER_AVAILABLE is True
+        assert facade.StrictScheduler is StrictScheduler
+        with patch("algorithms.scheduler.STRICT_SCHEDULER_AVAILABLE", False):
+            assert facade._lazy("STRICT_SCHEDULER_AVAILABLE") is False
+        assert facade.STRICT_SCHEDULER_AVAILABLE is True
+        with pytest.raises(AttributeError):
+            facade.NoSuchScheduler
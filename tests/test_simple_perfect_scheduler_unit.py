@@ -8,6 +8,7 @@ from unittest.mock import MagicMock
 import pytest
 
 from algorithms.simple_perfect_scheduler import SimplePerfectScheduler
+from database.requirement_table import RequirementTable
 
 
 @pytest.fixture
@@ -26,7 +27,7 @@ def mock_db_manager():
     db.get_all_classrooms.return_value = []
     db.get_schedule_by_school_type.return_value = []
     db.get_school_type.return_value = "Lise"
-    db.get_weekly_hours_for_lesson.return_value = 2
+    db.get_requirement_table.return_value = RequirementTable()
     db.get_teacher_by_id.return_value = MagicMock()
     db.is_teacher_available.return_value = True
     return db
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the bitmask slot suggestion engine
+"""
+
+import pytest
+
+from algorithms.slot_suggestion_engine import SlotSuggestionEngine
+
+
+def _entry(class_id, teacher_id, day, slot, lesson_id=1):
+    return {"class_id": class_id, "teacher_id": teacher_id, "lesson_id": lesson_id, "day": day, "time_slot": slot}
+
+
+class TestSlotSuggestionEngine:
+    """Test SlotSuggestionEngine functionality"""
+
+    def test_feasible_mask_excludes_busy_slots(self):
+        """Class and teacher busy slots are not feasible"""
+        engine = SlotSuggestionEngine()
+        engine.rebuild([_entry(1, 1, 0, 0), _entry(2, 2, 1, 3)])
+        mask = engine.feasible_mask(_entry(1, 2, 4, 7))
+        assert not mask & (1 << engine.bit(0, 0))
+        assert not mask & (1 << engine.bit(1, 3))
+        assert mask & (1 << engine.bit(2, 2))
+
+    def test_double_booking_counts(self):
+        """Removing one of two entries in a slot keeps it busy"""
+        engine = SlotSuggestionEngine()
+        first, second = _entry(1, 1, 0, 0), _entry(1, 2, 0, 0)
+        engine.rebuild([first, second])
+        engine.remove(first)
+        assert engine.busy[("class", 1)] & 1
+        engine.remove(second)
+        assert not engine.busy[("class", 1)] & 1
+
+    def test_unavailable_slots(self):
+        """Availability provider masks are applied and cached"""
+        calls = []
+
+        def provider(teacher_id):
+            calls.append(teacher_id)
+            return 1 << 5
+
+        engine = SlotSuggestionEngine(availability_provider=provider)
+        assert not engine.feasible_mask(_entry(1, 1, 0, 0)) & (1 << 5)
+        engine.feasible_mask(_entry(1, 1, 0, 0))
+        assert calls == [1]
+
+    def test_gap_scores(self):
+        """Slots that keep the class day contiguous score higher"""
+        engine = SlotSuggestionEngine()
+        entry = _entry(1, 1, 4, 7)
+        engine.rebuild([_entry(1, 2, 0, 1), _entry(1, 3, 0, 4), entry])
+        scores = {(d, s): score for d, s, score in engine.score_mask(entry, engine.full_mask, exclude=[entry])}
+        assert scores[(0, 2)] == 50.0 - 20  # inside the span, still leaves a hole
+        assert scores[(1, 2)] == 50.0
+
+        engine.rebuild([_entry(1, 2, 0, 1), _entry(1, 3, 0, 3), entry])
+        scores = {(d, s): score for d, s, score in engine.score_mask(entry, engine.full_mask, exclude=[entry])}
+        assert scores[(0, 2)] == 50.0 + 10
+
+    def test_difficult_lesson_prefers_morning(self):
+        """Difficult lessons get a morning bonus"""
+        engine = SlotSuggestionEngine(lesson_name_provider=lambda lesson_id: "Matematik")
+        entry = _entry(1, 1, 4, 7)
+        engine.rebuild([entry])
+        best = engine.suggest(entry, max_suggestions=1)[0]
+        assert best[1] < 4
+        assert best[2] == 65.0
+
+    def test_can_swap(self):
+        """Swapping two lessons of the same class is legal"""
+        engine = SlotSuggestionEngine()
+        first, second = _entry(1, 1, 0, 0), _entry(1, 2, 0, 1)
+        engine.rebuild([first, second, _entry(2, 2, 0, 0)])
+        # Teacher 2 is busy at (0, 0) with class 2
+        assert not engine.can_swap(first, second)
+        engine.rebuild([first, second])
+        assert engine.can_swap(first, second)
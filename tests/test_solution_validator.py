@@ -13,12 +13,22 @@ import pytest
 from unittest.mock import Mock, MagicMock
 from algorithms.solution_validator import (
     SolutionValidator, ValidationReport, ValidationViolation, ViolationType,
-    BlockValidationResult, WorkloadValidationResult
+    BlockValidationResult, WorkloadValidationResult, SolutionIndex
 )
 from algorithms.optimized_curriculum_scheduler import (
     EnhancedScheduleEntry, PlacementMethod, ConstraintLevel
 )
 from database.models import Teacher, Class, Lesson
+from database.requirement_table import Requirement, RequirementTable
+
+
+def _requirements(keys, weekly_hours, lesson_name="Mathematics"):
+    """Requirement table with an assigned requirement per (class_id, lesson_id)"""
+    return RequirementTable(
+        Requirement(class_id, f"Class {class_id}", 5, lesson_id, lesson_name, weekly_hours,
+                    teacher_id=1, assignment_id=index)
+        for index, (class_id, lesson_id) in enumerate(keys, 1)
+    )
 
 
 class TestSolutionValidator:
@@ -64,10 +74,7 @@ class TestSolutionValidator:
     def test_validate_complete_solution_success(self, validator, sample_entries):
         """Test successful validation of complete solution"""
         # Mock database methods
-        validator.db_manager.get_all_classes.return_value = [
-            Class(1, "Class 1", 5), Class(2, "Class 2", 6)
-        ]
-        validator.db_manager.get_schedule_by_school_type.return_value = []
+        validator.db_manager.get_requirement_table.return_value = RequirementTable()
         
         report = validator.validate_complete_solution(sample_entries)
         
@@ -272,22 +279,8 @@ class TestCurriculumValidation:
         validator = SolutionValidator(mock_db)
         
         # Mock database responses
-        mock_db.get_all_classes.return_value = [
-            Class(1, "Class 1", 5),
-            Class(2, "Class 2", 6)
-        ]
-        
-        mock_assignment = Mock()
-        mock_assignment.class_id = 1
-        mock_assignment.lesson_id = 1
-        mock_assignment.teacher_id = 1
-        mock_db.get_schedule_by_school_type.return_value = [mock_assignment]
-        
-        mock_db.get_weekly_hours_for_lesson.return_value = 3  # Requires 3 hours
-        
-        mock_lesson = Mock()
-        mock_lesson.name = "Mathematics"
-        mock_db.get_lesson_by_id.return_value = mock_lesson
+        # Class 1 requires 3 hours of lesson 1
+        mock_db.get_requirement_table.return_value = _requirements([(1, 1)], 3)
         
         return validator
     
@@ -466,11 +459,8 @@ class TestValidationIntegration:
         validator = SolutionValidator(mock_db)
         
         # Mock all database methods
-        mock_db.get_all_classes.return_value = [Class(1, "Class 1", 5)]
-        mock_db.get_schedule_by_school_type.return_value = []
+        mock_db.get_requirement_table.return_value = RequirementTable()
         mock_db.get_teacher_by_id.return_value = Teacher(1, "Teacher 1", "Math")
-        mock_db.get_lesson_by_id.return_value = Lesson(1, "Mathematics")
-        mock_db.get_weekly_hours_for_lesson.return_value = 2
         
         return validator
     
@@ -526,4 +516,156 @@ class TestValidationIntegration:
         
         # Should have both conflict and block violations
         violation_types = list(report.violations_by_type.keys())
-        assert any(vt == ViolationType.TEACHER_CONFLICT for vt in violation_types)
\ No newline at end of file
+        assert any(vt == ViolationType.TEACHER_CONFLICT for vt in violation_types)
+
+class TestSinglePassValidation:
+    """Test that validation loads requirements once and scales linearly"""
+    
+    @pytest.fixture
+    def counting_db(self):
+        """Mock database with several classes sharing lessons"""
+        mock_db = Mock()
+        mock_db.get_requirement_table.return_value = _requirements(
+            [(class_id, lesson_id) for class_id in range(1, 11) for lesson_id in range(1, 4)], 2
+        )
+        mock_db.get_teacher_by_id.return_value = Teacher(1, "Teacher 1", "Math")
+        return mock_db
+    
+    def test_requirements_loaded_once(self, counting_db):
+        """The requirement table is read once; teachers are fetched once each"""
+        validator = SolutionValidator(counting_db)
+        entries = [
+            EnhancedScheduleEntry(schedule_id=1, class_id=1, teacher_id=1, lesson_id=1,
+                                  day=0, time_slot=0, block_position=1, block_id="b1")
+        ]
+        
+        report = validator.validate_complete_solution(entries)
+        
+        assert counting_db.get_requirement_table.call_count == 1
+        assert counting_db.get_weekly_hours_for_lesson.call_count == 0
+        assert counting_db.get_teacher_by_id.call_count == 1
+        assert report.violations_by_type[ViolationType.CURRICULUM_VIOLATION] == 30
+        assert "validation_time_ms" in report.validation_metrics
+    
+    def test_index_groups_entries(self):
+        """SolutionIndex groups entries by every rule family key"""
+        entries = [
+            EnhancedScheduleEntry(schedule_id=1, class_id=1, teacher_id=1, lesson_id=1,
+                                  day=0, time_slot=0, block_position=1, block_id="b1"),
+            EnhancedScheduleEntry(schedule_id=2, class_id=2, teacher_id=1, lesson_id=2,
+                                  day=0, time_slot=0, block_position=1, block_id="b2"),
+        ]
+        
+        index = SolutionIndex.build(entries)
+        
+        assert len(index.teacher_slots[(1, 0, 0)]) == 2
+        assert set(index.blocks) == {"b1", "b2"}
+        assert index.class_lesson_hours[2][2] == 1
+        assert index.entry_count == 2
+    
+    def test_large_solution_validates_quickly(self, counting_db):
+        """A 2,000-entry solution validates well under a second"""
+        import time
+        
+        validator = SolutionValidator(counting_db)
+        entries = []
+        for i in range(2000):
+            class_id = i // 40 + 1
+            slot = i % 40
+            entries.append(EnhancedScheduleEntry(
+                schedule_id=i, class_id=class_id, teacher_id=i % 50, lesson_id=slot % 10,
+                day=slot // 8, time_slot=slot % 8, block_position=1, block_id=f"b{i}"
+            ))
+        
+        start = time.perf_counter()
+        report = validator.validate_complete_solution(entries)
+        elapsed = time.perf_counter() - start
+        
+        assert report.validation_metrics["total_entries_validated"] == 2000
+        assert elapsed < 1.0
+
+
+class TestIncrementalValidation:
+    """Test changeset-based re-validation"""
+    
+    @pytest.fixture
+    def validator(self):
+        """Validator with a small curriculum: class 1 needs 2 hours of lesson 1"""
+        mock_db = Mock()
+        mock_db.get_requirement_table.return_value = _requirements([(1, 1)], 2)
+        mock_db.get_teacher_by_id.return_value = Teacher(1, "Teacher 1", "Math")
+        return SolutionValidator(mock_db)
+    
+    @staticmethod
+    def _entry(schedule_id, class_id, teacher_id, lesson_id, day, slot, block_id=None):
+        return EnhancedScheduleEntry(
+            schedule_id=schedule_id, class_id=class_id, teacher_id=teacher_id, lesson_id=lesson_id,
+            day=day, time_slot=slot, block_position=1, block_id=block_id or f"b{schedule_id}"
+        )
+    
+    @staticmethod
+    def _fingerprint(report):
+        return (
+            report.total_violations,
+            dict(report.violations_by_type),
+            len(report.critical_violations),
+            len(report.major_violations),
+            len(report.minor_violations),
+        )
+    
+    def test_changeset_updates_cached_report(self, validator):
+        """Adding a conflicting entry and removing it again round-trips the report"""
+        first = self._entry(1, 1, 1, 1, 0, 0)
+        second = self._entry(2, 1, 1, 1, 1, 0)
+        baseline = validator.begin_incremental([first, second])
+        assert ViolationType.CURRICULUM_VIOLATION not in baseline.violations_by_type
+        
+        clash = self._entry(3, 2, 1, 2, 0, 0)
+        report = validator.validate_incremental(added=[clash])
+        assert report.violations_by_type[ViolationType.TEACHER_CONFLICT] == 1
+        assert report.validation_metrics["total_entries_validated"] == 3
+        
+        report = validator.validate_incremental(removed=[clash])
+        assert ViolationType.TEACHER_CONFLICT not in report.violations_by_type
+        assert self._fingerprint(report) == self._fingerprint(baseline)
+    
+    def test_only_touched_units_revalidated(self, validator):
+        """A move re-checks a handful of units, not the whole solution"""
+        entries = [self._entry(i, 10 + i // 8, 20 + i % 5, 5, (i // 8) % 5, i % 8) for i in range(200)]
+        validator.begin_incremental(entries)
+        
+        moved = entries[0]
+        replacement = self._entry(0, moved.class_id, moved.teacher_id, moved.lesson_id, 4, 7, moved.block_id)
+        report = validator.validate_incremental(added=[replacement], removed=[moved])
+        
+        assert report.validation_metrics["units_revalidated"] <= 10
+    
+    def test_incremental_matches_full_validation(self, validator):
+        """After a sequence of edits the cached report equals a full re-validation"""
+        import random
+        
+        rng = random.Random(7)
+        entries = [self._entry(i, rng.randint(1, 4), rng.randint(1, 5), rng.randint(1, 3),
+                               rng.randint(0, 4), rng.randint(0, 7), f"b{i % 12}") for i in range(60)]
+        validator.begin_incremental(entries)
+        
+        for step in range(40):
+            old = entries.pop(rng.randrange(len(entries)))
+            new = self._entry(100 + step, old.class_id, old.teacher_id, old.lesson_id,
+                              rng.randint(0, 4), rng.randint(0, 7), old.block_id)
+            entries.append(new)
+            report = validator.validate_incremental(added=[new], removed=[old])
+        
+        full = SolutionValidator(validator.db_manager).validate_complete_solution(entries)
+        assert self._fingerprint(report) == self._fingerprint(full)
+        assert sorted(report.block_validation.fragmented_blocks) == sorted(full.block_validation.fragmented_blocks)
+    
+    def test_sync_incremental_diffs_by_identity(self, validator):
+        """sync_incremental derives the changeset from the current entry list"""
+        first = self._entry(1, 1, 1, 1, 0, 0)
+        second = self._entry(2, 1, 1, 1, 1, 0)
+        validator.sync_incremental([first, second])
+        
+        report = validator.sync_incremental([first])
+        assert report.violations_by_type[ViolationType.CURRICULUM_VIOLATION] == 1
+        assert validator.incremental_report is report
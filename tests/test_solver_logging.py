@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for hot-loop solver logging and the background log writer
+"""
+
+import logging
+
+from algorithms.enhanced_logging import SolverLog, lazy
+from logging_config import clear_handlers, start_queue_listener, stop_logging
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def _logger(name, level=logging.DEBUG):
+    logger = logging.getLogger(f"tests.solver_logging.{name}")
+    logger.setLevel(level)
+    logger.propagate = False
+    handler = _ListHandler()
+    logger.handlers = [handler]
+    return logger, handler
+
+
+class TestSolverLog:
+    """Rate limiting, sampling and lazy formatting"""
+
+    def test_progress_is_rate_limited_per_call_site(self):
+        """One record per interval and call site; suppressed calls are reported with the next one"""
+        logger, handler = _logger("progress")
+        now = [0.0]
+        log = SolverLog(logger, interval=1.0, clock=lambda: now[0])
+
+        for step in range(10):
+            now[0] = step * 0.25
+            log.progress("adım %d", step)
+        log.progress("başka satır")
+
+        messages = [r.getMessage() for r in handler.records]
+        assert messages == ["adım 0", "adım 4 (+3 bastırıldı)", "adım 8 (+3 bastırıldı)", "başka satır"]
+        assert log.stats()["suppressed"] == 1
+        assert handler.records[0].funcName == "test_progress_is_rate_limited_per_call_site"
+
+    def test_sampled_debug_events(self):
+        """Every n-th debug event is kept; nothing is recorded when DEBUG is off"""
+        logger, handler = _logger("sample")
+        log = SolverLog(logger, sample_every=10)
+        for slot in range(25):
+            log.sample("slot %d", slot)
+
+        assert [r.getMessage() for r in handler.records] == [
+            "slot 0 [1/10 örnek]", "slot 10 [1/10 örnek]", "slot 20 [1/10 örnek]",
+        ]
+        assert log.stats()["unsampled"] == 22
+
+        quiet, quiet_handler = _logger("quiet", logging.INFO)
+        calls = []
+        SolverLog(quiet).sample("%s", lazy(calls.append, 1))
+        SolverLog(quiet).debug("%s", lazy(calls.append, 1))
+        assert quiet_handler.records == [] and calls == []
+
+
+class TestQueueListener:
+    """Records are written on a background thread"""
+
+    def test_writer_thread_receives_records(self):
+        """Queued records reach the handlers (with their own level) once the writer is stopped"""
+        logger = logging.getLogger("tests.solver_logging.queue")
+        logger.setLevel(logging.DEBUG)
+        logger.propagate = False
+        target = _ListHandler()
+        target.setLevel(logging.INFO)
+        listener = start_queue_listener(logger, [target])
+
+        logger.debug("gizli")
+        logger.info("ders %s yerleşti", "Matematik")
+        stop_logging(listener)
+
+        assert [r.getMessage() for r in target.records] == ["ders Matematik yerleşti"]
+        assert target.records[0].args is None
+        clear_handlers(logger)
+        assert logger.handlers == []
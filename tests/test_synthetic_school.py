@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the synthetic school generator
+"""
+
+from database.db_manager import DatabaseManager
+from utils.synthetic_school import SchoolSpec, build_curriculum, generate_school, scaling_ladder
+
+
+def _snapshot(db):
+    assignments = sorted((e.class_id, e.teacher_id, e.lesson_id) for e in db.get_schedule_by_school_type())
+    blocked = sorted(
+        (teacher.teacher_id, row["day"], row["time_slot"])
+        for teacher in db.get_all_teachers()
+        for row in db.get_teacher_availability(teacher.teacher_id)
+        if not row["is_available"]
+    )
+    return assignments, blocked
+
+
+class TestSyntheticSchool:
+    """Test synthetic school generation"""
+
+    def test_curriculum_matches_tightness(self):
+        """Every grade asks for tightness × weekly slots hours"""
+        for school_type, weekly_slots in (("İlkokul", 35), ("Ortaokul", 35), ("Lise", 40)):
+            spec = SchoolSpec(school_type=school_type, curriculum_tightness=0.8)
+            curriculum = build_curriculum(spec)
+
+            assert set(curriculum) == set(spec.grades)
+            for lessons in curriculum.values():
+                assert sum(lessons.values()) == round(0.8 * weekly_slots)
+                assert all(1 <= hours <= 6 for hours in lessons.values())
+
+    def test_same_seed_same_school(self):
+        """A fixed seed reproduces assignments and availability exactly"""
+        spec = SchoolSpec(class_count=10, availability_density=0.7, seed=3)
+        first, second = DatabaseManager(":memory:"), DatabaseManager(":memory:")
+
+        generate_school(first, spec)
+        generate_school(second, spec)
+
+        assert _snapshot(first) == _snapshot(second)
+        assert _snapshot(first)[1]  # density < 1 blocks some slots
+
+    def test_generated_school_is_loadable(self):
+        """Classes, teachers, curriculum and assignments are visible through the DB API"""
+        db = DatabaseManager(":memory:")
+        spec = SchoolSpec(school_type="Ortaokul", class_count=6, teacher_count=16, availability_density=0.8)
+
+        school = generate_school(db, spec)
+
+        assert db.get_school_type() == "Ortaokul"
+        assert len(db.get_all_classes()) == 6
+        assert len(db.get_all_teachers()) == 16
+        assert school.required_hours == 6 * round(0.85 * 35)
+        required = sum(
+            db.get_weekly_hours_for_lesson(e.lesson_id, db.get_class_by_id(e.class_id).grade)
+            for e in db.get_schedule_by_school_type()
+        )
+        assert required == school.required_hours
+
+        # Her öğretmen yükü kadar açık slota sahip
+        load = {}
+        for entry in db.get_schedule_by_school_type():
+            grade = db.get_class_by_id(entry.class_id).grade
+            load[entry.teacher_id] = load.get(entry.teacher_id, 0) + db.get_weekly_hours_for_lesson(
+                entry.lesson_id, grade
+            )
+        for teacher_id, hours in load.items():
+            blocked = sum(1 for row in db.get_teacher_availability(teacher_id) if not row["is_available"])
+            assert spec.weekly_slots - blocked >= hours
+
+    def test_scaling_ladder(self):
+        """Ladder rungs differ only in class count"""
+        ladder = scaling_ladder((10, 25), school_type="Lise", seed=9)
+
+        assert [spec.class_count for spec in ladder] == [10, 25]
+        assert sum(ladder[1].sections_per_grade().values()) == 25
+        assert len({spec.name for spec in ladder}) == 2
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the min-cost flow teacher assignment engine
+"""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from utils.teacher_assignment import MATCH_EXACT, MATCH_WORD, TeacherAssignmentEngine, subject_match
+
+
+def _teacher(teacher_id, subject):
+    return SimpleNamespace(teacher_id=teacher_id, name=f"Öğretmen {teacher_id}", subject=subject)
+
+
+def _requirement(class_id, lesson_id, lesson_name, weekly_hours):
+    return SimpleNamespace(class_id=class_id, lesson_id=lesson_id, lesson_name=lesson_name, weekly_hours=weekly_hours)
+
+
+class TestTeacherAssignmentEngine:
+    """Test matching, capacity and load balance"""
+
+    def test_subject_match(self):
+        """Substring matches beat shared words; unrelated subjects do not match"""
+        assert subject_match("Matematik", "matematik") == MATCH_EXACT
+        assert subject_match("Fen Bilimleri", "Fen") == MATCH_EXACT
+        assert subject_match("Fen Bilimleri", "Sosyal Bilimleri") == MATCH_WORD
+        assert subject_match("Müzik", "Matematik") is None
+
+    def test_balances_existing_load(self):
+        """New hours go to the less loaded teacher until loads even out"""
+        teachers = [_teacher(1, "Matematik"), _teacher(2, "Matematik")]
+        requirements = [_requirement(c, 1, "Matematik", 4) for c in range(6)]
+
+        plan = TeacherAssignmentEngine(teachers, existing_hours={1: 8}).solve(requirements)
+
+        assert plan.unassigned == []
+        assert plan.teacher_hours == {1: 16, 2: 16}
+        assert [req for req, _ in plan.assignments] == requirements
+
+    def test_capacity_and_word_match_fallback(self):
+        """Full exact-match teachers overflow to word matches, then requirements stay unassigned"""
+        teachers = [_teacher(1, "Fen Bilimleri"), _teacher(2, "Sosyal Bilimleri"), _teacher(3, "Müzik")]
+        requirements = [_requirement(c, 1, "Fen Bilimleri", 3) for c in range(5)]
+
+        plan = TeacherAssignmentEngine(teachers, capacity={1: 6, 2: 7}).solve(requirements)
+
+        assert sorted(teacher_id for _, teacher_id in plan.assignments) == [1, 1, 2, 2]
+        assert [reason for _, reason in plan.unassigned] == ["Öğretmen kapasitesi yetersiz"]
+        assert plan.teacher_hours == {1: 6, 2: 6, 3: 0}
+
+    def test_mixed_hours_never_exceed_capacity(self):
+        """Hour limits hold when a teacher's requirements have different lengths"""
+        teachers = [_teacher(t, "Türkçe") for t in range(1, 4)]
+        requirements = [_requirement(c, 1, "Türkçe", 5 if c % 2 else 2) for c in range(12)]
+
+        plan = TeacherAssignmentEngine(teachers, capacity={1: 9, 2: 9, 3: 9}).solve(requirements)
+
+        assert all(hours <= 9 for hours in plan.teacher_hours.values())
+        assert sum(plan.teacher_hours.values()) == sum(r.weekly_hours for r, _ in plan.assignments)
+        assert len(plan.assignments) >= 6
+
+    def test_large_school(self):
+        """Thousands of class-lesson pairs are solved per subject component"""
+        subjects = ["Matematik", "Türkçe", "Fizik", "Kimya", "Biyoloji", "Tarih", "Coğrafya", "İngilizce"]
+        teachers = [_teacher(t, subjects[t % len(subjects)]) for t in range(160)]
+        requirements = [
+            _requirement(c, l, subject, 2 + (c + l) % 3) for c in range(250) for l, subject in enumerate(subjects)
+        ]
+
+        plan = TeacherAssignmentEngine(teachers, default_capacity=45).solve(requirements)
+
+        assert len(plan.assignments) == len(requirements)
+        loads = plan.teacher_hours.values()
+        assert max(loads) <= 45 and max(loads) - min(loads) <= 4
+        assert plan.solves == len(subjects)
+
+
+class TestAutoFillAssignments:
+    """auto_fill_assignments uses the engine and one bulk insert"""
+
+    def test_bulk_insert(self, db_manager, sample_classes, sample_teachers, sample_lessons):
+        """All new assignments are written in one transaction and reach the change feed"""
+        db_manager.add_classroom("Derslik", 30)
+        for lesson in sample_lessons[:3]:
+            db_manager.add_lesson_weekly_hours(lesson.lesson_id, 5, "Ortaokul", 4)
+        revision = db_manager.get_assignment_revision()
+
+        with patch.object(db_manager.schedule, "add_schedule_entry") as single:
+            with patch.object(db_manager, "_safe_commit", wraps=db_manager._safe_commit) as commit:
+                result = db_manager.auto_fill_assignments()
+            assert single.call_count == 0
+            assert commit.call_count == 1
+
+        assert len(result["success"]) == 6 and result["failed"] == []
+        changes, _ = db_manager.get_assignment_changes_since(revision)
+        assert len(changes) == 6
+        assert db_manager.find_missing_assignments() == {}
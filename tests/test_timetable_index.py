@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the in-memory timetable index used by the schedule views
+"""
+
+import pytest
+
+from database.change_log import OP_ADD, OP_DELETE, OP_UPDATE, ScheduleChange
+from utils.timetable_index import TimetableIndex
+
+
+@pytest.fixture
+def program_refs(db_manager):
+    """Create the rows a program entry refers to"""
+    class_id = db_manager.add_class("5A", 5)
+    teacher_id = db_manager.add_teacher("Ahmet Yılmaz", "Matematik")
+    lesson_id = db_manager.add_lesson("Matematik")
+    classroom_id = db_manager.add_classroom("Derslik 1", 30)
+    return class_id, teacher_id, lesson_id, classroom_id
+
+
+class TestTimetableIndex:
+    """Test TimetableIndex functionality"""
+
+    def test_load_groups_by_owner(self, db_manager, program_refs):
+        """Program entries are reachable by class and by teacher"""
+        class_id, teacher_id, lesson_id, classroom_id = program_refs
+        db_manager.add_schedule_program(class_id, teacher_id, lesson_id, classroom_id, 1, 2)
+
+        index = TimetableIndex(db_manager)
+        index.load()
+
+        class_cells = index.cells_for("class", class_id)
+        assert (1, 2) in class_cells
+        assert index.cells_for("teacher", teacher_id)[(1, 2)] is class_cells[(1, 2)]
+        assert index.lesson_names[lesson_id] == "Matematik"
+        assert index.teacher_names[teacher_id] == "Ahmet Yılmaz"
+
+    def test_refresh_reports_changed_cells(self, db_manager, program_refs):
+        """Incremental refresh returns only the cells touched by new entries"""
+        class_id, teacher_id, lesson_id, classroom_id = program_refs
+        index = TimetableIndex(db_manager)
+        index.load()
+        assert index.refresh() == set()
+
+        db_manager.add_schedule_program(class_id, teacher_id, lesson_id, classroom_id, 3, 0)
+        changed = index.refresh()
+
+        assert changed == {("class", class_id, 3, 0), ("teacher", teacher_id, 3, 0)}
+        assert (3, 0) in index.cells_for("class", class_id)
+
+    def test_refresh_after_clear_reloads(self, db_manager, program_refs):
+        """A bulk clear makes the index reload everything"""
+        class_id = program_refs[0]
+        db_manager.add_schedule_program(*program_refs, 0, 0)
+        index = TimetableIndex(db_manager)
+        index.load()
+
+        db_manager.clear_schedule()
+
+        assert index.refresh() is None
+        assert index.cells_for("class", class_id) == {}
+
+    def test_apply_changes_without_database(self):
+        """Deltas fed by the caller return the removed and added entries"""
+        index = TimetableIndex(None)
+        entry = {"entry_id": 1, "class_id": 5, "teacher_id": 7, "day": 0, "time_slot": 0}
+        index.reset_entries([entry])
+
+        removed, added = index.apply_changes(
+            [
+                ScheduleChange(2, OP_UPDATE, 1, class_id=5, teacher_id=8, day=1, time_slot=3),
+                ScheduleChange(3, OP_ADD, 1, class_id=5, teacher_id=8, day=1, time_slot=3),
+                ScheduleChange(4, OP_DELETE, 99),
+            ]
+        )
+
+        assert [e["teacher_id"] for e in removed] == [7] and [e["teacher_id"] for e in added] == [8]
+        assert index.cells_for("class", 5) == {(1, 3): index.entries[1]}
+        assert index.cells_for("teacher", 7) == {}
+        assert set(index.cell_keys(added[0])) == {("class", 5, 1, 3), ("teacher", 8, 1, 3)}
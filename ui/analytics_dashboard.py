@@ -50,14 +50,33 @@ from PyQt5.QtWidgets import (
 )
 
 from database import db_manager
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-import seaborn as sns
+from utils.metrics_registry import performance_summary
 
-# Configure matplotlib for high DPI displays
-plt.rcParams['figure.dpi'] = 100
-plt.rcParams['savefig.dpi'] = 150
-sns.set_palette("husl")
+_matplotlib = None
+
+
+def _load_matplotlib():
+    """
+    Import matplotlib and seaborn on the first chart
+
+    matplotlib/seaborn bu modülün içe aktarılmasını yüz milisaniyelerce uzatır;
+    panel açılana kadar yüklenmezler.
+
+    Returns:
+        (pyplot, FigureCanvasQTAgg)
+    """
+    global _matplotlib
+    if _matplotlib is None:
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
+
+        # Configure matplotlib for high DPI displays
+        plt.rcParams['figure.dpi'] = 100
+        plt.rcParams['savefig.dpi'] = 150
+        sns.set_palette("husl")
+        _matplotlib = (plt, FigureCanvasQTAgg)
+    return _matplotlib
 
 
 class AnalyticsCard(QFrame):
@@ -340,14 +359,8 @@ class DataLoaderThread(QThread):
         return time_slots
 
     def _load_performance_metrics(self) -> Dict:
-        """Load performance metrics (mock data for now)"""
-        # In a real system, this would load from performance logs
-        return {
-            'avg_algorithm_runtime': 2.5,  # seconds
-            'total_generations': 1,
-            'success_rate': 95.0,  # percentage
-            'last_generation_time': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        }
+        """Load performance metrics from the live metrics registry"""
+        return performance_summary()
 
     def _analyze_conflicts(self, schedule) -> int:
         """Analyze scheduling conflicts"""
@@ -381,13 +394,20 @@ class DataLoaderThread(QThread):
         }
 
 
-class MatplotlibCanvas(FigureCanvas):
-    """Matplotlib canvas for embedding plots"""
+class MatplotlibCanvas(QWidget):
+    """Matplotlib canvas for embedding plots (matplotlib is imported on first use)"""
 
     def __init__(self, parent=None, width=5, height=4, dpi=100):
+        super().__init__(parent)
+        plt, FigureCanvas = _load_matplotlib()
         self.fig, self.axes = plt.subplots(figsize=(width, height), dpi=dpi)
-        super().__init__(self.fig)
-        self.setParent(parent)
+        self.canvas = FigureCanvas(self.fig)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.canvas)
+
+    def draw(self):
+        self.canvas.draw()
 
     def plot_workload_distribution(self, data: Dict[str, int]):
         """Plot teacher workload distribution"""
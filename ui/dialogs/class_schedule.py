@@ -19,6 +19,7 @@ from PyQt5.QtWidgets import (
 
 from database import db_manager
 from utils.helpers import generate_color_for_lesson
+from utils.timetable_index import TimetableIndex
 
 
 class ClassScheduleDialog(QDialog):
@@ -43,6 +44,12 @@ class ClassScheduleDialog(QDialog):
 
         self.setWindowTitle("Sınıf Programı Görüntüle")
         self.setFixedSize(1000, 600)
+
+        # Name lookups and rendered pages are shared across class switches
+        self.timetable_index = TimetableIndex(db_manager)
+        self.timetable_index.load()
+        self._html_cache = {}
+
         self.setup_ui()
         self.populate_classes()
         self.apply_styles()
@@ -156,11 +163,8 @@ class ClassScheduleDialog(QDialog):
         """
 
         # Add lesson-specific colors
-        lessons = set()
-        for entry in class_entries:
-            lesson = db_manager.get_lesson_by_id(entry.lesson_id)
-            if lesson:
-                lessons.add(lesson.name)
+        lesson_names = self.timetable_index.lesson_names
+        lessons = {lesson_names[e.lesson_id] for e in class_entries if e.lesson_id in lesson_names}
 
         for lesson in lessons:
             color = generate_color_for_lesson(lesson)
@@ -218,17 +222,17 @@ class ClassScheduleDialog(QDialog):
             for slot in range(8):
                 entry = schedule_grid.get(day, {}).get(slot)
                 if entry:
-                    lesson = db_manager.get_lesson_by_id(entry.lesson_id)
-                    teacher = db_manager.get_teacher_by_id(entry.teacher_id)
-                    classroom = db_manager.get_classroom_by_id(entry.classroom_id)
+                    lesson = lesson_names.get(entry.lesson_id)
+                    teacher = self.timetable_index.teacher_names.get(entry.teacher_id)
+                    classroom = self.timetable_index.classroom_names.get(entry.classroom_id)
 
                     if lesson and teacher and classroom:
-                        color_class = f"lesson-{hash(lesson.name) % 1000}"
+                        color_class = f"lesson-{hash(lesson) % 1000}"
                         html += f"""
                         <td class="{color_class}">
-                            <div class="lesson-content">📚 {lesson.name}</div>
-                            <div class="teacher-name">👨‍🏫 {teacher.name}</div>
-                            <div class="classroom-name">🏫 {classroom.name}</div>
+                            <div class="lesson-content">📚 {lesson}</div>
+                            <div class="teacher-name">👨‍🏫 {teacher}</div>
+                            <div class="classroom-name">🏫 {classroom}</div>
                         </td>
                         """
                     else:
@@ -341,8 +345,16 @@ class ClassScheduleDialog(QDialog):
         if not class_id:
             return
 
-        class_entries = db_manager.get_schedule_for_specific_class(class_id)
-        html_content = self.generate_html_schedule(class_entries)
+        # Re-render only if the program changed since this class was last shown
+        previous_revision = self.timetable_index.revision
+        if self.timetable_index.refresh() is None or self.timetable_index.revision != previous_revision:
+            self._html_cache.clear()
+        cache_key = (class_id, self.timetable_index.revision)
+        html_content = self._html_cache.get(cache_key)
+        if html_content is None:
+            class_entries = db_manager.get_schedule_for_specific_class(class_id)
+            html_content = self.generate_html_schedule(class_entries)
+            self._html_cache[cache_key] = html_content
         self.schedule_html.setHtml(html_content)
 
     def export_to_html(self):
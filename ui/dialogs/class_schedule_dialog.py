@@ -3,21 +3,22 @@ Class schedule dialog - FINAL FIX
 """
 
 from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QBrush, QColor, QFont
+from PyQt5.QtGui import QFont
 from PyQt5.QtWidgets import (
+    QAbstractItemView,
     QComboBox,
     QDialog,
     QHBoxLayout,
     QHeaderView,
     QLabel,
     QPushButton,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QVBoxLayout,
 )
 
 from database import db_manager
-from utils.helpers import generate_color_for_lesson
+from ui.timetable_model import TimetableModel
+from utils.timetable_index import TimetableIndex
 
 
 class ClassScheduleDialog(QDialog):
@@ -75,27 +76,19 @@ class ClassScheduleDialog(QDialog):
 
         time_slots_count = self.SCHOOL_TIME_SLOTS.get(school_type, 8)
 
-        # Time slot labels
-        time_slot_labels = []
-        for i in range(time_slots_count):
-            start_hour = 8 + i
-            end_hour = 9 + i
-            time_slot_labels.append(f"{start_hour:02d}:00-{end_hour:02d}:00")
-
-        # Schedule table
-        self.schedule_table = QTableWidget()
-        self.schedule_table.setColumnCount(time_slots_count)
-        self.schedule_table.setRowCount(5)
-        self.schedule_table.setHorizontalHeaderLabels(time_slot_labels)
-        self.schedule_table.setVerticalHeaderLabels(
-            ["Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma"]
-        )
+        # Schedule table (model/view: cells are rendered from the shared index)
+        self.timetable_index = TimetableIndex(db_manager)
+        self.timetable_index.load()
+        self.schedule_model = TimetableModel(self.timetable_index, "class", time_slots_count, self)
+
+        self.schedule_table = QTableView()
+        self.schedule_table.setModel(self.schedule_model)
 
         # Table properties
-        self.schedule_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.schedule_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.schedule_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.schedule_table.verticalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.schedule_table.setSelectionMode(QTableWidget.NoSelection)
+        self.schedule_table.setSelectionMode(QAbstractItemView.NoSelection)
 
         layout.addWidget(self.schedule_table)
 
@@ -162,7 +155,7 @@ class ClassScheduleDialog(QDialog):
                 background-color: #3498db;
                 color: white;
             }
-            QTableWidget {
+            QTableView {
                 border: 2px solid #dee2e6;
                 border-radius: 12px;
                 gridline-color: #e9ecef;
@@ -205,38 +198,6 @@ class ClassScheduleDialog(QDialog):
         if not class_id:
             return
 
-        # Get schedule entries
-        class_entries = db_manager.get_schedule_for_specific_class(class_id)
-
-        # Clear table
-        for row in range(self.schedule_table.rowCount()):
-            for col in range(self.schedule_table.columnCount()):
-                self.schedule_table.setItem(row, col, QTableWidgetItem(""))
-
-        # Populate table
-        for entry in class_entries:
-            lesson = db_manager.get_lesson_by_id(entry.lesson_id)
-            teacher = db_manager.get_teacher_by_id(entry.teacher_id)
-            classroom = db_manager.get_classroom_by_id(entry.classroom_id)
-
-            if lesson and teacher and classroom:
-                display_text = f"📚 {lesson.name}\n👨‍🏫 {teacher.name}\n🏫 {classroom.name}"
-
-                item = QTableWidgetItem(display_text)
-                item.setTextAlignment(Qt.AlignCenter | Qt.AlignVCenter)
-                item.setFlags(item.flags() & ~Qt.ItemIsEditable)
-
-                # Generate and apply color
-                color = generate_color_for_lesson(lesson.name)
-                item.setBackground(QBrush(color))
-                item.setForeground(QBrush(QColor(255, 255, 255)))
-
-                # Bold font
-                font = QFont("Segoe UI", 10, QFont.Bold)
-                item.setFont(font)
-
-                self.schedule_table.setItem(entry.day, entry.time_slot, item)
-
-                print(
-                    f"✓ Set color for {lesson.name}: RGB({color.red()}, {color.green()}, {color.blue()})"
-                )
+        # Pick up program changes made since the last view, then repaint
+        self.schedule_model.refresh()
+        self.schedule_model.set_owner(class_id)
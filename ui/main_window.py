@@ -22,8 +22,6 @@ from PyQt5.QtWidgets import (
 )
 
 from database import db_manager
-from reports.generator import ReportGenerator
-from ui.dialogs.backup_restore_dialog import BackupRestoreDialog
 from ui.dialogs.class_dialog import ClassDialog
 from ui.dialogs.class_list_dialog import ClassListDialog
 from ui.dialogs.lesson_dialog import LessonDialog
@@ -44,7 +42,7 @@ class MainWindow(QMainWindow):
         super().__init__()
         self.setWindowTitle("Ders Programı")
         self.setGeometry(100, 100, 1200, 800)
-        self.report_generator = ReportGenerator(db_manager)
+        self._report_generator = None
         self.file_manager = FileManager(db_manager)
         self.notification_manager = get_notification_manager(self)
         self.setup_ui()
@@ -52,6 +50,15 @@ class MainWindow(QMainWindow):
         # Show school type selection
         self.show_school_type_selection()
 
+    @property
+    def report_generator(self):
+        """Report generator; reportlab/openpyxl are imported on first use"""
+        if self._report_generator is None:
+            from reports.generator import ReportGenerator
+
+            self._report_generator = ReportGenerator(db_manager)
+        return self._report_generator
+
     def setup_ui(self):
         """Set up the user interface with modern dashboard design"""
         # Create central widget
@@ -34,6 +34,7 @@ from PyQt5.QtWidgets import (
     QWidget,
 )
 
+from algorithms.phase_profiler import get_profiler, phase
 from algorithms.scheduler import Scheduler
 from database import db_manager
 from utils.helpers import generate_color_for_lesson
@@ -51,6 +52,11 @@ class ScheduleGenerationThread(QThread):
         self.scheduler = scheduler
 
     def run(self):
+        # --profile ile açıldıysa bu üretim için faz profili çıkarılır
+        with get_profiler().session("schedule_generation"):
+            self._generate()
+
+    def _generate(self):
         try:
             self.progress.emit(10, "🔍 Ders atamaları kontrol ediliyor...")
             assignments = db_manager.get_schedule_by_school_type()
@@ -69,16 +75,17 @@ class ScheduleGenerationThread(QThread):
 
             self.progress.emit(70, "💾 Veritabanına kaydediliyor...")
             saved_count = 0
-            for entry in schedule_entries:
-                if db_manager.add_schedule_program(
-                    entry["class_id"],
-                    entry["teacher_id"],
-                    entry["lesson_id"],
-                    entry["classroom_id"],
-                    entry["day"],
-                    entry["time_slot"],
-                ):
-                    saved_count += 1
+            with phase("persistence"):
+                for entry in schedule_entries:
+                    if db_manager.add_schedule_program(
+                        entry["class_id"],
+                        entry["teacher_id"],
+                        entry["lesson_id"],
+                        entry["classroom_id"],
+                        entry["day"],
+                        entry["time_slot"],
+                    ):
+                        saved_count += 1
 
             self.progress.emit(100, f"✅ Tamamlandı! {saved_count} ders yerleştirildi")
             self.finished.emit(schedule_entries)
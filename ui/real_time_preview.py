@@ -3,137 +3,150 @@ Real-time Schedule Preview Widget
 Provides live preview of schedule changes during generation
 """
 import sys
-from typing import List, Dict, Any, Optional
+import time
+from collections import Counter
+from typing import List, Dict, Any, Optional, Tuple
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
+    QWidget, QVBoxLayout, QHBoxLayout, QTableView, QAbstractItemView,
     QLabel, QHeaderView, QSplitter, QGroupBox, QPushButton, QFrame
 )
 from PyQt5.QtCore import Qt, QTimer
-from PyQt5.QtGui import QColor, QFont
-from database.models import Class, Teacher, Lesson
+from PyQt5.QtGui import QFont
+from database.change_log import ScheduleChange
+from database.models import Class, Classroom, Teacher, Lesson
+from ui.timetable_model import TimetableModel
+from utils.timetable_index import TimetableIndex
 
 
-class RealTimeSchedulePreviewWidget(QTableWidget):
+class IncrementalConflictCounter:
+    """
+    Counts class/teacher double bookings incrementally
+
+    Each added or removed entry updates the occupancy of its (class, day, slot)
+    and (teacher, day, slot) keys, so the conflict total is kept in O(1) per change.
+    """
+
+    def __init__(self):
+        self.occupancy: Counter = Counter()
+        self.conflicts = 0
+
+    def reset(self, entries: List[Dict[str, Any]]):
+        """Rebuild the counts from a full entry list"""
+        self.occupancy.clear()
+        self.conflicts = 0
+        for entry in entries:
+            self.add(entry)
+
+    def add(self, entry: Dict[str, Any]):
+        """Count an added entry"""
+        for key in self._keys(entry):
+            self.occupancy[key] += 1
+            if self.occupancy[key] > 1:
+                self.conflicts += 1
+
+    def remove(self, entry: Dict[str, Any]):
+        """Count a removed entry"""
+        for key in self._keys(entry):
+            if self.occupancy[key] > 1:
+                self.conflicts -= 1
+            self.occupancy[key] -= 1
+            if self.occupancy[key] <= 0:
+                del self.occupancy[key]
+
+    @staticmethod
+    def _keys(entry: Dict[str, Any]):
+        day, slot = entry.get("day"), entry.get("time_slot")
+        return (("class", entry.get("class_id"), day, slot), ("teacher", entry.get("teacher_id"), day, slot))
+
+
+class RealTimeSchedulePreviewWidget(QTableView):
     """
     Real-time schedule preview widget that shows schedule as it's being generated
+
+    Cells are rendered by the shared TimetableModel; change-feed deltas only
+    emit ``dataChanged`` for the cells they touch.
     """
-    
+
+    TIME_SLOTS = 8
+
     def __init__(self, parent=None):
         super().__init__(parent)
+        # Fed by the dialog from the change feed, so the index never queries the database itself
+        self.timetable_index = TimetableIndex(None)
+        self.schedule_model = TimetableModel(self.timetable_index, "class", self.TIME_SLOTS, self)
+        self.setModel(self.schedule_model)
         self.setup_ui()
-        self.schedule_data = {}  # {class_id: {day: {time_slot: entry}}}
-        self.classes = []
-        self.teachers = {}
-        self.lessons = {}
-        
+
+    @property
+    def entries_by_id(self) -> Dict[int, Dict[str, Any]]:
+        """Entries currently shown, keyed by entry ID"""
+        return self.timetable_index.entries
+
     def setup_ui(self):
         """Setup the UI for the schedule preview"""
-        self.setColumnCount(9)  # 8 time slots + 1 for day names
-        self.setRowCount(6)  # 5 days + 1 header
-        
-        # Set headers
-        day_headers = ["", "Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma"]
-        time_headers = ["", "1", "2", "3", "4", "5", "6", "7", "8"]
-        
-        # Set horizontal headers (time slots)
-        self.setHorizontalHeaderLabels(time_headers)
-        
-        # Set vertical headers (days) 
-        self.setVerticalHeaderLabels(day_headers)
-        
-        # Configure table properties
-        self.setEditTriggers(self.NoEditTriggers)
-        self.setSelectionBehavior(self.SelectItems)
-        self.setSelectionMode(self.NoSelection)
-        self.setAlternatingRowColors(True)
-        
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+
         # Set header properties
-        h_header = self.horizontalHeader()
-        h_header.setSectionResizeMode(QHeaderView.Stretch)
-        v_header = self.verticalHeader()
-        v_header.setSectionResizeMode(QHeaderView.Stretch)
-        
+        self.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.verticalHeader().setSectionResizeMode(QHeaderView.Stretch)
+
         # Set table properties
         self.setShowGrid(True)
         self.setGridStyle(Qt.SolidLine)
-        
-    def update_schedule_preview(self, schedule_entries: List[Dict[str, Any]], 
-                              classes: List[Class], 
-                              teachers: List[Teacher], 
-                              lessons: List[Lesson]):
+
+    def update_schedule_preview(self, schedule_entries: List[Any],
+                              classes: List[Class],
+                              teachers: List[Teacher],
+                              lessons: List[Lesson],
+                              classrooms: Optional[List[Classroom]] = None):
         """
-        Update the schedule preview with new entries
-        
+        Update the schedule preview with new entries (full repaint)
+
         Args:
-            schedule_entries: List of schedule entries
+            schedule_entries: List of schedule entries (ScheduleEntry objects or dicts)
             classes: List of classes
             teachers: List of teachers
             lessons: List of lessons
+            classrooms: List of classrooms
         """
-        # Store references to class, teacher, and lesson data
-        self.classes = classes
-        self.teachers = {t.teacher_id: t for t in teachers}
-        self.lessons = {l.lesson_id: l for l in lessons}
-        
-        # Clear existing data
-        for i in range(self.rowCount()):
-            for j in range(self.columnCount()):
-                item = self.item(i, j)
-                if item:
-                    item.setText("")
-                    item.setBackground(QColor(255, 255, 255))
-        
-        # Populate schedule data
-        self.schedule_data = {}
-        for entry in schedule_entries:
-            class_id = entry.get("class_id")
-            day = entry.get("day", 0) + 1  # +1 to match table indexing (days start from 1)
-            time_slot = entry.get("time_slot", 0) + 1  # +1 to match table indexing (slots start from 1)
-            
-            if class_id not in self.schedule_data:
-                self.schedule_data[class_id] = {}
-            if day not in self.schedule_data[class_id]:
-                self.schedule_data[class_id][day] = {}
-            
-            self.schedule_data[class_id][day][time_slot] = entry
-            
-            # Find the class name
-            class_name = "Unknown"
-            for cls in classes:
-                if cls.class_id == class_id:
-                    class_name = cls.name
-                    break
-            
-            # Get teacher and lesson info
-            teacher = self.teachers.get(entry.get("teacher_id", -1))
-            lesson = self.lessons.get(entry.get("lesson_id", -1))
-            
-            teacher_name = teacher.name if teacher else "Unknown"
-            lesson_name = lesson.name if lesson else "Unknown"
-            
-            # Set the item text and style
-            item = QTableWidgetItem(f"{lesson_name}\n{teacher_name}")
-            item.setTextAlignment(Qt.AlignCenter)
-            
-            # Color coding based on lesson type
-            if "Matematik" in lesson_name or "Fizik" in lesson_name or "Kimya" in lesson_name:
-                # Science subjects in blue
-                item.setBackground(QColor(173, 216, 230))
-            elif "Beden" in lesson_name or "Müzik" in lesson_name or "Sanat" in lesson_name:
-                # PE and arts in green
-                item.setBackground(QColor(144, 238, 144))
-            else:
-                # Other subjects in light yellow
-                item.setBackground(QColor(255, 255, 224))
-            
-            self.setItem(class_id % (self.rowCount()-1) + 1, time_slot, item)
-        
-        self.update()
-    
+        index = self.timetable_index
+        index.class_names = {c.class_id: c.name for c in classes}
+        index.teacher_names = {t.teacher_id: t.name for t in teachers}
+        index.lesson_names = {l.lesson_id: l.name for l in lessons}
+        index.classroom_names = {r.classroom_id: r.name for r in classrooms or []}
+        index.reset_entries(schedule_entries)
+
+        # Keep the selected class if it still exists, otherwise show the first one
+        owner_id = self.schedule_model.owner_id
+        if owner_id not in index.class_names:
+            owner_id = classes[0].class_id if classes else None
+        self.schedule_model.set_owner(owner_id)
+
+    def apply_changes(self, changes: List[ScheduleChange]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Apply change-feed deltas and repaint only the affected cells
+
+        Args:
+            changes: Deltas returned by ``db_manager.get_schedule_changes_since``
+
+        Returns:
+            (removed_entries, added_entries) tuple
+        """
+        removed, added = self.timetable_index.apply_changes(changes)
+        self.schedule_model.update_cells(
+            {key for entry in removed + added for key in self.timetable_index.cell_keys(entry)}
+        )
+        return removed, added
+
+    def clear_preview(self):
+        """Drop all shown entries"""
+        self.timetable_index.reset_entries([])
+        self.schedule_model.set_owner(None)
+
     def set_class_selection(self, class_id: int):
-        """Highlight a specific class in the preview"""
-        # This would highlight the row for the selected class
-        pass
+        """Show the program of a specific class in the preview"""
+        self.schedule_model.set_owner(class_id)
 
 
 class SchedulePreviewDialog(QWidget):
@@ -157,6 +170,11 @@ class SchedulePreviewDialog(QWidget):
         
         # Store original schedule data for comparison
         self.original_entries = []
+
+        # Change-feed state: last schedule revision shown and incremental conflict counts
+        self.last_revision: Optional[int] = None
+        self.class_count = 0
+        self.conflict_counter = IncrementalConflictCounter()
         
     def setup_ui(self):
         """Setup the main UI"""
@@ -214,39 +232,67 @@ class SchedulePreviewDialog(QWidget):
         self.update_button_text()
         
     def update_preview(self):
-        """Update the preview with latest schedule data"""
+        """Update the preview with the schedule changes since the last tick"""
         if self.updates_paused or not self.db_manager:
             return
-            
+
         try:
-            # Get current schedule data
-            classes = self.db_manager.get_all_classes() or []
-            teachers = self.db_manager.get_all_teachers() or []
-            lessons = self.db_manager.get_all_lessons() or []
-            current_entries = self.db_manager.get_schedule_program_by_school_type() or []
-            
-            # Update the preview widget
-            self.preview_widget.update_schedule_preview(current_entries, classes, teachers, lessons)
-            
-            # Update statistics
-            total_slots = len(classes) * 5 * 8  # 5 days, max 8 slots per day
-            scheduled_count = len(current_entries)
-            coverage = (scheduled_count / total_slots * 100) if total_slots > 0 else 0
-            
-            # Count conflicts (simplified - in a real app you'd check the actual conflicts)
-            # For demo purposes, we'll just count entries
-            conflicts = 0  # This would actually check for conflicts
-            
-            self.coverage_label.setText(f"Coverage: {coverage:.1f}% ({scheduled_count}/{total_slots})")
-            self.conflicts_label.setText(f"Conflicts: {conflicts}")
-            self.entries_label.setText(f"Entries: {scheduled_count}")
-            
+            changes = None
+            if self.last_revision is not None:
+                changes, revision = self.db_manager.get_schedule_changes_since(self.last_revision)
+                if changes == []:
+                    return  # Nothing changed since the last tick
+
+            if changes is None:
+                self._reload_preview()
+                changed = len(self.preview_widget.entries_by_id)
+            else:
+                removed, added = self.preview_widget.apply_changes(changes)
+                for entry in removed:
+                    self.conflict_counter.remove(entry)
+                for entry in added:
+                    self.conflict_counter.add(entry)
+                self.last_revision = revision
+                changed = len(removed) + len(added)
+
+            self._update_statistics()
+
             # Update status
-            self.status_label.setText(f"Updated preview at {time.strftime('%H:%M:%S')}. {scheduled_count} entries shown.")
-            
+            self.status_label.setText(
+                f"Updated preview at {time.strftime('%H:%M:%S')} (revision {self.last_revision}). "
+                f"{changed} entries refreshed."
+            )
+
         except Exception as e:
             self.status_label.setText(f"Error updating preview: {str(e)}")
-    
+
+    def _reload_preview(self):
+        """Reload the full program (first tick, or when the change log cannot be replayed)"""
+        # Read the revision first; deltas racing with the reload are de-duplicated by entry ID
+        revision = self.db_manager.get_schedule_revision()
+        classes = self.db_manager.get_all_classes() or []
+        teachers = self.db_manager.get_all_teachers() or []
+        lessons = self.db_manager.get_all_lessons() or []
+        classrooms = self.db_manager.get_all_classrooms() or []
+        current_entries = self.db_manager.get_schedule_program_by_school_type() or []
+
+        self.preview_widget.update_schedule_preview(
+            current_entries, classes, teachers, lessons, classrooms
+        )
+        self.conflict_counter.reset(list(self.preview_widget.entries_by_id.values()))
+        self.class_count = len(classes)
+        self.last_revision = revision
+
+    def _update_statistics(self):
+        """Update the statistics labels from the incremental state"""
+        total_slots = self.class_count * 5 * 8  # 5 days, max 8 slots per day
+        scheduled_count = len(self.preview_widget.entries_by_id)
+        coverage = (scheduled_count / total_slots * 100) if total_slots > 0 else 0
+
+        self.coverage_label.setText(f"Coverage: {coverage:.1f}% ({scheduled_count}/{total_slots})")
+        self.conflicts_label.setText(f"Conflicts: {self.conflict_counter.conflicts}")
+        self.entries_label.setText(f"Entries: {scheduled_count}")
+
     def toggle_updates(self):
         """Toggle between pause and resume updates"""
         self.updates_paused = not self.updates_paused
@@ -268,7 +314,9 @@ class SchedulePreviewDialog(QWidget):
     
     def reset_preview(self):
         """Reset the preview to empty state"""
-        self.preview_widget.clear()
+        self.preview_widget.clear_preview()
+        self.conflict_counter.reset([])
+        self.last_revision = None
         self.coverage_label.setText("Coverage: 0% (0/0)")
         self.conflicts_label.setText("Conflicts: 0")
         self.entries_label.setText("Entries: 0")
@@ -287,7 +335,6 @@ class SchedulePreviewDialog(QWidget):
 
 if __name__ == "__main__":
     from PyQt5.QtWidgets import QApplication
-    import time
     
     app = QApplication(sys.argv)
     
@@ -34,9 +34,12 @@ from PyQt5.QtWidgets import (
     QWidget,
 )
 
+from algorithms.generation_jobs import placement_rows
+from algorithms.phase_profiler import get_profiler, phase
 from algorithms.scheduler import Scheduler
 from database import db_manager
 from utils.helpers import generate_color_for_lesson
+from utils.metrics_registry import track_solve
 
 
 class ScheduleGenerationThread(QThread):
@@ -56,6 +59,11 @@ class ScheduleGenerationThread(QThread):
         self.progress.emit(int(percentage), message)
 
     def run(self):
+        # --profile ile açıldıysa bu üretim için faz profili çıkarılır
+        with get_profiler().session("schedule_generation"):
+            self._generate()
+
+    def _generate(self):
         try:
             self.progress.emit(10, "🔍 Ders atamaları kontrol ediliyor...")
             assignments = db_manager.get_schedule_by_school_type()
@@ -66,8 +74,13 @@ class ScheduleGenerationThread(QThread):
                 )
                 return
 
-            self.progress.emit(20, "🧹 Mevcut program temizleniyor...")
-            db_manager.clear_schedule()
+            self.progress.emit(15, "🧮 Yapılabilirlik ön kontrolü yapılıyor...")
+            certificate = self.scheduler.presolve()
+            if certificate is not None and not certificate.feasible:
+                self.error.emit(f"❌ Bu verilerle program oluşturulamaz!\n\n{certificate.describe()}")
+                return
+
+            # Eski program, kaydetme adımında replace_schedule ile aynı işlemde silinir
             self.progress.emit(25, "📋 Mevcut ders atamaları yükleniyor...")
 
             self.progress.emit(40, "🎯 Akıllı algoritma çalışıyor...")
@@ -83,7 +96,9 @@ class ScheduleGenerationThread(QThread):
                     self.progress.emit(45 + int(percentage * 0.35), message)  # Scale to 45-80% range
                 
                 optimized_scheduler = OptimizedCurriculumScheduler(self.scheduler.db_manager, progress_callback)
-                schedule_entries = optimized_scheduler.generate_schedule()
+                with track_solve("OptimizedCurriculumScheduler") as solve:
+                    schedule_entries = optimized_scheduler.generate_schedule()
+                    solve.observe_scheduler(optimized_scheduler, schedule_entries)
                 self.progress.emit(80, f"✅ Optimize edilmiş algoritma çalıştı: {len(schedule_entries)} ders")
                 
                 self.logger.info("🚀 OPTIMIZED CURRICULUM SCHEDULER Aktif - %100 tamamlama hedefi!")
@@ -119,23 +134,18 @@ class ScheduleGenerationThread(QThread):
             self.progress.emit(60, "🔍 Çakışmalar kontrol ediliyor...")
 
             self.progress.emit(70, "💾 Veritabanına kaydediliyor...")
-            saved_count = 0
-
-            # ACTUALLY SAVE THE SCHEDULE TO DATABASE
-            for entry in schedule_entries:
-                try:
-                    db_manager.add_schedule_program(
-                        class_id=entry["class_id"],
-                        teacher_id=entry["teacher_id"], 
-                        lesson_id=entry["lesson_id"],
-                        classroom_id=entry.get("classroom_id", 1),
-                        day=entry["day"],
-                        time_slot=entry["time_slot"]
-                    )
-                    saved_count += 1
-                except Exception as save_error:
-                    logging.warning(f"Failed to save entry: {save_error}")
-                    continue
+            # ACTUALLY SAVE THE SCHEDULE TO DATABASE (tek işlemde, toplu)
+            # Eksik/yerleşmemiş girdiler atlanır; kalanlar birlikte yazılır ya da hiç
+            with phase("persistence"):
+                rows = placement_rows(schedule_entries)
+                skipped = len(schedule_entries) - len(rows)
+                if skipped:
+                    self.logger.warning(f"{skipped} incomplete or unplaced entries not saved")
+                schedule_ids = db_manager.replace_schedule(rows)
+            if schedule_ids is None:
+                self.error.emit("❌ Program veritabanına kaydedilemedi!")
+                return
+            saved_count = len(schedule_ids)
 
             self.progress.emit(90, f"💾 Program temizleniyor...")
             self.progress.emit(100, f"✅ Tamamlandı! {saved_count} ders yerleştirildi")
@@ -0,0 +1,122 @@
+"""
+Model/view timetable grid shared by the class and teacher schedule dialogs.
+Renders straight from the in-memory TimetableIndex; no per-cell widget items.
+"""
+
+from typing import Dict, Optional
+
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt5.QtGui import QBrush, QColor, QFont
+
+from utils.helpers import generate_color_for_lesson
+from utils.timetable_index import TimetableIndex
+
+DAY_NAMES = ["Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma"]
+
+_lesson_brushes: Dict[str, QBrush] = {}
+
+
+def lesson_brush(lesson_name: str) -> QBrush:
+    """Background brush for a lesson (colour generated once per lesson name)"""
+    brush = _lesson_brushes.get(lesson_name)
+    if brush is None:
+        brush = QBrush(generate_color_for_lesson(lesson_name))
+        _lesson_brushes[lesson_name] = brush
+    return brush
+
+
+class TimetableModel(QAbstractTableModel):
+    """
+    Day × time-slot table model for one class or one teacher
+
+    Switching the displayed owner or applying schedule changes emits
+    ``dataChanged`` instead of rebuilding the view.
+    """
+
+    CELL_FONT = None
+    TEXT_BRUSH = None
+
+    def __init__(self, index: TimetableIndex, kind: str, time_slots_count: int = 8, parent=None):
+        """
+        Args:
+            index: Shared timetable index
+            kind: "class" or "teacher"
+            time_slots_count: Number of columns
+        """
+        super().__init__(parent)
+        self.index_data = index
+        self.kind = kind
+        self.time_slots_count = time_slots_count
+        self.owner_id: Optional[int] = None
+
+        if TimetableModel.CELL_FONT is None:
+            TimetableModel.CELL_FONT = QFont("Segoe UI", 10, QFont.Bold)
+            TimetableModel.TEXT_BRUSH = QBrush(QColor(255, 255, 255))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(DAY_NAMES)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.time_slots_count
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return f"{8 + section:02d}:00-{9 + section:02d}:00"
+        return DAY_NAMES[section] if section < len(DAY_NAMES) else None
+
+    def _entry_at(self, index: QModelIndex) -> Optional[dict]:
+        if self.owner_id is None or not index.isValid():
+            return None
+        return self.index_data.cells_for(self.kind, self.owner_id).get((index.row(), index.column()))
+
+    def data(self, index, role=Qt.DisplayRole):
+        entry = self._entry_at(index)
+        if entry is None:
+            return None
+
+        lesson_name = self.index_data.lesson_names.get(entry["lesson_id"], "")
+        if role == Qt.DisplayRole:
+            classroom = self.index_data.classroom_names.get(entry["classroom_id"], "-")
+            if self.kind == "class":
+                other = f"👨‍🏫 {self.index_data.teacher_names.get(entry['teacher_id'], '-')}"
+                return f"📚 {lesson_name}\n{other}\n🏫 {classroom}"
+            other = f"🎓 {self.index_data.class_names.get(entry['class_id'], '-')}"
+            return f"📚 {lesson_name}\n{other}\n🏢 {classroom}"
+        if role == Qt.BackgroundRole:
+            return lesson_brush(lesson_name)
+        if role == Qt.ForegroundRole:
+            return self.TEXT_BRUSH
+        if role == Qt.FontRole:
+            return self.CELL_FONT
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter | Qt.AlignVCenter
+        return None
+
+    def flags(self, index):
+        return Qt.ItemIsEnabled
+
+    def set_owner(self, owner_id: Optional[int]):
+        """Show another class/teacher; the grid shape is unchanged so only data changes"""
+        self.owner_id = owner_id
+        self._emit_all_changed()
+
+    def refresh(self):
+        """Pull schedule changes and repaint only the affected cells"""
+        changed = self.index_data.refresh()
+        if changed is None:
+            self._emit_all_changed()
+            return
+        self.update_cells(changed)
+
+    def update_cells(self, changed):
+        """Repaint the given (kind, owner_id, day, time_slot) cells if this model shows them"""
+        for kind, owner_id, day, slot in changed:
+            if kind == self.kind and owner_id == self.owner_id:
+                if 0 <= day < self.rowCount() and 0 <= slot < self.columnCount():
+                    cell = self.index(day, slot)
+                    self.dataChanged.emit(cell, cell)
+
+    def _emit_all_changed(self):
+        self.dataChanged.emit(self.index(0, 0), self.index(self.rowCount() - 1, self.columnCount() - 1))
@@ -5,9 +5,13 @@ Extends caching strategy beyond teacher availability
 """
 
 import logging
+import threading
 import time
+from collections import OrderedDict
 from functools import wraps
-from typing import Any, Callable, Dict, Optional, Tuple
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Set, Tuple
+
+from utils.metrics_registry import track_cache
 
 logger = logging.getLogger(__name__)
 
@@ -32,7 +36,7 @@ class CacheManager:
             ttl: Time to live in seconds (default: 5 minutes)
         """
         self.ttl = ttl
-        self._cache: Dict[str, Tuple[Any, float]] = {}
+        self._cache: Dict[str, Tuple[Any, float]] = {}  # key -> (value, expiry deadline)
         self._hit_count = 0
         self._miss_count = 0
 
@@ -50,10 +54,10 @@ class CacheManager:
             self._miss_count += 1
             return None
 
-        value, timestamp = self._cache[key]
+        value, deadline = self._cache[key]
         
         # Check if expired
-        if time.time() - timestamp > self.ttl:
+        if time.monotonic() > deadline:
             del self._cache[key]
             self._miss_count += 1
             return None
@@ -69,7 +73,7 @@ class CacheManager:
             key: Cache key
             value: Value to cache
         """
-        self._cache[key] = (value, time.time())
+        self._cache[key] = (value, time.monotonic() + self.ttl)
 
     def delete(self, key: str) -> None:
         """
@@ -144,6 +148,7 @@ def get_cache() -> CacheManager:
     global _global_cache
     if _global_cache is None:
         _global_cache = CacheManager()
+        track_cache("global", _global_cache)
     return _global_cache
 
 
@@ -195,7 +200,8 @@ class LRUCache:
     """
     Least Recently Used (LRU) Cache
     
-    More sophisticated caching with size limit
+    More sophisticated caching with size limit; every operation is O(1)
+    (OrderedDict keeps the recency order).
     """
 
     def __init__(self, max_size: int = 100):
@@ -206,10 +212,11 @@ class LRUCache:
             max_size: Maximum number of items to cache
         """
         self.max_size = max_size
-        self._cache: Dict[str, Any] = {}
-        self._access_order: list = []
+        self._cache: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._hit_count = 0
+        self._miss_count = 0
 
-    def get(self, key: str) -> Optional[Any]:
+    def get(self, key: Hashable) -> Optional[Any]:
         """
         Get value from cache
         
@@ -219,16 +226,18 @@ class LRUCache:
         Returns:
             Cached value or None
         """
-        if key not in self._cache:
+        try:
+            value = self._cache[key]
+        except KeyError:
+            self._miss_count += 1
             return None
 
         # Update access order
-        self._access_order.remove(key)
-        self._access_order.append(key)
-        
-        return self._cache[key]
+        self._cache.move_to_end(key)
+        self._hit_count += 1
+        return value
 
-    def set(self, key: str, value: Any) -> None:
+    def set(self, key: Hashable, value: Any) -> None:
         """
         Set value in cache
         
@@ -236,28 +245,184 @@ class LRUCache:
             key: Cache key
             value: Value to cache
         """
-        # If key exists, update it
         if key in self._cache:
-            self._access_order.remove(key)
-        
-        # If cache is full, remove least recently used
-        elif len(self._cache) >= self.max_size:
-            lru_key = self._access_order.pop(0)
-            del self._cache[lru_key]
-        
-        # Add new item
+            self._cache.move_to_end(key)
         self._cache[key] = value
-        self._access_order.append(key)
+
+        # If cache is full, remove least recently used
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """Delete a key if present"""
+        self._cache.pop(key, None)
 
     def clear(self) -> None:
         """Clear cache"""
         self._cache.clear()
-        self._access_order.clear()
+        self._hit_count = 0
+        self._miss_count = 0
 
     def size(self) -> int:
         """Get current cache size"""
         return len(self._cache)
 
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        total_requests = self._hit_count + self._miss_count
+        return {
+            'size': len(self._cache),
+            'max_size': self.max_size,
+            'hits': self._hit_count,
+            'misses': self._miss_count,
+            'hit_rate': self._hit_count / total_requests * 100 if total_requests > 0 else 0,
+        }
+
+
+_MISSING = object()
+
+
+class ReadThroughCache:
+    """
+    Thread-safe read-through LRU cache with tag-based invalidation
+    
+    Entries never expire by time. Every entry carries tags (``"teachers"``,
+    ``"lesson:5"``, ...) and writers invalidate exactly the tags they touch,
+    so a read after a write always sees the database state. ``None`` results
+    are cached too (a missing row stays missing until a write invalidates it).
+    """
+
+    def __init__(self, max_size: int = 2048):
+        """
+        Args:
+            max_size: Maximum number of cached results
+        """
+        self.max_size = max_size
+        self.enabled = True
+        self._entries: "OrderedDict[Hashable, Tuple[Any, Tuple[str, ...]]]" = OrderedDict()
+        self._tags: Dict[str, Set[Hashable]] = {}
+        self._lock = threading.RLock()
+        self._hit_count = 0
+        self._miss_count = 0
+        self._invalidation_count = 0
+        self._eviction_count = 0
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any], tags: Iterable[str] = ()) -> Any:
+        """
+        Return the cached result for ``key`` or call ``loader`` and cache it
+        
+        List results are returned as shallow copies so callers may sort or
+        extend them without touching the cache.
+        
+        Args:
+            key: Hashable cache key (include every argument of the query)
+            loader: Zero-argument function running the query
+            tags: Invalidation tags of the result
+        """
+        if not self.enabled:
+            return loader()
+
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING:
+                self._entries.move_to_end(key)
+                self._hit_count += 1
+                return _copy_result(entry[0])
+            self._miss_count += 1
+            # Yükleme sırasında gelen yazma işlemleri bu nesil sayacıyla tespit edilir
+            generation = self._invalidation_count
+
+        value = loader()
+
+        with self._lock:
+            if generation == self._invalidation_count:
+                self._store(key, value, tuple(tags))
+        return _copy_result(value)
+
+    def _store(self, key: Hashable, value: Any, tags: Tuple[str, ...]):
+        self._discard(key)
+        self._entries[key] = (value, tags)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_size:
+            oldest = next(iter(self._entries))
+            self._discard(oldest)
+            self._eviction_count += 1
+
+    def _discard(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[1]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def invalidate(self, *tags: str) -> int:
+        """
+        Drop every entry carrying one of ``tags``
+        
+        Returns:
+            Number of entries dropped
+        """
+        with self._lock:
+            self._invalidation_count += 1
+            dropped = 0
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._discard(key)
+                    dropped += 1
+            return dropped
+
+    def evict(self, count: int) -> int:
+        """Drop up to ``count`` least recently used entries"""
+        with self._lock:
+            dropped = 0
+            while self._entries and dropped < count:
+                self._discard(next(iter(self._entries)))
+                dropped += 1
+            self._eviction_count += dropped
+            return dropped
+
+    def clear(self) -> None:
+        """Drop every entry and reset statistics"""
+        with self._lock:
+            self._invalidation_count += 1
+            self._entries.clear()
+            self._tags.clear()
+            self._hit_count = 0
+            self._miss_count = 0
+            self._eviction_count = 0
+
+    def size(self) -> int:
+        return len(self._entries)
+
+    def approximate_bytes(self) -> int:
+        """Sampled estimate of the memory held by cached results"""
+        from utils.memory_budget import estimate_size
+
+        with self._lock:
+            return estimate_size(self._entries) if self._entries else 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss statistics"""
+        total_requests = self._hit_count + self._miss_count
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hits': self._hit_count,
+            'misses': self._miss_count,
+            'hit_rate': self._hit_count / total_requests * 100 if total_requests > 0 else 0,
+            'invalidations': self._invalidation_count,
+            'evictions': self._eviction_count,
+        }
+
+
+def _copy_result(value: Any) -> Any:
+    return list(value) if isinstance(value, list) else value
+
 
 class ScheduleCache:
     """
@@ -22,6 +22,10 @@ def analyze_schedule_feasibility(db_manager):
     teachers = db_manager.get_all_teachers()
     lessons = db_manager.get_all_lessons()
     assignments = db_manager.get_schedule_by_school_type()
+    requirements = db_manager.get_requirement_table()
+    teacher_hours = requirements.teacher_hours()
+    class_hours = requirements.class_hours()
+    teachers_by_id = {t.teacher_id: t for t in teachers}
     
     school_type = db_manager.get_school_type() or "Lise"
     school_hours = {
@@ -51,22 +55,18 @@ def analyze_schedule_feasibility(db_manager):
     print("=" * 80)
     
     teacher_capacity_issues = []
+    teacher_available_hours = {}
+    unavailable = db_manager.get_teacher_unavailable_slots()
     for teacher in teachers:
         # Calculate teacher's total available hours per week
-        available_hours = 0
-        for day in range(total_days):
-            for hour in range(daily_hours):
-                if db_manager.is_teacher_available(teacher.teacher_id, day, hour):
-                    available_hours += 1
+        closed = unavailable.get(teacher.teacher_id, set())
+        available_hours = sum(
+            1 for day in range(total_days) for hour in range(daily_hours) if (day, hour) not in closed
+        )
+        teacher_available_hours[teacher.teacher_id] = available_hours
         
         # Calculate how many hours this teacher is assigned
-        assigned_hours = 0
-        for assignment in assignments:
-            if assignment.teacher_id == teacher.teacher_id:
-                lesson_grade = next((c.grade for c in classes if c.class_id == assignment.class_id), 0)
-                weekly_hours = db_manager.get_weekly_hours_for_lesson(assignment.lesson_id, lesson_grade)
-                if weekly_hours:
-                    assigned_hours += weekly_hours
+        assigned_hours = teacher_hours.get(teacher.teacher_id, 0)
         
         print(f"{teacher.name} ({teacher.subject}):")
         print(f"   - Uygun saat: {available_hours}")
@@ -98,14 +98,8 @@ def analyze_schedule_feasibility(db_manager):
     total_required_hours = 0
     
     for cls in classes:
-        # Get all lessons assigned to this class
-        class_assignments = [a for a in assignments if a.class_id == cls.class_id]
-        class_required_hours = 0
-        
-        for assignment in class_assignments:
-            weekly_hours = db_manager.get_weekly_hours_for_lesson(assignment.lesson_id, cls.grade)
-            if weekly_hours:
-                class_required_hours += weekly_hours
+        # Hours of all lessons assigned to this class
+        class_required_hours = class_hours.get(cls.class_id, 0)
         
         theoretical_capacity = total_days * daily_hours
         print(f"{cls.name}:")
@@ -140,27 +134,21 @@ def analyze_schedule_feasibility(db_manager):
     
     lesson_structure_issues = []
     
-    for assignment in assignments:
-        cls = next((c for c in classes if c.class_id == assignment.class_id), None)
-        lesson = next((l for l in lessons if l.lesson_id == assignment.lesson_id), None)
-        teacher = next((t for t in teachers if t.teacher_id == assignment.teacher_id), None)
+    for requirement in requirements.assigned():
+        teacher = teachers_by_id.get(requirement.teacher_id)
         
-        if cls and lesson and teacher:
-            weekly_hours = db_manager.get_weekly_hours_for_lesson(lesson.lesson_id, cls.grade)
+        if teacher:
+            weekly_hours = requirement.weekly_hours
             if weekly_hours:
-                print(f"{cls.name} - {lesson.name}: {weekly_hours} saat ({teacher.name})")
+                print(f"{requirement.class_name} - {requirement.lesson_name}: {weekly_hours} saat ({teacher.name})")
                 
                 # Check if this can be scheduled based on teacher availability
-                teacher_available_slots = 0
-                for day in range(total_days):
-                    for hour in range(daily_hours):
-                        if db_manager.is_teacher_available(teacher.teacher_id, day, hour):
-                            teacher_available_slots += 1
+                teacher_available_slots = teacher_available_hours.get(teacher.teacher_id, 0)
                 
                 if weekly_hours > teacher_available_slots:
                     lesson_structure_issues.append({
-                        'class': cls.name,
-                        'lesson': lesson.name,
+                        'class': requirement.class_name,
+                        'lesson': requirement.lesson_name,
                         'teacher': teacher.name,
                         'required': weekly_hours,
                         'available': teacher_available_slots
@@ -182,28 +170,24 @@ def analyze_schedule_feasibility(db_manager):
     # Check for lessons that require block distribution (e.g., 3 hours -> 2+1)
     block_constraint_issues = []
     
-    for assignment in assignments:
-        cls = next((c for c in classes if c.class_id == assignment.class_id), None)
-        lesson = next((l for l in lessons if l.lesson_id == assignment.lesson_id), None)
-        
-        if cls and lesson:
-            weekly_hours = db_manager.get_weekly_hours_for_lesson(lesson.lesson_id, cls.grade)
-            if weekly_hours and weekly_hours > 2:
-                # This lesson likely needs block distribution
-                print(f"{cls.name} - {lesson.name}: {weekly_hours} saat")
-                
-                # Calculate how many different days at least needed
-                # For example: 6 hours might need 3 days (2+2+2), 5 hours might need 3 days (2+2+1)
-                min_days_needed = weekly_hours // 2 + (1 if weekly_hours % 2 > 0 else 0)
-                
-                if min_days_needed > total_days:
-                    block_constraint_issues.append({
-                        'class': cls.name,
-                        'lesson': lesson.name,
-                        'hours': weekly_hours,
-                        'min_days_needed': min_days_needed,
-                        'available_days': total_days
-                    })
+    for requirement in requirements.assigned():
+        weekly_hours = requirement.weekly_hours
+        if weekly_hours > 2:
+            # This lesson likely needs block distribution
+            print(f"{requirement.class_name} - {requirement.lesson_name}: {weekly_hours} saat")
+            
+            # Calculate how many different days at least needed
+            # For example: 6 hours might need 3 days (2+2+2), 5 hours might need 3 days (2+2+1)
+            min_days_needed = len(requirement.block_pattern)
+            
+            if min_days_needed > total_days:
+                block_constraint_issues.append({
+                    'class': requirement.class_name,
+                    'lesson': requirement.lesson_name,
+                    'hours': weekly_hours,
+                    'min_days_needed': min_days_needed,
+                    'available_days': total_days
+                })
     
     if block_constraint_issues:
         print("\nUyarı: Blok kısıtlama sorunları:")
@@ -294,20 +278,15 @@ def suggest_data_improvements(db_manager):
     print("=" * 80)
     
     classes = db_manager.get_all_classes()
-    assignments = db_manager.get_schedule_by_school_type()
+    class_hours = db_manager.get_requirement_table().class_hours()
+    current_schedule = db_manager.get_schedule_program_by_school_type()
     
     # Find classes with lowest filling rates
     class_filling_rates = []
     for cls in classes:
-        cls_assignments = [a for a in assignments if a.class_id == cls.class_id]
-        total_required = 0
-        for assignment in cls_assignments:
-            weekly_hours = db_manager.get_weekly_hours_for_lesson(assignment.lesson_id, cls.grade)
-            if weekly_hours:
-                total_required += weekly_hours
+        total_required = class_hours.get(cls.class_id, 0)
         
         # Get current schedule for this class
-        current_schedule = db_manager.get_schedule_program_by_school_type()
         cls_schedule = [entry for entry in current_schedule if entry.class_id == cls.class_id]
         
         filling_rate = len(cls_schedule) / (5 * 7) * 100 if (5 * 7) > 0 else 0  # 5 days * 7 hours
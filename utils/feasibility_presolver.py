@@ -0,0 +1,305 @@
+# -*- coding: utf-8 -*-
+"""
+Feasibility Presolver - Zamanlayıcıdan önce milisaniyeler içinde yapılabilirlik kontrolü
+Müsaitlik matrisinden öğretmen, sınıf ve gün bazında kapasite sınırlarını çıkarır,
+her sınıf için (öğretmen, slot) arz/talep eşlemesi kurup Hall koşulunu sınar ve
+yapılandırılmış bir yapılamazlık sertifikası döndürür.
+
+Kontroller:
+    teacher_capacity  öğretmenin ders saati > müsait slot sayısı             (hata)
+    class_capacity    sınıfın ders saati > haftalık slot sayısı              (hata)
+    hall              sınıfın bazı öğretmenlerinin toplam saati > bu
+                      öğretmenlerin müsait olduğu farklı slot sayısı         (hata)
+    block_days        bloklar için gereken gün sayısı > öğretmenin müsait günü (uyarı)
+    unassigned        müfredattaki ders için öğretmen atanmamış              (uyarı)
+
+Usage:
+    certificate = FeasibilityPresolver(db_manager).run()
+    if not certificate.feasible:
+        print(certificate.describe())
+"""
+
+import logging
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from algorithms.constants import DAYS_PER_WEEK, SCHOOL_TIME_SLOTS
+
+logger = logging.getLogger(__name__)
+
+SEVERITY_ERROR = "error"
+SEVERITY_WARNING = "warning"
+
+Slot = Tuple[int, int]
+
+
+@dataclass
+class Violation:
+    """One reason the instance cannot (or may not) be scheduled"""
+
+    kind: str
+    severity: str
+    resource_type: str  # "teacher" | "class"
+    resource_id: int
+    resource_name: str
+    demand: int
+    supply: int
+    message: str
+    # Hall ihlalinde ihlali oluşturan öğretmenler
+    teacher_ids: List[int] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass
+class ResourceBounds:
+    """Weekly demand and supply of a teacher or class"""
+
+    demand: int
+    supply: int
+    per_day: List[int]  # müsait slot sayısı, gün başına
+
+    @property
+    def slack(self) -> int:
+        return self.supply - self.demand
+
+
+@dataclass
+class FeasibilityCertificate:
+    """Presolve result: bounds plus the violations found"""
+
+    violations: List[Violation] = field(default_factory=list)
+    teacher_bounds: Dict[int, ResourceBounds] = field(default_factory=dict)
+    class_bounds: Dict[int, ResourceBounds] = field(default_factory=dict)
+    days: int = DAYS_PER_WEEK
+    slots_per_day: int = 8
+    elapsed_ms: float = 0.0
+
+    @property
+    def feasible(self) -> bool:
+        """False when at least one hard violation proves the instance impossible"""
+        return not self.errors()
+
+    def errors(self) -> List[Violation]:
+        return [v for v in self.violations if v.severity == SEVERITY_ERROR]
+
+    def warnings(self) -> List[Violation]:
+        return [v for v in self.violations if v.severity == SEVERITY_WARNING]
+
+    def to_dict(self) -> dict:
+        return {
+            "feasible": self.feasible,
+            "elapsed_ms": round(self.elapsed_ms, 2),
+            "days": self.days,
+            "slots_per_day": self.slots_per_day,
+            "violations": [v.to_dict() for v in self.violations],
+            "teacher_bounds": {tid: asdict(b) for tid, b in self.teacher_bounds.items()},
+            "class_bounds": {cid: asdict(b) for cid, b in self.class_bounds.items()},
+        }
+
+    def describe(self, limit: int = 10) -> str:
+        """Human readable summary (errors first)"""
+        if not self.violations:
+            return "Program yapılabilir görünüyor: kapasite ve Hall kontrolleri geçti."
+        errors, warnings = self.errors(), self.warnings()
+        lines = [
+            f"{len(errors)} hata, {len(warnings)} uyarı"
+            + (" - program bu verilerle oluşturulamaz:" if errors else ":")
+        ]
+        for violation in (errors + warnings)[:limit]:
+            marker = "❌" if violation.severity == SEVERITY_ERROR else "⚠️"
+            lines.append(f"  {marker} {violation.message}")
+        if len(self.violations) > limit:
+            lines.append(f"  ... ve {len(self.violations) - limit} sorun daha")
+        return "\n".join(lines)
+
+
+class FeasibilityPresolver:
+    """Capacity bounds and Hall-condition checks on the curriculum requirements"""
+
+    def __init__(self, db_manager, slots_per_day: Optional[int] = None, days: int = DAYS_PER_WEEK):
+        """
+        Initialize presolver
+
+        Args:
+            db_manager: DatabaseManager instance
+            slots_per_day: Daily lesson slots (default: from the school type)
+            days: School days per week
+        """
+        self.db_manager = db_manager
+        self.days = days
+        if slots_per_day is None:
+            slots_per_day = SCHOOL_TIME_SLOTS.get(db_manager.get_school_type() or "Lise", 8)
+        self.slots_per_day = slots_per_day
+
+    def run(self) -> FeasibilityCertificate:
+        """
+        Compute bounds and check them
+
+        Returns:
+            FeasibilityCertificate
+        """
+        start = time.perf_counter()
+        certificate = FeasibilityCertificate(days=self.days, slots_per_day=self.slots_per_day)
+        requirements = self.db_manager.get_requirement_table()
+        teacher_names = {t.teacher_id: t.name for t in self.db_manager.get_all_teachers()}
+        unavailable = self.db_manager.get_teacher_unavailable_slots()
+        all_slots = [(day, slot) for day in range(self.days) for slot in range(self.slots_per_day)]
+
+        # Talep: (sınıf, öğretmen) başına saat
+        class_teacher_hours: Dict[int, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        class_names: Dict[int, str] = {}
+        for req in requirements:
+            class_names[req.class_id] = req.class_name
+            if not req.is_assigned:
+                certificate.violations.append(
+                    Violation(
+                        "unassigned", SEVERITY_WARNING, "class", req.class_id, req.class_name,
+                        req.weekly_hours, 0, f"{req.class_name} - {req.lesson_name}: öğretmen atanmamış",
+                    )
+                )
+            elif req.weekly_hours > 0:
+                class_teacher_hours[req.class_id][req.teacher_id] += req.weekly_hours
+
+        # Arz: öğretmen başına müsait slotlar
+        available: Dict[int, Set[Slot]] = {}
+        teacher_hours = requirements.teacher_hours()
+        for teacher_id in set(teacher_names) | set(teacher_hours):
+            closed = unavailable.get(teacher_id, set())
+            available[teacher_id] = {slot for slot in all_slots if slot not in closed}
+            per_day = [0] * self.days
+            for day, _ in available[teacher_id]:
+                per_day[day] += 1
+            certificate.teacher_bounds[teacher_id] = ResourceBounds(
+                teacher_hours.get(teacher_id, 0), len(available[teacher_id]), per_day
+            )
+
+        self._check_teachers(certificate, teacher_names)
+        self._check_blocks(certificate, requirements, teacher_names)
+        for class_id, hours_by_teacher in class_teacher_hours.items():
+            name = class_names[class_id]
+            bounds = ResourceBounds(sum(hours_by_teacher.values()), len(all_slots), [self.slots_per_day] * self.days)
+            certificate.class_bounds[class_id] = bounds
+            if bounds.demand > bounds.supply:
+                certificate.violations.append(
+                    Violation(
+                        "class_capacity", SEVERITY_ERROR, "class", class_id, name, bounds.demand, bounds.supply,
+                        f"{name}: {bounds.demand} saat ders, haftada yalnızca {bounds.supply} slot var",
+                    )
+                )
+            else:
+                self._check_hall(certificate, class_id, name, hours_by_teacher, available, teacher_names)
+
+        certificate.elapsed_ms = (time.perf_counter() - start) * 1000
+        logger.info(
+            f"Presolve: {'feasible' if certificate.feasible else 'INFEASIBLE'} "
+            f"({len(certificate.errors())} errors, {len(certificate.warnings())} warnings, "
+            f"{certificate.elapsed_ms:.1f} ms)"
+        )
+        return certificate
+
+    def _check_teachers(self, certificate: FeasibilityCertificate, teacher_names: Dict[int, str]):
+        for teacher_id, bounds in certificate.teacher_bounds.items():
+            if bounds.demand > bounds.supply:
+                name = teacher_names.get(teacher_id, str(teacher_id))
+                certificate.violations.append(
+                    Violation(
+                        "teacher_capacity", SEVERITY_ERROR, "teacher", teacher_id, name, bounds.demand, bounds.supply,
+                        f"{name}: {bounds.demand} saat ders atanmış, yalnızca {bounds.supply} saat müsait",
+                    )
+                )
+
+    def _check_blocks(self, certificate: FeasibilityCertificate, requirements, teacher_names: Dict[int, str]):
+        """Blocks of one lesson go to different days; the teacher must be available on that many days"""
+        for req in requirements.assigned():
+            bounds = certificate.teacher_bounds.get(req.teacher_id)
+            if bounds is None:
+                continue
+            open_days = sum(1 for count in bounds.per_day if count)
+            needed = len(req.block_pattern)
+            if needed > open_days:
+                name = teacher_names.get(req.teacher_id, str(req.teacher_id))
+                certificate.violations.append(
+                    Violation(
+                        "block_days", SEVERITY_WARNING, "teacher", req.teacher_id, name, needed, open_days,
+                        f"{req.class_name} - {req.lesson_name}: {needed} güne bölünmeli, "
+                        f"{name} yalnızca {open_days} gün müsait",
+                    )
+                )
+
+    def _check_hall(
+        self,
+        certificate: FeasibilityCertificate,
+        class_id: int,
+        class_name: str,
+        hours_by_teacher: Dict[int, int],
+        available: Dict[int, Set[Slot]],
+        teacher_names: Dict[int, str],
+    ):
+        """
+        Match the class hours to distinct slots (teacher hours -> slots the teacher is free)
+
+        When the matching falls short, the teachers still reachable from the
+        source in the residual graph form a Hall violator: their hours exceed
+        the number of slots they can use together.
+        """
+        teachers = list(hours_by_teacher)
+        slot_owner: Dict[Slot, int] = {}
+        used: Dict[int, int] = defaultdict(int)
+
+        def augment(teacher_id: int, seen: Set[Slot]) -> bool:
+            for slot in available.get(teacher_id, ()):
+                if slot in seen:
+                    continue
+                seen.add(slot)
+                owner = slot_owner.get(slot)
+                if owner is None or augment(owner, seen):
+                    if owner is not None:
+                        used[owner] -= 1
+                    slot_owner[slot] = teacher_id
+                    used[teacher_id] += 1
+                    return True
+            return False
+
+        for teacher_id in teachers:
+            while used[teacher_id] < hours_by_teacher[teacher_id] and augment(teacher_id, set()):
+                pass
+
+        matched = sum(used.values())
+        demand = sum(hours_by_teacher.values())
+        if matched == demand:
+            return
+
+        # Kalıntı ağda açığı olan öğretmenlerden ulaşılabilen öğretmenler = Hall kümesi
+        violators = {t for t in teachers if used[t] < hours_by_teacher[t]}
+        frontier = list(violators)
+        while frontier:
+            teacher_id = frontier.pop()
+            for slot in available.get(teacher_id, ()):
+                owner = slot_owner.get(slot)
+                if owner is not None and owner not in violators:
+                    violators.add(owner)
+                    frontier.append(owner)
+        # Tek başına kapasitesi yetmeyen öğretmenler zaten teacher_capacity olarak raporlandı
+        over_capacity = {v.resource_id for v in certificate.violations if v.kind == "teacher_capacity"}
+        if violators <= over_capacity:
+            return
+        hours = sum(hours_by_teacher[t] for t in violators)
+        slots = len(set().union(*(available.get(t, set()) for t in violators)))
+        names = ", ".join(sorted(teacher_names.get(t, str(t)) for t in violators))
+        certificate.violations.append(
+            Violation(
+                "hall", SEVERITY_ERROR, "class", class_id, class_name, hours, slots,
+                f"{class_name}: {names} toplam {hours} saat ders veriyor, "
+                f"ama birlikte yalnızca {slots} farklı slotta müsaitler",
+                teacher_ids=sorted(violators),
+            )
+        )
+
+
+def presolve(db_manager, **kwargs) -> FeasibilityCertificate:
+    """Run the presolver with default settings"""
+    return FeasibilityPresolver(db_manager, **kwargs).run()
@@ -187,6 +187,8 @@ class FileManager:
             import shutil
 
             shutil.copy2(filename, self.db_manager.db_path)
+            self.db_manager.invalidate_cache()
+            self.db_manager.schedule.reset_change_logs()
 
             # Reopen database connection
             self.db_manager.get_connection()
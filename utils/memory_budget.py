@@ -0,0 +1,408 @@
+# -*- coding: utf-8 -*-
+"""
+Memory Budget - Zamanlayıcılar için bellek bütçesi yöneticisi
+Süreç RSS'ini gerçek değerinden (psutil veya /proc/self/statm) izler,
+çözücü yapılarının (geri izleme snapshot yığını, yerleştirme geçmişi,
+GA popülasyonu, önbellekler) yaklaşık boyutunu hesaplar ve bütçe aşıldığında
+en az değerli yapılardan başlayarak tahliye eder.
+
+Limit ``config/scheduler_config.yaml`` içindeki ``performance.memory_limit``
+(MB) değeridir. ``trace_allocations`` açıkken her çözüm ``tracemalloc`` ile
+izlenir ve tepe bellek raporlanır.
+
+Usage:
+    from utils.memory_budget import get_memory_budget
+
+    budget = get_memory_budget()
+    budget.register("solution_stack", manager, size_of_stack, drop_old_snapshots, value=1.0)
+    budget.maybe_check()                      # sıcak döngülerde ucuz kontrol
+    with budget.solve("OptimizedCurriculumScheduler") as report:
+        ...
+"""
+
+import gc
+import logging
+import os
+import sys
+import time
+import tracemalloc
+import weakref
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+try:
+    import psutil
+
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+MB = 1024 * 1024
+DEFAULT_MEMORY_LIMIT_MB = 500
+
+# Tahliye RSS bu orana inene kadar sürer (limit × oran)
+LOW_WATER_RATIO = 0.85
+
+logger = logging.getLogger(__name__)
+
+
+def configured_memory_limit() -> float:
+    """``performance.memory_limit`` from the scheduler config (MB)"""
+    try:
+        from config.config_loader import get_config_value
+
+        return float(get_config_value("performance.memory_limit", DEFAULT_MEMORY_LIMIT_MB))
+    except Exception as e:  # yaml/cerberus yoksa veya dosya okunamıyorsa varsayılan
+        logger.debug(f"Memory limit not read from config: {e}")
+        return float(DEFAULT_MEMORY_LIMIT_MB)
+
+
+_process = None
+
+
+def current_rss_mb() -> Optional[float]:
+    """
+    Current resident set size of this process in MB
+
+    Uses psutil when installed, /proc/self/statm on Linux otherwise.
+    Returns None when neither is available.
+    """
+    global _process
+    if PSUTIL_AVAILABLE:
+        if _process is None:
+            _process = psutil.Process(os.getpid())
+        return _process.memory_info().rss / MB
+    try:
+        with open("/proc/self/statm", "r") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / MB
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def estimate_size(obj: Any, sample: int = 32, depth: int = 4) -> int:
+    """
+    Approximate deep size of ``obj`` in bytes
+
+    Large containers are sampled: the first ``sample`` items are measured and
+    the average is extrapolated, so the cost stays bounded for big structures.
+
+    Args:
+        obj: Object to measure
+        sample: Items measured per container
+        depth: Maximum nesting followed
+    """
+    size = sys.getsizeof(obj)
+    if depth <= 0 or isinstance(obj, (str, bytes, int, float, bool, type(None))):
+        return size
+
+    if isinstance(obj, dict):
+        items = list(obj.items())[:sample]
+        measured = sum(estimate_size(k, sample, depth - 1) + estimate_size(v, sample, depth - 1) for k, v in items)
+        count = len(obj)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        items = list(obj)[:sample] if not isinstance(obj, (list, tuple)) else obj[:sample]
+        measured = sum(estimate_size(item, sample, depth - 1) for item in items)
+        count = len(obj)
+    else:
+        attributes = getattr(obj, "__dict__", None)
+        if attributes is not None:
+            return size + estimate_size(attributes, sample, depth - 1)
+        slots = getattr(type(obj), "__slots__", ())
+        return size + sum(estimate_size(getattr(obj, s, None), sample, depth - 1) for s in slots)
+
+    if not items:
+        return size
+    return size + int(measured / len(items) * count)
+
+
+@dataclass
+class TrackedStructure:
+    """A solver structure the budget may shrink"""
+
+    name: str
+    owner: "weakref.ReferenceType"
+    sizer: Callable[[Any], int]  # sizer(owner) -> bytes
+    evictor: Callable[[Any, int], int]  # evictor(owner, bytes_to_free) -> bytes freed
+    value: float = 1.0  # lower value → evicted first
+
+    def size(self) -> int:
+        owner = self.owner()
+        return self.sizer(owner) if owner is not None else 0
+
+    def evict(self, target_bytes: int) -> int:
+        owner = self.owner()
+        if owner is None:
+            return 0
+        return max(0, int(self.evictor(owner, target_bytes) or 0))
+
+
+@dataclass
+class MemoryReport:
+    """Memory figures of one solve"""
+
+    name: str
+    limit_mb: float
+    rss_start_mb: Optional[float] = None
+    rss_end_mb: Optional[float] = None
+    peak_rss_mb: Optional[float] = None
+    traced_peak_mb: Optional[float] = None
+    evicted_mb: float = 0.0
+    evictions: Dict[str, int] = field(default_factory=dict)
+    duration: float = 0.0
+
+    @property
+    def over_budget(self) -> bool:
+        return self.peak_rss_mb is not None and self.peak_rss_mb > self.limit_mb
+
+    def describe(self) -> str:
+        def fmt(value):
+            return f"{value:.1f} MB" if value is not None else "n/a"
+
+        parts = [
+            f"{self.name}: peak RSS {fmt(self.peak_rss_mb)} (limit {self.limit_mb:.0f} MB)",
+            f"RSS {fmt(self.rss_start_mb)} → {fmt(self.rss_end_mb)}",
+        ]
+        if self.traced_peak_mb is not None:
+            parts.append(f"tracemalloc peak {fmt(self.traced_peak_mb)}")
+        if self.evictions:
+            evicted = ", ".join(f"{name}×{count}" for name, count in sorted(self.evictions.items()))
+            parts.append(f"evicted {self.evicted_mb:.1f} MB ({evicted})")
+        return ", ".join(parts)
+
+    def to_dict(self) -> Dict:
+        return {
+            "name": self.name,
+            "limit_mb": self.limit_mb,
+            "rss_start_mb": self.rss_start_mb,
+            "rss_end_mb": self.rss_end_mb,
+            "peak_rss_mb": self.peak_rss_mb,
+            "traced_peak_mb": self.traced_peak_mb,
+            "evicted_mb": round(self.evicted_mb, 3),
+            "evictions": dict(self.evictions),
+            "duration": round(self.duration, 4),
+        }
+
+
+class MemoryBudget:
+    """
+    Keeps the process under ``limit_mb`` by shrinking registered structures
+
+    Structures are held through a weak reference to their owner, so a
+    finished scheduler drops out of the budget by itself. When RSS exceeds
+    the limit, structures are evicted in ascending ``value`` order until RSS
+    (estimated from the freed bytes) is back under ``limit × LOW_WATER_RATIO``.
+    """
+
+    def __init__(self, limit_mb: Optional[float] = None, check_interval: int = 256, trace_allocations: bool = False):
+        """
+        Args:
+            limit_mb: RSS limit in MB (default: ``performance.memory_limit``)
+            check_interval: ``maybe_check`` calls between two RSS reads
+            trace_allocations: Trace every solve with tracemalloc (slows solving down)
+        """
+        self.limit_mb = float(limit_mb) if limit_mb is not None else configured_memory_limit()
+        self.check_interval = max(1, check_interval)
+        self.trace_allocations = trace_allocations
+        self.rss_reader: Callable[[], Optional[float]] = current_rss_mb
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._structures: Dict[tuple, TrackedStructure] = {}
+        self._calls = 0
+        self._observed_peak_mb: Optional[float] = None
+        self.eviction_totals: Dict[str, List[int]] = {}  # name -> [evictions, bytes]
+        self.last_report: Optional[MemoryReport] = None
+
+    def configure(self, limit_mb: Optional[float] = None, trace_allocations: Optional[bool] = None):
+        """Change the limit and/or tracemalloc tracing"""
+        if limit_mb is not None:
+            self.limit_mb = float(limit_mb)
+        if trace_allocations is not None:
+            self.trace_allocations = trace_allocations
+
+    # ------------------------------------------------------------------
+    # Kayıt
+    # ------------------------------------------------------------------
+
+    def register(
+        self,
+        name: str,
+        owner: Any,
+        sizer: Callable[[Any], int],
+        evictor: Callable[[Any, int], int],
+        value: float = 1.0,
+    ) -> TrackedStructure:
+        """
+        Track a structure owned by ``owner``
+
+        ``sizer`` and ``evictor`` receive the owner as first argument; they
+        must not capture it, otherwise the owner never becomes unreachable.
+
+        Args:
+            name: Structure name (reports)
+            owner: Object holding the structure (held weakly)
+            sizer: Returns the structure size in bytes
+            evictor: Frees about the given number of bytes, returns bytes freed
+            value: Keep priority; lower values are evicted first
+        """
+        key = (name, id(owner))
+        ref = weakref.ref(owner, lambda _ref, key=key: self._structures.pop(key, None))
+        structure = TrackedStructure(name, ref, sizer, evictor, value)
+        self._structures[key] = structure
+        return structure
+
+    def register_history(self, name: str, owner: Any, attribute: str, value: float = 0.5, keep: int = 1) -> TrackedStructure:
+        """
+        Track a list attribute of ``owner`` whose oldest items are evicted first
+
+        Args:
+            name: Structure name (reports)
+            owner: Object holding the list
+            attribute: Name of the list attribute
+            value: Keep priority
+            keep: Newest items that are never evicted
+        """
+
+        def sizer(obj) -> int:
+            return estimate_size(getattr(obj, attribute, None) or [])
+
+        def evictor(obj, target_bytes: int) -> int:
+            items = getattr(obj, attribute, None) or []
+            if len(items) <= keep:
+                return 0
+            per_item = max(1, estimate_size(items) // len(items))
+            count = min(len(items) - keep, -(-target_bytes // per_item))
+            del items[:count]
+            return count * per_item
+
+        return self.register(name, owner, sizer, evictor, value)
+
+    def unregister(self, owner: Any, name: Optional[str] = None):
+        """Stop tracking the structures of ``owner`` (only ``name`` if given)"""
+        for key in [k for k in self._structures if k[1] == id(owner) and (name is None or k[0] == name)]:
+            self._structures.pop(key, None)
+
+    def structures(self) -> List[TrackedStructure]:
+        """Live structures, least valuable first"""
+        return sorted(
+            (s for s in list(self._structures.values()) if s.owner() is not None), key=lambda s: s.value
+        )
+
+    def tracked_bytes(self) -> Dict[str, int]:
+        """Estimated size per structure name"""
+        sizes: Dict[str, int] = {}
+        for structure in self.structures():
+            sizes[structure.name] = sizes.get(structure.name, 0) + structure.size()
+        return sizes
+
+    # ------------------------------------------------------------------
+    # Kontrol ve tahliye
+    # ------------------------------------------------------------------
+
+    def rss_mb(self) -> Optional[float]:
+        """Current RSS (MB), also updating the observed peak"""
+        rss = self.rss_reader()
+        if rss is not None and (self._observed_peak_mb is None or rss > self._observed_peak_mb):
+            self._observed_peak_mb = rss
+        return rss
+
+    def over_budget(self) -> bool:
+        rss = self.rss_mb()
+        return rss is not None and rss > self.limit_mb
+
+    def maybe_check(self) -> int:
+        """Cheap hot-loop hook: enforces the budget every ``check_interval`` calls"""
+        self._calls += 1
+        if self._calls % self.check_interval:
+            return 0
+        return self.enforce()
+
+    def enforce(self) -> int:
+        """
+        Evict structures while RSS is above the limit
+
+        Returns:
+            Estimated bytes freed
+        """
+        rss = self.rss_mb()
+        if rss is None or rss <= self.limit_mb:
+            return 0
+
+        target = int((rss - self.limit_mb * LOW_WATER_RATIO) * MB)
+        freed = 0
+        for structure in self.structures():
+            if freed >= target:
+                break
+            size = structure.size()
+            if size <= 0:
+                continue
+            released = structure.evict(min(size, target - freed))
+            if released:
+                freed += released
+                totals = self.eviction_totals.setdefault(structure.name, [0, 0])
+                totals[0] += 1
+                totals[1] += released
+                self.logger.debug(f"Evicted {released / MB:.2f} MB from {structure.name}")
+
+        if freed:
+            gc.collect()
+            self.logger.warning(
+                f"Memory budget exceeded ({rss:.1f} MB > {self.limit_mb:.0f} MB): evicted ~{freed / MB:.1f} MB"
+            )
+        else:
+            self.logger.debug(f"Memory budget exceeded ({rss:.1f} MB > {self.limit_mb:.0f} MB): nothing to evict")
+        return freed
+
+    # ------------------------------------------------------------------
+    # Raporlama
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def solve(self, name: str) -> Iterator[MemoryReport]:
+        """
+        Measure one solve: RSS before/after, peak RSS and (optionally) the
+        tracemalloc peak; the report is logged and kept in ``last_report``
+        """
+        started_tracing = False
+        if self.trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            started_tracing = True
+        elif tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+
+        evicted_before = {name: tuple(totals) for name, totals in self.eviction_totals.items()}
+        self._observed_peak_mb = None
+        report = MemoryReport(name, self.limit_mb, rss_start_mb=self.rss_mb())
+        start = time.perf_counter()
+        try:
+            yield report
+        finally:
+            report.duration = time.perf_counter() - start
+            if tracemalloc.is_tracing():
+                report.traced_peak_mb = tracemalloc.get_traced_memory()[1] / MB
+                if started_tracing:
+                    tracemalloc.stop()
+            report.rss_end_mb = self.rss_mb()
+            report.peak_rss_mb = self._observed_peak_mb
+            for name, (count, evicted) in self.eviction_totals.items():
+                before_count, before_bytes = evicted_before.get(name, (0, 0))
+                if count > before_count:
+                    report.evictions[name] = count - before_count
+                    report.evicted_mb += (evicted - before_bytes) / MB
+            self.last_report = report
+            if report.over_budget or report.evictions:
+                self.logger.warning(report.describe())
+            else:
+                self.logger.info(report.describe())
+
+
+# Global instance
+_memory_budget = None
+
+
+def get_memory_budget() -> MemoryBudget:
+    """Get global memory budget instance"""
+    global _memory_budget
+    if _memory_budget is None:
+        _memory_budget = MemoryBudget()
+    return _memory_budget
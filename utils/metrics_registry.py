@@ -0,0 +1,514 @@
+# -*- coding: utf-8 -*-
+"""
+Metrics Registry - Prometheus/OpenMetrics uyumlu metrik kaydı
+Sayaç (counter), gösterge (gauge) ve histogramları tutar; OpenMetrics metin
+formatında bir HTTP uç noktası veya textfile olarak dışa aktarır.
+
+Usage:
+    from utils.metrics_registry import get_registry, track_solve
+
+    with track_solve("OptimizedCurriculumScheduler") as solve:
+        entries = scheduler.generate_schedule()
+        solve.observe_scheduler(scheduler, entries)
+
+    get_registry().serve(port=9464)            # http://127.0.0.1:9464/metrics
+    get_registry().write_textfile("scheduler.prom")
+"""
+
+import bisect
+import logging
+import math
+import os
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Saniye cinsinden gecikme kovaları
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SOLVE_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for v in values)
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(names, escaped)) + "}"
+
+
+class _Metric:
+    """Base for a metric family with fixed label names"""
+
+    TYPE = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children: Dict[LabelValues, object] = {}
+
+    def labels(self, *values, **kwargs):
+        """Child metric for one label combination"""
+        if kwargs:
+            values = tuple(str(kwargs[name]) for name in self.labelnames)
+        else:
+            values = tuple(str(value) for value in values)
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _default(self):
+        return self.labels()
+
+    def _samples(self) -> Iterator[Tuple[str, Tuple, LabelValues, float]]:
+        """(sample suffix, extra labels, label values, value) for every sample"""
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# TYPE {self.name} {self.TYPE}", f"# HELP {self.name} {self.documentation}"]
+        for suffix, extra, labelvalues, value in self._samples():
+            names = self.labelnames + tuple(name for name, _ in extra)
+            values = labelvalues + tuple(v for _, v in extra)
+            lines.append(f"{self.name}{suffix}{_format_labels(names, values)} {_format_value(value)}")
+        return lines
+
+
+class _CounterChild:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        with self._lock:
+            self.value += amount
+
+
+class Counter(_Metric):
+    """Monotonic counter (exposed as <name>_total)"""
+
+    TYPE = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self._default().inc(amount)
+
+    def _samples(self):
+        for labels, child in list(self._children.items()):
+            yield "_total", (), labels, child.value
+
+
+class _GaugeChild:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value: float):
+        self.value = float(value)
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+
+    TYPE = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float):
+        self._default().set(value)
+
+    def _samples(self):
+        for labels, child in list(self._children.items()):
+            yield "", (), labels, child.value
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum", "_lock")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last = +Inf
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    @contextmanager
+    def time(self):
+        """Observe the duration of the enclosed block in seconds"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+
+class Histogram(_Metric):
+    """Cumulative histogram with fixed bucket bounds"""
+
+    TYPE = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self._default().observe(value)
+
+    def _samples(self):
+        for labels, child in list(self._children.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), child.counts):
+                cumulative += count
+                le = "+Inf" if math.isinf(bound) else repr(float(bound))
+                yield "_bucket", (("le", le),), labels, cumulative
+            yield "_count", (), labels, cumulative
+            yield "_sum", (), labels, child.sum
+
+
+class MetricsRegistry:
+    """
+    Process-wide collection of metric families
+
+    Metrics are created on first use (``counter()``/``gauge()``/``histogram()``
+    return the existing family for a known name). Callbacks registered with
+    ``register_callback`` run at scrape time to refresh derived gauges.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._metrics: Dict[str, _Metric] = {}
+        self._callbacks: List[Callable[["MetricsRegistry"], None]] = []
+        self._lock = threading.Lock()
+        self._server: Optional["ThreadingHTTPServer"] = None
+        self.textfile_path: Optional[str] = None
+
+    def _get_or_create(self, cls, name: str, documentation: str, labelnames: Sequence[str], **kwargs):
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(name)
+                if metric is None:
+                    metric = cls(name, documentation, labelnames, **kwargs)
+                    self._metrics[name] = metric
+        if not isinstance(metric, cls):
+            raise ValueError(f"Metric {name} already registered as {metric.TYPE}")
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def register_callback(self, callback: Callable[["MetricsRegistry"], None]):
+        """Run ``callback(registry)`` before every render"""
+        self._callbacks.append(callback)
+
+    def render(self) -> str:
+        """All metrics in OpenMetrics text format"""
+        for callback in list(self._callbacks):
+            try:
+                callback(self)
+            except Exception as e:
+                self.logger.warning(f"Metrics callback failed: {e}")
+        lines = []
+        for name in sorted(self._metrics):
+            lines.extend(self._metrics[name].render())
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: Optional[str] = None) -> Optional[str]:
+        """
+        Write the exposition atomically (for textfile collectors)
+
+        Args:
+            path: Target file (default: ``textfile_path``)
+
+        Returns:
+            Written path, or None if no path is configured
+        """
+        path = path or self.textfile_path
+        if not path:
+            return None
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+        return path
+
+    def serve(self, port: int = 9464, host: str = "127.0.0.1") -> "ThreadingHTTPServer":
+        """
+        Serve ``/metrics`` from a daemon thread
+
+        Returns:
+            The running server (``server.server_address`` has the bound port)
+        """
+        if self._server is not None:
+            return self._server
+        # http.server yalnızca uç nokta açılınca yüklenir (açılış süresi)
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                registry.logger.debug("metrics scrape: " + format % args)
+
+        self._server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=self._server.serve_forever, name="MetricsServer", daemon=True).start()
+        self.logger.info(f"Metrics endpoint: http://{host}:{self._server.server_address[1]}/metrics")
+        return self._server
+
+    def shutdown(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+# Global instance
+_global_registry = MetricsRegistry()
+
+
+def get_registry() -> MetricsRegistry:
+    """Get global metrics registry instance"""
+    return _global_registry
+
+
+# ----------------------------------------------------------------------
+# Scheduler metrics
+# ----------------------------------------------------------------------
+
+
+@dataclass
+class SolveObservation:
+    """Result of one scheduler run, filled in inside ``track_solve``"""
+
+    algorithm: str
+    outcome: str = "success"
+    duration: float = 0.0
+    placements: int = 0
+    required_hours: int = 0
+    backtracks: int = 0
+
+    @property
+    def coverage(self) -> Optional[float]:
+        """Placed / required hours (None if the requirement is unknown)"""
+        if self.required_hours <= 0:
+            return None
+        return min(1.0, self.placements / self.required_hours)
+
+    def observe_scheduler(self, scheduler, entries: Sequence) -> "SolveObservation":
+        """
+        Fill in placements, coverage and backtracks from a finished scheduler
+
+        Uses ``target_hours`` and ``backtrack_manager`` statistics when the
+        scheduler has them.
+        """
+        self.placements = len(entries)
+        self.required_hours = int(getattr(scheduler, "target_hours", 0) or 0)
+        backtrack_manager = getattr(scheduler, "backtrack_manager", None)
+        if backtrack_manager is not None:
+            self.backtracks = int(backtrack_manager.get_statistics().get("total_backtracks", 0))
+        return self
+
+
+def record_solve(observation: SolveObservation, registry: Optional[MetricsRegistry] = None):
+    """Publish one scheduler run"""
+    registry = registry or _global_registry
+    algorithm = observation.algorithm
+
+    registry.histogram(
+        "scheduler_solve_duration_seconds", "Schedule generation latency", ["algorithm"], buckets=SOLVE_BUCKETS
+    ).labels(algorithm).observe(observation.duration)
+    registry.counter("scheduler_runs", "Schedule generation runs", ["algorithm", "outcome"]).labels(
+        algorithm, observation.outcome
+    ).inc()
+    registry.counter("scheduler_placements", "Lesson hours placed", ["algorithm"]).labels(algorithm).inc(
+        observation.placements
+    )
+    registry.counter("scheduler_backtracks", "Backtracking steps", ["algorithm"]).labels(algorithm).inc(
+        observation.backtracks
+    )
+    registry.gauge(
+        "scheduler_placements_per_second", "Placement rate of the last run", ["algorithm"]
+    ).labels(algorithm).set(observation.placements / observation.duration if observation.duration > 0 else 0.0)
+    if observation.coverage is not None:
+        registry.gauge("scheduler_coverage_ratio", "Placed / required hours of the last run", ["algorithm"]).labels(
+            algorithm
+        ).set(observation.coverage)
+    registry.gauge(
+        "scheduler_last_run_timestamp_seconds", "Unix time the last run finished", ["algorithm"]
+    ).labels(algorithm).set(time.time())
+
+    if registry.textfile_path:
+        try:
+            registry.write_textfile()
+        except OSError as e:
+            registry.logger.warning(f"Failed to write metrics textfile: {e}")
+
+
+@contextmanager
+def track_solve(algorithm: str, registry: Optional[MetricsRegistry] = None) -> Iterator[SolveObservation]:
+    """
+    Time a scheduler run and publish it on exit
+
+    An exception marks the run as ``outcome="error"`` and is re-raised.
+    """
+    observation = SolveObservation(algorithm)
+    start = time.perf_counter()
+    try:
+        yield observation
+    except BaseException:
+        observation.outcome = "error"
+        raise
+    finally:
+        observation.duration = time.perf_counter() - start
+        record_solve(observation, registry)
+
+
+def db_query_histogram(registry: Optional[MetricsRegistry] = None) -> Histogram:
+    """Latency of repository queries by repository and method"""
+    return (registry or _global_registry).histogram(
+        "db_query_duration_seconds", "Database query latency", ["repository", "method"]
+    )
+
+
+def track_cache(name: str, cache, registry: Optional[MetricsRegistry] = None):
+    """
+    Export hit/miss gauges for a cache with ``get_stats()`` ('hits', 'misses')
+
+    The cache is held weakly; gauges stop updating once it is gone.
+    """
+    registry = registry or _global_registry
+    cache_ref = weakref.ref(cache)
+
+    def refresh(reg: MetricsRegistry):
+        current = cache_ref()
+        if current is None:
+            return
+        stats = current.get_stats()
+        hits, misses = stats.get("hits", 0), stats.get("misses", 0)
+        reg.gauge("cache_hits", "Cache hits since the last clear", ["cache"]).labels(name).set(hits)
+        reg.gauge("cache_misses", "Cache misses since the last clear", ["cache"]).labels(name).set(misses)
+        reg.gauge("cache_hit_ratio", "Cache hits / lookups", ["cache"]).labels(name).set(
+            hits / (hits + misses) if hits + misses else 0.0
+        )
+
+    registry.register_callback(refresh)
+
+
+def performance_summary(registry: Optional[MetricsRegistry] = None) -> Dict:
+    """
+    Aggregated scheduler/DB figures for the analytics dashboard
+
+    Returns:
+        Dict with avg_algorithm_runtime (s), total_generations, success_rate (%),
+        last_generation_time, avg_db_query_ms, placements_per_second and
+        cache_hit_ratio (%), all derived from the live registry
+    """
+    registry = registry or _global_registry
+    registry.render()  # refresh callback gauges
+
+    def children(name):
+        metric = registry.get(name)
+        return list(metric._children.items()) if metric else []
+
+    solve = children("scheduler_solve_duration_seconds")
+    solve_count = sum(child.count for _, child in solve)
+    solve_sum = sum(child.sum for _, child in solve)
+
+    runs = children("scheduler_runs")
+    total_runs = sum(child.value for _, child in runs)
+    successes = sum(child.value for labels, child in runs if labels[1] == "success")
+
+    last_run = max((child.value for _, child in children("scheduler_last_run_timestamp_seconds")), default=0.0)
+
+    db = children("db_query_duration_seconds")
+    db_count = sum(child.count for _, child in db)
+    db_sum = sum(child.sum for _, child in db)
+
+    rates = [child.value for _, child in children("scheduler_placements_per_second")]
+    hits = sum(child.value for _, child in children("cache_hits"))
+    misses = sum(child.value for _, child in children("cache_misses"))
+
+    return {
+        "avg_algorithm_runtime": solve_sum / solve_count if solve_count else 0.0,
+        "total_generations": int(total_runs),
+        "success_rate": successes / total_runs * 100 if total_runs else 0.0,
+        "last_generation_time": (
+            time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(last_run)) if last_run else "-"
+        ),
+        "avg_db_query_ms": db_sum / db_count * 1000 if db_count else 0.0,
+        "db_queries": db_count,
+        "placements_per_second": max(rates, default=0.0),
+        "cache_hit_ratio": hits / (hits + misses) * 100 if hits + misses else 0.0,
+    }
@@ -0,0 +1,373 @@
+# -*- coding: utf-8 -*-
+"""
+Performance Gate - Kayıtlı baseline'lara karşı performans regresyon kontrolü
+Senaryoları tekrar tekrar ölçer, medyan süreyi baseline JSON'daki medyanla
+karşılaştırır ve tolerans + gürültü (MAD) eşiğini aşan yavaşlamaları
+regresyon olarak işaretler.
+
+Usage:
+    from utils.perf_gate import BaselineStore, PerfGate
+
+    gate = PerfGate(BaselineStore("tests/perf_baselines.json"), tolerance=0.3)
+    verdict = gate.check("generation", "OptimizedCurriculumScheduler", run_once, repeat=5)
+    assert not verdict.failed, verdict.describe()
+
+    # Soğuk açılış: her ölçüm yeni bir ``python -X importtime`` süreci
+    verdict = gate.record("cold_start", "algorithms.scheduler", measure_import("algorithms.scheduler"))
+"""
+
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Normal dağılım için MAD → standart sapma çarpanı
+MAD_TO_SIGMA = 1.4826
+
+STATUS_OK = "ok"
+STATUS_REGRESSION = "regression"
+STATUS_IMPROVED = "improved"
+STATUS_NEW = "new"
+
+
+def machine_fingerprint() -> str:
+    """Identifies the machine a baseline was recorded on"""
+    return f"{platform.system()}-{platform.machine()}-py{platform.python_version()}-cpu{os.cpu_count()}"
+
+
+@dataclass
+class Timing:
+    """Wall-clock samples of one scenario (seconds)"""
+
+    samples: List[float]
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.samples)
+
+    @property
+    def mad(self) -> float:
+        """Median absolute deviation"""
+        median = self.median
+        return statistics.median(abs(s - median) for s in self.samples)
+
+    @property
+    def minimum(self) -> float:
+        return min(self.samples)
+
+    def to_dict(self) -> Dict:
+        return {
+            "median_s": round(self.median, 6),
+            "mad_s": round(self.mad, 6),
+            "min_s": round(self.minimum, 6),
+            "samples": [round(s, 6) for s in self.samples],
+        }
+
+
+def measure(func: Callable[[], object], repeat: int = 5, warmup: int = 1) -> Timing:
+    """
+    Time ``func`` ``repeat`` times after ``warmup`` untimed calls
+
+    Args:
+        func: Zero-argument callable running one scenario
+        repeat: Timed runs
+        warmup: Untimed runs (imports, caches, SQLite page cache)
+    """
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return Timing(samples)
+
+
+IMPORTTIME_MARKER = "--perf-gate-import--"
+
+
+@dataclass
+class ImportProfile:
+    """``python -X importtime`` breakdown of one cold import (seconds)"""
+
+    module: str
+    total: float
+    # modül -> (kendi süresi, kümülatif süre), ilk içe aktarıldığı sırayla
+    modules: Dict[str, Tuple[float, float]] = field(default_factory=dict)
+
+    def loaded(self, prefix: str) -> List[str]:
+        """Imported modules equal to ``prefix`` or inside the ``prefix`` package"""
+        return [name for name in self.modules if name == prefix or name.startswith(prefix + ".")]
+
+    def top(self, n: int = 10, cumulative: bool = False) -> List[Tuple[str, float, float]]:
+        """The ``n`` slowest modules by self (or cumulative) time"""
+        index = 1 if cumulative else 0
+        ranked = sorted(self.modules.items(), key=lambda item: item[1][index], reverse=True)
+        return [(name, own, total) for name, (own, total) in ranked[:n]]
+
+    def to_dict(self, top: int = 15) -> Dict:
+        return {
+            "module": self.module,
+            "total_s": round(self.total, 6),
+            "modules_imported": len(self.modules),
+            "top_self": [
+                {"module": name, "self_s": round(own, 6), "cumulative_s": round(total, 6)}
+                for name, own, total in self.top(top)
+            ],
+        }
+
+
+def parse_importtime(output: str, module: str) -> ImportProfile:
+    """
+    Parse ``-X importtime`` stderr output
+
+    Only lines after ``IMPORTTIME_MARKER`` count, so interpreter start-up
+    (site, encodings) is left out. The total is the sum of the cumulative
+    times of the top-level imports.
+    """
+    lines = output.splitlines()
+    if IMPORTTIME_MARKER in lines:
+        lines = lines[lines.index(IMPORTTIME_MARKER) + 1:]
+    profile = ImportProfile(module, 0.0)
+    for line in lines:
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        try:
+            own, cumulative, name = line[len("import time:"):].split("|", 2)
+            own_s, cumulative_s = int(own) / 1e6, int(cumulative) / 1e6
+        except ValueError:
+            continue
+        if not name[1:].startswith(" "):  # en üst seviye içe aktarma
+            profile.total += cumulative_s
+        profile.modules[name.strip()] = (own_s, cumulative_s)
+    return profile
+
+
+def profile_import(module: str, python: Optional[str] = None, cwd: Optional[str] = None, timeout: float = 120.0) -> ImportProfile:
+    """
+    Import ``module`` in a fresh interpreter with ``-X importtime``
+
+    Args:
+        module: Dotted module name
+        python: Interpreter (default: the current one)
+        cwd: Working directory, put first on ``sys.path`` (default: current directory)
+        timeout: Seconds before the child is killed
+
+    Raises:
+        ImportError: The module cannot be imported
+    """
+    code = f"import sys; print({IMPORTTIME_MARKER!r}, file=sys.stderr, flush=True); import {module}"
+    result = subprocess.run(
+        [python or sys.executable, "-X", "importtime", "-c", code],
+        cwd=cwd, capture_output=True, text=True, timeout=timeout,
+    )
+    if result.returncode != 0:
+        last = result.stderr.strip().splitlines()[-1:] or ["?"]
+        raise ImportError(f"import {module} failed: {last[0]}")
+    return parse_importtime(result.stderr, module)
+
+
+def measure_import(module: str, repeat: int = 5, **kwargs) -> Timing:
+    """Cold import time of ``module`` over ``repeat`` fresh processes"""
+    return Timing([profile_import(module, **kwargs).total for _ in range(max(1, repeat))])
+
+
+@dataclass
+class Verdict:
+    """Comparison of one scenario against its baseline"""
+
+    scenario: str
+    algorithm: str
+    timing: Timing
+    baseline_median: Optional[float] = None
+    allowed: Optional[float] = None
+    status: str = STATUS_NEW
+    enforced: bool = True
+
+    @property
+    def key(self) -> str:
+        return scenario_key(self.scenario, self.algorithm)
+
+    @property
+    def delta_pct(self) -> Optional[float]:
+        if not self.baseline_median:
+            return None
+        return (self.timing.median - self.baseline_median) / self.baseline_median * 100
+
+    @property
+    def failed(self) -> bool:
+        return self.status == STATUS_REGRESSION and self.enforced
+
+    def describe(self) -> str:
+        median_ms = self.timing.median * 1000
+        if self.baseline_median is None:
+            return f"{self.key}: {median_ms:.1f} ms (no baseline)"
+        note = "" if self.enforced else " [baseline from another machine, not enforced]"
+        return (
+            f"{self.key}: {median_ms:.1f} ms vs baseline {self.baseline_median * 1000:.1f} ms "
+            f"({self.delta_pct:+.1f}%, limit {self.allowed * 1000:.1f} ms) → {self.status}{note}"
+        )
+
+    def to_dict(self) -> Dict:
+        return {
+            "scenario": self.scenario,
+            "algorithm": self.algorithm,
+            "status": self.status,
+            "enforced": self.enforced,
+            "median_s": round(self.timing.median, 6),
+            "baseline_median_s": self.baseline_median,
+            "allowed_s": round(self.allowed, 6) if self.allowed is not None else None,
+            "delta_pct": round(self.delta_pct, 2) if self.delta_pct is not None else None,
+            "samples": self.timing.to_dict()["samples"],
+        }
+
+
+def scenario_key(scenario: str, algorithm: str) -> str:
+    return f"{scenario}[{algorithm}]"
+
+
+class BaselineStore:
+    """
+    Baseline timings persisted as JSON
+
+    Layout: ``{"machine": ..., "updated": ..., "scenarios": {key: Timing.to_dict()}}``
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.machine: Optional[str] = None
+        self.scenarios: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.machine = data.get("machine")
+            self.scenarios = data.get("scenarios", {})
+        except (OSError, ValueError) as e:
+            logging.getLogger(__name__).warning(f"Could not read performance baselines {self.path}: {e}")
+
+    def get(self, key: str) -> Optional[Dict]:
+        return self.scenarios.get(key)
+
+    def update(self, key: str, timing: Timing):
+        with self._lock:
+            self.scenarios[key] = timing.to_dict()
+            self.machine = machine_fingerprint()
+
+    def save(self):
+        data = {
+            "machine": self.machine or machine_fingerprint(),
+            "updated": datetime.now().isoformat(timespec="seconds"),
+            "scenarios": dict(sorted(self.scenarios.items())),
+        }
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+
+
+@dataclass
+class PerfGate:
+    """
+    Measures scenarios and compares them with stored baselines
+
+    A run regresses when its median exceeds
+    ``baseline + max(tolerance × baseline, mad_factor × σ, min_delta)``, where σ
+    is the noise estimate (MAD × 1.4826) of baseline and current samples.
+    Regressions are only enforced when the baseline was recorded on the same
+    kind of machine, unless ``strict`` is set.
+    """
+
+    store: BaselineStore
+    tolerance: float = 0.30
+    mad_factor: float = 4.0
+    min_delta: float = 0.005  # seconds; sub-millisecond jitter is never a regression
+    update: bool = False
+    strict: bool = False
+    verdicts: List[Verdict] = field(default_factory=list)
+
+    def check(self, scenario: str, algorithm: str, func: Callable[[], object], repeat: int = 5, warmup: int = 1) -> Verdict:
+        """
+        Measure one scenario and compare it with its baseline
+
+        Args:
+            scenario: Scenario name (generation, validation, export, ...)
+            algorithm: Variant inside the scenario (scheduler class, exporter)
+            func: Zero-argument callable running the scenario once
+            repeat: Timed runs
+            warmup: Untimed runs
+
+        Returns:
+            Verdict (also kept in ``verdicts`` for the session report)
+        """
+        return self.record(scenario, algorithm, measure(func, repeat, warmup))
+
+    def record(self, scenario: str, algorithm: str, timing: Timing) -> Verdict:
+        """Compare an already measured timing (e.g. ``measure_import``) and keep the verdict"""
+        verdict = self.compare(scenario, algorithm, timing)
+        if self.update:
+            self.store.update(verdict.key, timing)
+        self.verdicts.append(verdict)
+        return verdict
+
+    def compare(self, scenario: str, algorithm: str, timing: Timing) -> Verdict:
+        baseline = self.store.get(scenario_key(scenario, algorithm))
+        verdict = Verdict(scenario, algorithm, timing)
+        if baseline is None:
+            return verdict
+
+        base = baseline["median_s"]
+        noise = MAD_TO_SIGMA * max(baseline.get("mad_s", 0.0), timing.mad)
+        margin = max(self.tolerance * base, self.mad_factor * noise, self.min_delta)
+        verdict.baseline_median = base
+        verdict.allowed = base + margin
+        if timing.median > base + margin:
+            verdict.status = STATUS_REGRESSION
+        elif timing.median < base - margin:
+            verdict.status = STATUS_IMPROVED
+        else:
+            verdict.status = STATUS_OK
+        verdict.enforced = self.strict or self.store.machine in (None, machine_fingerprint())
+        return verdict
+
+    def finish(self):
+        """Persist updated baselines (only with ``update``)"""
+        if self.update and self.verdicts:
+            self.store.save()
+
+    def report(self) -> str:
+        """Per-scenario / per-algorithm delta table"""
+        if not self.verdicts:
+            return ""
+        lines = [f"{'scenario':<14} {'algorithm':<34} {'median':>10} {'baseline':>10} {'delta':>8}  status"]
+        for v in sorted(self.verdicts, key=lambda v: (v.scenario, v.algorithm)):
+            baseline = f"{v.baseline_median * 1000:.1f}ms" if v.baseline_median is not None else "-"
+            delta = f"{v.delta_pct:+.1f}%" if v.delta_pct is not None else "-"
+            status = v.status if v.enforced else f"{v.status} (not enforced)"
+            lines.append(
+                f"{v.scenario:<14} {v.algorithm:<34} {v.timing.median * 1000:>8.1f}ms {baseline:>10} {delta:>8}  {status}"
+            )
+        return "\n".join(lines)
+
+    def to_dict(self) -> Dict:
+        return {
+            "machine": machine_fingerprint(),
+            "baseline_machine": self.store.machine,
+            "tolerance": self.tolerance,
+            "results": [v.to_dict() for v in self.verdicts],
+        }
@@ -0,0 +1,416 @@
+# -*- coding: utf-8 -*-
+"""
+Run History - Algoritma seçimini geçmiş çalıştırmalardan öğrenir
+Her zamanlayıcı çalıştırmasını örnek özellikleri (boyutlar, yoğunluk, müsaitlik
+darlığı, müfredat baskısı) ile birlikte süre ve kapsama olarak kaydeder; yerel
+bir model, benzer örneklerde %100 kapsamaya ulaşması muhtemel en hızlı algoritmayı
+tahmin eder.
+
+Model:
+    k-NN (varsayılan, bağımlılıksız) - standartlaştırılmış özelliklerde mesafe ağırlıklı
+    Gradient boosting (scikit-learn varsa ve algoritma başına yeterli kayıt varsa)
+
+Usage:
+    history = get_run_history()
+    features = InstanceFeatures.from_database(db_manager)
+    history.record(features, "HybridOptimalScheduler", wall_time=4.2, coverage=1.0)
+    best = history.predictor().best(features)
+"""
+
+import importlib.util
+import json
+import logging
+import math
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field, fields
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from algorithms.constants import DAYS_PER_WEEK, SCHOOL_TIME_SLOTS
+
+# sklearn yalnızca ağaç modelleri eğitilirken içe aktarılır; burada sadece varlığı kontrol edilir
+SKLEARN_AVAILABLE = importlib.util.find_spec("sklearn") is not None
+
+logger = logging.getLogger(__name__)
+
+
+def user_data_dir() -> str:
+    """Per-user directory for runtime state (kept out of the source checkout)"""
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+    else:
+        base = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    return os.path.join(base, "class-scheduling-program")
+
+
+# Çalışma dizininden bağımsız: geçmiş kullanıcının veri dizininde tutulur
+DEFAULT_HISTORY_PATH = os.path.join(user_data_dir(), "run_history.json")
+MAX_RECORDS = 1000
+# Kapsama bu değere ulaşırsa çalıştırma "tamamlandı" sayılır
+COMPLETE_COVERAGE = 0.999
+MIN_TIME = 1e-3
+
+
+@dataclass
+class InstanceFeatures:
+    """Size and tightness of a scheduling instance, from COUNT(*) queries"""
+
+    num_classes: int = 0
+    num_teachers: int = 0
+    num_lessons: int = 0
+    num_assignments: int = 0
+    required_hours: int = 0
+    assigned_hours: int = 0
+    unavailable_slots: int = 0
+    slots_per_week: int = 40
+
+    @classmethod
+    def from_counts(cls, counts: Dict, slots_per_week: int) -> "InstanceFeatures":
+        names = {f.name for f in fields(cls)}
+        values = {f"num_{key}" if f"num_{key}" in names else key: int(value or 0) for key, value in counts.items()}
+        return cls(**{k: v for k, v in values.items() if k in names}, slots_per_week=slots_per_week)
+
+    @classmethod
+    def from_database(cls, db_manager) -> "InstanceFeatures":
+        """
+        Extract features with one aggregate query
+
+        Args:
+            db_manager: DatabaseManager instance
+
+        Returns:
+            InstanceFeatures
+        """
+        slots_per_day = SCHOOL_TIME_SLOTS.get(db_manager.get_school_type() or "Lise", 8)
+        return cls.from_counts(db_manager.get_instance_counts(), DAYS_PER_WEEK * slots_per_day)
+
+    @property
+    def assignment_density(self) -> float:
+        """Assigned class/lesson pairs per possible pair"""
+        return self.num_assignments / max(1, self.num_classes * self.num_lessons)
+
+    @property
+    def availability_tightness(self) -> float:
+        """Share of teacher slots marked unavailable"""
+        return self.unavailable_slots / max(1, self.num_teachers * self.slots_per_week)
+
+    @property
+    def curriculum_pressure(self) -> float:
+        """Required hours per class slot (1.0 = every slot of every class is filled)"""
+        return self.required_hours / max(1, self.num_classes * self.slots_per_week)
+
+    @property
+    def teacher_load(self) -> float:
+        """Assigned hours per available teacher slot"""
+        open_slots = self.num_teachers * self.slots_per_week - self.unavailable_slots
+        return self.assigned_hours / max(1, open_slots)
+
+    def vector(self) -> List[float]:
+        """Model input: log sizes plus the ratios"""
+        return [
+            math.log1p(self.num_classes),
+            math.log1p(self.num_teachers),
+            math.log1p(self.num_lessons),
+            math.log1p(self.assigned_hours),
+            self.assignment_density,
+            self.availability_tightness,
+            self.curriculum_pressure,
+            self.teacher_load,
+        ]
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    def describe(self) -> Dict[str, float]:
+        """Counts and derived ratios (for logs and recommendations)"""
+        data = self.to_dict()
+        data.update(
+            assignment_density=round(self.assignment_density, 4),
+            availability_tightness=round(self.availability_tightness, 4),
+            curriculum_pressure=round(self.curriculum_pressure, 4),
+            teacher_load=round(self.teacher_load, 4),
+        )
+        return data
+
+
+@dataclass
+class RunRecord:
+    """One recorded scheduler run"""
+
+    algorithm: str
+    wall_time: float
+    coverage: float
+    features: InstanceFeatures
+    timestamp: str = ""
+
+    @property
+    def complete(self) -> bool:
+        return self.coverage >= COMPLETE_COVERAGE
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["wall_time"] = round(self.wall_time, 4)
+        data["coverage"] = round(self.coverage, 4)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "RunRecord":
+        return cls(
+            algorithm=data["algorithm"],
+            wall_time=float(data["wall_time"]),
+            coverage=float(data["coverage"]),
+            features=InstanceFeatures(**data.get("features", {})),
+            timestamp=data.get("timestamp", ""),
+        )
+
+
+@dataclass
+class Prediction:
+    """Expected wall time and completion chance of one algorithm"""
+
+    algorithm: str
+    expected_time: float
+    p_complete: float
+    samples: int
+    model: str  # "knn" | "gbt"
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["expected_time"] = round(self.expected_time, 4)
+        data["p_complete"] = round(self.p_complete, 4)
+        return data
+
+
+class AlgorithmPredictor:
+    """
+    Per-algorithm wall time and completion model
+
+    Features are standardized over all records. With fewer than
+    ``gbt_min_runs`` runs of an algorithm (or without scikit-learn) the
+    prediction is a distance-weighted average of the ``k`` nearest runs:
+    log wall time for the time, complete/incomplete for the probability.
+    """
+
+    def __init__(self, k: int = 5, min_runs: int = 2, gbt_min_runs: int = 40, threshold: float = 0.5):
+        """
+        Initialize predictor
+
+        Args:
+            k: Neighbours used by k-NN
+            min_runs: Runs an algorithm needs before it is predicted at all
+            gbt_min_runs: Runs an algorithm needs before gradient boosting is used
+            threshold: Completion probability an algorithm needs to be preferred on speed
+        """
+        self.k = k
+        self.min_runs = min_runs
+        self.gbt_min_runs = gbt_min_runs
+        self.threshold = threshold
+        self._mean: List[float] = []
+        self._scale: List[float] = []
+        self._runs: Dict[str, List[tuple]] = {}
+        self._models: Dict[str, tuple] = {}
+
+    def fit(self, records: Iterable[RunRecord]) -> "AlgorithmPredictor":
+        records = list(records)
+        self._runs.clear()
+        self._models.clear()
+        if not records:
+            return self
+        vectors = [r.features.vector() for r in records]
+        columns = list(zip(*vectors))
+        self._mean = [sum(col) / len(col) for col in columns]
+        self._scale = [
+            math.sqrt(sum((x - m) ** 2 for x in col) / len(col)) or 1.0 for col, m in zip(columns, self._mean)
+        ]
+        for record, vector in zip(records, vectors):
+            self._runs.setdefault(record.algorithm, []).append(
+                (self._standardize(vector), math.log(max(record.wall_time, MIN_TIME)), 1.0 if record.complete else 0.0)
+            )
+        if SKLEARN_AVAILABLE:
+            for algorithm, runs in self._runs.items():
+                if len(runs) >= self.gbt_min_runs:
+                    self._models[algorithm] = self._fit_trees(runs)
+        return self
+
+    @staticmethod
+    def _fit_trees(runs: List[tuple]) -> tuple:
+        from sklearn.ensemble import GradientBoostingClassifier, GradientBoostingRegressor
+
+        X = [x for x, _, _ in runs]
+        times = GradientBoostingRegressor(n_estimators=100, max_depth=3).fit(X, [t for _, t, _ in runs])
+        labels = [c for _, _, c in runs]
+        if len(set(labels)) < 2:
+            return times, labels[0]
+        return times, GradientBoostingClassifier(n_estimators=100, max_depth=3).fit(X, labels)
+
+    def _standardize(self, vector: Sequence[float]) -> List[float]:
+        return [(x - m) / s for x, m, s in zip(vector, self._mean, self._scale)]
+
+    def _knn(self, runs: List[tuple], x: List[float]) -> tuple:
+        nearest = sorted((math.dist(x, rx), t, c) for rx, t, c in runs)[: self.k]
+        weights = [1.0 / (d + 1e-6) for d, _, _ in nearest]
+        total = sum(weights)
+        log_time = sum(w * t for w, (_, t, _) in zip(weights, nearest)) / total
+        p_complete = sum(w * c for w, (_, _, c) in zip(weights, nearest)) / total
+        return math.exp(log_time), p_complete
+
+    def predict(self, features: InstanceFeatures, candidates: Optional[Iterable[str]] = None) -> List[Prediction]:
+        """
+        Predict every algorithm with enough history, best first
+
+        Algorithms likely to complete come first, fastest first; the rest
+        follow by completion chance.
+
+        Args:
+            features: Instance to predict for
+            candidates: Algorithm names to consider (default: all recorded)
+
+        Returns:
+            List of Prediction
+        """
+        if not self._runs:
+            return []
+        x = self._standardize(features.vector())
+        names = self._runs if candidates is None else [c for c in candidates if c in self._runs]
+        predictions = []
+        for algorithm in names:
+            runs = self._runs[algorithm]
+            if len(runs) < self.min_runs:
+                continue
+            model = self._models.get(algorithm)
+            if model is not None:
+                times, completion = model
+                expected = math.exp(float(times.predict([x])[0]))
+                p_complete = float(completion) if isinstance(completion, float) else float(completion.predict_proba([x])[0][1])
+                predictions.append(Prediction(algorithm, expected, p_complete, len(runs), "gbt"))
+            else:
+                expected, p_complete = self._knn(runs, x)
+                predictions.append(Prediction(algorithm, expected, p_complete, len(runs), "knn"))
+        predictions.sort(
+            key=lambda p: (p.p_complete < self.threshold, p.expected_time if p.p_complete >= self.threshold else -p.p_complete)
+        )
+        return predictions
+
+    def best(self, features: InstanceFeatures, candidates: Optional[Iterable[str]] = None) -> Optional[Prediction]:
+        """Fastest algorithm likely to reach 100% coverage (None if no candidate reaches ``threshold``)"""
+        predictions = self.predict(features, candidates)
+        if not predictions or predictions[0].p_complete < self.threshold:
+            return None
+        return predictions[0]
+
+
+class RunHistoryStore:
+    """
+    Recorded scheduler runs persisted as JSON
+
+    Layout: ``{"updated": ..., "runs": [RunRecord.to_dict(), ...]}``; only the
+    newest ``max_records`` runs are kept.
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_HISTORY_PATH, max_records: int = MAX_RECORDS):
+        """
+        Initialize store
+
+        Args:
+            path: JSON file (None keeps the history in memory only)
+            max_records: Runs kept, oldest dropped first
+        """
+        self.path = path
+        self.max_records = max_records
+        self.runs: List[RunRecord] = []
+        self._lock = threading.Lock()
+        self._predictor: Optional[AlgorithmPredictor] = None
+        self.load()
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.runs = [RunRecord.from_dict(run) for run in data.get("runs", [])]
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Could not read run history {self.path}: {e}")
+
+    def record(
+        self, features: InstanceFeatures, algorithm: str, wall_time: float, coverage: float
+    ) -> Optional[RunRecord]:
+        """
+        Add one run and persist the history
+
+        Runs on empty instances (no class or no required hour) teach the
+        model nothing and are skipped.
+
+        Args:
+            features: Instance the run solved
+            algorithm: Scheduler class name
+            wall_time: Seconds the run took
+            coverage: Placed / required hours (0..1)
+
+        Returns:
+            The stored RunRecord, or None if the run was skipped
+        """
+        if features.num_classes <= 0 or features.assigned_hours <= 0:
+            logger.debug(f"Run of {algorithm} on an empty instance not recorded")
+            return None
+        run = RunRecord(
+            algorithm, wall_time, max(0.0, min(1.0, coverage)), features, datetime.now().isoformat(timespec="seconds")
+        )
+        with self._lock:
+            self.runs.append(run)
+            del self.runs[: -self.max_records]
+            self._predictor = None
+        if self.path:
+            try:
+                self.save()
+            except OSError as e:
+                logger.warning(f"Could not save run history {self.path}: {e}")
+        return run
+
+    def predictor(self, **kwargs) -> AlgorithmPredictor:
+        """Model fitted on the current history (cached until the next record)"""
+        with self._lock:
+            if self._predictor is None or kwargs:
+                start = time.perf_counter()
+                predictor = AlgorithmPredictor(**kwargs).fit(self.runs)
+                logger.debug(f"Run history model fitted on {len(self.runs)} runs in {time.perf_counter() - start:.3f}s")
+                if kwargs:
+                    return predictor
+                self._predictor = predictor
+            return self._predictor
+
+    def save(self):
+        """Write the history atomically; concurrent savers never leave a partial file"""
+        with self._lock:
+            data = {
+                "updated": datetime.now().isoformat(timespec="seconds"),
+                "runs": [run.to_dict() for run in self.runs],
+            }
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Aynı dizinde geçici dosya + os.replace: okuyucular eski ya da yeni dosyayı görür
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
+                    f.write("\n")
+                os.replace(tmp_path, self.path)
+            except OSError:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+
+# Global instance
+_run_history = None
+
+
+def get_run_history() -> RunHistoryStore:
+    """Get global run history instance"""
+    global _run_history
+    if _run_history is None:
+        _run_history = RunHistoryStore()
+    return _run_history
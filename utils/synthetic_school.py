@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+"""
+Synthetic School Generator - Tekrarlanabilir sentetik okul verisi
+Okul türü, şube sayısı, öğretmen sayısı, müsaitlik yoğunluğu ve müfredat
+sıkılığı parametreleriyle sabit tohumlu (seed) test/benchmark veritabanları üretir.
+
+Müfredat MEB zorunlu ders saatlerinden (ScheduleRequirements) türetilir ve
+haftalık kapasitenin ``curriculum_tightness`` oranına ölçeklenir.
+
+Usage:
+    from utils.synthetic_school import SchoolSpec, generate_school
+
+    spec = SchoolSpec(school_type="Lise", class_count=40, availability_density=0.8, seed=7)
+    summary = generate_school(db_manager, spec)
+"""
+
+import logging
+import math
+import random
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from algorithms.constants import DAYS_PER_WEEK, SCHOOL_TIME_SLOTS
+from utils.schedule_requirements import ScheduleRequirements
+
+logger = logging.getLogger(__name__)
+
+SCHOOL_GRADES = {
+    "İlkokul": (1, 2, 3, 4),
+    "Ortaokul": (5, 6, 7, 8),
+}
+HIGH_SCHOOL_GRADES = (9, 10, 11, 12)
+
+# Tek bir dersin bir sınıftaki en fazla haftalık saati; fazlası numaralı derslere bölünür
+MAX_LESSON_HOURS = 6
+SECTION_LETTERS = "ABCDEFGHIJKLMNOPRSTUVYZ"
+
+
+@dataclass(frozen=True)
+class SchoolSpec:
+    """Parameters of one synthetic school instance"""
+
+    school_type: str = "Lise"
+    classes_per_grade: int = 3
+    class_count: Optional[int] = None  # set: distribute exactly this many classes over the grades
+    teacher_count: Optional[int] = None  # None: enough for max_teacher_hours each; at least one per lesson
+    availability_density: float = 1.0  # share of weekly slots each teacher is available
+    curriculum_tightness: float = 0.85  # required hours / weekly slots per class
+    max_teacher_hours: int = 22
+    seed: int = 42
+
+    @property
+    def grades(self) -> Tuple[int, ...]:
+        return SCHOOL_GRADES.get(self.school_type, HIGH_SCHOOL_GRADES)
+
+    @property
+    def slots_per_day(self) -> int:
+        return SCHOOL_TIME_SLOTS.get(self.school_type, 8)
+
+    @property
+    def weekly_slots(self) -> int:
+        return DAYS_PER_WEEK * self.slots_per_day
+
+    @property
+    def name(self) -> str:
+        classes = self.class_count if self.class_count is not None else self.classes_per_grade * len(self.grades)
+        return (
+            f"{self.school_type}-c{classes}-t{self.teacher_count or 'auto'}"
+            f"-a{self.availability_density:g}-k{self.curriculum_tightness:g}-s{self.seed}"
+        )
+
+    def sections_per_grade(self) -> Dict[int, int]:
+        """Number of classes (şube) in each grade"""
+        if self.class_count is None:
+            return {grade: self.classes_per_grade for grade in self.grades}
+        base, extra = divmod(self.class_count, len(self.grades))
+        return {grade: base + (1 if index < extra else 0) for index, grade in enumerate(self.grades)}
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+@dataclass
+class GeneratedSchool:
+    """Summary of a generated instance"""
+
+    spec: SchoolSpec
+    class_ids: List[int] = field(default_factory=list)
+    teacher_ids: List[int] = field(default_factory=list)
+    lesson_ids: Dict[str, int] = field(default_factory=dict)
+    assignments: int = 0
+    required_hours: int = 0
+    blocked_slots: int = 0
+
+    def to_dict(self) -> Dict:
+        return {
+            "spec": self.spec.to_dict(),
+            "classes": len(self.class_ids),
+            "teachers": len(self.teacher_ids),
+            "lessons": len(self.lesson_ids),
+            "assignments": self.assignments,
+            "required_hours": self.required_hours,
+            "blocked_slots": self.blocked_slots,
+        }
+
+
+def build_curriculum(spec: SchoolSpec) -> Dict[int, Dict[str, int]]:
+    """
+    Weekly hours per lesson for every grade, scaled to the requested tightness
+
+    Args:
+        spec: School parameters
+
+    Returns:
+        {grade: {lesson name: weekly hours}}
+    """
+    target = max(1, min(spec.weekly_slots, round(spec.curriculum_tightness * spec.weekly_slots)))
+    curriculum = {}
+    for grade in spec.grades:
+        base = ScheduleRequirements.get_mandatory_subjects_for_grade(grade, spec.school_type)
+        hours = _scale_hours(base, target)
+        curriculum[grade] = _split_long_lessons(hours)
+    return curriculum
+
+
+def _scale_hours(base: Dict[str, int], target: int) -> Dict[str, int]:
+    """Largest-remainder scaling of lesson hours to ``target`` (every lesson keeps ≥ 1 hour)"""
+    total = sum(base.values())
+    names = list(base)
+    if target < len(names):
+        names = sorted(names, key=lambda n: -base[n])[:target]
+        total = sum(base[n] for n in names)
+    shares = {n: base[n] * target / total for n in names}
+    hours = {n: max(1, int(shares[n])) for n in names}
+    remainder = target - sum(hours.values())
+    order = sorted(names, key=lambda n: (shares[n] - int(shares[n]), base[n]), reverse=True)
+    index = 0
+    while remainder != 0 and order:
+        name = order[index % len(order)]
+        if remainder > 0:
+            hours[name] += 1
+            remainder -= 1
+        elif hours[name] > 1:
+            hours[name] -= 1
+            remainder += 1
+        index += 1
+    return hours
+
+
+def _split_long_lessons(hours: Dict[str, int]) -> Dict[str, int]:
+    """Split lessons longer than MAX_LESSON_HOURS into numbered lessons"""
+    result = {}
+    for name, total in hours.items():
+        if total <= MAX_LESSON_HOURS:
+            result[name] = total
+            continue
+        parts = math.ceil(total / MAX_LESSON_HOURS)
+        size, extra = divmod(total, parts)
+        for part in range(parts):
+            result[f"{name} {part + 1}"] = size + (1 if part < extra else 0)
+    return result
+
+
+def _teachers_per_lesson(demand: Dict[str, int], spec: SchoolSpec) -> Dict[str, int]:
+    """Split the teacher pool over lessons in proportion to their weekly demand"""
+    if spec.teacher_count is None:
+        return {name: max(1, math.ceil(hours / spec.max_teacher_hours)) for name, hours in demand.items()}
+
+    total = sum(demand.values())
+    count = max(spec.teacher_count, len(demand))
+    shares = {name: hours * count / total for name, hours in demand.items()}
+    allocation = {name: max(1, int(share)) for name, share in shares.items()}
+    order = sorted(demand, key=lambda n: shares[n] - int(shares[n]), reverse=True)
+    index = 0
+    while sum(allocation.values()) < count:
+        allocation[order[index % len(order)]] += 1
+        index += 1
+    while sum(allocation.values()) > count:
+        name = max(allocation, key=lambda n: (allocation[n], -demand[n]))
+        allocation[name] -= 1
+    return allocation
+
+
+def generate_school(db_manager, spec: SchoolSpec) -> GeneratedSchool:
+    """
+    Populate an empty database with a synthetic school
+
+    The same spec (including the seed) always produces the same classes,
+    teachers, curriculum, assignments and availability.
+
+    Args:
+        db_manager: DatabaseManager on an empty database
+        spec: School parameters
+
+    Returns:
+        GeneratedSchool summary
+    """
+    rng = random.Random(spec.seed)
+    db_manager.set_school_type(spec.school_type)
+    result = GeneratedSchool(spec)
+    curriculum = build_curriculum(spec)
+    sections = spec.sections_per_grade()
+
+    # Dersler ve müfredat
+    for grade, lessons in curriculum.items():
+        for name, hours in lessons.items():
+            if name not in result.lesson_ids:
+                result.lesson_ids[name] = db_manager.add_lesson(name)
+            db_manager.add_lesson_weekly_hours(result.lesson_ids[name], grade, spec.school_type, hours)
+
+    # Sınıflar ve her sınıfa bir derslik
+    classes: List[Tuple[int, int, int]] = []  # (class_id, grade, classroom_id)
+    for grade in spec.grades:
+        for section in range(sections[grade]):
+            letter = SECTION_LETTERS[section % len(SECTION_LETTERS)]
+            suffix = "" if section < len(SECTION_LETTERS) else str(section // len(SECTION_LETTERS))
+            name = f"{grade}-{letter}{suffix}"
+            class_id = db_manager.add_class(name, grade)
+            classroom_id = db_manager.add_classroom(f"Derslik {name}", 30)
+            classes.append((class_id, grade, classroom_id))
+            result.class_ids.append(class_id)
+
+    # Öğretmenler: ders başına talep oranında
+    demand: Dict[str, int] = {}
+    for grade, lessons in curriculum.items():
+        for name, hours in lessons.items():
+            demand[name] = demand.get(name, 0) + hours * sections[grade]
+    demand = {name: hours for name, hours in demand.items() if hours > 0}
+
+    pools: Dict[str, List[int]] = {}
+    for name, count in _teachers_per_lesson(demand, spec).items():
+        pools[name] = []
+        for index in range(count):
+            teacher_id = db_manager.add_teacher(f"{name} Öğretmeni {index + 1}", name)
+            pools[name].append(teacher_id)
+            result.teacher_ids.append(teacher_id)
+
+    # Atamalar: her sınıf-ders için en az yüklü öğretmen
+    load = {teacher_id: 0 for teacher_id in result.teacher_ids}
+    for class_id, grade, classroom_id in classes:
+        for name, hours in curriculum[grade].items():
+            pool = pools[name]
+            teacher_id = min(pool, key=lambda t: (load[t], rng.random()))
+            load[teacher_id] += hours
+            db_manager.add_schedule_entry(class_id, teacher_id, result.lesson_ids[name], classroom_id, -1, -1)
+            result.assignments += 1
+            result.required_hours += hours
+
+    # Müsaitlik: her öğretmen yükünü karşılayacak kadar açık slot bırakılır
+    slots = [(day, slot) for day in range(DAYS_PER_WEEK) for slot in range(spec.slots_per_day)]
+    for teacher_id in result.teacher_ids:
+        wanted = round((1.0 - spec.availability_density) * len(slots))
+        blocked = max(0, min(wanted, len(slots) - load[teacher_id]))
+        for day, slot in rng.sample(slots, blocked):
+            db_manager.set_teacher_availability(teacher_id, day, slot, False)
+        result.blocked_slots += blocked
+
+    logger.info(
+        f"Synthetic school {spec.name}: {len(result.class_ids)} classes, {len(result.teacher_ids)} teachers, "
+        f"{result.required_hours} required hours, {result.blocked_slots} blocked slots"
+    )
+    return result
+
+
+def scaling_ladder(
+    class_counts=(10, 25, 50, 100, 200), **overrides
+) -> List[SchoolSpec]:
+    """
+    Specs of increasing size that share every other parameter
+
+    Args:
+        class_counts: Total number of classes per rung
+        **overrides: Other SchoolSpec fields (school_type, seed, ...)
+    """
+    return [SchoolSpec(class_count=count, **overrides) for count in class_counts]
@@ -0,0 +1,335 @@
+# -*- coding: utf-8 -*-
+"""
+Teacher Assignment Engine - Eksik ders atamalarının min-cost flow ile çözümü
+Öğretmenleri, branş uyumunu ve haftalık saat kapasitesini bir b-eşleme
+(min-cost flow) problemi olarak modeller ve tüm eksik atamaları tek seferde,
+yükleri dengeleyerek çözer.
+
+Ağ:
+    kaynak -> (ders, saat) grubu -> uyumlu öğretmen -> hedef
+
+Aynı dersi ve saati isteyen sınıflar tek düğümde toplanır; öğretmen -> hedef
+yayının maliyeti öğretmenin yükü arttıkça artar (konveks), böylece en az
+yüklü öğretmenler önce dolar. Amaç sırası: (1) olabildiğince çok atama,
+(2) tam branş eşleşmesi, (3) dengeli yük.
+
+Usage:
+    engine = TeacherAssignmentEngine(teachers, existing_hours=table.teacher_hours(), capacity=capacity)
+    plan = engine.solve(table.missing())
+"""
+
+import heapq
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from algorithms.constants import DAYS_PER_WEEK, SCHOOL_TIME_SLOTS
+
+logger = logging.getLogger(__name__)
+
+MATCH_EXACT = 0  # "Matematik" dersi <-> "Matematik" öğretmeni (alt dize)
+MATCH_WORD = 1  # "Fen Bilimleri" dersi <-> "Fen Bilgisi" öğretmeni (ortak kelime)
+
+# Bir kelime eşleşmesi, yük dengesindeki her farktan pahalı olmalı
+WORD_MATCH_PENALTY = 10**6
+# Yük maliyetleri tamsayı kalsın diye saatler 10 ile ölçeklenir
+LOAD_SCALE = 10
+
+def weekly_slot_count(school_type: Optional[str]) -> int:
+    """Haftalık ders saati sayısı (bir öğretmenin en fazla girebileceği saat)"""
+    return DAYS_PER_WEEK * SCHOOL_TIME_SLOTS.get(school_type, 8)
+
+
+def subject_match(lesson_name: str, subject: Optional[str]) -> Optional[int]:
+    """
+    Match quality of a teacher subject for a lesson
+
+    Args:
+        lesson_name: Lesson name
+        subject: Teacher subject
+
+    Returns:
+        MATCH_EXACT, MATCH_WORD or None when the teacher cannot teach the lesson
+    """
+    lesson, subject = (lesson_name or "").lower(), (subject or "").lower()
+    if not lesson or not subject:
+        return None
+    if subject in lesson or lesson in subject:
+        return MATCH_EXACT
+    subject_words = subject.split()
+    if any(word in subject_words for word in lesson.split() if len(word) > 3):
+        return MATCH_WORD
+    return None
+
+
+@dataclass
+class AssignmentPlan:
+    """Result of one solve"""
+
+    # (requirement, teacher_id) in requirement order
+    assignments: List[Tuple[object, int]] = field(default_factory=list)
+    # (requirement, reason) for requirements left without a teacher
+    unassigned: List[Tuple[object, str]] = field(default_factory=list)
+    # Weekly hours per teacher after the plan (existing + new)
+    teacher_hours: Dict[int, int] = field(default_factory=dict)
+    augmentations: int = 0
+    solves: int = 0
+
+
+class _ConvexFlow:
+    """
+    Successive shortest paths on the group -> teacher transport network
+
+    Group nodes are fed by the source (one unit per requirement); teacher
+    nodes drain into the sink through a convex arc whose j-th unit costs
+    marginal[t](j). Dijkstra with node potentials finds each augmenting path;
+    reverse arcs let later units push earlier ones to another teacher.
+    """
+
+    def __init__(self, supply: List[int], arcs: List[List[Tuple[int, int]]], caps: List[int], marginal):
+        self.supply = list(supply)
+        self.arcs = arcs  # group -> [(teacher, cost)]
+        self.arc_cost = [dict(group_arcs) for group_arcs in arcs]
+        self.caps = caps
+        self.marginal = marginal  # (teacher, j) -> cost of the j-th unit, increasing in j
+        self.flow: List[Dict[int, int]] = [dict() for _ in supply]  # group -> {teacher: units}
+        self.inflow: List[Dict[int, int]] = [dict() for _ in caps]  # teacher -> {group: cost}
+        self.load = [0] * len(caps)
+        self.augmentations = 0
+
+    def run(self):
+        groups, teachers = len(self.supply), len(self.caps)
+        # Düğümler: 0 = kaynak, 1..G gruplar, G+1..G+T öğretmenler, G+T+1 hedef
+        sink = groups + teachers + 1
+        potential = [0] * (sink + 1)
+        while True:
+            dist, parent = self._shortest_paths(potential, groups, sink)
+            if dist[sink] is None:
+                return
+            # Hedeften sonra kesinleşmeyen düğümler hedef mesafesiyle sınırlanır
+            for node, value in enumerate(dist):
+                potential[node] += dist[sink] if value is None else min(value, dist[sink])
+            self._augment(parent, groups, sink)
+            self.augmentations += 1
+
+    def _shortest_paths(self, potential, groups, sink):
+        dist: List[Optional[int]] = [None] * (sink + 1)
+        parent: List[Optional[int]] = [None] * (sink + 1)
+        dist[0] = 0
+        heap = [(0, 0)]
+        while heap:
+            d, node = heapq.heappop(heap)
+            if node == sink:
+                break
+            if d != dist[node]:
+                continue
+            for target, cost in self._residual(node, groups, sink):
+                reduced = d + cost + potential[node] - potential[target]
+                if dist[target] is None or reduced < dist[target]:
+                    dist[target], parent[target] = reduced, node
+                    heapq.heappush(heap, (reduced, target))
+        return dist, parent
+
+    def _residual(self, node, groups, sink):
+        if node == 0:
+            for g, left in enumerate(self.supply):
+                if left > 0:
+                    yield g + 1, 0
+        elif node <= groups:
+            for t, cost in self.arcs[node - 1]:
+                yield groups + 1 + t, cost
+        else:
+            t = node - groups - 1
+            # Geri yay: bu öğretmenin aldığı bir birimi başka öğretmene kaydır
+            for g, cost in self.inflow[t].items():
+                yield g + 1, -cost
+            if self.load[t] < self.caps[t]:
+                yield sink, self.marginal(t, self.load[t] + 1)
+
+    def _augment(self, parent, groups, sink):
+        teacher = parent[sink] - groups - 1
+        self.load[teacher] += 1
+        node = parent[sink]
+        while node != 0:
+            prev = parent[node]
+            if prev == 0:
+                self.supply[node - 1] -= 1
+            elif prev <= groups:  # grup -> öğretmen
+                g, t = prev - 1, node - groups - 1
+                self.flow[g][t] = self.flow[g].get(t, 0) + 1
+                self.inflow[t][g] = self.arc_cost[g][t]
+            else:  # öğretmen -> grup (geri yay)
+                t, g = prev - groups - 1, node - 1
+                self.flow[g][t] -= 1
+                if not self.flow[g][t]:
+                    del self.flow[g][t]
+                    del self.inflow[t][g]
+            node = prev
+
+
+class TeacherAssignmentEngine:
+    """Assign teachers to requirements as a min-cost b-matching"""
+
+    def __init__(
+        self,
+        teachers: Sequence,
+        existing_hours: Optional[Dict[int, int]] = None,
+        capacity: Optional[Dict[int, int]] = None,
+        default_capacity: int = 40,
+    ):
+        """
+        Initialize engine
+
+        Args:
+            teachers: Teacher objects (teacher_id, name, subject)
+            existing_hours: Weekly hours each teacher already teaches
+            capacity: Weekly hour limit per teacher
+            default_capacity: Limit for teachers missing from capacity
+        """
+        self.teachers = list(teachers)
+        self.existing_hours = dict(existing_hours or {})
+        self.capacity = dict(capacity or {})
+        self.default_capacity = default_capacity
+
+    def solve(self, requirements: Iterable) -> AssignmentPlan:
+        """
+        Choose a teacher for every requirement at once
+
+        Args:
+            requirements: Objects with class_id, lesson_id, lesson_name, weekly_hours
+
+        Returns:
+            AssignmentPlan
+        """
+        requirements = list(requirements)
+        plan = AssignmentPlan()
+        teacher_ids = [t.teacher_id for t in self.teachers]
+        base = [self.existing_hours.get(tid, 0) for tid in teacher_ids]
+        room = [max(0, self.capacity.get(tid, self.default_capacity) - load) for tid, load in zip(teacher_ids, base)]
+
+        # (ders, saat) grupları ve uyumlu öğretmenleri
+        group_index: Dict[Tuple[int, int], int] = {}
+        members: List[List[object]] = []
+        arcs: List[List[Tuple[int, int]]] = []
+        match_cache: Dict[int, List[Tuple[int, int]]] = {}
+        for requirement in requirements:
+            key = (requirement.lesson_id, requirement.weekly_hours)
+            if key not in group_index:
+                if requirement.lesson_id not in match_cache:
+                    match_cache[requirement.lesson_id] = self._compatible(requirement.lesson_name)
+                group_index[key] = len(members)
+                members.append([])
+                arcs.append(
+                    [(t, WORD_MATCH_PENALTY * match) for t, match in match_cache[requirement.lesson_id]]
+                )
+            members[group_index[key]].append(requirement)
+        hours = [group[0].weekly_hours or 0 for group in members]
+
+        # Öğretmen başına birim sınırı ve ortalama saat (yük maliyeti için)
+        reachable: List[List[int]] = [[] for _ in teacher_ids]
+        for g, group_arcs in enumerate(arcs):
+            for t, _ in group_arcs:
+                reachable[t].append(g)
+        caps, step = [], []
+        for t, groups in enumerate(reachable):
+            units = sum(len(members[g]) for g in groups)
+            smallest = min((max(hours[g], 1) for g in groups), default=1)
+            caps.append(min(room[t] // smallest, units))
+            mean = sum(hours[g] * len(members[g]) for g in groups) / units if units else 1
+            step.append(max(1, round(mean * LOAD_SCALE)))
+
+        # Branşlar birbirinden bağımsız: her bağlı bileşen ayrı (ve çok daha küçük) bir akış problemi
+        group_flow: List[Dict[int, int]] = [dict() for _ in members]
+        assigned_hours = [0] * len(teacher_ids)
+        for component_groups, component_teachers in self._components(arcs, len(teacher_ids)):
+            local = {t: i for i, t in enumerate(component_teachers)}
+            local_arcs = [[(local[t], cost) for t, cost in arcs[g]] for g in component_groups]
+            local_caps = [caps[t] for t in component_teachers]
+
+            def marginal(i: int, j: int, teachers=component_teachers) -> int:
+                return base[teachers[i]] * LOAD_SCALE + j * step[teachers[i]]
+
+            # Saat kapasitesi birim sınırına tam yansımaz: aşan öğretmenin sınırı düşürülüp yeniden çözülür
+            while True:
+                flow = _ConvexFlow([len(members[g]) for g in component_groups], local_arcs, local_caps, marginal)
+                flow.run()
+                plan.solves += 1
+                plan.augmentations += flow.augmentations
+                local_hours = [0] * len(component_teachers)
+                largest = [0] * len(component_teachers)
+                for i, g in enumerate(component_groups):
+                    for t, units in flow.flow[i].items():
+                        local_hours[t] += units * hours[g]
+                        largest[t] = max(largest[t], hours[g])
+                over = [t for t, tid in enumerate(component_teachers) if local_hours[t] > room[tid]]
+                if not over:
+                    break
+                for t in over:
+                    excess = local_hours[t] - room[component_teachers[t]]
+                    local_caps[t] = flow.load[t] - max(1, -(-excess // max(largest[t], 1)))
+
+            for i, g in enumerate(component_groups):
+                group_flow[g] = {component_teachers[t]: units for t, units in flow.flow[i].items()}
+            for t, tid in enumerate(component_teachers):
+                assigned_hours[tid] = local_hours[t]
+
+            # Düşürülen sınırlar yüzünden kalan boşluklar: açıkta kalanları sığan en az yüklü öğretmene ver
+            for i, g in enumerate(component_groups):
+                for _ in range(flow.supply[i]):
+                    fits = [
+                        (cost, base[t] + assigned_hours[t], t)
+                        for t, cost in arcs[g]
+                        if assigned_hours[t] + hours[g] <= room[t]
+                    ]
+                    if not fits:
+                        break
+                    t = min(fits)[2]
+                    group_flow[g][t] = group_flow[g].get(t, 0) + 1
+                    assigned_hours[t] += hours[g]
+
+        for g, group in enumerate(members):
+            queue = [t for t, units in sorted(group_flow[g].items()) for _ in range(units)]
+            for requirement, t in zip(group, queue):
+                plan.assignments.append((requirement, teacher_ids[t]))
+            for requirement in group[len(queue):]:
+                reason = "Uygun öğretmen bulunamadı" if not arcs[g] else "Öğretmen kapasitesi yetersiz"
+                plan.unassigned.append((requirement, reason))
+
+        order = {id(requirement): index for index, requirement in enumerate(requirements)}
+        plan.assignments.sort(key=lambda item: order[id(item[0])])
+        plan.unassigned.sort(key=lambda item: order[id(item[0])])
+        plan.teacher_hours = {tid: base[t] + assigned_hours[t] for t, tid in enumerate(teacher_ids)}
+        logger.info(
+            f"Teacher assignment: {len(plan.assignments)}/{len(requirements)} assigned "
+            f"({len(members)} groups, {plan.augmentations} augmentations, {plan.solves} solve(s))"
+        )
+        return plan
+
+    @staticmethod
+    def _components(arcs: List[List[Tuple[int, int]]], teacher_count: int) -> List[Tuple[List[int], List[int]]]:
+        """Connected (groups, teachers) components of the compatibility graph"""
+        parent = list(range(len(arcs) + teacher_count))
+
+        def find(node: int) -> int:
+            while parent[node] != node:
+                parent[node] = parent[parent[node]]
+                node = parent[node]
+            return node
+
+        for g, group_arcs in enumerate(arcs):
+            for t, _ in group_arcs:
+                parent[find(len(arcs) + t)] = find(g)
+
+        components: Dict[int, Tuple[List[int], List[int]]] = {}
+        for g in range(len(arcs)):
+            components.setdefault(find(g), ([], []))[0].append(g)
+        for t in range(teacher_count):
+            root = find(len(arcs) + t)
+            if root in components:
+                components[root][1].append(t)
+        return list(components.values())
+
+    def _compatible(self, lesson_name: str) -> List[Tuple[int, int]]:
+        """(teacher index, match) pairs of the teachers who can teach a lesson"""
+        matches = [(t, subject_match(lesson_name, teacher.subject)) for t, teacher in enumerate(self.teachers)]
+        return [(t, match) for t, match in matches if match is not None]
@@ -0,0 +1,130 @@
+"""
+In-memory timetable index for the schedule views.
+Loads the program and its lookup tables once, then follows the schedule
+change feed so that views only re-render the cells that actually changed.
+"""
+
+import logging
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from database.change_log import OP_ADD, OP_DELETE, OP_UPDATE
+
+# ("class" | "teacher", owner_id, day, time_slot)
+CellKey = Tuple[str, int, int, int]
+
+
+class TimetableIndex:
+    """Schedule program grouped by class and by teacher, with name lookups"""
+
+    OWNER_FIELDS = (("class", "class_id"), ("teacher", "teacher_id"))
+
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+        self.logger = logging.getLogger(__name__)
+        self.revision: Optional[int] = None
+
+        # (kind, owner_id) -> {(day, time_slot): entry}
+        self.cells: Dict[Tuple[str, int], Dict[Tuple[int, int], dict]] = defaultdict(dict)
+        self.entries: Dict[int, dict] = {}
+
+        self.lesson_names: Dict[int, str] = {}
+        self.teacher_names: Dict[int, str] = {}
+        self.class_names: Dict[int, str] = {}
+        self.classroom_names: Dict[int, str] = {}
+
+    def load(self):
+        """Load lookups and the full program (one query per table)"""
+        self.revision = self.db_manager.get_schedule_revision()
+        self.lesson_names = {l.lesson_id: l.name for l in self.db_manager.get_all_lessons() or []}
+        self.teacher_names = {t.teacher_id: t.name for t in self.db_manager.get_all_teachers() or []}
+        self.class_names = {c.class_id: c.name for c in self.db_manager.get_all_classes() or []}
+        self.classroom_names = {r.classroom_id: r.name for r in self.db_manager.get_all_classrooms() or []}
+
+        self.reset_entries(self.db_manager.get_schedule_program_by_school_type() or [])
+
+    def reset_entries(self, entries: Iterable[Any]):
+        """Replace the indexed program (ScheduleEntry objects or entry dicts)"""
+        self.cells.clear()
+        self.entries.clear()
+        for entry in entries:
+            if not isinstance(entry, dict):
+                entry = {
+                    "entry_id": entry.entry_id,
+                    "class_id": entry.class_id,
+                    "teacher_id": entry.teacher_id,
+                    "lesson_id": entry.lesson_id,
+                    "classroom_id": entry.classroom_id,
+                    "day": entry.day,
+                    "time_slot": entry.time_slot,
+                }
+            self._add(entry)
+
+    def refresh(self) -> Optional[Set[CellKey]]:
+        """
+        Bring the index up to date with the schedule change feed
+
+        Returns:
+            Set of changed cells, or None if everything was reloaded
+        """
+        if self.revision is None:
+            self.load()
+            return None
+
+        changes, revision = self.db_manager.get_schedule_changes_since(self.revision)
+        if changes is None:
+            self.load()
+            return None
+
+        removed, added = self.apply_changes(changes)
+        self.revision = revision
+        return {key for entry in removed + added for key in self.cell_keys(entry)}
+
+    def apply_changes(self, changes) -> Tuple[List[dict], List[dict]]:
+        """
+        Apply change-feed deltas without touching the stored revision
+
+        Args:
+            changes: Deltas returned by ``db_manager.get_schedule_changes_since``
+
+        Returns:
+            (removed_entries, added_entries) tuple
+        """
+        removed, added = [], []
+        for change in changes:
+            if change.op in (OP_DELETE, OP_UPDATE):
+                old = self._remove(change.entry_id)
+                if old is not None:
+                    removed.append(old)
+            # Already indexed if a full reload raced with this delta
+            if change.op in (OP_ADD, OP_UPDATE) and change.entry_id not in self.entries:
+                entry = change.to_dict()
+                self._add(entry)
+                added.append(entry)
+        return removed, added
+
+    def cells_for(self, kind: str, owner_id: int) -> Dict[Tuple[int, int], dict]:
+        """Entries of a class or teacher keyed by (day, time_slot)"""
+        return self.cells.get((kind, owner_id), {})
+
+    def cell_keys(self, entry: dict):
+        """Cells of the class and teacher views that show an entry"""
+        for kind, field in self.OWNER_FIELDS:
+            yield kind, entry.get(field), entry.get("day"), entry.get("time_slot")
+
+    def _add(self, entry: dict):
+        if entry.get("entry_id") is not None:
+            self.entries[entry["entry_id"]] = entry
+        for kind, field in self.OWNER_FIELDS:
+            self.cells[(kind, entry.get(field))][(entry.get("day"), entry.get("time_slot"))] = entry
+
+    def _remove(self, entry_id: int) -> Optional[dict]:
+        entry = self.entries.pop(entry_id, None)
+        if entry is None:
+            return None
+        for kind, field in self.OWNER_FIELDS:
+            owner_cells = self.cells.get((kind, entry.get(field)), {})
+            position = (entry.get("day"), entry.get("time_slot"))
+            if owner_cells.get(position) is entry:
+                del owner_cells[position]
+        return entry